@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark trace ID lookups: like(_raw) scans over index=* versus indexed-term lookups over
+index=*, with a like(_raw) fallback restricted to the indices the error search found errors in.
+
+Offline (default) the searches are replayed against a recorded dataset
+(benchmark_data/trace_lookup_events.jsonl) with a simplified model of Splunk's lexicon:
+a term lookup only reads events whose segments contain the ID, a like() scan reads every
+event of the selected indices. With --live both SPL variants are run against the configured
+Splunk instance and the job's scanCount is reported.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, 'src')
+
+from src.tools.splunk_trace_search_by_ids import MAJOR_BREAKERS, SplunkTraceSearchByIdsTool
+
+DATASET = Path(__file__).parent / "benchmark_data" / "trace_lookup_events.jsonl"
+
+# UUIDs and 32-hex trace IDs, as they appear in error logs
+TRACE_ID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{32}")
+
+# Characters Splunk uses to split major segments further into minor segments
+MINOR_BREAKERS = set("/:=@.-$#%\\_")
+
+
+def _split(text, breakers):
+    """Split text on any of the given breaker characters."""
+    segments, current = [], []
+    for char in text:
+        if char in breakers:
+            if current:
+                segments.append("".join(current))
+                current = []
+        else:
+            current.append(char)
+    if current:
+        segments.append("".join(current))
+    return segments
+
+
+def index_event(raw):
+    """Lexicon entries of one event: its major segments and their minor segments."""
+    major = {segment.lower() for segment in _split(raw, MAJOR_BREAKERS)}
+    minor = {part for segment in major for part in _split(segment, MINOR_BREAKERS)}
+    return major, major | minor
+
+
+def term_matches(token, raw, major, lexicon):
+    """Whether a lookup token from _term_token() selects this event from the index."""
+    if token.startswith("TERM("):
+        return token[5:-1].lower() in major
+    if token.startswith('"'):
+        phrase = token[1:-1].replace('\\"', '"')
+        parts = _split(phrase.lower(), MAJOR_BREAKERS | MINOR_BREAKERS)
+        return all(part in lexicon for part in parts) and phrase in raw
+    return token.lower() in lexicon
+
+
+def whole_token(trace_id, raw):
+    """Whether an ID appears in the event delimited by non-alphanumeric characters."""
+    return re.search(rf"(?<![0-9A-Za-z]){re.escape(trace_id)}(?![0-9A-Za-z])", raw) is not None
+
+
+def load_events(path):
+    """Load the recorded events and build their lexicon entries."""
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            event = json.loads(line)
+            event["major"], event["lexicon"] = index_event(event["_raw"])
+            events.append(event)
+    return events
+
+
+def error_sample(events):
+    """Indices with errors and the trace IDs mentioned in their error events, like splunk_error_search."""
+    errors = [e for e in events if "ERROR" in e["_raw"]]
+    indices = sorted({e["index"] for e in errors})
+    ids = list(dict.fromkeys(m for e in errors for m in TRACE_ID_PATTERN.findall(e["_raw"])))
+    return indices, ids
+
+
+def simulate(events, spl_ids, indices, mode, tool):
+    """Replay one search; returns (events scanned, events returned, matching events per ID)."""
+    selected = [e for e in events if not indices or e["index"] in indices]
+    if mode == "scan":
+        # like(_raw) has no index support: every event of the selected indices is read
+        hits = [[i for i in spl_ids if i in e["_raw"]] for e in selected]
+        return len(selected), sum(1 for h in hits if h), Counter(i for h in hits for i in h)
+
+    tokens = {i: tool._term_token(i) for i in spl_ids}
+    scanned, found = 0, Counter()
+    for event in selected:
+        hits = [i for i, token in tokens.items() if term_matches(token, event["_raw"], event["major"], event["lexicon"])]
+        if hits:
+            scanned += 1
+            found.update(hits)
+    # Every event read from the lexicon matches, so scanned equals returned
+    return scanned, scanned, found
+
+
+def run_offline(args, tool):
+    """Compare both lookups against the recorded dataset."""
+    events = load_events(args.dataset)
+    indices, ids = error_sample(events)
+    if args.ids:
+        ids = args.ids
+    all_indices = sorted({e["index"] for e in events})
+
+    print(f"📦 Dataset: {args.dataset} ({len(events):,} events in {', '.join(all_indices)})")
+    print(f"🔎 {len(ids)} trace IDs from error events in: {', '.join(indices)}")
+    print()
+
+    baseline_scanned, baseline_returned, baseline_found = simulate(events, ids, None, "scan", tool)
+    print("🐢 Baseline: like(_raw) over index=*")
+    print(f"   SPL: {tool._build_trace_spl(ids[:1], None, 'scan')} ...")
+    print(f"   Events scanned: {baseline_scanned:,}, returned: {baseline_returned:,}")
+    print(f"   IDs found: {len(baseline_found)}/{len(ids)}")
+    print()
+
+    term_scanned, term_returned, term_found = simulate(events, ids, None, "term", tool)
+    pending = [i for i in ids if i not in term_found]
+    fallback_scanned, fallback_returned, fallback_found = (simulate(events, pending, indices, "scan", tool)
+                                                           if pending else (0, 0, Counter()))
+    found = term_found + fallback_found
+    total = term_scanned + fallback_scanned
+    print("🚀 Indexed terms over index=*, raw scan over error indices for IDs not found")
+    print(f"   SPL: {tool._build_trace_spl(ids[:3], None, 'term')} ...")
+    print(f"   Events scanned by term lookup: {term_scanned:,}, returned: {term_returned:,}")
+    print(f"   Events scanned by fallback ({len(pending)} IDs): {fallback_scanned:,}, "
+          f"returned: {fallback_returned:,}")
+    print(f"   IDs found: {len(found)}/{len(ids)}")
+    print()
+
+    print(f"📉 Scan reduction: {baseline_scanned:,} → {total:,} events "
+          f"({baseline_scanned / max(total, 1):.1f}x fewer)")
+    if set(found) != set(baseline_found):
+        print(f"❌ Found IDs differ: {sorted(set(baseline_found) ^ set(found))}")
+        return False
+    print("✅ Both lookups found the same IDs")
+    missing = {i: baseline_found[i] - found[i] for i in ids if found[i] != baseline_found[i]}
+    if not missing:
+        print("✅ Both lookups returned the same events per ID")
+        return True
+    print(f"⚠️  Term lookup returned {term_returned + fallback_returned:,} of {baseline_returned:,} events:")
+    for trace_id, difference in missing.items():
+        print(f"   {trace_id}: {found[trace_id]}/{baseline_found[trace_id]} events ({difference} missing)")
+    # like(_raw) also matches an ID embedded in a longer token, which is not the same ID
+    embedded = [e for i in missing for e in events if i in e["_raw"] and not whole_token(i, e["_raw"])]
+    if len(embedded) != sum(missing.values()):
+        print("❌ The term lookup misses events that mention an ID as a whole token")
+        return False
+    print(f"   All {len(embedded)} only contain the ID inside a longer token, e.g.: {embedded[0]['_raw'][:80]}")
+    return True
+
+
+def run_live(args, tool):
+    """Run both SPL variants against Splunk and compare the jobs' scan counts."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    from src.config import get_config
+    from src.splunk.client import SplunkClient
+
+    if not args.ids:
+        print("❌ --live needs --ids")
+        return False
+
+    client = SplunkClient(get_config().splunk)
+    client.connect()
+    try:
+        variants = [("like(_raw) over index=*", tool._build_trace_spl(args.ids, None, "scan")),
+                    ("indexed terms over index=*", tool._build_trace_spl(args.ids, None, "term"))]
+        counts = []
+        for label, spl in variants:
+            result = client.run_search(spl, earliest_time=args.earliest_time, latest_time="now",
+                                       max_results=4000, strategy="normal")
+            execution = result["execution"]
+            counts.append(execution.get("scan_count") or 0)
+            print(f"🔎 {label}")
+            print(f"   SPL: {spl}")
+            print(f"   Events scanned: {counts[-1]:,}, results: {len(result['results']):,}, "
+                  f"{execution.get('elapsed_seconds')}s")
+        print(f"📉 Scan reduction: {counts[0] / max(counts[1], 1):.1f}x fewer events")
+        return True
+    finally:
+        client.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", default=str(DATASET), help="Recorded events (JSON lines with index and _raw)")
+    parser.add_argument("--ids", nargs="+", help="Trace IDs to look up (default: IDs found in error events)")
+    parser.add_argument("--earliest-time", default="-24h", help="Search window for --live mode")
+    parser.add_argument("--live", action="store_true", help="Run against the configured Splunk instance")
+    args = parser.parse_args()
+
+    tool = SplunkTraceSearchByIdsTool()
+    ok = run_live(args, tool) if args.live else run_offline(args, tool)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,44 @@ class SplunkConfig:
     version: str = "8.0"
     verify_ssl: bool = True
     timeout: int = 30
+    # Longest wait for a search job to finish (MCP_SEARCH_TIMEOUT)
+    search_timeout: int = 300
+    # Job polling: start fast, back off towards the max interval
+    poll_interval_min: float = 0.1
+    poll_interval_max: float = 2.0
+    poll_backoff_factor: float = 1.5
+    # Threads available for running blocking Splunk calls from async tools
+    max_workers: int = 8
+    # Shared pool of logged-in sessions
+    pool_size: int = 4
+    pool_idle_timeout: float = 300.0
+    pool_health_check_interval: float = 60.0
+    # Rows fetched per request when paging through job results
+    results_page_size: int = 1000
+    # Searches bounded at or below this many results run as oneshot
+    oneshot_max_results: int = 1000
+    # Search result cache; an empty cache_dir disables the on-disk tier
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttl: float = 60.0
+    cache_time_granularity: int = 60
+    cache_dir: str = ""
+    cache_disk_max_bytes: int = 512 * 1024 * 1024
+    # Events per trace ID reused across trace searches; windows are snapped to the TTL
+    trace_cache_max_bytes: int = 32 * 1024 * 1024
+    trace_cache_ttl: float = 300.0
+    # Finished jobs kept alive on splunkd for reuse via loadjob/paged reads
+    job_retention_ttl: int = 600
+    job_registry_max_entries: int = 100
+    job_retention_max_count: int = 10000
+    # Concurrent searches admitted by the scheduler; capped to the role quota when detected
+    max_concurrent_searches: int = 4
+    detect_search_quota: bool = True
+    # Retries for transient REST failures and the splunkd circuit breaker
+    retry_max_attempts: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    breaker_failure_threshold: int = 5
+    breaker_recovery_timeout: float = 30.0
 
 
 @dataclass
@@ -48,6 +86,38 @@ class MCPConfig:
     version: str = "1.0.0"
     max_results_default: int = 100
     search_timeout: int = 300
+    # Results passed between chained tools by artifact_id; an empty artifact_dir disables spilling to disk
+    artifact_max_bytes: int = 64 * 1024 * 1024
+    artifact_ttl: float = 3600.0
+    artifact_dir: str = ""
+    artifact_disk_max_bytes: int = 512 * 1024 * 1024
+    # Estimated prompt tokens allowed per trace and for all traces in analyze_traces_narrative
+    analysis_trace_token_budget: int = 6000
+    analysis_total_token_budget: int = 24000
+    # JSON in tool responses: 'compact' or 'pretty', encoded with orjson when available ('auto')
+    response_format: str = "compact"
+    json_encoder: str = "auto"
+    # splunk_monitor result buffer; overflow is 'drop_oldest', 'spill' or 'pause'
+    monitor_buffer_max_results: int = 10000
+    monitor_buffer_max_bytes: int = 32 * 1024 * 1024
+    monitor_overflow: str = "drop_oldest"
+    monitor_spill_dir: str = ""
+    monitor_spill_max_bytes: int = 256 * 1024 * 1024
+    # All monitor sessions share one scheduler; checks run on a bounded pool
+    monitor_max_concurrent_checks: int = 8
+    monitor_max_sessions: int = 50
+    # Sessions with the same normalized query and an interval within the
+    # tolerance (a fraction of the feed's interval) share one search per tick
+    monitor_coalesce: bool = True
+    monitor_coalesce_tolerance: float = 0.25
+    # Monitor checks window on _indextime: events may trail their index time
+    # by up to monitor_lateness seconds, and each check re-reads
+    # monitor_index_overlap seconds of index time, deduplicating events
+    monitor_lateness: int = 300
+    monitor_index_overlap: int = 10
+    # 'poll' or 'realtime' (one long-lived real-time search per session)
+    monitor_mode: str = "poll"
+    monitor_realtime_backfill: int = 300
     # External MCP servers
     atlassian_server_name: str = "atlassian-mcp-server"
     github_server_name: str = "github-mcp-server"
@@ -110,6 +180,33 @@ class ConfigLoader:
         version = os.getenv('SPLUNK_VERSION', '8.0')
         verify_ssl = self._get_bool_env('SPLUNK_VERIFY_SSL', True)
         timeout = self._get_int_env('SPLUNK_TIMEOUT', 30)
+        search_timeout = self._get_int_env('MCP_SEARCH_TIMEOUT', 300)
+        poll_interval_min = self._get_float_env('SPLUNK_POLL_INTERVAL_MIN', 0.1)
+        poll_interval_max = self._get_float_env('SPLUNK_POLL_INTERVAL_MAX', 2.0)
+        poll_backoff_factor = self._get_float_env('SPLUNK_POLL_BACKOFF_FACTOR', 1.5)
+        max_workers = self._get_int_env('SPLUNK_MAX_WORKERS', 8)
+        pool_size = self._get_int_env('SPLUNK_POOL_SIZE', 4)
+        pool_idle_timeout = self._get_float_env('SPLUNK_POOL_IDLE_TIMEOUT', 300.0)
+        pool_health_check_interval = self._get_float_env('SPLUNK_POOL_HEALTH_CHECK_INTERVAL', 60.0)
+        results_page_size = self._get_int_env('SPLUNK_RESULTS_PAGE_SIZE', 1000)
+        oneshot_max_results = self._get_int_env('SPLUNK_ONESHOT_MAX_RESULTS', 1000)
+        cache_max_bytes = self._get_int_env('SPLUNK_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        cache_ttl = self._get_float_env('SPLUNK_CACHE_TTL', 60.0)
+        cache_time_granularity = self._get_int_env('SPLUNK_CACHE_TIME_GRANULARITY', 60)
+        cache_dir = os.getenv('SPLUNK_CACHE_DIR', '')
+        cache_disk_max_bytes = self._get_int_env('SPLUNK_CACHE_DISK_MAX_BYTES', 512 * 1024 * 1024)
+        trace_cache_max_bytes = self._get_int_env('SPLUNK_TRACE_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+        trace_cache_ttl = self._get_float_env('SPLUNK_TRACE_CACHE_TTL', 300.0)
+        job_retention_ttl = self._get_int_env('SPLUNK_JOB_RETENTION_TTL', 600)
+        job_registry_max_entries = self._get_int_env('SPLUNK_JOB_REGISTRY_MAX_ENTRIES', 100)
+        job_retention_max_count = self._get_int_env('SPLUNK_JOB_RETENTION_MAX_COUNT', 10000)
+        max_concurrent_searches = self._get_int_env('SPLUNK_MAX_CONCURRENT_SEARCHES', 4)
+        detect_search_quota = self._get_bool_env('SPLUNK_DETECT_SEARCH_QUOTA', True)
+        retry_max_attempts = self._get_int_env('SPLUNK_RETRY_MAX_ATTEMPTS', 3)
+        retry_base_delay = self._get_float_env('SPLUNK_RETRY_BASE_DELAY', 0.5)
+        retry_max_delay = self._get_float_env('SPLUNK_RETRY_MAX_DELAY', 8.0)
+        breaker_failure_threshold = self._get_int_env('SPLUNK_BREAKER_FAILURE_THRESHOLD', 5)
+        breaker_recovery_timeout = self._get_float_env('SPLUNK_BREAKER_RECOVERY_TIMEOUT', 30.0)
         
         # Create Splunk config
         splunk_config = SplunkConfig(
@@ -120,7 +217,34 @@ class ConfigLoader:
             scheme=scheme,
             version=version,
             verify_ssl=verify_ssl,
-            timeout=timeout
+            timeout=timeout,
+            search_timeout=search_timeout,
+            poll_interval_min=poll_interval_min,
+            poll_interval_max=poll_interval_max,
+            poll_backoff_factor=poll_backoff_factor,
+            max_workers=max_workers,
+            pool_size=pool_size,
+            pool_idle_timeout=pool_idle_timeout,
+            pool_health_check_interval=pool_health_check_interval,
+            results_page_size=results_page_size,
+            oneshot_max_results=oneshot_max_results,
+            cache_max_bytes=cache_max_bytes,
+            cache_ttl=cache_ttl,
+            cache_time_granularity=cache_time_granularity,
+            cache_dir=cache_dir,
+            cache_disk_max_bytes=cache_disk_max_bytes,
+            trace_cache_max_bytes=trace_cache_max_bytes,
+            trace_cache_ttl=trace_cache_ttl,
+            job_retention_ttl=job_retention_ttl,
+            job_registry_max_entries=job_registry_max_entries,
+            job_retention_max_count=job_retention_max_count,
+            max_concurrent_searches=max_concurrent_searches,
+            detect_search_quota=detect_search_quota,
+            retry_max_attempts=retry_max_attempts,
+            retry_base_delay=retry_base_delay,
+            retry_max_delay=retry_max_delay,
+            breaker_failure_threshold=breaker_failure_threshold,
+            breaker_recovery_timeout=breaker_recovery_timeout
         )
         
         # Get optional JIRA configuration
@@ -167,14 +291,67 @@ class ConfigLoader:
         server_name = os.getenv('MCP_SERVER_NAME', 'splunk-mcp-server')
         mcp_version = os.getenv('MCP_VERSION', '1.0.0')
         max_results_default = self._get_int_env('MCP_MAX_RESULTS_DEFAULT', 100)
-        search_timeout = self._get_int_env('MCP_SEARCH_TIMEOUT', 300)
+        artifact_max_bytes = self._get_int_env('MCP_ARTIFACT_MAX_BYTES', 64 * 1024 * 1024)
+        artifact_ttl = self._get_float_env('MCP_ARTIFACT_TTL', 3600.0)
+        artifact_dir = os.getenv('MCP_ARTIFACT_DIR', '')
+        artifact_disk_max_bytes = self._get_int_env('MCP_ARTIFACT_DISK_MAX_BYTES', 512 * 1024 * 1024)
+        analysis_trace_token_budget = self._get_int_env('MCP_ANALYSIS_TRACE_TOKEN_BUDGET', 6000)
+        analysis_total_token_budget = self._get_int_env('MCP_ANALYSIS_TOTAL_TOKEN_BUDGET', 24000)
+        response_format = os.getenv('MCP_RESPONSE_FORMAT', 'compact').lower()
+        if response_format not in ('compact', 'pretty'):
+            logger.warning("Invalid MCP_RESPONSE_FORMAT, using compact", value=response_format)
+            response_format = 'compact'
+        json_encoder = os.getenv('MCP_JSON_ENCODER', 'auto').lower()
+        if json_encoder not in ('auto', 'orjson', 'json'):
+            logger.warning("Invalid MCP_JSON_ENCODER, using auto", value=json_encoder)
+            json_encoder = 'auto'
+        monitor_buffer_max_results = self._get_int_env('MCP_MONITOR_BUFFER_MAX_RESULTS', 10000)
+        monitor_buffer_max_bytes = self._get_int_env('MCP_MONITOR_BUFFER_MAX_BYTES', 32 * 1024 * 1024)
+        monitor_overflow = os.getenv('MCP_MONITOR_OVERFLOW', 'drop_oldest').lower()
+        if monitor_overflow not in ('drop_oldest', 'spill', 'pause'):
+            logger.warning("Invalid MCP_MONITOR_OVERFLOW, using drop_oldest", value=monitor_overflow)
+            monitor_overflow = 'drop_oldest'
+        monitor_spill_dir = os.getenv('MCP_MONITOR_SPILL_DIR', '')
+        monitor_spill_max_bytes = self._get_int_env('MCP_MONITOR_SPILL_MAX_BYTES', 256 * 1024 * 1024)
+        monitor_max_concurrent_checks = self._get_int_env('MCP_MONITOR_MAX_CONCURRENT_CHECKS', 8)
+        monitor_max_sessions = self._get_int_env('MCP_MONITOR_MAX_SESSIONS', 50)
+        monitor_coalesce = self._get_bool_env('MCP_MONITOR_COALESCE', True)
+        monitor_coalesce_tolerance = self._get_float_env('MCP_MONITOR_COALESCE_TOLERANCE', 0.25)
+        monitor_lateness = self._get_int_env('MCP_MONITOR_LATENESS', 300)
+        monitor_index_overlap = self._get_int_env('MCP_MONITOR_INDEX_OVERLAP', 10)
+        monitor_mode = os.getenv('MCP_MONITOR_MODE', 'poll').lower()
+        if monitor_mode not in ('poll', 'realtime'):
+            logger.warning("Invalid MCP_MONITOR_MODE, using poll", value=monitor_mode)
+            monitor_mode = 'poll'
+        monitor_realtime_backfill = self._get_int_env('MCP_MONITOR_REALTIME_BACKFILL', 300)
         
         # Create MCP config
         mcp_config = MCPConfig(
             server_name=server_name,
             version=mcp_version,
             max_results_default=max_results_default,
-            search_timeout=search_timeout
+            search_timeout=search_timeout,
+            artifact_max_bytes=artifact_max_bytes,
+            artifact_ttl=artifact_ttl,
+            artifact_dir=artifact_dir,
+            artifact_disk_max_bytes=artifact_disk_max_bytes,
+            analysis_trace_token_budget=analysis_trace_token_budget,
+            analysis_total_token_budget=analysis_total_token_budget,
+            response_format=response_format,
+            json_encoder=json_encoder,
+            monitor_buffer_max_results=monitor_buffer_max_results,
+            monitor_buffer_max_bytes=monitor_buffer_max_bytes,
+            monitor_overflow=monitor_overflow,
+            monitor_spill_dir=monitor_spill_dir,
+            monitor_spill_max_bytes=monitor_spill_max_bytes,
+            monitor_max_concurrent_checks=monitor_max_concurrent_checks,
+            monitor_max_sessions=monitor_max_sessions,
+            monitor_coalesce=monitor_coalesce,
+            monitor_coalesce_tolerance=monitor_coalesce_tolerance,
+            monitor_lateness=monitor_lateness,
+            monitor_index_overlap=monitor_index_overlap,
+            monitor_mode=monitor_mode,
+            monitor_realtime_backfill=monitor_realtime_backfill
         )
         
         return Config(
@@ -197,6 +374,19 @@ class ConfigLoader:
                          env_var=env_var, value=value, default=default)
             return default
     
+    def _get_float_env(self, env_var: str, default: float) -> float:
+        """Get float value from environment variable with default."""
+        value = os.getenv(env_var)
+        if value is None:
+            return default
+        
+        try:
+            return float(value)
+        except ValueError:
+            logger.warning("Invalid float value for environment variable, using default", 
+                         env_var=env_var, value=value, default=default)
+            return default
+    
     def _get_bool_env(self, env_var: str, default: bool) -> bool:
         """Get boolean value from environment variable with default."""
         value = os.getenv(env_var)
@@ -5,6 +5,7 @@ MCP server with SSE transport exposing Splunk, JIRA, and GitHub tools
 Following the working FastMCP pattern
 """
 
+import signal
 import sys
 from typing import Dict, Any, List, Optional
 from mcp.server.fastmcp import FastMCP
@@ -22,6 +23,8 @@ from src.tools.search import get_search_tool
 from src.tools.indexes import get_indexes_tool
 from src.tools.export import get_export_tool
 from src.tools.monitor import get_monitor_tool
+from src.tools.status import get_status_tool
+from src.tools.prompt import get_prompt_registry
 from src.tools.automated_issue_creation import execute_automated_issue_creation
 from src.tools.issue_reader import get_issue_reader_tool
 from src.tools.test_reproduction import get_test_reproduction_tool
@@ -54,6 +57,11 @@ async def splunk_search(
     latest_time: str = "now", 
     max_results: int = 100,
     timeout: int = 300,
+    strategy: str = "auto",
+    cache: str = "prefer",
+    retain: bool = False,
+    offset: int = 0,
+    slices: int = 1,
     context: Context = None
 ) -> str:
     """Execute a Splunk search query using SPL (Search Processing Language).
@@ -64,6 +72,11 @@ async def splunk_search(
         latest_time: End time for search. Use 'now' for current time or absolute time (e.g., '2023-01-02T00:00:00')
         max_results: Maximum number of results to return (1-10000, default: 100)
         timeout: Search timeout in seconds (10-3600, default: 300)
+        strategy: Execution strategy - 'auto' (default), 'oneshot', 'export' or 'normal'
+        cache: Result cache mode - 'prefer' (default, reuse recent identical searches), 'bypass' or 'only'
+        retain: Keep the search job alive and return its sid for paging, export or '| loadjob <sid>'
+        offset: Index of the first result to return, for paging through results
+        slices: Split the time range into this many slices searched in parallel, newest first (event searches over wide windows, 1-32, default: 1)
 
     Returns:
         Formatted search results with analysis suggestions and metadata
@@ -76,7 +89,12 @@ async def splunk_search(
             "earliest_time": earliest_time,
             "latest_time": latest_time,
             "max_results": max_results,
-            "timeout": timeout
+            "timeout": timeout,
+            "strategy": strategy,
+            "cache": cache,
+            "retain": retain,
+            "offset": offset,
+            "slices": slices
         }
         
         results = await search_tool.execute(arguments)
@@ -143,6 +161,7 @@ async def splunk_export(
     max_results: int = 1000,
     timeout: int = 300,
     fields: List[str] = None,
+    sid: str = None,
     context: Context = None
 ) -> str:
     """Export Splunk search results to various formats for data analysis and integration.
@@ -155,6 +174,7 @@ async def splunk_export(
         max_results: Maximum number of results to export (1-50000, default: 1000)
         timeout: Search timeout in seconds (10-3600, default: 300)
         fields: Specific fields to include in export (optional, exports all fields if not specified)
+        sid: Export from a retained search job (splunk_search with retain=true) instead of re-running the query
 
     Returns:
         Exported data in the specified format with size information and processing suggestions
@@ -174,6 +194,9 @@ async def splunk_export(
         if fields is not None:
             arguments["fields"] = fields
         
+        if sid is not None:
+            arguments["sid"] = sid
+        
         results = await export_tool.execute(arguments)
         
         # Convert TextContent results to string
@@ -185,6 +208,32 @@ async def splunk_export(
     except Exception as e:
         return f"Error executing export: {str(e)}"
 
+@mcp.tool()
+async def splunk_status(
+    check_connection: bool = False,
+    context: Context = None
+) -> str:
+    """Report Splunk connectivity health: circuit breaker state, search queue, session pool, cache and retained jobs.
+
+    Args:
+        check_connection: Also make a live server-info call through the circuit breaker (default: False)
+
+    Returns:
+        Health summary with the breaker state and component statistics as JSON
+    """
+    try:
+        status_tool = get_status_tool()
+        results = await status_tool.execute({"check_connection": check_connection})
+
+        # Convert TextContent results to string
+        if results and len(results) > 0:
+            return results[0].text
+        else:
+            return "No status returned"
+
+    except Exception as e:
+        return f"Error retrieving status: {str(e)}"
+
 @mcp.tool()
 async def splunk_monitor(
     action: str,
@@ -193,25 +242,39 @@ async def splunk_monitor(
     max_results: int = 1000,
     timeout: int = 60,
     clear_buffer: bool = True,
+    overflow: str = None,
+    cursor: int = None,
+    limit: int = 100,
+    session_id: str = None,
+    mode: str = None,
+    window: str = None,
     context: Context = None
 ) -> str:
     """Start continuous monitoring of Splunk logs with specified intervals for real-time analysis.
     
-    This tool creates a single monitoring session that runs in the background, collecting logs 
-    at regular intervals and buffering results for analysis. Only one monitoring session 
-    can be active at a time.
+    This tool creates monitoring sessions that run in the background, collecting logs 
+    at regular intervals and buffering results for analysis. Several sessions can run at 
+    once; each is identified by the session_id returned by 'start'.
     
     Args:
         action: Action to perform:
             - 'start': Begin monitoring with a query and interval (requires query parameter)
-            - 'stop': Stop the current monitoring session
-            - 'status': Get status of the current monitoring session
+            - 'stop': Stop a monitoring session
+            - 'status': Get status of a monitoring session (all sessions when several run and no session_id is given)
             - 'get_results': Retrieve buffered results from the session
         query: SPL search query to monitor (required for 'start' action, e.g., 'index=main error | head 100')
         interval: Monitoring interval in seconds (10-3600, default: 60) - how often to check for new data
         max_results: Maximum results per monitoring check (1-10000, default: 1000)
         timeout: Search timeout in seconds for each monitoring check (10-300, default: 60)
         clear_buffer: Whether to clear results buffer after retrieving (for get_results action, default: True)
+        overflow: When the results buffer is full - 'drop_oldest', 'spill' or 'pause' (for 'start', default: server setting)
+        cursor: Page through results from this cursor, 0 for the oldest (for get_results; each page returns the next cursor)
+        limit: Results per page when paging with cursor (1-1000, default: 100)
+        session_id: Monitoring session to act on (default: the most recently started); 'start' with an
+            existing session_id replaces that session
+        mode: 'poll' (a search every interval) or 'realtime' (one long-lived real-time search that buffers
+            events as they arrive and reconnects if it drops) (for 'start', default: server setting)
+        window: Real-time window to backfill when a 'realtime' session starts, e.g. 'rt-5m' (default: new events only)
 
     Returns:
         Monitoring session status, buffered results, or confirmation messages with analysis suggestions
@@ -233,6 +296,17 @@ async def splunk_monitor(
             arguments["timeout"] = timeout
         if not clear_buffer:
             arguments["clear_buffer"] = clear_buffer
+        if overflow is not None:
+            arguments["overflow"] = overflow
+        if cursor is not None:
+            arguments["cursor"] = cursor
+            arguments["limit"] = limit
+        if session_id is not None:
+            arguments["session_id"] = session_id
+        if mode is not None:
+            arguments["mode"] = mode
+        if window is not None:
+            arguments["window"] = window
         
         results = await monitor_tool.execute(arguments)
         
@@ -305,12 +379,19 @@ async def splunk_trace_search_by_ids(
     include_raw: bool = True,
     sort_by_time: bool = True,
     additional_fields: List[str] = None,
+    lookup_mode: str = "term",
+    multi_id_policy: str = "all",
+    cache: str = "prefer",
     context: Context = None
 ) -> str:
     """Search Splunk for traces by specific trace IDs.
 
     This tool allows you to find all log entries associated with one or more trace IDs
-    across specified indexes or all available indexes.
+    across specified indexes or all available indexes. IDs are looked up as indexed tokens
+    (lookup_mode='term'); IDs without hits get one raw scan. lookup_mode='scan' always scans _raw.
+    Log lines naming several IDs go to every trace (multi_id_policy='all'), only the first
+    ('first') or none ('drop'). Events of IDs fetched recently are reused (cache='prefer');
+    cache='bypass' searches every ID again.
     """
     try:
         trace_search_tool = get_splunk_trace_search_by_ids_tool()
@@ -319,7 +400,10 @@ async def splunk_trace_search_by_ids(
             "ids": trace_ids,
             "earliest_time": earliest_time,
             "latest_time": latest_time,
-            "max_results": max_results
+            "max_results": max_results,
+            "lookup_mode": lookup_mode,
+            "multi_id_policy": multi_id_policy,
+            "cache": cache
         }
 
         if indexes is not None:
@@ -328,7 +412,8 @@ async def splunk_trace_search_by_ids(
         results = await trace_search_tool.execute(arguments)
 
         if results and len(results) > 0:
-            return results[0].text
+            # Plan first, then per-chunk search timings
+            return "\n\n".join(result.text for result in results)
         else:
             return "No results returned from trace search"
 
@@ -341,16 +426,19 @@ async def splunk_error_search(
     earliest_time: str = None,
     latest_time: str = "now",
     max_results: int = 500,
+    concurrent: bool = False,
     context: Context = None
 ) -> str:
     """Search Splunk for logs containing 'ERROR' or 'error' in one or more indices.
-    If no earliest_time is provided, automatically broadens search up to 3 days.
-    If still no results, returns a detailed no-results summary."""
+    If no earliest_time is provided, automatically broadens search up to 3 days, one new day at a time
+    (set concurrent=True to search all days at once and keep the most recent day with errors).
+    If still no results, returns a detailed no-results summary with the events scanned per attempt."""
     try:
         arguments = {
             "indices": indices,
             "latest_time": latest_time,
-            "max_results": max_results
+            "max_results": max_results,
+            "concurrent": concurrent
         }
 
         if earliest_time is not None:
@@ -399,11 +487,14 @@ async def error_logs(
 @mcp.tool()
 async def analyze_traces_narrative(
     traces: List[Dict[str, Any]] = None,
+    artifact_id: str = None,
     events: List[Dict[str, Any]] = None,
     id: str = None,
     kind: str = None,
     mode: str = "auto",
     verbosity: str = "normal",
+    compact: bool = True,
+    token_budget: int = None,
     context: Context = None
 ) -> str:
     """Analyze traces and generate narrative analysis with cross-service story and per-service breakdown.
@@ -415,11 +506,15 @@ async def analyze_traces_narrative(
 
     Args:
         traces: Preferred format - array of trace objects with id and events (e.g., [{"id": "trace1", "events": [...]}])
+        artifact_id: Handle of the traces stored by splunk_trace_search_by_ids (instead of traces)
         events: Fallback format - single trace's events array (will be wrapped into traces[0])
         id: Optional id for the single-trace 'events' fallback
         kind: If present and == 'data', may include 'traces' wrapper from previous step
         mode: Analysis mode - 'auto' (adaptive), 'simple' (basic), or 'full' (comprehensive) (default: 'auto')
         verbosity: Output verbosity - 'brief', 'normal', or 'verbose' (default: 'normal')
+        compact: Drop noise fields, collapse repeated events and stack traces, and hold traces to
+            the token budget (default: True)
+        token_budget: Estimated prompt tokens for all traces together (default: server setting)
 
     Returns:
         JSON analysis with narrative story and service breakdown, plus plan for root cause identification
@@ -428,11 +523,16 @@ async def analyze_traces_narrative(
         analyze_tool = get_analyze_traces_narrative_tool()
         arguments = {
             "mode": mode,
-            "verbosity": verbosity
+            "verbosity": verbosity,
+            "compact": compact
         }
+        if token_budget is not None:
+            arguments["token_budget"] = token_budget
 
         if traces is not None:
             arguments["traces"] = traces
+        if artifact_id is not None:
+            arguments["artifact_id"] = artifact_id
         if events is not None:
             arguments["events"] = events
         if id is not None:
@@ -481,25 +581,39 @@ async def logs_debug_entry(
 
 @mcp.tool()
 async def group_error_logs(
-    logs: List[Dict[str, Any]],
+    logs: List[Dict[str, Any]] = None,
+    artifact_id: str = None,
     max_groups: int = 10,
+    indices: List[str] = None,
+    clustering: str = "local",
     context: Context = None
 ) -> str:
     """Group ERROR logs into semantic clusters and pick one representative trace/correlation ID per group.
 
     Args:
         logs: Raw Splunk events (array of objects) from splunk_error_search
+        artifact_id: Handle of the error logs stored by splunk_error_search (instead of logs)
         max_groups: Soft cap for number of groups to aim for (model-level guidance)
+        indices: Indices the errors came from (from splunk_error_search), passed on to the trace search
+        clustering: 'local' clusters logs by message template server-side and sends only cluster
+            summaries to the model; 'model' sends every log for the model to group (default: 'local')
 
     Returns:
         Grouped error logs with representative IDs and plan for next step
     """
     try:
         arguments = {
-            "logs": logs,
-            "max_groups": max_groups
+            "max_groups": max_groups,
+            "clustering": clustering
         }
 
+        if logs is not None:
+            arguments["logs"] = logs
+        if artifact_id is not None:
+            arguments["artifact_id"] = artifact_id
+        if indices is not None:
+            arguments["indices"] = indices
+
         results = await execute_group_error_logs(arguments)
 
         if results and len(results) > 0:
@@ -801,6 +915,7 @@ def main():
     print(f"    - splunk_export: Export search results to files (for data analysis and reporting)")
     print(f"    - splunk_monitor: Set up continuous monitoring (for ongoing surveillance of specific queries)")
     print(f"    - splunk_trace_search_by_ids: Search by known trace IDs (when you have specific trace identifiers)")
+    print(f"    - splunk_status: Check Splunk health and circuit breaker state (when searches fail or stall)")
     print(f"    - error_logs: Process pre-retrieved log data (for analyzing logs already collected)")
 
     # Splunk tools (always available)
@@ -809,6 +924,7 @@ def main():
     print(f"    - splunk_indexes: List available Splunk indexes")
     print(f"    - splunk_export: Export Splunk search results to various formats")
     print(f"    - splunk_monitor: Start continuous monitoring of Splunk logs")
+    print(f"    - splunk_status: Report circuit breaker, queue, pool and cache status")
 
     print("  Analysis & Workflow Tools:")
     print(f"    - logs_debug_entry: 🚀 START HERE for general debugging (e.g., 'something is wrong in staging')")
@@ -847,6 +963,10 @@ def main():
     else:
         print("  GitHub Tools: Not configured (set GITHUB_TOKEN)")
 
+    # SIGHUP reloads the prompt templates without a restart
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: get_prompt_registry().request_reload())
+
     uvicorn.run(starlette_app, host="0.0.0.0", port=port)
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+"""Asyncio wrapper around the Splunk API client.
+
+splunklib is a blocking library, so every REST call made from an ``async def``
+tool stalls the FastMCP event loop. ``AsyncSplunkClient`` exposes the same
+surface as ``SplunkClient`` but runs each call on a bounded, process-wide
+thread pool so concurrent tool calls actually run concurrently.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, TypeVar, AsyncIterator
+import splunklib.client as client
+import structlog
+from .client import SplunkClient
+from ..config import get_config
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar('T')
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool used for blocking Splunk calls.
+
+    Returns:
+        ThreadPoolExecutor: Executor bounded by ``SPLUNK_MAX_WORKERS``
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = get_config().splunk.max_workers
+            _executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="splunk-io")
+            logger.info("Created Splunk I/O executor", max_workers=max_workers)
+        return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut down the shared thread pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+class AsyncSplunkClient:
+    """Async facade over ``SplunkClient`` backed by a bounded thread pool."""
+
+    def __init__(self, sync_client: SplunkClient, executor: Optional[ThreadPoolExecutor] = None):
+        """Initialize async Splunk client.
+
+        Args:
+            sync_client: Blocking client that performs the REST calls
+            executor: Executor to run calls on (defaults to the shared pool)
+        """
+        self.sync_client = sync_client
+        self._executor = executor
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call on the executor without blocking the event loop.
+
+        The caller's context variables (e.g. the MCP session used for fair
+        search scheduling) are carried over to the worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._executor or get_executor()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(executor, context.run, functools.partial(func, *args, **kwargs))
+
+    async def connect(self) -> None:
+        """Connect to Splunk instance."""
+        await self._run(self.sync_client.connect)
+
+    async def disconnect(self) -> None:
+        """Disconnect from Splunk instance."""
+        await self._run(self.sync_client.disconnect)
+
+    async def test_connection(self) -> Dict[str, Any]:
+        """Test connection to Splunk and return server info."""
+        return await self._run(self.sync_client.test_connection)
+
+    async def get_indexes(self, filter_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get list of available indexes."""
+        return await self._run(self.sync_client.get_indexes, filter_pattern=filter_pattern)
+
+    async def create_search_job(self, query: str, **kwargs) -> client.Job:
+        """Create a search job."""
+        return await self._run(self.sync_client.create_search_job, query, **kwargs)
+
+    async def wait_for_job(self, job: client.Job, timeout: Optional[int] = None) -> Dict[str, Any]:
+        """Wait for search job to complete."""
+        return await self._run(self.sync_client.wait_for_job, job, timeout)
+
+    async def get_job_results(self, job: client.Job, output_mode: str = 'json',
+                              **kwargs) -> List[Dict[str, Any]]:
+        """Get all results from a completed search job.
+
+        The result stream is consumed on the executor thread, so the full
+        list is returned rather than an iterator.
+        """
+        return await self._run(
+            lambda: list(self.sync_client.get_job_results(job, output_mode=output_mode, **kwargs))
+        )
+
+    async def execute_search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """Execute a search and return results."""
+        return await self._run(self.sync_client.execute_search, query, **kwargs)
+
+    async def run_search(self, query: str, **kwargs) -> Dict[str, Any]:
+        """Execute a search and return results with execution metadata."""
+        return await self._run(self.sync_client.run_search, query, **kwargs)
+
+    async def run_sliced_search(self, query: str, slices: int, **kwargs) -> Dict[str, Any]:
+        """Execute a search as concurrent time slices."""
+        return await self._run(self.sync_client.run_sliced_search, query, slices, **kwargs)
+
+    async def read_job(self, sid: str, **kwargs) -> List[Dict[str, Any]]:
+        """Read results from an existing job artifact."""
+        return await self._run(self.sync_client.read_job, sid, **kwargs)
+
+    async def execute_search_stream(self, query: str, batch_size: Optional[int] = None,
+                                    **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Execute a search and yield result batches.
+
+        Each batch is fetched on the executor, so only one page is buffered
+        at a time and the event loop stays free between pages.
+        """
+        batches = self.sync_client.execute_search_stream(query, batch_size=batch_size, **kwargs)
+        try:
+            while True:
+                batch = await self._run(next, batches, None)
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            await self._run(batches.close)
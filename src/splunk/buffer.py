@@ -0,0 +1,341 @@
+"""Bounded result buffer for monitoring sessions.
+
+``ResultRingBuffer`` holds the results a monitor collects between reads,
+bounded by item count and by bytes (measured as the item's JSON encoding).
+When a new batch doesn't fit, the overflow policy decides what gives:
+
+- ``drop_oldest`` evicts the oldest results and counts them as dropped.
+- ``spill`` appends the oldest results to local append-only segment files
+  (JSON lines) and keeps reading them from there; the spill area is bounded
+  too, and whole segments are deleted oldest first when it is full.
+- ``pause`` refuses results that don't fit and reports the buffer as paused,
+  so the monitor skips checks until a consumer reads and trims it. Monitors
+  add each check's results as a whole batch, which a buffer that isn't full
+  yet takes in full, exceeding its limits by at most that batch; a partly
+  taken batch would lose the rest, as the next check searches on from there.
+
+Every result gets a sequence number. ``read(cursor, limit)`` pages through
+the buffer from a cursor without copying it, and ``trim(cursor)`` discards
+what a consumer has acknowledged. ``close()`` discards everything and
+removes a spill directory the buffer created itself.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from array import array
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "spill", "pause")
+
+
+class _Segment:
+    """One append-only spill file and the offsets of its results."""
+
+    def __init__(self, path: str, first_seq: int):
+        self.path = path
+        self.first_seq = first_seq
+        # First sequence number not yet trimmed
+        self.start_seq = first_seq
+        self.offsets = array('q')
+        self.bytes = 0
+
+    @property
+    def end_seq(self) -> int:
+        return self.first_seq + len(self.offsets)
+
+    def __len__(self) -> int:
+        return self.end_seq - self.start_seq
+
+
+class ResultRingBuffer:
+    """Result buffer bounded by count and bytes, with an overflow policy."""
+
+    def __init__(self, max_items: int = 10000, max_bytes: int = 32 * 1024 * 1024,
+                 overflow: str = "drop_oldest", spill_dir: Optional[str] = None,
+                 spill_max_bytes: int = 256 * 1024 * 1024, segment_bytes: int = 16 * 1024 * 1024):
+        """Initialize the buffer.
+
+        Args:
+            max_items: Results kept in memory
+            max_bytes: Bytes of results kept in memory
+            overflow: 'drop_oldest', 'spill' or 'pause'
+            spill_dir: Directory for spill segments (a temporary directory if None)
+            spill_max_bytes: Bytes of spilled results kept on disk
+            segment_bytes: Size at which a new spill segment is started
+
+        Raises:
+            ValueError: If the overflow policy is unknown
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        self.max_items = max(1, max_items)
+        self.max_bytes = max(1, max_bytes)
+        self.overflow = overflow
+        self.spill_dir = spill_dir or None
+        # Only a temporary directory created by the buffer is removed on close
+        self._owns_spill_dir = False
+        self.spill_max_bytes = spill_max_bytes
+        self.segment_bytes = segment_bytes
+
+        self._lock = threading.Lock()
+        # (sequence number, result, encoded size)
+        self._items: Deque[Tuple[int, Dict[str, Any], int]] = deque()
+        self._bytes = 0
+        self._segments: Deque[_Segment] = deque()
+        self._spill_bytes = 0
+        self._next_seq = 0
+        self._name = uuid.uuid4().hex[:8]
+        self._closed = False
+        self._stats = {'appended': 0, 'dropped': 0, 'spilled': 0, 'rejected': 0}
+
+    def extend(self, results: List[Dict[str, Any]], whole_batch: bool = False) -> int:
+        """Add results, applying the overflow policy.
+
+        Args:
+            results: Results to add
+            whole_batch: For 'pause', take every result unless the buffer is
+                already full, rather than as many as fit
+
+        Returns:
+            int: Results accepted (fewer than given only when paused)
+        """
+        accepted = 0
+        with self._lock:
+            if self._closed:
+                return 0
+            pause = self.overflow == "pause"
+            if pause and whole_batch and results and self._is_full_locked(1):
+                self._stats['rejected'] += len(results)
+                return 0
+            for result in results:
+                size = len(json.dumps(result, ensure_ascii=False, default=str).encode('utf-8'))
+                if pause and not whole_batch and self._is_full_locked(size):
+                    self._stats['rejected'] += len(results) - accepted
+                    break
+                self._items.append((self._next_seq, result, size))
+                self._next_seq += 1
+                self._bytes += size
+                accepted += 1
+                self._evict_locked()
+            self._stats['appended'] += accepted
+        return accepted
+
+    def append(self, result: Dict[str, Any]) -> bool:
+        """Add one result; False if it was refused because the buffer is paused."""
+        return self.extend([result]) == 1
+
+    def read(self, cursor: Optional[int] = None, limit: int = 100) -> Dict[str, Any]:
+        """Read results from a cursor without removing them.
+
+        Args:
+            cursor: Sequence number to start from (the oldest result if None)
+            limit: Maximum results to return
+
+        Returns:
+            Dict[str, Any]: ``results``, ``next_cursor``, ``missed`` (results
+                before the cursor's position that were dropped) and ``remaining``
+        """
+        with self._lock:
+            first = self._first_seq_locked()
+            start = first if cursor is None else max(cursor, first)
+            missed = max(0, first - cursor) if cursor is not None else 0
+            results: List[Dict[str, Any]] = []
+            # Sequence numbers have gaps where a result failed to spill, so the
+            # cursor follows the last result returned rather than the count
+            next_cursor = start
+
+            for segment in self._segments:
+                if len(results) >= limit:
+                    break
+                if start < segment.end_seq:
+                    segment_start = max(start, segment.start_seq)
+                    page = self._read_segment_locked(segment, segment_start, limit - len(results))
+                    results.extend(page)
+                    if page:
+                        next_cursor = segment_start + len(page)
+            if len(results) < limit and self._items:
+                skip = max(0, start - self._items[0][0])
+                for index in range(skip, len(self._items)):
+                    if len(results) >= limit:
+                        break
+                    seq, result, _ = self._items[index]
+                    results.append(result)
+                    next_cursor = seq + 1
+
+            return {
+                'results': results,
+                'next_cursor': next_cursor,
+                'missed': missed,
+                'remaining': self._count_from_locked(next_cursor)
+            }
+
+    def trim(self, cursor: int) -> int:
+        """Discard results before a cursor.
+
+        Args:
+            cursor: Sequence number of the first result to keep
+
+        Returns:
+            int: Results discarded
+        """
+        removed = 0
+        with self._lock:
+            while self._segments and self._segments[0].start_seq < cursor:
+                segment = self._segments[0]
+                if cursor >= segment.end_seq:
+                    removed += len(segment)
+                    self._remove_segment_locked()
+                else:
+                    removed += cursor - segment.start_seq
+                    segment.start_seq = cursor
+            while self._items and self._items[0][0] < cursor:
+                _, _, size = self._items.popleft()
+                self._bytes -= size
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Discard every result; returns how many were discarded."""
+        return self.trim(self._next_seq)
+
+    def close(self) -> int:
+        """Discard every result, refuse new ones and remove a spill directory the buffer created.
+
+        Returns:
+            int: Results discarded
+        """
+        with self._lock:
+            self._closed = True
+        removed = self.clear()
+        with self._lock:
+            spill_dir, owned = self.spill_dir, self._owns_spill_dir
+            self._owns_spill_dir = False
+        if owned and spill_dir:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+        return removed
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Return every result, oldest first, and clear the buffer."""
+        with self._lock:
+            end = self._next_seq
+        page = self.read(limit=len(self))
+        self.trim(end)
+        return page['results']
+
+    @property
+    def paused(self) -> bool:
+        """Whether a 'pause' buffer is full and refusing results."""
+        with self._lock:
+            return self.overflow == "pause" and self._is_full_locked(1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sizes, limits, cursors and overflow counters."""
+        with self._lock:
+            return {
+                'overflow': self.overflow,
+                'items': len(self._items),
+                'bytes': self._bytes,
+                'max_items': self.max_items,
+                'max_bytes': self.max_bytes,
+                'spilled_pending': sum(len(segment) for segment in self._segments),
+                'spill_bytes': self._spill_bytes,
+                'first_cursor': self._first_seq_locked(),
+                'next_cursor': self._next_seq,
+                'paused': self.overflow == "pause" and self._is_full_locked(1),
+                **self._stats
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items) + sum(len(segment) for segment in self._segments)
+
+    def __iter__(self):
+        return iter(self.read(limit=len(self))['results'])
+
+    # --- internals ---
+
+    def _first_seq_locked(self) -> int:
+        if self._segments:
+            return self._segments[0].start_seq
+        return self._items[0][0] if self._items else self._next_seq
+
+    def _count_from_locked(self, cursor: int) -> int:
+        """Results at or after a cursor."""
+        count = sum(max(0, segment.end_seq - max(cursor, segment.start_seq)) for segment in self._segments)
+        if self._items:
+            count += len(self._items) - min(len(self._items), max(0, cursor - self._items[0][0]))
+        return count
+
+    def _is_full_locked(self, incoming_bytes: int) -> bool:
+        return (len(self._items) >= self.max_items
+                or (self._items and self._bytes + incoming_bytes > self.max_bytes))
+
+    def _evict_locked(self) -> None:
+        """Move results out of memory until it is within its limits."""
+        if self.overflow == "pause":
+            # Refused up front instead; only a whole batch goes past the limits
+            return
+        while self._items and (len(self._items) > self.max_items or self._bytes > self.max_bytes):
+            seq, result, size = self._items.popleft()
+            self._bytes -= size
+            if self.overflow == "spill" and self._spill_locked(seq, result):
+                self._stats['spilled'] += 1
+            else:
+                self._stats['dropped'] += 1
+
+    def _spill_locked(self, seq: int, result: Dict[str, Any]) -> bool:
+        """Append one result to the newest spill segment."""
+        line = (json.dumps(result, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+        try:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="splunk-monitor-")
+                self._owns_spill_dir = True
+            segment = self._segments[-1] if self._segments else None
+            if segment is None or segment.end_seq != seq or segment.bytes >= self.segment_bytes:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                path = os.path.join(self.spill_dir, f"{self._name}-{seq:012d}.jsonl")
+                segment = _Segment(path, seq)
+                self._segments.append(segment)
+            with open(segment.path, 'ab') as handle:
+                handle.write(line)
+        except OSError as e:
+            logger.warning("Failed to spill monitoring result to disk", error=str(e))
+            return False
+
+        segment.offsets.append(segment.bytes)
+        segment.bytes += len(line)
+        self._spill_bytes += len(line)
+        while self._spill_bytes > self.spill_max_bytes and self._segments:
+            self._stats['dropped'] += len(self._segments[0])
+            self._remove_segment_locked()
+        return True
+
+    def _read_segment_locked(self, segment: _Segment, start: int, limit: int) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        if limit <= 0 or start >= segment.end_seq:
+            return results
+        try:
+            with open(segment.path, 'rb') as handle:
+                handle.seek(segment.offsets[start - segment.first_seq])
+                for _ in range(min(limit, segment.end_seq - start)):
+                    results.append(json.loads(handle.readline()))
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read spilled monitoring results", path=segment.path, error=str(e))
+        return results
+
+    def _remove_segment_locked(self) -> None:
+        segment = self._segments.popleft()
+        self._spill_bytes -= segment.bytes
+        try:
+            os.remove(segment.path)
+        except OSError:
+            pass
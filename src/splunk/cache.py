@@ -0,0 +1,447 @@
+"""Search result caching.
+
+Agents tend to re-issue the same SPL over the same window several times a
+minute. ``ByteLRUCache`` is a byte-bounded LRU with per-entry TTL and an
+optional on-disk tier that catches entries evicted from memory.
+``SearchResultCache`` keys search results on the normalized query, the
+resolved time window snapped to a configurable granularity, ``max_results``
+and the requested fields, so "-24h" issued twice within the same
+granularity bucket is served from the cache. ``TraceCache`` keeps the events
+found for each trace ID, so a trace search only asks Splunk for IDs it has
+not looked up recently.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import structlog
+from .utils import resolve_time
+from ..config import SplunkConfig, get_config
+
+logger = structlog.get_logger(__name__)
+
+# Values of the ``cache`` search argument
+CACHE_MODES = ('prefer', 'bypass', 'only')
+
+
+def normalize_query(query: str) -> str:
+    """Normalize SPL so trivially different spellings share a key.
+
+    Collapses whitespace outside quoted strings and adds the implicit
+    leading ``search`` command.
+    """
+    parts = re.split(r'("(?:[^"\\]|\\.)*")', query.strip())
+    normalized = ''.join(part if part.startswith('"') else re.sub(r'\s+', ' ', part)
+                         for part in parts)
+    if not normalized.lower().startswith('search ') and not normalized.startswith('|'):
+        normalized = f"search {normalized}"
+    return normalized
+
+
+def make_search_key(query: str, earliest_time: str, latest_time: str, granularity: int,
+                    extra: Optional[List[Any]] = None, now: Optional[float] = None) -> Optional[str]:
+    """Build a stable key for a search over a resolved time window.
+
+    Args:
+        query: SPL search query
+        earliest_time: Start time for search
+        latest_time: End time for search
+        granularity: Seconds that resolved times are snapped down to
+        extra: Additional JSON-serializable key components
+        now: Reference epoch time for relative times
+
+    Returns:
+        str: Hex digest, or None if either time cannot be resolved
+    """
+    now = time.time() if now is None else now
+    earliest = resolve_time(earliest_time, now)
+    latest = resolve_time(latest_time, now)
+    if earliest is None or latest is None:
+        return None
+
+    granularity = max(1, granularity)
+    key_parts = [
+        normalize_query(query),
+        int(earliest // granularity) * granularity,
+        int(latest // granularity) * granularity,
+        extra or []
+    ]
+    return hashlib.sha256(json.dumps(key_parts).encode('utf-8')).hexdigest()
+
+
+class ByteLRUCache:
+    """LRU cache of byte strings bounded by total size, with TTL expiry.
+
+    Entries evicted from memory are spilled to ``disk_dir`` when a disk tier
+    is configured, and promoted back to memory on their next hit.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = 0, name: str = "cache"):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of in-memory entries
+            ttl: Default entry lifetime in seconds
+            disk_dir: Directory for the on-disk tier (None disables it)
+            disk_max_bytes: Maximum total size of on-disk entries
+            name: Name used in log messages
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir or None
+        self.disk_max_bytes = disk_max_bytes
+        self.name = name
+        self._lock = threading.Lock()
+        # key -> (value, expires_at monotonic)
+        self._memory: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (size, expires_at wall clock); insertion order is spill order
+        self._disk: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._stats = {
+            'hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evictions': 0,
+            'spills': 0
+        }
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes: Cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._memory.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                self._remove_memory_locked(key)
+                self._stats['expired'] += 1
+
+            value, expires_at = self._read_disk_locked(key)
+            if value is None:
+                self._stats['misses'] += 1
+                return None
+
+            self._stats['hits'] += 1
+            self._stats['disk_hits'] += 1
+
+        # Promote back to memory with the remaining lifetime
+        self.set(key, value, ttl=expires_at - time.time())
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Lifetime in seconds (defaults to the cache TTL)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove_memory_locked(key)
+            self._remove_disk_locked(key)
+            self._memory[key] = (value, time.monotonic() + ttl)
+            self._memory_bytes += len(value)
+
+            while self._memory_bytes > self.max_bytes:
+                old_key, (old_value, old_expires_at) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(old_value)
+                self._stats['evictions'] += 1
+                remaining = old_expires_at - time.monotonic()
+                if remaining > 0:
+                    self._spill_locked(old_key, old_value, remaining)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key from both tiers."""
+        with self._lock:
+            self._remove_memory_locked(key)
+            self._remove_disk_locked(key)
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        with self._lock:
+            for key in list(self._disk):
+                self._remove_disk_locked(key)
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters and current sizes.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counters, entry counts and byte usage
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'entries': len(self._memory),
+                'bytes': self._memory_bytes,
+                'max_bytes': self.max_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes
+            })
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _remove_memory_locked(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[0])
+
+    # --- disk tier ---
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.bin")
+
+    def _spill_locked(self, key: str, value: bytes, ttl: float) -> None:
+        """Write an entry evicted from memory to the disk tier."""
+        if not self.disk_dir or len(value) > self.disk_max_bytes:
+            return
+
+        expires_at = time.time() + ttl
+        try:
+            with open(self._disk_path(key), 'wb') as handle:
+                handle.write(f"{expires_at}\n".encode())
+                handle.write(value)
+        except OSError as e:
+            logger.warning("Failed to spill cache entry to disk", cache=self.name, error=str(e))
+            return
+
+        self._disk[key] = (len(value), expires_at)
+        self._disk_bytes += len(value)
+        self._stats['spills'] += 1
+
+        while self._disk_bytes > self.disk_max_bytes:
+            self._remove_disk_locked(next(iter(self._disk)))
+
+    def _read_disk_locked(self, key: str) -> Tuple[Optional[bytes], float]:
+        """Read an entry from the disk tier, removing it from there."""
+        entry = self._disk.get(key)
+        if entry is None:
+            return None, 0.0
+
+        _, expires_at = entry
+        value = None
+        if expires_at > time.time():
+            try:
+                with open(self._disk_path(key), 'rb') as handle:
+                    handle.readline()
+                    value = handle.read()
+            except OSError as e:
+                logger.warning("Failed to read cache entry from disk", cache=self.name, error=str(e))
+        else:
+            self._stats['expired'] += 1
+
+        self._remove_disk_locked(key)
+        return value, expires_at
+
+    def _remove_disk_locked(self, key: str) -> None:
+        entry = self._disk.pop(key, None)
+        if entry is None:
+            return
+        self._disk_bytes -= entry[0]
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
+
+    def _load_disk_index(self) -> None:
+        """Index entries left on disk by a previous process, dropping expired ones."""
+        now = time.time()
+        entries = []
+        for filename in os.listdir(self.disk_dir):
+            if not filename.endswith('.bin'):
+                continue
+            path = os.path.join(self.disk_dir, filename)
+            try:
+                with open(path, 'rb') as handle:
+                    expires_at = float(handle.readline())
+                size = os.path.getsize(path) - len(f"{expires_at}\n")
+            except (OSError, ValueError):
+                continue
+            if expires_at <= now:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            entries.append((expires_at, filename[:-len('.bin')], size))
+
+        # Oldest expiry first so those are the first to go when over budget
+        for expires_at, key, size in sorted(entries):
+            self._disk[key] = (size, expires_at)
+            self._disk_bytes += size
+
+
+class SearchResultCache:
+    """Cache of search results keyed on query, resolved time window and shape."""
+
+    def __init__(self, cache: ByteLRUCache, granularity: int = 60):
+        """Initialize the search result cache.
+
+        Args:
+            cache: Underlying byte cache
+            granularity: Seconds that resolved earliest/latest times are snapped to
+        """
+        self.cache = cache
+        self.granularity = max(1, granularity)
+
+    def make_key(self, query: str, earliest_time: str = "-24h", latest_time: str = "now",
+                 max_results: int = 100, fields: Optional[List[str]] = None,
+                 offset: int = 0, now: Optional[float] = None) -> Optional[str]:
+        """Build the cache key for a search.
+
+        Args:
+            query: SPL search query
+            earliest_time: Start time for search
+            latest_time: End time for search
+            max_results: Maximum number of results
+            fields: Requested fields
+            offset: Index of the first result requested
+            now: Reference epoch time for relative times
+
+        Returns:
+            str: Cache key, or None if the time window cannot be resolved
+                (e.g. real-time searches), in which case the search is not cached
+        """
+        return make_search_key(query, earliest_time, latest_time, self.granularity,
+                               extra=[max_results, sorted(fields) if fields else None, offset],
+                               now=now)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get cached results for a key."""
+        value = self.cache.get(key)
+        return json.loads(value) if value is not None else None
+
+    def put(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """Store results for a key."""
+        self.cache.set(key, json.dumps(results, ensure_ascii=False).encode('utf-8'))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return self.cache.get_stats()
+
+
+class TraceCache:
+    """Raw events per trace ID, keyed on the ID, resolved time window and lookup scope.
+
+    IDs that had no events are cached too (as an empty list), so repeated
+    lookups of an unknown ID don't search again until the entry expires.
+    """
+
+    def __init__(self, cache: ByteLRUCache, granularity: int = 300):
+        """Initialize the trace cache.
+
+        Args:
+            cache: Underlying byte cache
+            granularity: Seconds that resolved earliest/latest times are snapped to
+        """
+        self.cache = cache
+        self.granularity = max(1, granularity)
+
+    def make_key(self, trace_id: str, earliest_time: str, latest_time: str,
+                 indices: Optional[List[str]] = None, lookup_mode: str = "term",
+                 now: Optional[float] = None) -> Optional[str]:
+        """Build the cache key for one trace ID.
+
+        Args:
+            trace_id: Trace/correlation ID
+            earliest_time: Start of the window the ID was looked up in
+            latest_time: End of the window the ID was looked up in
+            indices: Indices searched (None for all)
+            lookup_mode: How the ID was matched ('term' or 'scan')
+            now: Reference epoch time for relative times
+
+        Returns:
+            str: Cache key, or None if the time window cannot be resolved
+        """
+        return make_search_key(trace_id, earliest_time, latest_time, self.granularity,
+                               extra=['trace', sorted(indices) if indices else None, lookup_mode],
+                               now=now)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Get the cached raw events for a key."""
+        value = self.cache.get(key)
+        return json.loads(value) if value is not None else None
+
+    def put(self, key: str, raw_logs: List[str]) -> None:
+        """Store the raw events found for a key."""
+        self.cache.set(key, json.dumps(raw_logs, ensure_ascii=False).encode('utf-8'))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return self.cache.get_stats()
+
+
+# Process-wide search result cache shared by all tools
+_search_cache: Optional[SearchResultCache] = None
+_search_cache_lock = threading.Lock()
+
+# Process-wide trace cache used by splunk_trace_search_by_ids
+_trace_cache: Optional[TraceCache] = None
+_trace_cache_lock = threading.Lock()
+
+
+def create_search_cache(config: SplunkConfig) -> SearchResultCache:
+    """Create a search result cache from configuration."""
+    byte_cache = ByteLRUCache(
+        max_bytes=config.cache_max_bytes,
+        ttl=config.cache_ttl,
+        disk_dir=config.cache_dir or None,
+        disk_max_bytes=config.cache_disk_max_bytes,
+        name="search_results"
+    )
+    return SearchResultCache(byte_cache, granularity=config.cache_time_granularity)
+
+
+def get_search_cache() -> SearchResultCache:
+    """Get the process-wide search result cache."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = create_search_cache(get_config().splunk)
+        return _search_cache
+
+
+def create_trace_cache(config: SplunkConfig) -> TraceCache:
+    """Create a trace cache from configuration."""
+    byte_cache = ByteLRUCache(
+        max_bytes=config.trace_cache_max_bytes,
+        ttl=config.trace_cache_ttl,
+        name="trace_events"
+    )
+    return TraceCache(byte_cache, granularity=int(config.trace_cache_ttl))
+
+
+def get_trace_cache() -> TraceCache:
+    """Get the process-wide trace cache."""
+    global _trace_cache
+    with _trace_cache_lock:
+        if _trace_cache is None:
+            _trace_cache = create_trace_cache(get_config().splunk)
+        return _trace_cache
@@ -1,9 +1,16 @@
 """Splunk API client module."""
 
+import socket
+import threading
+import time
+from contextlib import ExitStack, contextmanager
 import splunklib.client as client
 import splunklib.results as results
-from typing import Dict, Any, List, Optional, Iterator
+from typing import Dict, Any, List, Optional, Iterator, Callable
 import structlog
+from .jobs import JobRegistry, get_job_registry
+from .resilience import CircuitBreaker, CircuitOpenError, call_with_retry, create_retry_policy, get_circuit_breaker
+from .scheduler import SearchScheduler, detect_search_quota, get_search_scheduler
 from ..config import SplunkConfig
 
 logger = structlog.get_logger(__name__)
@@ -14,6 +21,11 @@ class SplunkConnectionError(Exception):
     pass
 
 
+class SplunkCircuitOpenError(SplunkConnectionError):
+    """Exception raised when calls are short-circuited because splunkd looks unhealthy."""
+    pass
+
+
 class SplunkAuthenticationError(Exception):
     """Exception raised when authentication to Splunk fails."""
     pass
@@ -24,18 +36,90 @@ class SplunkSearchError(Exception):
     pass
 
 
+class SplunkSearchTimeoutError(SplunkSearchError):
+    """Exception raised when a search job does not finish before its deadline."""
+    pass
+
+
+class SplunkSearchQueueTimeoutError(SplunkSearchTimeoutError):
+    """Exception raised when a search waits for a scheduler slot past its deadline."""
+    pass
+
+
+class SplunkQuotaExceededError(SplunkSearchError):
+    """Exception raised when splunkd refuses a search because of the user's search quota."""
+    pass
+
+
+class SplunkCacheMissError(SplunkSearchError):
+    """Exception raised when cached results are required but not available."""
+    pass
+
+
+# How a search is run; 'auto' lets the client pick per search
+EXECUTION_STRATEGIES = ('auto', 'oneshot', 'export', 'normal')
+
+
+@contextmanager
+def search_slot(scheduler: SearchScheduler, priority: str, timeout: float) -> Iterator[float]:
+    """Hold a scheduler slot, raising the client's errors when admission fails.
+    
+    Args:
+        scheduler: Search admission scheduler
+        priority: Scheduler priority class
+        timeout: Seconds to wait for a slot
+    
+    Yields:
+        float: Seconds the search was queued
+        
+    Raises:
+        SplunkSearchError: If the priority is unknown
+        SplunkSearchQueueTimeoutError: If no slot frees up within the timeout
+    """
+    try:
+        waited = scheduler.acquire(priority, timeout=timeout)
+    except ValueError as e:
+        raise SplunkSearchError(str(e))
+    except TimeoutError:
+        raise SplunkSearchQueueTimeoutError(
+            f"Search was queued for more than {timeout} seconds behind other searches"
+        )
+    
+    if waited:
+        logger.info("Search admitted after queueing", priority=priority, queue_seconds=round(waited, 3))
+    try:
+        yield waited
+    finally:
+        scheduler.release()
+
+
 class SplunkClient:
     """Splunk API client for connecting to Splunk instances."""
     
-    def __init__(self, config: SplunkConfig):
+    def __init__(self, config: SplunkConfig, handler: Optional[Callable] = None,
+                 job_registry: Optional[JobRegistry] = None,
+                 scheduler: Optional[SearchScheduler] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         """Initialize Splunk client.
         
         Args:
             config: Splunk configuration
+            handler: Optional splunklib HTTP request handler (e.g. keep-alive)
+            job_registry: Registry of retained jobs (defaults to the shared registry)
+            scheduler: Search admission scheduler (defaults to the shared scheduler)
+            breaker: Circuit breaker guarding splunkd (defaults to the shared breaker)
         """
         self.config = config
+        self._handler = handler
+        self._job_registry = job_registry
+        self._scheduler = scheduler
+        self._breaker = breaker
+        self._retry_policy = create_retry_policy(config)
         self._service: Optional[client.Service] = None
         self._connected = False
+        self._stats_lock = threading.Lock()
+        self._poll_stats = {'jobs': 0, 'polls': 0, 'timeouts': 0, 'wait_seconds': 0.0}
+        self._execution_stats: Dict[str, Dict[str, Any]] = {}
     
     def connect(self) -> None:
         """Connect to Splunk instance.
@@ -50,8 +134,12 @@ class SplunkClient:
         logger.info("Connecting to Splunk", host=self.config.host, port=self.config.port)
         
         try:
+            connect_kwargs = {}
+            if self._handler is not None:
+                connect_kwargs['handler'] = self._handler
+            
             # Create service connection using username/password authentication
-            self._service = client.connect(
+            self._service = self._call('connect', lambda: client.connect(
                 host=self.config.host,
                 port=self.config.port,
                 username=self.config.username,
@@ -59,17 +147,20 @@ class SplunkClient:
                 scheme=self.config.scheme,
                 verify=self.config.verify_ssl,
                 timeout=self.config.timeout,
-                autologin=True
-            )
+                autologin=True,
+                **connect_kwargs
+            ))
             
             # Test connection by getting server info
-            info = self._service.info
+            info = self._call('server_info', lambda: self._service.info)
             logger.info("Connected to Splunk successfully", 
                        version=info.get('version'), 
                        build=info.get('build'))
             
             self._connected = True
             
+        except SplunkCircuitOpenError:
+            raise
         except Exception as e:
             error_msg = str(e).lower()
             if 'authentication' in error_msg or 'login' in error_msg or 'unauthorized' in error_msg:
@@ -125,7 +216,7 @@ class SplunkClient:
         """
         try:
             service = self.get_service()
-            info = service.info
+            info = self._call('server_info', lambda: service.info)
             
             return {
                 'connected': True,
@@ -135,6 +226,8 @@ class SplunkClient:
                 'license_state': info.get('licenseState'),
                 'mode': info.get('mode')
             }
+        except SplunkCircuitOpenError:
+            raise
         except Exception as e:
             logger.error("Connection test failed", error=str(e))
             raise SplunkConnectionError(f"Connection test failed: {e}")
@@ -150,7 +243,7 @@ class SplunkClient:
         """
         try:
             service = self.get_service()
-            info = service.info
+            info = self._call('server_info', lambda: service.info)
             
             return {
                 'version': info.get('version'),
@@ -161,6 +254,8 @@ class SplunkClient:
                 'host': info.get('host'),
                 'product_type': info.get('product_type')
             }
+        except SplunkCircuitOpenError:
+            raise
         except Exception as e:
             logger.error("Failed to get server info", error=str(e))
             raise SplunkConnectionError(f"Failed to get server info: {e}")
@@ -204,7 +299,7 @@ class SplunkClient:
         """
         try:
             service = self.get_service()
-            indexes = service.indexes
+            indexes = self._call('get_indexes', lambda: list(service.indexes))
             
             index_list = []
             for index in indexes:
@@ -225,6 +320,8 @@ class SplunkClient:
             logger.info("Retrieved indexes", count=len(index_list))
             return index_list
             
+        except SplunkCircuitOpenError:
+            raise
         except Exception as e:
             logger.error("Failed to get indexes", error=str(e))
             raise SplunkConnectionError(f"Failed to get indexes: {e}")
@@ -245,10 +342,7 @@ class SplunkClient:
         try:
             service = self.get_service()
             
-            # Ensure query starts with 'search' command if it doesn't already
-            normalized_query = query.strip()
-            if not normalized_query.lower().startswith('search ') and not normalized_query.startswith('|'):
-                normalized_query = f"search {normalized_query}"
+            normalized_query = self._normalize_query(query)
             
             # Set default search parameters
             search_kwargs = {
@@ -265,53 +359,172 @@ class SplunkClient:
             
             logger.info("Creating search job", query=normalized_query, **search_kwargs)
             
-            job = service.jobs.create(normalized_query, **search_kwargs)
+            # Dispatching twice would run the search twice; only unsent requests are retried
+            job = self._call('create_search_job',
+                             lambda: service.jobs.create(normalized_query, **search_kwargs),
+                             idempotent=False)
             
             logger.info("Search job created", sid=job.sid)
             return job
             
+        except SplunkCircuitOpenError:
+            raise
         except Exception as e:
             logger.error("Failed to create search job", query=query, error=str(e))
+            if self._is_quota_error(e):
+                raise SplunkQuotaExceededError(
+                    f"Splunk search quota reached, try again when other searches finish: {e}"
+                )
             raise SplunkSearchError(f"Failed to create search job: {e}")
     
-    def wait_for_job(self, job: client.Job, timeout: Optional[int] = None) -> None:
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Ensure query starts with 'search' command if it doesn't already."""
+        normalized_query = query.strip()
+        if not normalized_query.lower().startswith('search ') and not normalized_query.startswith('|'):
+            normalized_query = f"search {normalized_query}"
+        return normalized_query
+    
+    def wait_for_job(self, job: client.Job, timeout: Optional[int] = None) -> Dict[str, Any]:
         """Wait for search job to complete.
         
+        Polls the job with an adaptive backoff: the interval grows geometrically
+        from ``poll_interval_min`` to ``poll_interval_max`` and is shortened when
+        the job's ``doneProgress`` suggests it is about to finish.
+        
         Args:
             job: Search job instance
             timeout: Timeout in seconds
             
+        Returns:
+            Dict[str, Any]: Polling statistics for the job (sid, polls, elapsed_seconds)
+            
         Raises:
-            SplunkSearchError: If job fails or times out
+            SplunkSearchTimeoutError: If the job does not finish within the timeout
+            SplunkSearchError: If job fails
         """
+        timeout = timeout or self.config.search_timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        interval = self.config.poll_interval_min
+        polls = 0
+        
         try:
-            timeout = timeout or self.config.timeout
-            
             logger.info("Waiting for search job to complete", sid=job.sid, timeout=timeout)
             
-            # Wait for job to complete
-            while not job.is_done():
-                job.refresh()
+            while True:
+                polls += 1
+                # is_done() issues a single GET and refreshes the job state
+                if self._call('job_status', job.is_done):
+                    break
                 
-                # Check for job failure
-                if job.state == 'FAILED':
+                content = self._get_job_content(job)
+                if content.get('dispatchState') == 'FAILED' or content.get('isFailed') == '1':
                     raise SplunkSearchError(f"Search job failed: {job.sid}")
+                
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    with self._stats_lock:
+                        self._poll_stats['timeouts'] += 1
+                    raise SplunkSearchTimeoutError(
+                        f"Search job {job.sid} did not complete within {timeout} seconds"
+                    )
+                
+                interval = self._next_poll_interval(
+                    interval, now - started, self._parse_progress(content.get('doneProgress'))
+                )
+                time.sleep(min(interval, remaining))
+            
+            elapsed = time.monotonic() - started
+            with self._stats_lock:
+                self._poll_stats['jobs'] += 1
+                self._poll_stats['polls'] += polls
+                self._poll_stats['wait_seconds'] += elapsed
             
             logger.info("Search job completed", 
                        sid=job.sid, 
                        result_count=job.resultCount,
-                       event_count=job.eventCount)
+                       event_count=job.eventCount,
+                       polls=polls,
+                       elapsed_seconds=round(elapsed, 3))
+            
+            return {
+                'sid': job.sid,
+                'polls': polls,
+                'elapsed_seconds': round(elapsed, 3)
+            }
             
+        except (SplunkSearchError, SplunkCircuitOpenError) as e:
+            logger.error("Error waiting for search job", sid=job.sid, polls=polls, error=str(e))
+            raise
         except Exception as e:
-            logger.error("Error waiting for search job", sid=job.sid, error=str(e))
+            logger.error("Error waiting for search job", sid=job.sid, polls=polls, error=str(e))
             raise SplunkSearchError(f"Error waiting for search job: {e}")
     
-    def get_job_results(self, job: client.Job, output_mode: str = 'json') -> Iterator[Dict[str, Any]]:
+    def _next_poll_interval(self, current: float, elapsed: float, progress: float) -> float:
+        """Compute the sleep before the next job poll.
+        
+        Args:
+            current: Interval used for the previous poll
+            elapsed: Seconds since the job wait started
+            progress: Job ``doneProgress`` in the range 0.0-1.0
+            
+        Returns:
+            float: Interval in seconds
+        """
+        interval = min(current * self.config.poll_backoff_factor, self.config.poll_interval_max)
+        
+        if 0.0 < progress < 1.0:
+            # Linear estimate of the time left; poll around its midpoint
+            estimated_remaining = elapsed * (1.0 - progress) / progress
+            interval = min(interval, estimated_remaining / 2)
+        
+        return max(interval, self.config.poll_interval_min)
+    
+    @staticmethod
+    def _get_job_content(job: client.Job) -> Dict[str, Any]:
+        """Return the job's last fetched state without another round trip."""
+        state = getattr(job, '_state', None)
+        content = getattr(state, 'content', None)
+        return content if isinstance(content, dict) else {}
+    
+    @staticmethod
+    def _parse_progress(value: Any) -> float:
+        """Parse the ``doneProgress`` job property into a float."""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+    
+    def get_poll_stats(self) -> Dict[str, Any]:
+        """Get cumulative job polling statistics for this client.
+        
+        Returns:
+            Dict[str, Any]: Job, poll and timeout counters
+        """
+        with self._stats_lock:
+            stats = dict(self._poll_stats)
+        
+        stats['avg_polls_per_job'] = round(stats['polls'] / stats['jobs'], 2) if stats['jobs'] else 0.0
+        stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        return stats
+    
+    def get_job_results(self, job: client.Job, output_mode: str = 'json',
+                        page_size: Optional[int] = None, max_results: Optional[int] = None,
+                        fields: Optional[List[str]] = None, offset: int = 0) -> Iterator[Dict[str, Any]]:
         """Get results from completed search job.
         
+        JSON results are fetched page by page with ``count``/``offset`` so
+        only one page is held in memory at a time.
+        
         Args:
             job: Completed search job
             output_mode: Output format ('json', 'csv', 'xml')
+            page_size: Rows per request (defaults to ``results_page_size``)
+            max_results: Stop after this many results (None reads everything)
+            fields: Only return these fields (pushed to splunkd as ``f=``)
+            offset: Index of the first result to return
             
         Returns:
             Iterator[Dict[str, Any]]: Search results
@@ -319,70 +532,523 @@ class SplunkClient:
         Raises:
             SplunkSearchError: If getting results fails
         """
+        page_size = page_size or self.config.results_page_size
+        params: Dict[str, Any] = {}
+        if fields:
+            params['f'] = list(fields)
+        
         try:
-            logger.info("Getting search results", sid=job.sid, output_mode=output_mode)
+            logger.info("Getting search results", sid=job.sid, output_mode=output_mode,
+                       page_size=page_size, max_results=max_results)
             
-            # Get results
-            result_stream = job.results(output_mode=output_mode)
-            
-            if output_mode == 'json':
-                # Parse JSON results
-                reader = results.JSONResultsReader(result_stream)
-                for result in reader:
-                    if isinstance(result, dict):
-                        yield result
-            else:
+            if output_mode != 'json':
                 # For other formats, yield raw data
+                result_stream = self._call('job_results', lambda: job.results(
+                    output_mode=output_mode, count=max_results or 0, offset=offset, **params))
                 for line in result_stream:
                     yield {'raw': line.decode('utf-8') if isinstance(line, bytes) else line}
+                logger.info("Search results retrieved", sid=job.sid)
+                return
             
-            logger.info("Search results retrieved", sid=job.sid)
+            returned = 0
+            pages = 0
+            while max_results is None or returned < max_results:
+                count = page_size if max_results is None else min(page_size, max_results - returned)
+                result_stream = self._call('job_results', lambda: job.results(
+                    output_mode=output_mode, count=count, offset=offset + returned, **params))
+                pages += 1
+                
+                page_rows = 0
+                for result in results.JSONResultsReader(result_stream):
+                    if isinstance(result, dict):
+                        page_rows += 1
+                        yield result
+                returned += page_rows
+                
+                # A short page means the job has no more results
+                if page_rows < count:
+                    break
+            
+            logger.info("Search results retrieved", sid=job.sid, result_count=returned, pages=pages)
             
+        except SplunkCircuitOpenError:
+            raise
         except Exception as e:
             logger.error("Failed to get search results", sid=job.sid, error=str(e))
             raise SplunkSearchError(f"Failed to get search results: {e}")
     
-    def execute_search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
-        """Execute a search and return results.
+    def execute_search_stream(self, query: str, batch_size: Optional[int] = None,
+                              retain: bool = False, offset: int = 0,
+                              priority: Optional[str] = 'interactive',
+                              **kwargs) -> Iterator[List[Dict[str, Any]]]:
+        """Execute a search and yield its results in batches.
+        
+        Each batch is one page of job results, so memory use is bounded by
+        the batch size rather than ``max_results``. The job is cancelled when
+        the iterator is exhausted or closed, unless it is retained.
         
         Args:
             query: SPL search query
-            **kwargs: Search parameters
+            batch_size: Results per batch (defaults to ``results_page_size``)
+            retain: Keep the finished job alive and record it in the job registry
+            offset: Index of the first result to return
+            priority: Scheduler priority class; None if the caller already holds a slot
+            **kwargs: Search parameters; ``fields`` limits the returned fields
             
         Returns:
-            List[Dict[str, Any]]: Search results
+            Iterator[List[Dict[str, Any]]]: Batches of search results
             
         Raises:
             SplunkSearchError: If search execution fails
         """
+        with ExitStack() as slot:
+            if priority is not None:
+                slot.enter_context(self._search_slot(priority, kwargs.get('timeout')))
+            yield from self._stream_job(query, batch_size or self.config.results_page_size,
+                                        retain, offset, **kwargs)
+    
+    def _stream_job(self, query: str, batch_size: int, retain: bool, offset: int,
+                    job_stats: Optional[Dict[str, Any]] = None,
+                    **kwargs) -> Iterator[List[Dict[str, Any]]]:
+        """Run a job and yield result batches; see ``execute_search_stream``.
+        
+        ``job_stats``, if given, is filled with the finished job's scan statistics.
+        """
+        fields = kwargs.pop('fields', None)
+        max_results = kwargs.get('max_results', 100)
         job = None
+        finished = False
         try:
-            # Create search job
-            job = self.create_search_job(query, **kwargs)
+            # Create search job; a retained job keeps enough rows for later pages
+            job_max_count = max(offset + max_results, self.config.job_retention_max_count)
+            job_kwargs = dict(kwargs, max_results=job_max_count) if retain else kwargs
+            job = self.create_search_job(query, **job_kwargs)
             
             # Wait for completion
-            self.wait_for_job(job, kwargs.get('timeout'))
+            poll_stats = self.wait_for_job(job, kwargs.get('timeout'))
+            finished = True
+            if job_stats is not None:
+                job_stats.update(self.get_scan_stats(job))
             
-            # Get results
-            results_list = list(self.get_job_results(job))
+            # Stream results one page at a time
+            total = 0
+            batch: List[Dict[str, Any]] = []
+            for result in self.get_job_results(job, page_size=batch_size, max_results=max_results,
+                                               fields=fields, offset=offset):
+                batch.append(result)
+                if len(batch) >= batch_size:
+                    total += len(batch)
+                    yield batch
+                    batch = []
+            if batch:
+                total += len(batch)
+                yield batch
             
-            logger.info("Search executed successfully", 
+            logger.info("Search job results streamed", 
                        query=query, 
-                       result_count=len(results_list))
-            
-            return results_list
+                       result_count=total,
+                       polls=poll_stats['polls'])
             
+        except (SplunkSearchTimeoutError, SplunkCircuitOpenError):
+            logger.error("Search execution aborted", query=query)
+            raise
         except Exception as e:
             logger.error("Search execution failed", query=query, error=str(e))
             raise SplunkSearchError(f"Search execution failed: {e}")
         finally:
-            # Clean up job
-            if job is not None:
+            if job is not None and retain and finished:
+                self._retain_job(job, query, kwargs.get('earliest_time', '-24h'),
+                                 kwargs.get('latest_time', 'now'), job_max_count)
+            elif job is not None:
+                # Clean up job
                 try:
                     job.cancel()
                 except Exception as e:
                     logger.warning("Failed to cancel search job", sid=job.sid, error=str(e))
     
+    @property
+    def job_registry(self) -> JobRegistry:
+        """Registry of retained jobs."""
+        if self._job_registry is None:
+            self._job_registry = get_job_registry()
+        return self._job_registry
+    
+    @property
+    def scheduler(self) -> SearchScheduler:
+        """Scheduler admitting searches under the concurrency limit."""
+        if self._scheduler is None:
+            self._scheduler = get_search_scheduler()
+        return self._scheduler
+    
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Circuit breaker guarding splunkd REST calls."""
+        if self._breaker is None:
+            self._breaker = get_circuit_breaker()
+        return self._breaker
+    
+    def _call(self, operation: str, func: Callable[[], Any], idempotent: bool = True,
+              timeouts_are_failures: bool = True) -> Any:
+        """Make a splunkd REST call through the retry policy and circuit breaker.
+        
+        Raises:
+            SplunkCircuitOpenError: If the circuit breaker is open
+        """
+        try:
+            return call_with_retry(func, self.circuit_breaker, self._retry_policy, operation,
+                                   idempotent=idempotent, timeouts_are_failures=timeouts_are_failures)
+        except CircuitOpenError as e:
+            raise SplunkCircuitOpenError(str(e)) from e
+    
+    @contextmanager
+    def _search_slot(self, priority: Optional[str], timeout: Optional[float] = None) -> Iterator[float]:
+        """Hold a scheduler slot while a search runs.
+        
+        Args:
+            priority: Scheduler priority class; None if the caller already holds a slot
+            timeout: Seconds to wait for a slot (defaults to the search timeout)
+        
+        Yields:
+            float: Seconds the search was queued
+            
+        Raises:
+            SplunkSearchQueueTimeoutError: If no slot frees up within the timeout
+        """
+        if priority is None:
+            yield 0.0
+            return
+        self.scheduler.ensure_quota(lambda: detect_search_quota(self.get_service()))
+        with search_slot(self.scheduler, priority, timeout or self.config.search_timeout) as waited:
+            yield waited
+    
+    def _retain_job(self, job: client.Job, query: str, earliest_time: str, latest_time: str,
+                    max_results: int) -> None:
+        """Extend a finished job's TTL and record it for reuse."""
+        key = self.job_registry.make_key(query, earliest_time, latest_time)
+        if key is None:
+            # Real-time or unresolvable windows can't be matched later
+            job.cancel()
+            return
+        
+        try:
+            job.set_ttl(self.job_registry.ttl)
+        except Exception as e:
+            logger.warning("Failed to retain search job", sid=job.sid, error=str(e))
+            return
+        
+        result_count = int(self._get_job_content(job).get('resultCount') or 0)
+        self.job_registry.register(key, job.sid, query, earliest_time, latest_time,
+                                   max_results=max_results, result_count=result_count)
+    
+    def read_job(self, sid: str, offset: int = 0, max_results: Optional[int] = None,
+                 fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Read results from an existing job artifact.
+        
+        Args:
+            sid: Search job ID
+            offset: Index of the first result to return
+            max_results: Maximum number of results (None reads everything)
+            fields: Only return these fields
+            
+        Returns:
+            List[Dict[str, Any]]: Search results
+            
+        Raises:
+            SplunkSearchError: If the job no longer exists or cannot be read
+        """
+        try:
+            service = self.get_service()
+            job = self._call('job_status', lambda: service.job(sid))
+        except SplunkCircuitOpenError:
+            raise
+        except Exception as e:
+            self.job_registry.remove(sid)
+            raise SplunkSearchError(f"Search job {sid} is no longer available: {e}")
+        
+        return list(self.get_job_results(job, max_results=max_results, fields=fields, offset=offset))
+    
+    def choose_strategy(self, max_results: Optional[int], needs_progress: bool = False) -> str:
+        """Pick how to run a search.
+        
+        Small bounded searches run as ``oneshot`` (one round trip), larger
+        pulls stream from the export endpoint, and a normal job is only
+        created when the caller needs job progress.
+        
+        Args:
+            max_results: Maximum number of results requested
+            needs_progress: Whether the caller needs a pollable job
+            
+        Returns:
+            str: One of 'oneshot', 'export' or 'normal'
+        """
+        if needs_progress:
+            return 'normal'
+        if max_results and max_results <= self.config.oneshot_max_results:
+            return 'oneshot'
+        return 'export'
+    
+    def run_search(self, query: str, strategy: str = 'auto', needs_progress: bool = False,
+                   retain: bool = False, offset: int = 0, **kwargs) -> Dict[str, Any]:
+        """Execute a search and return results with execution metadata.
+        
+        A live retained job for the same query and window is read instead of
+        running the search again.
+        
+        Args:
+            query: SPL search query
+            strategy: 'auto', 'oneshot', 'export' or 'normal'
+            needs_progress: Force a normal job when strategy is 'auto'
+            retain: Keep the job alive for reuse (forces a normal job)
+            offset: Index of the first result to return
+            **kwargs: Search parameters; ``fields`` limits the returned fields
+            
+        Returns:
+            Dict[str, Any]: 'results' list and 'execution' metadata (strategy,
+                elapsed_seconds, scan statistics for normal jobs, and
+                sid/expires_at for retained jobs)
+            
+        Raises:
+            SplunkSearchError: If search execution fails
+        """
+        if strategy not in EXECUTION_STRATEGIES:
+            raise SplunkSearchError(f"Unknown execution strategy: {strategy}")
+        
+        started = time.monotonic()
+        priority = kwargs.pop('priority', 'interactive')
+        max_results = kwargs.get('max_results', 100)
+        registry_key = self.job_registry.make_key(query, kwargs.get('earliest_time', '-24h'),
+                                                  kwargs.get('latest_time', 'now'))
+        
+        retained = self.job_registry.lookup(registry_key)
+        results_list = None
+        if retained is not None and retained.covers(offset, max_results):
+            try:
+                results_list = self.read_job(retained.sid, offset=offset, max_results=max_results,
+                                             fields=kwargs.get('fields'))
+                self.job_registry.record_reuse()
+                execution: Dict[str, Any] = {'strategy': 'loadjob'}
+            except SplunkSearchError as e:
+                logger.warning("Retained job unavailable, searching again", sid=retained.sid, error=str(e))
+                retained = None
+        
+        if results_list is None:
+            if retain:
+                strategy = 'normal'
+            elif strategy == 'auto':
+                strategy = self.choose_strategy(max_results, needs_progress)
+            
+            with self._search_slot(priority, kwargs.get('timeout')) as queue_seconds:
+                execution = {'strategy': strategy}
+                try:
+                    if strategy == 'oneshot':
+                        results_list = self._execute_oneshot(query, offset=offset, **kwargs)
+                    elif strategy == 'export':
+                        results_list = self._execute_export(query, offset=offset, **kwargs)
+                    else:
+                        results_list = self._execute_job(query, retain=retain, offset=offset,
+                                                         job_stats=execution, **kwargs)
+                except SplunkSearchError as e:
+                    # oneshot/export block on a single HTTP read; a slow search can hit
+                    # the socket timeout, so retry it as a job bounded by the search timeout
+                    if strategy == 'normal' or not self._is_timeout(e.__cause__):
+                        raise
+                    logger.warning("Search timed out on fast path, retrying as job",
+                                  strategy=strategy, query=query)
+                    execution = {'strategy': 'normal', 'fallback_from': strategy}
+                    results_list = self._execute_job(query, offset=offset, job_stats=execution, **kwargs)
+            execution['queue_seconds'] = round(queue_seconds, 3)
+            retained = self.job_registry.lookup(registry_key) if retain else None
+        
+        if retained is not None:
+            execution['sid'] = retained.sid
+            execution['expires_at'] = retained.expires_at
+        
+        elapsed = time.monotonic() - started
+        execution['elapsed_seconds'] = round(elapsed, 3)
+        with self._stats_lock:
+            stats = self._execution_stats.setdefault(execution['strategy'], {'searches': 0, 'seconds': 0.0})
+            stats['searches'] += 1
+            stats['seconds'] += elapsed
+        
+        logger.info("Search executed successfully",
+                   query=query,
+                   result_count=len(results_list),
+                   **execution)
+        
+        return {'results': results_list, 'execution': execution}
+    
+    def execute_search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """Execute a search and return results.
+        
+        Args:
+            query: SPL search query
+            **kwargs: Search parameters; see ``run_search``
+            
+        Returns:
+            List[Dict[str, Any]]: Search results
+            
+        Raises:
+            SplunkSearchError: If search execution fails
+        """
+        return self.run_search(query, **kwargs)['results']
+    
+    def get_execution_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-strategy search counts and average latency.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Stats keyed by strategy
+        """
+        with self._stats_lock:
+            return {
+                strategy: {
+                    'searches': stats['searches'],
+                    'avg_seconds': round(stats['seconds'] / stats['searches'], 3)
+                }
+                for strategy, stats in self._execution_stats.items()
+            }
+    
+    @classmethod
+    def get_scan_stats(cls, job: client.Job) -> Dict[str, Any]:
+        """Get how much data a finished job scanned from its last fetched state.
+        
+        Returns:
+            Dict[str, Any]: scan_count (events read from the index), event_count
+                (events matching the search) and run_duration_seconds
+        """
+        content = cls._get_job_content(job)
+        return {
+            'scan_count': int(cls._parse_progress(content.get('scanCount'))),
+            'event_count': int(cls._parse_progress(content.get('eventCount'))),
+            'run_duration_seconds': round(cls._parse_progress(content.get('runDuration')), 3)
+        }
+    
+    def _execute_job(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """Run a search as a normal job and collect all result pages (caller holds the slot)."""
+        results_list: List[Dict[str, Any]] = []
+        for batch in self.execute_search_stream(query, priority=None, **kwargs):
+            results_list.extend(batch)
+        return results_list
+    
+    def _execute_oneshot(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """Run a search with exec_mode=oneshot in a single round trip."""
+        params = {
+            'output_mode': 'json',
+            'earliest_time': kwargs.get('earliest_time', '-24h'),
+            'latest_time': kwargs.get('latest_time', 'now'),
+            'count': kwargs.get('max_results', 100)
+        }
+        if kwargs.get('fields'):
+            params['f'] = list(kwargs['fields'])
+        if kwargs.get('offset'):
+            params['offset'] = kwargs['offset']
+        
+        try:
+            service = self.get_service()
+            result_stream = self._call(
+                'oneshot', lambda: service.jobs.oneshot(self._normalize_query(query), **params),
+                idempotent=False, timeouts_are_failures=False)
+            return [result for result in results.JSONResultsReader(result_stream)
+                    if isinstance(result, dict)]
+        except SplunkCircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Oneshot search failed", query=query, error=str(e))
+            raise SplunkSearchError(f"Search execution failed: {e}") from e
+    
+    def _execute_export(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """Stream a search from the export endpoint, stopping at max_results."""
+        max_results = kwargs.get('max_results', 100)
+        fields = kwargs.get('fields')
+        skip = kwargs.get('offset', 0)
+        params = {
+            'output_mode': 'json',
+            'earliest_time': kwargs.get('earliest_time', '-24h'),
+            'latest_time': kwargs.get('latest_time', 'now'),
+            'search_mode': 'normal'
+        }
+        
+        results_list: List[Dict[str, Any]] = []
+        try:
+            service = self.get_service()
+            result_stream = self._call(
+                'export', lambda: service.jobs.export(self._normalize_query(query), **params),
+                idempotent=False, timeouts_are_failures=False)
+            try:
+                reader = results.JSONResultsReader(result_stream)
+                for result in reader:
+                    # Transforming searches emit preview rows before the final set
+                    if not isinstance(result, dict) or reader.is_preview:
+                        continue
+                    if skip > 0:
+                        skip -= 1
+                        continue
+                    if fields:
+                        # The export endpoint has no f= projection; trim client-side
+                        result = {field: result[field] for field in fields if field in result}
+                    results_list.append(result)
+                    if len(results_list) >= max_results:
+                        break
+            finally:
+                result_stream.close()
+            return results_list
+        except SplunkCircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Export search failed", query=query, error=str(e))
+            raise SplunkSearchError(f"Search execution failed: {e}") from e
+    
+    def open_realtime_export(self, query: str, earliest_time: str = 'rt',
+                             latest_time: str = 'rt') -> Any:
+        """Open a real-time search on the export endpoint.
+        
+        The search runs until the returned stream is closed. It doesn't take
+        a slot from the search scheduler, since it never finishes.
+        
+        Args:
+            query: SPL search query
+            earliest_time: Real-time window start ('rt', or 'rt-5m' to backfill)
+            latest_time: Real-time window end
+            
+        Returns:
+            Response stream of newline-delimited JSON results; read it line by
+            line (``JSONResultsReader`` waits for the whole response, which a
+            real-time search never finishes) and close it to end the search
+            
+        Raises:
+            SplunkSearchError: If the search can't be started
+        """
+        params = {
+            'output_mode': 'json',
+            'earliest_time': earliest_time,
+            'latest_time': latest_time,
+            'search_mode': 'realtime'
+        }
+        try:
+            service = self.get_service()
+            stream = self._call(
+                'export_realtime', lambda: service.jobs.export(self._normalize_query(query), **params),
+                idempotent=False, timeouts_are_failures=False)
+            logger.info("Real-time export search started", query=query, earliest_time=earliest_time)
+            return stream
+        except SplunkCircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Real-time export search failed", query=query, error=str(e))
+            raise SplunkSearchError(f"Real-time search failed: {e}") from e
+    
+    @staticmethod
+    def _is_quota_error(error: BaseException) -> bool:
+        """Check whether splunkd rejected a search because of the search quota."""
+        message = str(error).lower()
+        return 'quota' in message or 'maximum number of concurrent' in message
+    
+    @staticmethod
+    def _is_timeout(error: Optional[BaseException]) -> bool:
+        """Check whether an exception is an HTTP read timeout."""
+        if error is None:
+            return False
+        return isinstance(error, (socket.timeout, TimeoutError)) or 'timed out' in str(error).lower()
+    
     def __enter__(self):
         """Context manager entry."""
         self.connect()
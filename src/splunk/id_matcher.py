@@ -0,0 +1,132 @@
+"""Match many trace/correlation IDs against log lines in a single pass."""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+def _trie_pattern(ids: Iterable[str]) -> str:
+    """Regex alternation shaped like a trie of the IDs.
+
+    Shared prefixes are matched once, so the regex engine walks the trie
+    instead of trying every ID at every position. Where one ID is a prefix of
+    another the longer one is preferred.
+    """
+    trie: Dict[str, Any] = {}
+    for trace_id in ids:
+        node = trie
+        for char in trace_id:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def emit(node: Dict[str, Any]) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if is_end else "")
+
+    return emit(trie)
+
+
+class IdMatcher:
+    """Compiled matcher for a fixed set of IDs.
+
+    Lines are matched against all IDs at once: structured ID fields (JSON keys
+    or ``field=value`` pairs) first, then a single scan of the raw text with a
+    trie-shaped automaton compiled into one regex.
+    """
+
+    def __init__(self, ids: Iterable[str], fields: Iterable[str] = ()):
+        """Compile the matcher.
+
+        Args:
+            ids: IDs to look for; empty strings are ignored
+            fields: Field names whose value identifies the ID of an event
+        """
+        self.ids = list(dict.fromkeys(i for i in ids if i))
+        self._id_set = set(self.ids)
+        self.fields = list(fields)
+
+        # Lookahead so IDs overlapping each other are all reported
+        self._raw_pattern: Optional[re.Pattern] = (
+            re.compile("(?=(" + _trie_pattern(self.ids) + "))") if self.ids else None
+        )
+        self._field_pattern: Optional[re.Pattern] = None
+        if self.fields:
+            names = "|".join(re.escape(f) for f in sorted(self.fields, key=len, reverse=True))
+            self._field_pattern = re.compile(
+                r'(?<![\w-])"?(?:' + names + r')"?\s*[=:]\s*"?([^\s",;}\]]+)'
+            )
+
+    def find(self, text: str) -> List[str]:
+        """IDs occurring in the text, in order of first occurrence.
+
+        An occurrence lying inside the occurrence of a longer ID (``t1`` in
+        ``t10``) is not counted.
+
+        Args:
+            text: Raw log line
+
+        Returns:
+            List[str]: Distinct matching IDs
+        """
+        if not text or self._raw_pattern is None:
+            return []
+
+        spans = [(m.start(1), m.end(1)) for m in self._raw_pattern.finditer(text)]
+        found: List[str] = []
+        for start, end in spans:
+            covered = any(s <= start and end <= e and (e - s) > (end - start) for s, e in spans)
+            trace_id = text[start:end]
+            if not covered and trace_id not in found:
+                found.append(trace_id)
+        return found
+
+    def find_in_fields(self, raw: str, event: Optional[Dict[str, Any]] = None) -> List[str]:
+        """IDs named by a structured ID field of the event.
+
+        Args:
+            raw: Raw log line, searched for ``field=value`` pairs when no event is given
+            event: Parsed JSON event, if the line was JSON
+
+        Returns:
+            List[str]: Distinct IDs, in field order
+        """
+        found: List[str] = []
+        if event is not None:
+            values = [event.get(f) for f in self.fields]
+        elif self._field_pattern is not None and raw:
+            values = self._field_pattern.findall(raw)
+        else:
+            values = []
+
+        for value in values:
+            if isinstance(value, str) and value in self._id_set and value not in found:
+                found.append(value)
+        return found
+
+    def match(self, raw: str, event: Optional[Dict[str, Any]] = None) -> Tuple[List[str], Optional[str]]:
+        """IDs a log line belongs to and how they were found.
+
+        Structured fields are authoritative: when they name a requested ID the
+        raw text is not scanned, so other IDs merely mentioned in the message
+        don't pull the line into their trace.
+
+        Args:
+            raw: Raw log line
+            event: Parsed JSON event, if the line was JSON
+
+        Returns:
+            Tuple[List[str], Optional[str]]: Matching IDs and 'field', 'raw' or None
+        """
+        by_field = self.find_in_fields(raw, event)
+        if by_field:
+            return by_field, 'field'
+        by_raw = self.find(raw)
+        return by_raw, ('raw' if by_raw else None)
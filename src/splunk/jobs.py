@@ -0,0 +1,188 @@
+"""Registry of finished search jobs kept alive for reuse.
+
+By default a search job is cancelled as soon as its results are read, which
+throws away the artifact even when a follow-up call (an export, the next
+page, a ``| loadjob``) needs the same data. With retention enabled the job
+is kept on splunkd with a TTL and recorded here, keyed on the normalized
+query and snapped time window, so later calls read the existing artifact
+instead of dispatching the search again.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional
+import structlog
+from .cache import make_search_key
+from ..config import SplunkConfig, get_config
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class RetainedJob:
+    """A finished search job whose artifact is still available on splunkd."""
+    sid: str
+    query: str
+    earliest_time: str
+    latest_time: str
+    max_results: int
+    result_count: int
+    created_at: float
+    expires_at: float
+
+    def covers(self, offset: int, count: int) -> bool:
+        """Check whether the artifact holds the requested result range.
+
+        Args:
+            offset: Index of the first result requested
+            count: Number of results requested
+
+        Returns:
+            bool: True if the range is within the job's results
+        """
+        # A job that returned fewer rows than its cap holds the complete result set
+        return offset + count <= self.max_results or self.result_count < self.max_results
+
+    def loadjob_query(self, pipeline: str = "") -> str:
+        """Build an SPL query that reads this job's artifact.
+
+        Args:
+            pipeline: Optional SPL appended after ``| loadjob``
+
+        Returns:
+            str: SPL query
+        """
+        query = f"| loadjob {self.sid}"
+        pipeline = pipeline.strip().lstrip('|').strip()
+        return f"{query} | {pipeline}" if pipeline else query
+
+
+class JobRegistry:
+    """Thread-safe registry of retained search jobs with TTL expiry."""
+
+    def __init__(self, ttl: int = 600, max_entries: int = 100, granularity: int = 60):
+        """Initialize the job registry.
+
+        Args:
+            ttl: Seconds a retained job is kept on splunkd
+            max_entries: Maximum number of jobs tracked
+            granularity: Seconds that resolved time windows are snapped to
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.granularity = granularity
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, RetainedJob]" = OrderedDict()
+        self._stats = {'retained': 0, 'reused': 0, 'expired': 0, 'evicted': 0}
+
+    def make_key(self, query: str, earliest_time: str = "-24h", latest_time: str = "now",
+                 now: Optional[float] = None) -> Optional[str]:
+        """Build the registry key for a search.
+
+        Returns:
+            str: Key, or None if the time window cannot be resolved
+        """
+        return make_search_key(query, earliest_time, latest_time, self.granularity, now=now)
+
+    def register(self, key: str, sid: str, query: str, earliest_time: str, latest_time: str,
+                 max_results: int, result_count: int) -> RetainedJob:
+        """Record a retained job.
+
+        Returns:
+            RetainedJob: The registered entry
+        """
+        now = time.time()
+        entry = RetainedJob(
+            sid=sid,
+            query=query,
+            earliest_time=earliest_time,
+            latest_time=latest_time,
+            max_results=max_results,
+            result_count=result_count,
+            created_at=now,
+            expires_at=now + self.ttl
+        )
+
+        with self._lock:
+            self._jobs.pop(key, None)
+            self._jobs[key] = entry
+            self._stats['retained'] += 1
+            # Dropped entries simply expire on splunkd at the end of their TTL
+            while len(self._jobs) > self.max_entries:
+                self._jobs.popitem(last=False)
+                self._stats['evicted'] += 1
+
+        logger.info("Retained search job", sid=sid, ttl=self.ttl, result_count=result_count)
+        return entry
+
+    def lookup(self, key: Optional[str]) -> Optional[RetainedJob]:
+        """Find a live retained job for a key."""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._jobs.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._jobs[key]
+                self._stats['expired'] += 1
+                return None
+            self._jobs.move_to_end(key)
+            return entry
+
+    def get(self, sid: str) -> Optional[RetainedJob]:
+        """Find a live retained job by SID."""
+        with self._lock:
+            for key, entry in self._jobs.items():
+                if entry.sid == sid:
+                    break
+            else:
+                return None
+        return self.lookup(key)
+
+    def record_reuse(self) -> None:
+        """Count a read served from a retained job."""
+        with self._lock:
+            self._stats['reused'] += 1
+
+    def remove(self, sid: str) -> None:
+        """Forget a job, e.g. after splunkd reports it gone."""
+        with self._lock:
+            for key in [k for k, entry in self._jobs.items() if entry.sid == sid]:
+                del self._jobs[key]
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """List live retained jobs."""
+        now = time.time()
+        with self._lock:
+            return [asdict(entry) for entry in self._jobs.values() if entry.expires_at > now]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['jobs'] = len(self._jobs)
+        return stats
+
+
+# Process-wide registry shared by all tools
+_job_registry: Optional[JobRegistry] = None
+_job_registry_lock = threading.Lock()
+
+
+def create_job_registry(config: SplunkConfig) -> JobRegistry:
+    """Create a job registry from configuration."""
+    return JobRegistry(ttl=config.job_retention_ttl,
+                       max_entries=config.job_registry_max_entries,
+                       granularity=config.cache_time_granularity)
+
+
+def get_job_registry() -> JobRegistry:
+    """Get the process-wide job registry."""
+    global _job_registry
+    with _job_registry_lock:
+        if _job_registry is None:
+            _job_registry = create_job_registry(get_config().splunk)
+        return _job_registry
@@ -0,0 +1,245 @@
+"""Deterministic clustering of error logs into message templates.
+
+A Drain-style miner: each log's message is tokenized and variable tokens
+(numbers, hex, UUIDs, IPs, ``key=<value>``) are masked. Logs are routed
+through a fixed-depth prefix tree keyed on token count and leading tokens,
+and joined to the most similar template in the leaf, or start a new one.
+Differing positions of a joined template become ``<*>``. Every log is
+visited once, so 10k logs cluster in well under a second.
+
+Each cluster keeps a few exemplars and the trace/correlation IDs found in its
+logs, so the model only has to review cluster summaries instead of every log.
+"""
+
+import json
+import re
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+WILDCARD = "<*>"
+
+# ID fields in priority order, and the field_name reported for each
+ID_FIELDS: List[Tuple[str, str]] = [
+    ("traceId", "trace_id"), ("trace_id", "trace_id"), ("traceID", "trace_id"),
+    ("x-b3-traceid", "trace_id"), ("b3TraceId", "trace_id"),
+    ("correlationId", "correlation_id"), ("correlation_id", "correlation_id"),
+    ("requestId", "request_id"), ("request_id", "request_id"),
+    ("spanId", "span_id"), ("span_id", "span_id"),
+]
+
+# Preference of each field_name when picking a cluster's representative ID
+_ID_RANKS = {kind: rank for rank, kind in enumerate(dict.fromkeys(kind for _, kind in ID_FIELDS))}
+_ID_KINDS = dict(ID_FIELDS)
+
+# Fields holding the human-readable message of a JSON log
+MESSAGE_FIELDS = ("message", "msg", "error", "err", "exception", "event")
+SERVICE_FIELDS = ("service", "service_name", "app", "component", "logger")
+
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_HEX = re.compile(r"(?:0x)?[0-9a-fA-F]*[0-9][0-9a-fA-F]*")
+_IP = re.compile(r"\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?")
+_NUMBER = re.compile(r"[-+]?\d+(?:[.,:]\d+)*[a-zA-Z%]{0,3}")
+_KEY_VALUE_ID = re.compile(
+    r'(?<![\w-])"?(' + "|".join(re.escape(name) for name, _ in ID_FIELDS) + r')"?\s*[=:]\s*"?([\w.:-]+)'
+)
+_BARE_ID = re.compile(r"\b(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-f]{32}|[0-9a-f]{16})\b")
+_DIGIT = re.compile(r"\d")
+_TRIM = "()[]{}<>,;'\""
+
+
+@lru_cache(maxsize=65536)
+def mask_token(token: str) -> str:
+    """Replace a variable token with a placeholder.
+
+    Tokens without digits are kept (they carry the message); ``key=value``
+    keeps the key and masks the value.
+    """
+    if "=" in token:
+        key, _, value = token.partition("=")
+        return f"{key}={mask_token(value)}" if value else token
+    if not _DIGIT.search(token):
+        return token
+
+    core = token.strip(_TRIM)
+    if _UUID.fullmatch(core):
+        return "<UUID>"
+    if _IP.fullmatch(core):
+        return "<IP>"
+    if _NUMBER.fullmatch(core):
+        return "<NUM>"
+    if len(core) >= 8 and _HEX.fullmatch(core):
+        return "<HEX>"
+    return WILDCARD
+
+
+def extract_message(raw: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """The text to cluster on and the parsed JSON event, if the log is JSON.
+
+    For JSON logs that is the service and message fields; for plain text the
+    whole line.
+    """
+    if raw.lstrip().startswith("{"):
+        try:
+            event = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            event = None
+        if isinstance(event, dict):
+            service = next((str(event[f]) for f in SERVICE_FIELDS if event.get(f)), None)
+            message = next((str(event[f]) for f in MESSAGE_FIELDS if event.get(f)), None)
+            parts = [p for p in (service, message) if p]
+            return (" ".join(parts) if parts else raw), event
+    return raw, None
+
+
+def extract_ids(raw: str, event: Optional[Dict[str, Any]] = None) -> List[Tuple[str, str]]:
+    """Trace/correlation IDs in a log as (id, field_name), best field first.
+
+    Named ID fields are preferred (JSON keys, then ``key=value`` pairs); bare
+    UUIDs and 32/16-char hex strings are reported as ``generic_id``.
+    """
+    found: List[Tuple[str, str]] = []
+    if event is not None:
+        for name, kind in ID_FIELDS:
+            value = event.get(name)
+            if isinstance(value, str) and value:
+                found.append((value, kind))
+    if not found:
+        found = sorted(((value, _ID_KINDS[name]) for name, value in _KEY_VALUE_ID.findall(raw)),
+                       key=lambda item: _ID_RANKS[item[1]])
+    if not found:
+        found = [(value, "generic_id") for value in _BARE_ID.findall(raw)]
+
+    seen = set()
+    return [(i, kind) for i, kind in found if not (i in seen or seen.add(i))]
+
+
+@dataclass
+class LogCluster:
+    """Logs sharing one message template."""
+    cluster_id: int
+    template: List[str]
+    count: int = 0
+    exemplars: List[str] = field(default_factory=list)
+    ids: List[Tuple[str, str]] = field(default_factory=list)
+
+    def similarity(self, tokens: List[str]) -> Tuple[float, int]:
+        """Share of positions equal to the template, and its wildcard count."""
+        same = sum(1 for mine, theirs in zip(self.template, tokens) if mine == theirs)
+        wildcards = sum(1 for mine in self.template if mine == WILDCARD)
+        return same / len(tokens), wildcards
+
+    def merge(self, tokens: List[str]) -> None:
+        """Generalize positions where the template and tokens differ."""
+        self.template = [mine if mine == theirs else WILDCARD for mine, theirs in zip(self.template, tokens)]
+
+    def to_dict(self, max_ids: int = 3) -> Dict[str, Any]:
+        """Summary for the model: template, count, exemplars and IDs."""
+        representative = self.representative_id()
+        return {
+            "cluster": self.cluster_id,
+            "template": " ".join(self.template),
+            "count": self.count,
+            "exemplars": self.exemplars,
+            "representative_id": representative[0] if representative else None,
+            "id_field": representative[1] if representative else None,
+            "ids": [i for i, _ in self.ids[:max_ids]]
+        }
+
+    def representative_id(self) -> Optional[Tuple[str, str]]:
+        """The first ID seen from the best-ranked field."""
+        if not self.ids:
+            return None
+        return min(self.ids, key=lambda item: _ID_RANKS.get(item[1], len(_ID_RANKS)))
+
+
+class LogTemplateMiner:
+    """Drain-style online template miner."""
+
+    def __init__(self, depth: int = 4, similarity_threshold: float = 0.5, max_children: int = 100,
+                 max_exemplars: int = 2, max_exemplar_chars: int = 300, max_ids: int = 20):
+        """Initialize the miner.
+
+        Args:
+            depth: Prefix tree depth; logs are routed on ``depth - 2`` leading tokens
+            similarity_threshold: Share of equal tokens needed to join a cluster
+            max_children: Children per tree node before new tokens go to a wildcard branch
+            max_exemplars: Raw logs kept per cluster
+            max_exemplar_chars: Characters kept of each exemplar
+            max_ids: IDs kept per cluster
+        """
+        self.depth = max(3, depth)
+        self.similarity_threshold = similarity_threshold
+        self.max_children = max_children
+        self.max_exemplars = max_exemplars
+        self.max_exemplar_chars = max_exemplar_chars
+        self.max_ids = max_ids
+        self.clusters: List[LogCluster] = []
+        # token count -> nested prefix dicts -> list of clusters
+        self._tree: Dict[int, Any] = {}
+
+    def add(self, raw: str) -> LogCluster:
+        """Assign one raw log to a cluster.
+
+        Args:
+            raw: Raw log line
+
+        Returns:
+            LogCluster: The cluster the log joined or started
+        """
+        message, event = extract_message(raw)
+        tokens = [mask_token(token) for token in message.split()] or [""]
+
+        leaf = self._leaf(tokens)
+        best, best_key = None, (-1.0, 0)
+        for cluster in leaf:
+            sim, wildcards = cluster.similarity(tokens)
+            if (sim, wildcards) > best_key:
+                best, best_key = cluster, (sim, wildcards)
+
+        if best is not None and best_key[0] >= self.similarity_threshold:
+            best.merge(tokens)
+        else:
+            best = LogCluster(cluster_id=len(self.clusters) + 1, template=tokens)
+            self.clusters.append(best)
+            leaf.append(best)
+
+        best.count += 1
+        if len(best.exemplars) < self.max_exemplars:
+            best.exemplars.append(raw[:self.max_exemplar_chars])
+        if len(best.ids) < self.max_ids:
+            known = {i for i, _ in best.ids}
+            best.ids.extend(item for item in extract_ids(raw, event) if item[0] not in known)
+            del best.ids[self.max_ids:]
+        return best
+
+    def _leaf(self, tokens: List[str]) -> List[LogCluster]:
+        """Walk the prefix tree to the leaf for these tokens, creating nodes as needed."""
+        node = self._tree.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 2]:
+            key = WILDCARD if token.startswith("<") or "=<" in token else token
+            if key not in node and len(node) >= self.max_children:
+                key = WILDCARD
+            node = node.setdefault(key, {})
+        return node.setdefault("", [])
+
+
+def cluster_logs(raw_logs: List[str], **miner_kwargs: Any) -> List[LogCluster]:
+    """Cluster raw logs into templates, largest cluster first.
+
+    Args:
+        raw_logs: Raw log lines
+        **miner_kwargs: Options for ``LogTemplateMiner``
+
+    Returns:
+        List[LogCluster]: Clusters ordered by size
+    """
+    miner = LogTemplateMiner(**miner_kwargs)
+    for raw in raw_logs:
+        if raw:
+            miner.add(raw)
+    return sorted(miner.clusters, key=lambda cluster: cluster.count, reverse=True)
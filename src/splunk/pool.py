@@ -0,0 +1,596 @@
+"""Process-wide pool of authenticated Splunk sessions.
+
+Tools used to create their own ``SplunkClient`` and log in with username and
+password, paying a login plus a TLS handshake per tool instance and leaving
+sessions behind on splunkd. ``SplunkSessionPool`` keeps a bounded set of
+logged-in clients that every tool borrows from. Each pooled client talks to
+splunkd over keep-alive HTTP connections, idle sessions are health-checked
+before reuse and logged out once they have been idle for too long.
+
+Expired session tokens are handled by splunklib itself: clients connect with
+``autologin=True``, so a 401 triggers a fresh login and a single retry.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Any, List, Optional, Iterator, Callable, Tuple
+import requests
+import splunklib.binding as binding
+import splunklib.client as client
+import structlog
+from .cache import CACHE_MODES, SearchResultCache, get_search_cache
+from .client import (
+    SplunkClient,
+    SplunkConnectionError,
+    SplunkAuthenticationError,
+    SplunkSearchError,
+    SplunkCacheMissError,
+    search_slot
+)
+from .scheduler import SearchScheduler, detect_search_quota, get_search_scheduler
+from .slicing import run_sliced_search
+from ..config import SplunkConfig, get_config
+
+logger = structlog.get_logger(__name__)
+
+
+def keepalive_handler(config: SplunkConfig,
+                      read_timeout: Optional[float] = None) -> Callable[..., Dict[str, Any]]:
+    """Create a splunklib HTTP handler that reuses connections.
+
+    splunklib's default handler sends ``Connection: Close`` and opens a new
+    (TLS) connection for every REST call. This handler routes requests through
+    a ``requests.Session`` so connections are kept alive between calls.
+
+    Args:
+        config: Splunk configuration
+        read_timeout: Socket read timeout, if it should differ from the
+            connect timeout (``config.timeout``)
+
+    Returns:
+        Callable: Handler suitable for ``splunklib.client.connect(handler=...)``
+    """
+    http_session = requests.Session()
+    # splunklib tracks its own session cookies; don't let requests replay them
+    http_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def request(url: str, message: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        headers = {"User-Agent": "splunk-mcp-server", "Accept": "*/*"}
+        for key, value in message.get("headers", []):
+            headers[key] = value
+
+        response = http_session.request(
+            message.get("method", "GET"),
+            url,
+            data=message.get("body") or None,
+            headers=headers,
+            timeout=(config.timeout, read_timeout) if read_timeout else config.timeout,
+            verify=config.verify_ssl,
+            allow_redirects=False,
+            stream=True
+        )
+        response.raw.decode_content = True
+
+        return {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": list(response.raw.headers.items()),
+            "body": binding.ResponseReader(response.raw),
+        }
+
+    return request
+
+
+class SplunkSessionPool:
+    """Bounded pool of connected ``SplunkClient`` instances.
+
+    The pool also exposes the search methods of ``SplunkClient``; each call
+    borrows a session for its duration, so the pool can be used anywhere a
+    client is expected. Searches are admitted by the search scheduler before
+    they borrow a session, so they queue by priority there rather than in
+    ``acquire``.
+    """
+
+    def __init__(self, config: SplunkConfig, size: Optional[int] = None,
+                 idle_timeout: Optional[float] = None,
+                 health_check_interval: Optional[float] = None,
+                 client_factory: Optional[Callable[[], SplunkClient]] = None,
+                 result_cache: Optional[SearchResultCache] = None,
+                 scheduler: Optional[SearchScheduler] = None):
+        """Initialize the session pool.
+
+        Args:
+            config: Splunk configuration
+            size: Maximum number of live sessions
+            idle_timeout: Seconds after which an idle session is logged out
+            health_check_interval: Idle seconds after which a session is
+                checked with a ``server/info`` call before reuse
+            client_factory: Callable creating unconnected clients
+            result_cache: Search result cache (defaults to the shared cache)
+            scheduler: Search admission scheduler (defaults to the shared scheduler)
+        """
+        self.config = config
+        self.size = max(1, size if size is not None else config.pool_size)
+        self.idle_timeout = idle_timeout if idle_timeout is not None else config.pool_idle_timeout
+        self.health_check_interval = (health_check_interval if health_check_interval is not None
+                                      else config.pool_health_check_interval)
+        self._client_factory = client_factory or self._create_client
+        self.result_cache = result_cache
+        self._scheduler = scheduler
+        self._idle: List[Tuple[SplunkClient, float]] = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        # Never logged in; polls and reads jobs through the session that created them
+        self._job_client: Optional[SplunkClient] = None
+        self._stats = {
+            'logins': 0,
+            'borrows': 0,
+            'waits': 0,
+            'evictions': 0,
+            'health_check_failures': 0,
+            'discarded': 0,
+            'dedicated_logins': 0
+        }
+        self._dedicated = 0
+
+    def _create_client(self) -> SplunkClient:
+        """Create a client that uses keep-alive HTTP connections."""
+        return SplunkClient(self.config, handler=keepalive_handler(self.config))
+
+    def acquire(self, timeout: Optional[float] = None) -> SplunkClient:
+        """Borrow a connected client from the pool.
+
+        Args:
+            timeout: Seconds to wait for a free session (defaults to the
+                configured search timeout)
+
+        Returns:
+            SplunkClient: Connected client; must be returned with ``release``
+
+        Raises:
+            SplunkConnectionError: If the pool is closed, no session frees up
+                in time, or a new session cannot connect
+            SplunkAuthenticationError: If logging in a new session fails
+        """
+        timeout = timeout if timeout is not None else self.config.search_timeout
+        deadline = time.monotonic() + timeout
+        borrowed: Optional[Tuple[SplunkClient, float]] = None
+        expired: List[SplunkClient] = []
+
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise SplunkConnectionError("Splunk session pool is closed")
+
+                    expired.extend(self._pop_expired_locked())
+
+                    if self._idle:
+                        borrowed = self._idle.pop()  # LIFO keeps the warmest sessions in use
+                        break
+                    if self._live < self.size:
+                        self._live += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise SplunkConnectionError(
+                            f"Timed out after {timeout}s waiting for a pooled Splunk session"
+                        )
+                    self._stats['waits'] += 1
+                    self._cond.wait(remaining)
+        finally:
+            # Log out expired sessions without holding the pool lock
+            for expired_client in expired:
+                self._safe_disconnect(expired_client)
+
+        try:
+            if borrowed is None:
+                pooled_client = self._connect_new()
+            else:
+                pooled_client, last_used = borrowed
+                if time.monotonic() - last_used >= self.health_check_interval \
+                        and not self._is_healthy(pooled_client):
+                    with self._cond:
+                        self._stats['health_check_failures'] += 1
+                    self._safe_disconnect(pooled_client)
+                    pooled_client = self._connect_new()
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._stats['borrows'] += 1
+        return pooled_client
+
+    def release(self, pooled_client: SplunkClient, discard: bool = False) -> None:
+        """Return a borrowed client to the pool.
+
+        Args:
+            pooled_client: Client obtained from ``acquire``
+            discard: Log the session out instead of keeping it for reuse
+        """
+        with self._cond:
+            if discard or self._closed or not pooled_client.is_connected():
+                self._live -= 1
+                self._stats['discarded'] += 1
+                self._cond.notify()
+            else:
+                self._idle.append((pooled_client, time.monotonic()))
+                self._cond.notify()
+                return
+
+        self._safe_disconnect(pooled_client)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[SplunkClient]:
+        """Borrow a client for the duration of a ``with`` block.
+
+        Sessions that raise connection or authentication errors are discarded
+        rather than returned to the pool.
+        """
+        pooled_client = self.acquire(timeout)
+        discard = False
+        try:
+            yield pooled_client
+        except (SplunkConnectionError, SplunkAuthenticationError):
+            discard = True
+            raise
+        finally:
+            self.release(pooled_client, discard=discard)
+
+    @contextmanager
+    def dedicated_session(self, read_timeout: float) -> Iterator[SplunkClient]:
+        """Log in a client outside the pool for the duration of a ``with`` block.
+
+        Real-time searches hold their connection for as long as they run; a
+        pooled session would be taken from every other tool for that long.
+        The session doesn't count toward the pool size and is logged out
+        when the block exits.
+
+        Args:
+            read_timeout: Socket read timeout; longer than the quietest
+                expected stretch of the connection
+
+        Raises:
+            SplunkConnectionError: If the pool is closed or login fails
+        """
+        with self._cond:
+            if self._closed:
+                raise SplunkConnectionError("Splunk session pool is closed")
+        dedicated = SplunkClient(self.config, handler=keepalive_handler(self.config, read_timeout))
+        dedicated.connect()
+        with self._cond:
+            self._stats['dedicated_logins'] += 1
+            self._dedicated += 1
+        try:
+            yield dedicated
+        finally:
+            with self._cond:
+                self._dedicated -= 1
+            self._safe_disconnect(dedicated)
+
+    @contextmanager
+    def search_session(self, priority: Optional[str] = 'interactive',
+                       timeout: Optional[float] = None) -> Iterator[Tuple[SplunkClient, float]]:
+        """Wait for a scheduler slot, then borrow a client, for one search.
+
+        Args:
+            priority: Scheduler priority class; None if the caller already holds a slot
+            timeout: Seconds to wait for a slot (defaults to the search timeout)
+
+        Yields:
+            Tuple[SplunkClient, float]: Borrowed client and seconds spent queued
+
+        Raises:
+            SplunkSearchQueueTimeoutError: If no slot frees up within the timeout
+        """
+        if priority is None:
+            with self.session() as pooled_client:
+                yield pooled_client, 0.0
+            return
+        self.scheduler.ensure_quota(self._detect_quota)
+        with search_slot(self.scheduler, priority, timeout or self.config.search_timeout) as waited:
+            with self.session() as pooled_client:
+                yield pooled_client, waited
+
+    def evict_idle(self) -> int:
+        """Log out sessions that have been idle longer than ``idle_timeout``.
+
+        Returns:
+            int: Number of sessions evicted
+        """
+        with self._cond:
+            expired = self._pop_expired_locked()
+        for expired_client in expired:
+            self._safe_disconnect(expired_client)
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics.
+
+        Returns:
+            Dict[str, Any]: Pool size, live/idle session counts and counters
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self.size,
+                'live': self._live,
+                'idle': len(self._idle),
+                'in_use': self._live - len(self._idle),
+                'dedicated': self._dedicated,
+                'closed': self._closed
+            })
+        return stats
+
+    def close(self) -> None:
+        """Log out every idle session and refuse further borrows."""
+        with self._cond:
+            self._closed = True
+            idle = [c for c, _ in self._idle]
+            self._live -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for idle_client in idle:
+            self._safe_disconnect(idle_client)
+        logger.info("Splunk session pool closed", logged_out=len(idle))
+
+    @property
+    def scheduler(self) -> SearchScheduler:
+        """Scheduler admitting searches under the concurrency limit."""
+        if self._scheduler is None:
+            self._scheduler = get_search_scheduler()
+        return self._scheduler
+
+    # --- helpers ---
+
+    def _detect_quota(self) -> Optional[int]:
+        """Detect the search quota through a pooled session."""
+        with self.session() as pooled_client:
+            return detect_search_quota(pooled_client.get_service())
+
+    def _get_job_client(self) -> SplunkClient:
+        """Client for calls on jobs already bound to a service; it is never connected."""
+        with self._cond:
+            if self._job_client is None:
+                self._job_client = self._client_factory()
+            return self._job_client
+
+    def _connect_new(self) -> SplunkClient:
+        """Create and log in a new session."""
+        new_client = self._client_factory()
+        new_client.connect()
+        with self._cond:
+            self._stats['logins'] += 1
+        logger.info("Opened pooled Splunk session", pool_size=self.size)
+        return new_client
+
+    def _pop_expired_locked(self) -> List[SplunkClient]:
+        """Remove sessions idle past ``idle_timeout``; caller holds the lock."""
+        if not self._idle:
+            return []
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [c for c, last_used in self._idle if last_used < cutoff]
+        if expired:
+            self._idle = [(c, t) for c, t in self._idle if t >= cutoff]
+            self._live -= len(expired)
+            self._stats['evictions'] += len(expired)
+            self._cond.notify(len(expired))
+        return expired
+
+    @staticmethod
+    def _is_healthy(pooled_client: SplunkClient) -> bool:
+        """Check a session with a cheap ``server/info`` round trip."""
+        try:
+            pooled_client.test_connection()
+            return True
+        except Exception as e:
+            logger.warning("Pooled Splunk session failed health check", error=str(e))
+            return False
+
+    @staticmethod
+    def _safe_disconnect(pooled_client: SplunkClient) -> None:
+        """Log a session out, ignoring errors."""
+        try:
+            pooled_client.disconnect()
+        except Exception as e:
+            logger.warning("Error closing pooled Splunk session", error=str(e))
+
+    # --- SplunkClient-compatible surface ---
+
+    def connect(self) -> None:
+        """Make sure at least one session is logged in."""
+        with self.session():
+            pass
+
+    def disconnect(self) -> None:
+        """Log out idle sessions; the pool reconnects on the next borrow."""
+        with self._cond:
+            idle = [c for c, _ in self._idle]
+            self._live -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for idle_client in idle:
+            self._safe_disconnect(idle_client)
+
+    def is_connected(self) -> bool:
+        """Pooled sessions connect on demand, so the pool is usable unless closed."""
+        return not self._closed
+
+    def test_connection(self) -> Dict[str, Any]:
+        """Test connection to Splunk and return server info."""
+        with self.session() as pooled_client:
+            return pooled_client.test_connection()
+
+    def get_server_info(self) -> Dict[str, Any]:
+        """Get server information."""
+        with self.session() as pooled_client:
+            return pooled_client.get_server_info()
+
+    def get_indexes(self, filter_pattern: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get list of available indexes."""
+        with self.session() as pooled_client:
+            return pooled_client.get_indexes(filter_pattern=filter_pattern)
+
+    def create_search_job(self, query: str, **kwargs) -> client.Job:
+        """Create a search job.
+
+        The job keeps a reference to the session that created it, so it can
+        be polled and read after the session is returned to the pool.
+        """
+        with self.session() as pooled_client:
+            return pooled_client.create_search_job(query, **kwargs)
+
+    def wait_for_job(self, job: client.Job, timeout: Optional[int] = None) -> Dict[str, Any]:
+        """Wait for search job to complete on the job's own service, without borrowing a session."""
+        return self._get_job_client().wait_for_job(job, timeout)
+
+    def get_job_results(self, job: client.Job, output_mode: str = 'json',
+                        **kwargs) -> Iterator[Dict[str, Any]]:
+        """Get results from completed search job, one page at a time, without borrowing a session."""
+        yield from self._get_job_client().get_job_results(job, output_mode=output_mode, **kwargs)
+
+    def execute_search_stream(self, query: str, batch_size: Optional[int] = None,
+                              **kwargs) -> Iterator[List[Dict[str, Any]]]:
+        """Execute a search and yield result batches.
+
+        The slot and session stay held until the iterator is exhausted or closed.
+        """
+        priority = kwargs.pop('priority', 'interactive')
+        with self.search_session(priority, kwargs.get('timeout')) as (pooled_client, _):
+            yield from pooled_client.execute_search_stream(query, batch_size=batch_size,
+                                                           priority=None, **kwargs)
+
+    def execute_search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """Execute a search and return results."""
+        return self.run_search(query, **kwargs)['results']
+
+    def run_search(self, query: str, cache: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """Execute a search and return results with execution metadata.
+
+        Args:
+            query: SPL search query
+            cache: None to skip the result cache, or one of 'prefer' (serve
+                fresh cached results, otherwise search and store), 'bypass'
+                (always search, then refresh the cache) or 'only' (never search)
+            **kwargs: Search parameters; see ``SplunkClient.run_search``
+
+        Returns:
+            Dict[str, Any]: 'results' list and 'execution' metadata
+
+        Raises:
+            SplunkCacheMissError: If cache is 'only' and nothing is cached
+            SplunkSearchError: If search execution fails
+        """
+        if cache is None:
+            return self._run_admitted(query, **kwargs)
+
+        if cache not in CACHE_MODES:
+            raise SplunkSearchError(f"Unknown cache mode: {cache}")
+
+        started = time.monotonic()
+        result_cache = self.result_cache or get_search_cache()
+        key = result_cache.make_key(
+            query,
+            earliest_time=kwargs.get('earliest_time', '-24h'),
+            latest_time=kwargs.get('latest_time', 'now'),
+            max_results=kwargs.get('max_results', 100),
+            fields=kwargs.get('fields'),
+            offset=kwargs.get('offset', 0)
+        )
+
+        # A cached copy has no job behind it, so retention always searches
+        if key is not None and cache != 'bypass' and not kwargs.get('retain'):
+            cached = result_cache.get(key)
+            if cached is not None:
+                logger.info("Search served from cache", query=query, result_count=len(cached))
+                return {
+                    'results': cached,
+                    'execution': {
+                        'strategy': 'cache',
+                        'cache': 'hit',
+                        'elapsed_seconds': round(time.monotonic() - started, 3)
+                    }
+                }
+
+        if cache == 'only':
+            raise SplunkCacheMissError("No cached results for this search")
+
+        result = self._run_admitted(query, **kwargs)
+
+        if key is None:
+            result['execution']['cache'] = 'uncacheable'
+        else:
+            result_cache.put(key, result['results'])
+            result['execution']['cache'] = 'bypass' if cache == 'bypass' else 'miss'
+        return result
+
+    def _run_admitted(self, query: str, **kwargs) -> Dict[str, Any]:
+        """Run a search on a borrowed client once the scheduler admits it."""
+        priority = kwargs.pop('priority', 'interactive')
+        with self.search_session(priority, kwargs.get('timeout')) as (pooled_client, waited):
+            result = pooled_client.run_search(query, priority=None, **kwargs)
+        if 'queue_seconds' in result['execution']:
+            result['execution']['queue_seconds'] = round(waited, 3)
+        return result
+
+    def run_sliced_search(self, query: str, slices: int, cache: Optional[str] = None,
+                          **kwargs) -> Dict[str, Any]:
+        """Execute a search as concurrent time slices.
+
+        Each slice borrows its own session and goes through the result cache
+        and search scheduler like any other search.
+
+        Args:
+            query: SPL search query
+            slices: Number of time slices to split the window into
+            cache: Result cache mode for each slice; see ``run_search``
+            **kwargs: Search parameters; see ``SplunkClient.run_search``
+
+        Returns:
+            Dict[str, Any]: 'results' list and 'execution' metadata with per-slice timings
+
+        Raises:
+            SplunkSearchError: If a needed slice fails
+        """
+        return run_sliced_search(functools.partial(self.run_search, cache=cache), query, slices,
+                                 max_workers=self.config.max_concurrent_searches, **kwargs)
+
+    def read_job(self, sid: str, **kwargs) -> List[Dict[str, Any]]:
+        """Read results from an existing job artifact."""
+        with self.session() as pooled_client:
+            return pooled_client.read_job(sid, **kwargs)
+
+    def search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """Execute a search query."""
+        return self.execute_search(query, **kwargs)
+
+
+# Process-wide pool shared by all tools
+_session_pool: Optional[SplunkSessionPool] = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SplunkSessionPool:
+    """Get the process-wide Splunk session pool."""
+    global _session_pool
+    with _session_pool_lock:
+        if _session_pool is None or _session_pool.get_stats()['closed']:
+            _session_pool = SplunkSessionPool(get_config().splunk)
+        return _session_pool
+
+
+def close_session_pool() -> None:
+    """Close the process-wide Splunk session pool."""
+    global _session_pool
+    with _session_pool_lock:
+        if _session_pool is not None:
+            _session_pool.close()
+            _session_pool = None
@@ -0,0 +1,246 @@
+"""Long-lived real-time searches for monitoring.
+
+A polling monitor dispatches a fresh historical search every interval.
+``RealtimeStream`` instead keeps one real-time search open on the export
+endpoint and hands each event to a callback as it arrives, so a monitor
+costs one Splunk job per connection rather than one per interval.
+
+Reading the export response blocks, so each stream runs on its own thread
+and logs in its own session outside the pool; a pooled session would be
+taken from every other tool for as long as the stream runs. The read
+timeout of the connection is well above the quietest expected stretch of
+the search, and when it expires the stream just reconnects. Only failures
+to log in or dispatch the search count toward ``max_failures``.
+
+When the connection drops or the search ends, the stream reconnects with
+exponential backoff and backfills the time it was disconnected with a
+windowed real-time search (``rt-<gap>s``, at most ``backfill_max``
+seconds). Events already delivered
+before the disconnect come back in the backfill; the consumer drops them by
+``_bkt``/``_cd``. Reconnected searches are limited with ``index_earliest``
+to events indexed shortly before the disconnect, so events whose ``_time``
+falls in the backfill but which were indexed earlier aren't repeated.
+"""
+
+import io
+import json
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from .cache import normalize_query
+from .pool import get_session_pool
+from .resilience import is_timeout
+
+logger = structlog.get_logger(__name__)
+
+# Default socket read timeout of a real-time connection, in seconds
+QUIET_READ_TIMEOUT = 300.0
+
+
+class RealtimeStream:
+    """One real-time export search feeding a callback, reconnecting on failure."""
+
+    def __init__(self, query: str, on_results: Callable[[List[Dict[str, Any]]], None],
+                 window: Optional[str] = None, backfill_max: int = 300, backfill_overlap: int = 10,
+                 reconnect_min: float = 1.0, reconnect_max: float = 60.0, max_failures: int = 5,
+                 on_stopped: Optional[Callable[[str], None]] = None,
+                 read_timeout: float = QUIET_READ_TIMEOUT):
+        """Initialize the stream.
+
+        Args:
+            query: SPL event search to run in real time
+            on_results: Called on the stream thread with each batch of new events
+            window: Earliest time of the first connection ('rt' if None, 'rt-5m' to backfill)
+            backfill_max: Longest disconnected gap, in seconds, backfilled on reconnect
+            backfill_overlap: Seconds before the disconnect also re-read on reconnect
+            reconnect_min: First reconnect delay in seconds
+            reconnect_max: Longest reconnect delay in seconds
+            max_failures: Consecutive failed logins or dispatches before giving up
+            on_stopped: Called with the last error when the stream gives up
+            read_timeout: Seconds without data after which the stream reconnects
+        """
+        self.query = query
+        self.on_results = on_results
+        self.window = window or 'rt'
+        self.backfill_max = max(0, backfill_max)
+        self.backfill_overlap = max(0, backfill_overlap)
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self.max_failures = max(1, max_failures)
+        self.on_stopped = on_stopped
+        self.read_timeout = read_timeout
+
+        self.connected = False
+        self.last_error: Optional[str] = None
+        self.last_event_at: Optional[float] = None
+        self._disconnected_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._response: Any = None
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'connects': 0, 'reconnects': 0, 'quiet_reconnects': 0, 'events': 0, 'failures': 0}
+
+    @property
+    def running(self) -> bool:
+        """Whether the stream thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start reading on a background thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="monitor-realtime", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """End the search and wait briefly for the thread to exit."""
+        self._stop.set()
+        with self._lock:
+            response = self._response
+        if response is not None:
+            # Unblocks the reader; the real-time job ends with the connection
+            try:
+                response.close()
+            except Exception:
+                pass
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection state and counters; every connect dispatches one Splunk job."""
+        return {
+            'connected': self.connected,
+            'window': self.window,
+            'last_event_at': self.last_event_at,
+            'last_error': self.last_error,
+            **self._stats
+        }
+
+    # --- internals ---
+
+    def _run(self) -> None:
+        failures = 0
+        delay = self.reconnect_min
+        while not self._stop.is_set():
+            try:
+                events, quiet = self._stream_once()
+            except Exception as e:
+                # Raised only while logging in or dispatching the search
+                if self._stop.is_set():
+                    break
+                self.last_error = str(e)
+                logger.warning("Real-time monitor search failed", query=self.query, error=str(e))
+                failures += 1
+                self._stats['failures'] += 1
+                if failures >= self.max_failures:
+                    logger.error("Real-time monitor search gave up", query=self.query, failures=failures)
+                    if self.on_stopped is not None:
+                        self.on_stopped(self.last_error)
+                    return
+            else:
+                if self._stop.is_set():
+                    break
+                failures = 0
+                logger.info("Real-time monitor search ended, reconnecting", query=self.query,
+                            events=events, quiet=quiet)
+                # A search ending right away without events still backs off
+                if events or quiet:
+                    delay = self.reconnect_min
+            if self._stop.wait(delay):
+                break
+            delay = min(delay * 2, self.reconnect_max)
+
+    def _next_earliest(self) -> str:
+        """Window of the next connection: the configured one, or the disconnected gap."""
+        if self._disconnected_at is None:
+            return self.window
+        gap = math.ceil(time.time() - self._disconnected_at) + self.backfill_overlap
+        return f"rt-{min(gap, self.backfill_max)}s"
+
+    def _next_query(self) -> str:
+        """Query of the next connection, limited to events indexed since the disconnect."""
+        if self._disconnected_at is None:
+            return self.query
+        index_earliest = int(self._disconnected_at) - self.backfill_overlap
+        return f"search index_earliest={index_earliest} {normalize_query(self.query)[len('search '):]}"
+
+    def _stream_once(self) -> Tuple[int, bool]:
+        """Read one connection until it ends.
+
+        Returns:
+            Tuple[int, bool]: Events read, and whether the connection ended
+                because nothing arrived within the read timeout
+
+        Raises:
+            Exception: If logging in or dispatching the search fails
+        """
+        earliest_time = self._next_earliest()
+        query = self._next_query()
+        with get_session_pool().dedicated_session(self.read_timeout) as client:
+            response = client.open_realtime_export(query, earliest_time=earliest_time)
+            with self._lock:
+                self._response = response
+                self._stats['connects'] += 1
+                if self._stats['connects'] > 1:
+                    self._stats['reconnects'] += 1
+            self.connected = True
+            if self._stop.is_set():
+                response.close()
+
+            events, quiet = 0, False
+            try:
+                for result in self._read_results(response):
+                    if self._stop.is_set():
+                        break
+                    events += 1
+                    self._stats['events'] += 1
+                    self.last_event_at = time.time()
+                    self.on_results([result])
+            except Exception as e:
+                # The search was running; a read error is a disconnect, not a failure
+                if not self._stop.is_set():
+                    quiet = is_timeout(e)
+                    if quiet:
+                        self._stats['quiet_reconnects'] += 1
+                    else:
+                        self.last_error = str(e)
+                        logger.warning("Real-time monitor search disconnected", query=self.query, error=str(e))
+            finally:
+                with self._lock:
+                    self._response = None
+                self.connected = False
+                self._disconnected_at = time.time()
+                try:
+                    response.close()
+                except Exception:
+                    pass
+            return events, quiet
+
+    @staticmethod
+    def _read_results(response: Any) -> Iterator[Dict[str, Any]]:
+        """Yield results line by line as the export endpoint writes them.
+
+        ``JSONResultsReader`` reads the whole response before parsing, which
+        never happens for a real-time search.
+        """
+        for line in io.BufferedReader(response):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                document = json.loads(line)
+            except ValueError:
+                logger.warning("Unparseable real-time search output", line=line[:200])
+                continue
+            for message in document.get('messages') or []:
+                logger.info("Real-time search message", type=message.get('type'), text=message.get('text'))
+            if 'result' in document:
+                yield document['result']
+            for result in document.get('results') or []:
+                yield result
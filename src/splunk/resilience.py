@@ -0,0 +1,268 @@
+"""Retries and circuit breaking for splunkd REST calls.
+
+Transient failures (connection resets, timeouts, 5xx from a restarting
+search head) are retried with jittered exponential backoff, but only for
+calls that are safe to repeat. A process-wide ``CircuitBreaker`` counts
+consecutive transient failures; once splunkd looks unhealthy it fails calls
+fast instead of letting every agent pile more load onto it, and lets a
+single probe through after the recovery timeout.
+"""
+
+import random
+import ssl
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, TypeVar
+import structlog
+from ..config import SplunkConfig, get_config
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar('T')
+
+# HTTP statuses worth retrying: throttling and gateway/server hiccups
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"Splunk is unavailable; circuit breaker open, retry in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+def is_transient(error: BaseException) -> bool:
+    """Classify an error from a splunkd call.
+
+    Args:
+        error: Exception raised by splunklib or the HTTP handler
+
+    Returns:
+        bool: True if the call may succeed when repeated
+    """
+    status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        # Quota rejections are 503s too, but repeating them only adds load
+        if 'quota' in str(error).lower() or 'maximum number of concurrent' in str(error).lower():
+            return False
+        return status in TRANSIENT_STATUSES
+    if isinstance(error, ssl.SSLCertVerificationError):
+        return False
+    # Connection refused/reset, socket timeouts and requests' connection errors
+    return isinstance(error, (ConnectionError, TimeoutError, OSError))
+
+
+def is_unsent(error: BaseException) -> bool:
+    """Check whether a failed request never reached splunkd."""
+    return isinstance(error, ConnectionRefusedError) or 'connection refused' in str(error).lower()
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        """Initialize the retry policy.
+
+        Args:
+            max_attempts: Total attempts for retryable calls (1 disables retries)
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Upper bound for any single backoff
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker over consecutive transient failures."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive transient failures that open the circuit
+            recovery_timeout: Seconds to stay open before allowing a probe call
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._last_error: Optional[str] = None
+        self._stats = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    def before_call(self) -> None:
+        """Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            retry_in = self._opened_at + self.recovery_timeout - time.monotonic()
+            if self._state == self.OPEN and retry_in <= 0:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                # Let exactly one probe through
+                self._probe_in_flight = True
+                return
+
+            self._stats['rejected'] += 1
+            raise CircuitOpenError(max(retry_in, 0.0))
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy splunkd."""
+        with self._lock:
+            self._stats['successes'] += 1
+            self._consecutive_failures = 0
+            if self._state != self.CLOSED:
+                logger.info("Splunk circuit breaker closed")
+            self._state = self.CLOSED
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_neutral(self) -> None:
+        """Record a call that says nothing about splunkd's health, releasing a half-open probe."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, error: BaseException) -> None:
+        """Record a transient failure."""
+        with self._lock:
+            self._stats['failures'] += 1
+            self._consecutive_failures += 1
+            self._last_error = str(error)
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._stats['opened'] += 1
+                    logger.warning("Splunk circuit breaker opened",
+                                   consecutive_failures=self._consecutive_failures,
+                                   error=str(error))
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current breaker state."""
+        with self._lock:
+            return self._state
+
+    def get_state(self) -> Dict[str, Any]:
+        """Get breaker state and counters.
+
+        Returns:
+            Dict[str, Any]: State, failure counts and time until the next probe
+        """
+        with self._lock:
+            retry_in = None
+            if self._state == self.OPEN:
+                retry_in = round(max(self._opened_at + self.recovery_timeout - time.monotonic(), 0.0), 1)
+            return {
+                'state': self._state,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'recovery_timeout': self.recovery_timeout,
+                'retry_in_seconds': retry_in,
+                'last_error': self._last_error,
+                **self._stats
+            }
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Check whether an error is a read/socket timeout."""
+    return isinstance(error, TimeoutError) or 'timed out' in str(error).lower()
+
+
+def call_with_retry(func: Callable[[], T], breaker: CircuitBreaker, policy: RetryPolicy,
+                    operation: str, idempotent: bool = True,
+                    timeouts_are_failures: bool = True) -> T:
+    """Call splunkd through the circuit breaker, retrying transient failures.
+
+    Non-idempotent calls are only retried when the request never reached
+    splunkd (connection refused).
+
+    Args:
+        func: Zero-argument callable performing the REST call
+        breaker: Circuit breaker guarding splunkd
+        policy: Retry policy
+        operation: Name used in log messages
+        idempotent: Whether repeating the call is safe
+        timeouts_are_failures: False for calls that block while a search runs
+            (oneshot/export), where a read timeout means a slow search rather
+            than an unhealthy splunkd
+
+    Returns:
+        The callable's result
+
+    Raises:
+        CircuitOpenError: If the breaker rejects the call
+        Exception: The last error from ``func``
+    """
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            if not is_transient(e):
+                # splunkd answered; the request itself was bad
+                breaker.record_success()
+                raise
+            if not timeouts_are_failures and is_timeout(e):
+                breaker.record_neutral()
+                raise
+            breaker.record_failure(e)
+            retryable = idempotent or is_unsent(e)
+            if not retryable or attempt + 1 >= policy.max_attempts or breaker.state == CircuitBreaker.OPEN:
+                raise
+            delay = policy.delay(attempt)
+            logger.warning("Transient Splunk error, retrying", operation=operation,
+                           attempt=attempt + 1, delay=round(delay, 3), error=str(e))
+            time.sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            # Interrupted before an outcome; let the next call probe
+            breaker.record_neutral()
+            raise
+        breaker.record_success()
+        return result
+
+
+# Process-wide breaker: all sessions talk to the same splunkd
+_circuit_breaker: Optional[CircuitBreaker] = None
+_circuit_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get the process-wide circuit breaker."""
+    global _circuit_breaker
+    with _circuit_breaker_lock:
+        if _circuit_breaker is None:
+            config = get_config().splunk
+            _circuit_breaker = CircuitBreaker(failure_threshold=config.breaker_failure_threshold,
+                                              recovery_timeout=config.breaker_recovery_timeout)
+        return _circuit_breaker
+
+
+def create_retry_policy(config: SplunkConfig) -> RetryPolicy:
+    """Create a retry policy from configuration."""
+    return RetryPolicy(max_attempts=config.retry_max_attempts,
+                       base_delay=config.retry_base_delay,
+                       max_delay=config.retry_max_delay)
@@ -0,0 +1,281 @@
+"""Concurrency-aware scheduling of Splunk searches.
+
+splunkd enforces a per-user concurrent search quota (``srchJobsQuota`` on the
+user's roles). When several agents search at once the quota is exceeded and
+jobs fail or queue with opaque errors. ``SearchScheduler`` admits at most
+``max_concurrent`` searches at a time - lowered to the quota detected from
+the REST ``authorization`` endpoints - and queues the rest:
+
+* priority classes: interactive searches are admitted before background
+  (monitor) checks;
+* fair queuing: within a class, waiting MCP sessions are served round-robin
+  so one busy session cannot starve the others;
+* queue-time metrics per class.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Iterator, Callable, Deque
+import structlog
+from ..config import SplunkConfig, get_config
+
+logger = structlog.get_logger(__name__)
+
+# Priority classes, highest first
+PRIORITIES = ('interactive', 'background')
+
+_session_id: ContextVar[Optional[str]] = ContextVar('splunk_search_session_id', default=None)
+
+
+def set_session_id(session_id: Optional[str]) -> None:
+    """Set the session that searches in the current context are queued under."""
+    _session_id.set(session_id)
+
+
+def current_session_id() -> Optional[str]:
+    """Get the session id for the current context.
+
+    Falls back to the MCP request being served, so searches from different
+    MCP sessions are queued separately without tools passing ids around.
+    """
+    session_id = _session_id.get()
+    if session_id is not None:
+        return session_id
+    try:
+        from mcp.server.lowlevel.server import request_ctx
+        return f"mcp-{id(request_ctx.get().session):x}"
+    except (ImportError, LookupError):
+        return None
+
+
+def detect_search_quota(service: Any) -> Optional[int]:
+    """Detect the current user's concurrent search quota.
+
+    Reads the user's roles from ``authentication/current-context`` and their
+    ``srchJobsQuota`` from ``authorization/roles``; splunkd applies the
+    largest quota of the user's roles.
+
+    Args:
+        service: Connected ``splunklib.client.Service``
+
+    Returns:
+        int: Concurrent search quota, or None if no role sets one
+    """
+    response = service.get('authentication/current-context', output_mode='json')
+    content = json.loads(response.body.read())['entry'][0]['content']
+
+    quotas = []
+    for role_name in content.get('roles', []):
+        role = service.roles[role_name]
+        try:
+            quota = int(role.content.get('srchJobsQuota') or 0)
+        except (TypeError, ValueError):
+            continue
+        if quota > 0:
+            quotas.append(quota)
+
+    return max(quotas) if quotas else None
+
+
+class SearchScheduler:
+    """Admission control for concurrent Splunk searches."""
+
+    def __init__(self, max_concurrent: int = 4, detect_quota: bool = True):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrent: Maximum number of searches running at once
+            detect_quota: Lower the limit to the user's search quota on first use
+        """
+        self.configured_limit = max(1, max_concurrent)
+        self.limit = self.configured_limit
+        self.detected_quota: Optional[int] = None
+        self._quota_checked = not detect_quota
+        self._cond = threading.Condition()
+        self._running = 0
+        # priority -> session id -> waiting tickets; session order is the round-robin order
+        self._queues: Dict[str, "OrderedDict[str, Deque[object]]"] = {
+            priority: OrderedDict() for priority in PRIORITIES
+        }
+        self._stats = {
+            priority: {'admitted': 0, 'queued': 0, 'queue_timeouts': 0,
+                       'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+            for priority in PRIORITIES
+        }
+
+    def ensure_quota(self, provider: Callable[[], Optional[int]]) -> None:
+        """Detect the search quota once and cap the limit to it.
+
+        Args:
+            provider: Callable returning the quota (see ``detect_search_quota``)
+        """
+        with self._cond:
+            if self._quota_checked:
+                return
+            self._quota_checked = True
+
+        try:
+            quota = provider()
+        except Exception as e:
+            logger.warning("Could not detect Splunk search quota, using configured limit",
+                           limit=self.configured_limit, error=str(e))
+            return
+
+        with self._cond:
+            self.detected_quota = quota
+            if quota:
+                self.limit = min(self.configured_limit, quota)
+            self._cond.notify_all()
+        logger.info("Detected Splunk search quota", quota=quota, limit=self.limit)
+
+    def acquire(self, priority: str = 'interactive', session_id: Optional[str] = None,
+                timeout: Optional[float] = None) -> float:
+        """Wait for a search slot.
+
+        Args:
+            priority: 'interactive' or 'background'
+            session_id: Queue to wait in (defaults to the current MCP session)
+            timeout: Seconds to wait before giving up (None waits indefinitely)
+
+        Returns:
+            float: Seconds spent queued
+
+        Raises:
+            ValueError: If the priority is unknown
+            TimeoutError: If no slot frees up in time
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown search priority: {priority}")
+        session_id = session_id or current_session_id() or 'default'
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+
+        with self._cond:
+            if self._running < self.limit and not self._has_waiters_locked():
+                self._running += 1
+                self._record_locked(priority, 0.0)
+                return 0.0
+
+            ticket = object()
+            self._queues[priority].setdefault(session_id, deque()).append(ticket)
+            self._stats[priority]['queued'] += 1
+            logger.info("Search queued", priority=priority, session_id=session_id,
+                       running=self._running, limit=self.limit)
+
+            while not (self._running < self.limit and self._next_locked() == (priority, session_id, ticket)):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._remove_locked(priority, session_id, ticket)
+                    self._stats[priority]['queue_timeouts'] += 1
+                    self._cond.notify_all()
+                    raise TimeoutError(f"No search slot became free within {timeout} seconds")
+                self._cond.wait(remaining)
+
+            self._remove_locked(priority, session_id, ticket)
+            # Served sessions go to the back of their class
+            if session_id in self._queues[priority]:
+                self._queues[priority].move_to_end(session_id)
+            self._running += 1
+            waited = time.monotonic() - started
+            self._record_locked(priority, waited)
+            self._cond.notify_all()
+            return waited
+
+    def release(self) -> None:
+        """Return a search slot."""
+        with self._cond:
+            self._running = max(0, self._running - 1)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: str = 'interactive', session_id: Optional[str] = None,
+             timeout: Optional[float] = None) -> Iterator[float]:
+        """Hold a search slot for the duration of a ``with`` block.
+
+        Yields:
+            float: Seconds spent queued
+        """
+        waited = self.acquire(priority, session_id, timeout)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission and queue-time metrics.
+
+        Returns:
+            Dict[str, Any]: Limits, running/queued counts and per-priority queue times
+        """
+        with self._cond:
+            by_priority = {}
+            for priority, stats in self._stats.items():
+                waiting = sum(len(tickets) for tickets in self._queues[priority].values())
+                by_priority[priority] = {
+                    'admitted': stats['admitted'],
+                    'queued': stats['queued'],
+                    'waiting': waiting,
+                    'queue_timeouts': stats['queue_timeouts'],
+                    'avg_wait_seconds': round(stats['wait_seconds'] / stats['admitted'], 3)
+                    if stats['admitted'] else 0.0,
+                    'max_wait_seconds': round(stats['max_wait_seconds'], 3)
+                }
+            return {
+                'limit': self.limit,
+                'configured_limit': self.configured_limit,
+                'detected_quota': self.detected_quota,
+                'running': self._running,
+                'by_priority': by_priority
+            }
+
+    def _has_waiters_locked(self) -> bool:
+        return any(queue for queue in self._queues.values())
+
+    def _next_locked(self):
+        """The ticket to admit next: highest priority, then round-robin by session."""
+        for priority in PRIORITIES:
+            for session_id, tickets in self._queues[priority].items():
+                if tickets:
+                    return priority, session_id, tickets[0]
+        return None
+
+    def _remove_locked(self, priority: str, session_id: str, ticket: object) -> None:
+        tickets = self._queues[priority].get(session_id)
+        if tickets is None:
+            return
+        try:
+            tickets.remove(ticket)
+        except ValueError:
+            pass
+        if not tickets:
+            del self._queues[priority][session_id]
+
+    def _record_locked(self, priority: str, waited: float) -> None:
+        stats = self._stats[priority]
+        stats['admitted'] += 1
+        stats['wait_seconds'] += waited
+        stats['max_wait_seconds'] = max(stats['max_wait_seconds'], waited)
+
+
+# Process-wide scheduler shared by all clients
+_search_scheduler: Optional[SearchScheduler] = None
+_search_scheduler_lock = threading.Lock()
+
+
+def create_search_scheduler(config: SplunkConfig) -> SearchScheduler:
+    """Create a search scheduler from configuration."""
+    return SearchScheduler(max_concurrent=config.max_concurrent_searches,
+                           detect_quota=config.detect_search_quota)
+
+
+def get_search_scheduler() -> SearchScheduler:
+    """Get the process-wide search scheduler."""
+    global _search_scheduler
+    with _search_scheduler_lock:
+        if _search_scheduler is None:
+            _search_scheduler = create_search_scheduler(get_config().splunk)
+        return _search_scheduler
@@ -0,0 +1,162 @@
+"""Time-sliced parallel execution of long-range searches.
+
+A ``-7d`` event search runs as one job that the search head dispatches and
+merges serially. Splitting ``earliest_time..latest_time`` into contiguous
+slices and running them concurrently (each slice still admitted by the
+search scheduler) spreads the work across search slots. Event searches
+return newest events first, so the slices are consumed newest first and the
+older ones are skipped as soon as ``max_results`` is satisfied.
+
+Only streaming searches can be sliced: transforming or ordering commands
+(``stats``, ``sort``, ``head`` ...) give different answers per slice.
+"""
+
+import contextvars
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import structlog
+from .utils import resolve_time
+
+logger = structlog.get_logger(__name__)
+
+# Upper bound on slices per search
+MAX_TIME_SLICES = 32
+
+# Commands that operate on each event independently; anything else in the
+# pipeline makes per-slice results differ from the whole-range result
+STREAMING_COMMANDS = {
+    'search', 'where', 'eval', 'fields', 'rex', 'regex', 'rename', 'table',
+    'spath', 'fillnull', 'lookup', 'extract', 'kv', 'convert', 'makemv',
+    'mvexpand', 'replace', 'iplocation', 'addinfo'
+}
+
+_PIPE_SPLIT = re.compile(r'\|(?=(?:[^"]*"[^"]*")*[^"]*$)')
+
+
+def is_sliceable_query(query: str) -> bool:
+    """Check whether a query gives the same results when run per time slice.
+
+    Args:
+        query: SPL search query
+
+    Returns:
+        bool: True if every command in the pipeline is streaming
+    """
+    stripped = query.strip()
+    if stripped.startswith('|'):
+        # Generating commands (tstats, inputlookup, loadjob ...) pick their own data
+        return False
+    for segment in _PIPE_SPLIT.split(stripped)[1:]:
+        words = segment.split()
+        if not words or words[0].lower() not in STREAMING_COMMANDS:
+            return False
+    return True
+
+
+def plan_time_slices(earliest_time: str, latest_time: str, slices: int,
+                     now: Optional[float] = None) -> Optional[List[Tuple[str, str]]]:
+    """Split a search window into contiguous slices, newest first.
+
+    The outer bounds keep the caller's own time modifiers; inner boundaries
+    are whole epoch seconds.
+
+    Args:
+        earliest_time: Start of the window (Splunk time modifier)
+        latest_time: End of the window
+        slices: Number of slices wanted
+        now: Reference epoch time (defaults to the current time)
+
+    Returns:
+        List[Tuple[str, str]]: (earliest_time, latest_time) per slice, newest
+            first, or None if the window cannot be resolved to epochs
+    """
+    now = time.time() if now is None else now
+    earliest = resolve_time(earliest_time, now)
+    latest = resolve_time(latest_time, now)
+    if earliest is None or latest is None or latest <= earliest:
+        return None
+
+    # Slices shorter than a second would share boundaries
+    slices = max(1, min(slices, MAX_TIME_SLICES, int(latest - earliest)))
+    step = (latest - earliest) / slices
+    boundaries = [earliest_time] + [str(int(earliest + step * i)) for i in range(1, slices)] + [latest_time]
+    windows = [(boundaries[i], boundaries[i + 1]) for i in range(slices)]
+    return list(reversed(windows))
+
+
+def run_sliced_search(run_search: Callable[..., Dict[str, Any]], query: str, slices: int,
+                      max_workers: int, **kwargs) -> Dict[str, Any]:
+    """Run a search as concurrent time slices and merge the results.
+
+    Args:
+        run_search: Callable with the ``run_search(query, **kwargs)`` contract
+        query: SPL search query
+        slices: Number of time slices
+        max_workers: Slices in flight at once (the scheduler still applies)
+        **kwargs: Search parameters; earliest_time/latest_time define the window
+
+    Returns:
+        Dict[str, Any]: 'results' newest first and 'execution' metadata with
+            per-slice timings; searches that cannot be sliced run unchanged
+    """
+    started = time.monotonic()
+    max_results = kwargs.get('max_results', 100)
+    windows = None
+    if slices > 1 and is_sliceable_query(query) and not kwargs.get('offset') and not kwargs.get('retain'):
+        windows = plan_time_slices(kwargs.get('earliest_time', '-24h'), kwargs.get('latest_time', 'now'), slices)
+
+    if not windows or len(windows) == 1:
+        result = run_search(query, **kwargs)
+        result['execution']['sliced'] = False
+        return result
+
+    skipped = set()
+
+    def run_slice(index: int, window: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        if index in skipped:
+            return None
+        return run_search(query, **dict(kwargs, earliest_time=window[0], latest_time=window[1]))
+
+    logger.info("Running time-sliced search", query=query, slices=len(windows))
+    merged: List[Dict[str, Any]] = []
+    per_slice: List[Dict[str, Any]] = []
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(windows))),
+                                  thread_name_prefix="splunk-slice")
+    futures = [executor.submit(contextvars.copy_context().run, run_slice, index, window)
+               for index, window in enumerate(windows)]
+    try:
+        for index, future in enumerate(futures):
+            result = future.result()
+            execution = result['execution']
+            per_slice.append({
+                'earliest_time': windows[index][0],
+                'latest_time': windows[index][1],
+                'result_count': len(result['results']),
+                'strategy': execution.get('strategy'),
+                'elapsed_seconds': execution.get('elapsed_seconds')
+            })
+            merged.extend(result['results'])
+            if len(merged) >= max_results:
+                # Older slices cannot contribute to the newest max_results events
+                break
+    finally:
+        # Queued slices are dropped; ones already running finish in the background
+        skipped.update(range(len(per_slice), len(windows)))
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+    return {
+        'results': merged[:max_results],
+        'execution': {
+            'strategy': 'sliced',
+            'sliced': True,
+            'slices': len(windows),
+            'slices_run': len(per_slice),
+            'slices_skipped': len(windows) - len(per_slice),
+            'per_slice': per_slice,
+            'elapsed_seconds': round(time.monotonic() - started, 3)
+        }
+    }
@@ -1,8 +1,9 @@
 """Splunk utility functions module."""
 
 import re
+import time
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -149,6 +150,82 @@ def parse_time_range(time_str: str) -> Optional[str]:
     return None
 
 
+_RELATIVE_TIME_PATTERN = re.compile(r'^-(\d+)([smhdwMy])(?:@([smhdwMy]))?$')
+_UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'M': 2592000, 'y': 31536000}
+_ABSOLUTE_FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%m/%d/%Y:%H:%M:%S',
+]
+
+
+def _snap_time(moment: datetime, unit: str) -> datetime:
+    """Snap a datetime down to the start of the given time unit."""
+    if unit == 's':
+        return moment.replace(microsecond=0)
+    if unit == 'm':
+        return moment.replace(second=0, microsecond=0)
+    if unit == 'h':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if unit == 'd':
+        return day
+    if unit == 'w':
+        return day - timedelta(days=(day.weekday() + 1) % 7)  # Splunk weeks start on Sunday
+    if unit == 'M':
+        return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+
+def resolve_time(time_str: str, now: Optional[float] = None) -> Optional[float]:
+    """Resolve a Splunk time modifier to epoch seconds.
+    
+    Supports the formats accepted by ``parse_time_range`` except the
+    open-ended ('earliest', 'latest') and real-time ones. Months and years
+    in relative offsets are approximated as 30 and 365 days.
+    
+    Args:
+        time_str: Time string (e.g., '-24h', '-1d@d', 'now', '2023-01-01T12:00:00')
+        now: Reference epoch time (defaults to the current time)
+        
+    Returns:
+        float: Epoch seconds, or None if the time cannot be resolved
+    """
+    if parse_time_range(time_str) is None:
+        return None
+    
+    time_str = time_str.strip()
+    now = time.time() if now is None else now
+    
+    if time_str.lower() == 'now':
+        return now
+    
+    match = _RELATIVE_TIME_PATTERN.match(time_str)
+    if match:
+        amount, unit, snap = match.groups()
+        moment = datetime.fromtimestamp(now - int(amount) * _UNIT_SECONDS[unit])
+        if snap:
+            moment = _snap_time(moment, snap)
+        return moment.timestamp()
+    
+    # A trailing 'Z' marks UTC; other absolute times are local, as Splunk reads them
+    utc = time_str.endswith('Z')
+    for fmt in _ABSOLUTE_FORMATS:
+        try:
+            moment = datetime.strptime(time_str.rstrip('Z'), fmt)
+        except ValueError:
+            continue
+        if utc:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+    
+    try:
+        return float(time_str)
+    except ValueError:
+        return None
+
+
 def format_search_results(results: List[Dict[str, Any]], 
                          max_field_length: int = 100) -> List[Dict[str, Any]]:
     """Format search results for display.
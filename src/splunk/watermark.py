@@ -0,0 +1,188 @@
+"""Index-time watermarks for incremental monitoring.
+
+A monitor that windows its searches on wall-clock ``_time`` misses events
+that are indexed after the window has passed and repeats events on the
+second it re-reads at each boundary. ``IndexTimeWatermark`` windows on
+``_indextime`` instead: each check covers the index times since the previous
+check, re-reading a short overlap for events that became searchable late,
+and filters out events it has already delivered.
+
+Events are identified by ``_bkt`` and ``_cd`` (bucket and offset within the
+bucket), which Splunk returns with raw events. Keys are kept only while
+their ``_indextime`` is inside the overlap, so the dedup set is bounded by
+the events indexed in the overlap. Searches whose results carry no
+``_indextime`` (transforming searches) get back-to-back index-time windows
+without overlap or dedup.
+
+The event-time range of each search is widened by the lateness allowance,
+so an event is found when its ``_time`` trails its indexing by up to that
+many seconds; it only bounds which buckets Splunk scans.
+"""
+
+import hashlib
+import heapq
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from .cache import normalize_query
+
+logger = structlog.get_logger(__name__)
+
+
+class IndexTimeWatermark:
+    """Index-time window and dedup state of one incremental monitor."""
+
+    def __init__(self, lateness: int = 300, overlap: int = 10):
+        """Initialize the watermark.
+
+        Args:
+            lateness: Seconds an event's _time may trail its _indextime
+            overlap: Seconds of index time re-read each check for events
+                that became searchable after the previous check
+        """
+        self.lateness = max(0, lateness)
+        self.overlap = max(0, overlap)
+        # Index time the last delivered check searched up to (exclusive)
+        self.scanned_until: Optional[int] = None
+        self.high_watermark: Optional[int] = None
+        # None until results show whether events carry _indextime
+        self.keyed: Optional[bool] = None
+        self._seen: Dict[Tuple[Any, ...], int] = {}
+        # (indextime, key) in expiry order
+        self._expiry: List[Tuple[int, Tuple[Any, ...]]] = []
+        self._stats = {'checks': 0, 'delivered': 0, 'duplicates': 0, 'late': 0}
+
+    @staticmethod
+    def applies(query: str) -> bool:
+        """Whether index-time modifiers can be added to a query's base search."""
+        return not normalize_query(query).startswith('|')
+
+    def plan(self, query: str, interval: int, now: float) -> Tuple[str, Dict[str, str], int]:
+        """Build the next check's query and time range.
+
+        Args:
+            query: SPL query being monitored
+            interval: Monitoring interval, the index-time span of the first check
+            now: Epoch time of the check
+
+        Returns:
+            Tuple[str, Dict[str, str], int]: Query with index-time modifiers,
+                earliest_time/latest_time parameters, and the check's index_latest
+                to pass back to ``accept``
+        """
+        index_latest = int(now)
+        if self.scanned_until is None:
+            index_earliest = index_latest - interval
+        else:
+            index_earliest = self.scanned_until - (self.overlap if self.keyed is not False else 0)
+        base = normalize_query(query)[len('search '):]
+        windowed = f"search index_earliest={index_earliest} index_latest={index_latest} {base}"
+        time_range = {
+            'earliest_time': str(index_earliest - self.lateness),
+            'latest_time': str(index_latest + self.lateness)
+        }
+        return windowed, time_range, index_latest
+
+    def accept(self, results: List[Dict[str, Any]], index_latest: int) -> List[Dict[str, Any]]:
+        """Drop results already delivered and advance the watermark.
+
+        Args:
+            results: Results of the check planned with ``index_latest``
+            index_latest: Index time the check searched up to
+
+        Returns:
+            List[Dict[str, Any]]: Results not delivered before, in their original order
+        """
+        if results and self.keyed is None:
+            self.keyed = '_indextime' in results[0]
+            if not self.keyed:
+                logger.info("Monitor results carry no _indextime, windows won't overlap")
+
+        previous = self.scanned_until
+        fresh: List[Dict[str, Any]] = []
+        for result in results:
+            indextime = self._indextime(result)
+            if indextime is None:
+                fresh.append(result)
+                continue
+            key = self._key(result, indextime)
+            if key in self._seen:
+                self._stats['duplicates'] += 1
+                continue
+            self._seen[key] = indextime
+            heapq.heappush(self._expiry, (indextime, key))
+            if previous is not None and self._event_time(result) < previous - self.overlap:
+                self._stats['late'] += 1
+            if self.high_watermark is None or indextime > self.high_watermark:
+                self.high_watermark = indextime
+            fresh.append(result)
+
+        self.scanned_until = index_latest
+        # Keys older than the next check's overlap can't be returned again
+        floor = index_latest - self.overlap
+        while self._expiry and self._expiry[0][0] < floor:
+            _, key = heapq.heappop(self._expiry)
+            self._seen.pop(key, None)
+
+        self._stats['checks'] += 1
+        self._stats['delivered'] += len(fresh)
+        return fresh
+
+    def accept_stream(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop repeats from a real-time stream; the watermark follows the newest _indextime.
+        
+        Args:
+            results: Events as they arrive from the stream
+        
+        Returns:
+            List[Dict[str, Any]]: Events not delivered before
+        """
+        newest = max((t for t in map(self._indextime, results) if t is not None), default=None)
+        if newest is None:
+            return results
+        return self.accept(results, max(newest + 1, self.scanned_until or 0))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the watermark, dedup set size and delivery counters."""
+        return {
+            'scanned_until': self.scanned_until,
+            'high_watermark': self.high_watermark,
+            'keyed': self.keyed,
+            'lateness': self.lateness,
+            'overlap': self.overlap,
+            'dedup_keys': len(self._seen),
+            **self._stats
+        }
+
+    # --- internals ---
+
+    @staticmethod
+    def _indextime(result: Dict[str, Any]) -> Optional[int]:
+        try:
+            return int(float(result['_indextime']))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _event_time(result: Dict[str, Any]) -> float:
+        """Epoch _time; REST results give it as ISO 8601 text."""
+        value = result.get('_time')
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except ValueError:
+            return float('inf')
+
+    @staticmethod
+    def _key(result: Dict[str, Any], indextime: int) -> Tuple[Any, ...]:
+        """Event identity: bucket and offset, or a digest of the event when those are missing."""
+        if result.get('_cd') is not None:
+            return (indextime, result.get('_bkt'), result['_cd'])
+        digest = hashlib.sha1(f"{result.get('_time')}\0{result.get('_raw')}\0"
+                              f"{result.get('host')}\0{result.get('source')}".encode('utf-8', 'replace'))
+        return (indextime, digest.hexdigest())
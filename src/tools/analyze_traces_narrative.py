@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
-from string import Template
 from typing import Dict, Any, List
 import structlog
 from mcp.types import Tool, TextContent
+from .encoding import dumps_response
+from .artifacts import ArtifactNotFoundError, get_artifact_store
+from .compaction import compact_traces
+from ..config import get_config
 from .prompt import BasePromptTool
 
 logger = structlog.get_logger(__name__)
@@ -38,6 +39,10 @@ class SplunkLogAnalysisPromptTool(BasePromptTool):
                             "required": ["events"]
                         }
                     },
+                    "artifact_id": {
+                        "type": "string",
+                        "description": "Handle of the traces stored by splunk_trace_search_by_ids (instead of inline traces)."
+                    },
                     "events": {
                         "type": "array",
                         "description": "Fallback: a single trace's events array; will be wrapped into traces[0].",
@@ -60,6 +65,15 @@ class SplunkLogAnalysisPromptTool(BasePromptTool):
                         "type": "string",
                         "default": "normal",
                         "enum": ["brief", "normal", "verbose"]
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "default": True,
+                        "description": "Drop noise fields, collapse repeats and stack traces and hold traces to the token budget."
+                    },
+                    "token_budget": {
+                        "type": "integer",
+                        "description": "Estimated prompt tokens for all traces together (default from MCP_ANALYSIS_TOTAL_TOKEN_BUDGET)."
                     }
                 },
                 "required": []
@@ -67,10 +81,18 @@ class SplunkLogAnalysisPromptTool(BasePromptTool):
         )
 
     async def execute(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        # Load traces passed by handle
+        if not arguments.get("traces") and arguments.get("artifact_id"):
+            try:
+                stored = get_artifact_store().get(arguments["artifact_id"], kind="traces")
+            except ArtifactNotFoundError as e:
+                return [TextContent(type="text", text=f"❌ **Artifact not found**\n\n{e}")]
+            arguments = {**arguments, "traces": stored}
+
         # Normalize inputs into traces = [{id, events}]
         traces = self._coerce_to_traces(arguments)
         if not traces:
-            return [TextContent(type="text", text="❌ Expected traces or events. Provide either `traces` (array of {id, events}) or `events` (single trace).")]
+            return [TextContent(type="text", text="❌ Expected traces or events. Provide either `traces` (array of {id, events}), `artifact_id`, or `events` (single trace).")]
 
         mode = arguments.get("mode", "auto")
         verbosity = arguments.get("verbosity", "normal")
@@ -84,7 +106,7 @@ class SplunkLogAnalysisPromptTool(BasePromptTool):
 
         # Use Template.substitute() with $ placeholders for shared template
         next_tool = "root_cause_identification_prompt"
-        args_json = json.dumps(next_step_args)
+        args_json = dumps_response(next_step_args, tool="analyze_traces_narrative")
         reason = "Confirm service-level root causes based on narrative analysis and prepare for ticket creation"
 
         # Format input data with mode and verbosity
@@ -93,11 +115,16 @@ class SplunkLogAnalysisPromptTool(BasePromptTool):
             "mode": mode,
             "verbosity": verbosity
         }
+        if arguments.get("compact", True):
+            mcp_config = get_config().mcp
+            total_budget = int(arguments.get("token_budget") or mcp_config.analysis_total_token_budget)
+            input_data["traces"], input_data["compaction"] = compact_traces(
+                traces, mcp_config.analysis_trace_token_budget, total_budget
+            )
 
         # Simple template substitution - no string manipulation needed!
-        prompt_template = Template(self._get_prompt())
-        full_prompt = prompt_template.substitute(
-            INPUT_TRACES=json.dumps(input_data, indent=2),
+        full_prompt = self._render_prompt(
+            INPUT_TRACES=dumps_response(input_data, tool="analyze_traces_narrative"),
             nextTool=next_tool,
             argsJson=args_json,
             reason=reason
@@ -144,6 +171,7 @@ async def execute_analyze_traces_narrative(arguments: Dict[str, Any]) -> List[Te
     Expected args:
       {
         "traces": [{ id: string, events: array<object> }],  # preferred
+        "artifact_id": string,                              # handle from splunk_trace_search_by_ids
         "events": array<object>,                            # fallback for single trace
         "id": string,                                       # optional id for single trace
         "kind": string,                                     # if "data", may include traces wrapper
@@ -0,0 +1,130 @@
+"""Server-side artifacts passed between chained tools by handle.
+
+Tools in the debugging chain hand large payloads to the next step (error logs
+to ``group_error_logs``, traces to ``analyze_traces_narrative``). Embedding
+them in the plan makes the model read them and echo them back as arguments.
+Instead a tool deposits the payload in the ``ArtifactStore`` and the plan
+carries a short ``artifact_id``; the next tool accepts either the inline data
+or the handle.
+
+Artifacts live in a byte-bounded LRU with TTL expiry (spilling to disk when
+``MCP_ARTIFACT_DIR`` is set) and are namespaced per MCP session, so one
+session can't read another session's artifacts by guessing ids.
+"""
+
+import hashlib
+import json
+import secrets
+import threading
+from typing import Any, Dict, Optional
+
+import structlog
+
+from ..config import MCPConfig, get_config
+from ..splunk.cache import ByteLRUCache
+from ..splunk.scheduler import current_session_id
+
+logger = structlog.get_logger(__name__)
+
+
+class ArtifactNotFoundError(KeyError):
+    """Artifact unknown, expired, of another kind or owned by another session."""
+
+    def __str__(self) -> str:
+        return str(self.args[0]) if self.args else "Artifact not found"
+
+
+class ArtifactStore:
+    """Tool results stored server-side under short ids, per MCP session."""
+
+    def __init__(self, cache: ByteLRUCache):
+        """Initialize the artifact store.
+
+        Args:
+            cache: Underlying byte cache (bounds size and lifetime)
+        """
+        self.cache = cache
+
+    @staticmethod
+    def _key(artifact_id: str, session_id: Optional[str]) -> str:
+        namespace = session_id or current_session_id() or 'default'
+        digest = hashlib.sha256(f"{namespace}\0{artifact_id}".encode('utf-8')).hexdigest()
+        return digest[:40]
+
+    def put(self, kind: str, data: Any, session_id: Optional[str] = None) -> Optional[str]:
+        """Store a payload.
+
+        Args:
+            kind: What the payload is (e.g. 'error_logs', 'traces'); checked on read
+            data: JSON-serializable payload
+            session_id: Owning session (defaults to the current MCP session)
+
+        Returns:
+            str: Artifact id to pass to the next tool, or None if the payload is
+                larger than the store and has to be passed inline
+        """
+        artifact_id = f"art_{secrets.token_hex(8)}"
+        value = json.dumps({"kind": kind, "data": data}, ensure_ascii=False).encode('utf-8')
+        if len(value) > self.cache.max_bytes:
+            logger.warning("Artifact too large to store", kind=kind, bytes=len(value))
+            return None
+        self.cache.set(self._key(artifact_id, session_id), value)
+        logger.info("Artifact stored", artifact_id=artifact_id, kind=kind, bytes=len(value))
+        return artifact_id
+
+    def get(self, artifact_id: str, kind: Optional[str] = None, session_id: Optional[str] = None) -> Any:
+        """Load a payload.
+
+        Args:
+            artifact_id: Id returned by ``put``
+            kind: Expected kind, if the caller needs a specific one
+            session_id: Owning session (defaults to the current MCP session)
+
+        Returns:
+            Any: The stored payload
+
+        Raises:
+            ArtifactNotFoundError: If the artifact is unknown, expired or of another kind
+        """
+        value = self.cache.get(self._key(artifact_id, session_id)) if artifact_id else None
+        if value is None:
+            raise ArtifactNotFoundError(
+                f"Artifact '{artifact_id}' not found or expired; re-run the step that produced it."
+            )
+
+        entry = json.loads(value)
+        if kind is not None and entry["kind"] != kind:
+            raise ArtifactNotFoundError(
+                f"Artifact '{artifact_id}' holds {entry['kind']}, expected {kind}."
+            )
+        return entry["data"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        return self.cache.get_stats()
+
+
+# Process-wide artifact store shared by all tools
+_artifact_store: Optional[ArtifactStore] = None
+_artifact_store_lock = threading.Lock()
+
+
+def create_artifact_store(config: MCPConfig) -> ArtifactStore:
+    """Create an artifact store from configuration."""
+    byte_cache = ByteLRUCache(
+        max_bytes=config.artifact_max_bytes,
+        ttl=config.artifact_ttl,
+        disk_dir=config.artifact_dir or None,
+        disk_max_bytes=config.artifact_disk_max_bytes,
+        name="artifacts"
+    )
+    return ArtifactStore(byte_cache)
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get the process-wide artifact store."""
+    global _artifact_store
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            _artifact_store = create_artifact_store(get_config().mcp)
+        return _artifact_store
@@ -1,9 +1,9 @@
 """Automated issue creation tool for MCP - creates issues from root cause analysis."""
 
-import json
 from typing import Dict, Any, List
 import structlog
 from mcp.types import Tool, TextContent
+from .encoding import dumps_response
 from .prompt import BasePromptTool
 
 logger = structlog.get_logger(__name__)
@@ -92,10 +92,8 @@ class AutomatedIssueCreationTool(BasePromptTool):
             input_data = arguments
             
             # Get the prompt content and substitute the input data
-            from string import Template
-            prompt_template = Template(self._get_prompt())
-            full_prompt = prompt_template.substitute(
-                INPUT_DATA=json.dumps(input_data, indent=2)
+            full_prompt = self._render_prompt(
+                INPUT_DATA=dumps_response(input_data, tool="automated_issue_creation")
             )
             
             return [TextContent(type="text", text=full_prompt)]
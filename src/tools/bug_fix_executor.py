@@ -7,11 +7,11 @@ import asyncio
 import subprocess
 import shutil
 from pathlib import Path
-from string import Template
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import structlog
 from mcp.types import Tool, TextContent
+from .encoding import dumps_response
 from .prompt import BasePromptTool
 
 logger = structlog.get_logger(__name__)
@@ -27,10 +27,6 @@ class BugFixExecutorTool(BasePromptTool):
                        "Takes test reproduction output and issue reader context to implement fixes.",
             prompt_filename="bug_fix_executor.txt"
         )
-        # Load the plan template for chaining
-        self._plan_tpl_path = Path(__file__).parent.parent / "prompts" / "shared_plan_template.txt"
-        self._plan_tpl = Template(self._plan_tpl_path.read_text(encoding="utf-8"))
-        
         # Initialize components
         self.test_runner = TestRunner()
         self.code_modifier = CodeModifier()
@@ -128,7 +124,7 @@ Please analyze the inputData below and provide bug fixes as specified above."""
             ],
             "autoExecuteHint": False  # Don't auto-execute completion
         }
-        response_json = json.dumps(response_data, indent=2)
+        response_json = dumps_response(response_data, tool="bug_fix_executor")
         
         return [TextContent(type="text", text=response_json)]
     
@@ -314,7 +310,7 @@ Please analyze the inputData below and provide bug fixes as specified above."""
 ## Input Data
 
 ```json
-{json.dumps(context, indent=2, ensure_ascii=False)}
+{dumps_response(context, tool="bug_fix_executor")}
 ```
 
 Please analyze the test failures above and provide bug fixes as specified in the prompt."""
@@ -0,0 +1,245 @@
+"""Token-budgeted compaction of trace payloads for analysis prompts.
+
+``analyze_traces_narrative`` puts every event of every trace into its prompt.
+``compact_traces`` shrinks that payload while keeping what the analysis needs:
+
+1. Splunk bookkeeping fields (``_bkt``, ``punct``, ``date_*``, ...) are dropped.
+2. Fields with the same value in every event of a trace are moved to the
+   trace's ``common`` object.
+3. Repeated events (equal apart from their timestamp) are kept once with a
+   ``repeat`` count and the timestamp of the last repeat.
+4. Stack traces are cut to their first frames.
+5. Each trace is held to a token budget; when over it, events are elided from
+   the middle, keeping errors and the first and last events.
+
+Everything removed is reported under ``compaction`` so the model knows the
+payload is not complete. Tokens are estimated at four characters each, which
+is close enough for budgeting JSON and log text without a tokenizer.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Characters per token used for estimates
+CHARS_PER_TOKEN = 4
+
+# Splunk metadata that never helps the analysis
+NOISE_FIELDS = {
+    "_bkt", "_cd", "_si", "_serial", "_indextime", "_kv", "_eventtype_color", "_sourcetype",
+    "punct", "linecount", "splunk_server", "splunk_server_group", "timestartpos", "timeendpos",
+    "eventtype"
+}
+NOISE_PREFIXES = ("date_", "tag::")
+
+# Fields holding the event time; ignored when comparing events for duplicates
+TIME_FIELDS = ("_time", "timestamp", "time", "ts", "@timestamp", "datetime", "eventTime", "created_at")
+
+# Frames kept of each stack trace
+MAX_STACK_FRAMES = 5
+# Characters kept of any other long string value
+MAX_VALUE_CHARS = 2000
+
+_STACK_FRAME = re.compile(r"^\s+(?:at |File \"|\.\.\. \d+ more|#\d+ )")
+_LEVEL_FIELDS = ("level", "severity", "log_level", "levelname")
+_ERROR_WORDS = re.compile(r"\b(?:ERROR|FATAL|CRITICAL|Exception|Traceback)\b")
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the prompt tokens of a value serialized as JSON."""
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def collapse_stack_trace(text: str, max_frames: int = MAX_STACK_FRAMES) -> Tuple[str, int]:
+    """Keep the first frames of a stack trace.
+
+    Args:
+        text: String value that may hold a multi-line stack trace
+        max_frames: Frames to keep
+
+    Returns:
+        Tuple[str, int]: Collapsed text and the number of frames removed
+    """
+    if "\n" not in text:
+        return text, 0
+
+    kept: List[str] = []
+    frames = elided = 0
+    for line in text.splitlines():
+        if _STACK_FRAME.match(line):
+            frames += 1
+            if frames > max_frames:
+                elided += 1
+                continue
+        kept.append(line)
+    if elided:
+        kept.append(f"    ... {elided} more frames")
+    return "\n".join(kept), elided
+
+
+def _is_noise(field: str) -> bool:
+    return field in NOISE_FIELDS or field.startswith(NOISE_PREFIXES)
+
+
+def _is_error(event: Dict[str, Any]) -> bool:
+    level = next((event[f] for f in _LEVEL_FIELDS if isinstance(event.get(f), str)), None)
+    if level is not None:
+        return level.upper() in ("ERROR", "FATAL", "CRITICAL")
+    return bool(_ERROR_WORDS.search(json.dumps(event, ensure_ascii=False)))
+
+
+def _clean_event(event: Dict[str, Any], report: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop noise fields, unwrap plain-text events and shorten long values."""
+    if event.get("format") == "plain_text" and event.get("raw") == event.get("message"):
+        event = {"message": event.get("message")}
+
+    cleaned: Dict[str, Any] = {}
+    for field, value in event.items():
+        if _is_noise(field):
+            report["noise_fields_dropped"].add(field)
+            continue
+        if isinstance(value, str):
+            value, frames = collapse_stack_trace(value)
+            report["stack_frames_elided"] += frames
+            if len(value) > MAX_VALUE_CHARS:
+                report["values_truncated"] += 1
+                value = value[:MAX_VALUE_CHARS] + f"... [{len(value) - MAX_VALUE_CHARS} chars elided]"
+        cleaned[field] = value
+    return cleaned
+
+
+def _hoist_common(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Remove fields equal in every event and return them."""
+    if len(events) < 2:
+        return {}
+    common = {
+        field: value for field, value in events[0].items()
+        if field not in TIME_FIELDS and all(field in e and e[field] == value for e in events[1:])
+    }
+    for event in events:
+        for field in common:
+            del event[field]
+    return common
+
+
+def _dedupe(events: List[Dict[str, Any]], report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Keep the first of each set of events that differ only in their timestamp."""
+    kept: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        key = json.dumps({k: v for k, v in event.items() if k not in TIME_FIELDS},
+                         sort_keys=True, ensure_ascii=False, default=str)
+        first = kept.get(key)
+        if first is None:
+            kept[key] = event
+            continue
+        first["repeat"] = first.get("repeat", 1) + 1
+        last_time = next((event[f] for f in TIME_FIELDS if f in event), None)
+        if last_time is not None:
+            first["repeat_until"] = last_time
+        report["duplicates_collapsed"] += 1
+    return list(kept.values())
+
+
+def _fit_budget(events: List[Dict[str, Any]], budget: int, report: Dict[str, Any]) -> List[Any]:
+    """Elide events from the middle until the trace fits its budget.
+
+    Error events are kept first, then events alternately from the start and the
+    end of the trace; the elided run is replaced with a marker.
+    """
+    if estimate_tokens(events) <= budget:
+        return events
+
+    order = [i for i, e in enumerate(events) if _is_error(e)]
+    errors = set(order)
+    low, high = 0, len(events) - 1
+    while low <= high:
+        order.extend(i for i in dict.fromkeys((low, high)) if i not in errors)
+        low, high = low + 1, high - 1
+
+    keep, used = set(), 0
+    for i in order:
+        cost = estimate_tokens(events[i]) + 1
+        if used + cost > budget and keep:
+            continue
+        keep.add(i)
+        used += cost
+
+    result: List[Any] = []
+    skipped = 0
+    for i, event in enumerate(events):
+        if i in keep:
+            if skipped:
+                result.append({"elided_events": skipped})
+                skipped = 0
+            result.append(event)
+        else:
+            skipped += 1
+    if skipped:
+        result.append({"elided_events": skipped})
+    report["events_elided"] += len(events) - len(keep)
+    return result
+
+
+def compact_traces(traces: List[Dict[str, Any]], trace_budget: int,
+                   total_budget: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Compact traces for an analysis prompt.
+
+    Args:
+        traces: Traces as ``[{"id": ..., "events": [...]}]``
+        trace_budget: Token budget of each trace
+        total_budget: Token budget of all traces together; each trace gets an
+            equal share if that is lower than ``trace_budget``
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, Any]]: Compacted traces and a
+            report of what was removed
+    """
+    if total_budget and traces:
+        trace_budget = min(trace_budget, total_budget // len(traces))
+
+    compacted: List[Dict[str, Any]] = []
+    totals = {"tokens_before": 0, "tokens_after": 0, "events_before": 0, "events_after": 0}
+    per_trace: List[Dict[str, Any]] = []
+    for trace in traces:
+        events = [e for e in trace.get("events", []) if isinstance(e, dict)]
+        report: Dict[str, Any] = {
+            "noise_fields_dropped": set(), "stack_frames_elided": 0, "values_truncated": 0,
+            "duplicates_collapsed": 0, "events_elided": 0
+        }
+        tokens_before = estimate_tokens(trace.get("events", []))
+
+        cleaned = [_clean_event(e, report) for e in events]
+        common = _hoist_common(cleaned)
+        cleaned = _dedupe(cleaned, report)
+        fitted = _fit_budget(cleaned, max(1, trace_budget - estimate_tokens(common)), report)
+
+        item: Dict[str, Any] = {"id": trace.get("id")}
+        if common:
+            item["common"] = common
+        item["events"] = fitted
+        compacted.append(item)
+
+        tokens_after = estimate_tokens(item)
+        totals["tokens_before"] += tokens_before
+        totals["tokens_after"] += tokens_after
+        totals["events_before"] += len(events)
+        totals["events_after"] += sum(1 for e in fitted if "elided_events" not in e)
+        per_trace.append({
+            "id": trace.get("id"),
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "noise_fields_dropped": sorted(report["noise_fields_dropped"]),
+            "common_fields": sorted(common),
+            "duplicates_collapsed": report["duplicates_collapsed"],
+            "stack_frames_elided": report["stack_frames_elided"],
+            "values_truncated": report["values_truncated"],
+            "events_elided": report["events_elided"]
+        })
+
+    logger.info("Compacted traces for analysis", traces=len(traces), **totals)
+    return compacted, {"trace_token_budget": trace_budget, **totals, "traces": per_trace}
@@ -0,0 +1,142 @@
+"""Server-wide JSON encoding of tool responses.
+
+Tool results and the JSON embedded in prompts go straight into the model's
+context and over SSE, so by default they are encoded without whitespace
+(``compact``); ``pretty`` restores two-space indentation for debugging. orjson
+is used when it is installed, with the standard library as fallback.
+
+Bytes sent are counted per tool. Every ``SAVINGS_SAMPLE_EVERY``-th compact
+response is also encoded pretty, and the ratio between the two is used to
+estimate how many bytes the compact format saved.
+"""
+
+import json
+import threading
+from typing import Any, Dict, Optional
+
+import structlog
+
+from ..config import get_config
+
+try:
+    import orjson
+except ImportError:  # optional fast encoder
+    orjson = None
+
+logger = structlog.get_logger(__name__)
+
+RESPONSE_FORMATS = ("compact", "pretty")
+JSON_ENCODERS = ("auto", "orjson", "json")
+
+# One in this many compact responses per tool is also encoded pretty to estimate savings
+SAVINGS_SAMPLE_EVERY = 10
+
+
+class ResponseEncoder:
+    """JSON encoder for tool responses with per-tool byte counters."""
+
+    def __init__(self, mode: str = "compact", encoder: str = "auto"):
+        """Initialize the encoder.
+
+        Args:
+            mode: 'compact' (no whitespace) or 'pretty' (two-space indent)
+            encoder: 'auto' (orjson if installed), 'orjson' or 'json'
+
+        Raises:
+            ValueError: If mode or encoder is unknown
+        """
+        if mode not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown response format '{mode}', expected one of {RESPONSE_FORMATS}")
+        if encoder not in JSON_ENCODERS:
+            raise ValueError(f"Unknown JSON encoder '{encoder}', expected one of {JSON_ENCODERS}")
+        if encoder == "orjson" and orjson is None:
+            logger.warning("orjson is not installed, using the standard library JSON encoder")
+
+        self.mode = mode
+        self.use_orjson = orjson is not None and encoder != "json"
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def dumps(self, value: Any, tool: Optional[str] = None, mode: Optional[str] = None) -> str:
+        """Encode a value as JSON text.
+
+        Args:
+            value: Value to encode; unknown types are encoded with str()
+            tool: Tool the response belongs to, for the byte counters
+            mode: Override of the server-wide format
+
+        Returns:
+            str: JSON text
+        """
+        mode = mode or self.mode
+        text = self._encode(value, pretty=mode == "pretty")
+        if tool:
+            self._record(tool, value, text, mode)
+        return text
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the format, encoder and per-tool byte counters."""
+        with self._lock:
+            tools = {}
+            for tool, stats in self._stats.items():
+                entry = {"responses": stats["responses"], "bytes": stats["bytes"]}
+                if stats["sampled_pretty_bytes"]:
+                    ratio = stats["sampled_bytes"] / stats["sampled_pretty_bytes"]
+                    entry["estimated_bytes_saved"] = int(stats["compact_bytes"] / ratio - stats["compact_bytes"])
+                tools[tool] = entry
+        return {
+            "format": self.mode,
+            "encoder": "orjson" if self.use_orjson else "json",
+            "tools": tools
+        }
+
+    def _encode(self, value: Any, pretty: bool) -> str:
+        if self.use_orjson:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            try:
+                return orjson.dumps(value, default=str, option=option).decode("utf-8")
+            except TypeError:
+                # e.g. integers beyond 64 bits; the standard library handles them
+                pass
+        if pretty:
+            return json.dumps(value, ensure_ascii=False, indent=2, default=str)
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def _record(self, tool: str, value: Any, text: str, mode: str) -> None:
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            stats = self._stats.setdefault(tool, {
+                "responses": 0, "bytes": 0, "compact_bytes": 0, "sampled_bytes": 0, "sampled_pretty_bytes": 0
+            })
+            stats["responses"] += 1
+            stats["bytes"] += size
+            if mode != "compact":
+                return
+            sample = stats["compact_bytes"] == 0 or stats["responses"] % SAVINGS_SAMPLE_EVERY == 0
+            stats["compact_bytes"] += size
+        if sample:
+            pretty_size = len(self._encode(value, pretty=True).encode("utf-8"))
+            with self._lock:
+                stats["sampled_bytes"] += size
+                stats["sampled_pretty_bytes"] += pretty_size
+
+
+_response_encoder: Optional[ResponseEncoder] = None
+_response_encoder_lock = threading.Lock()
+
+
+def get_response_encoder() -> ResponseEncoder:
+    """Get the process-wide response encoder configured from MCP settings."""
+    global _response_encoder
+    if _response_encoder is None:
+        with _response_encoder_lock:
+            if _response_encoder is None:
+                mcp_config = get_config().mcp
+                _response_encoder = ResponseEncoder(mode=mcp_config.response_format,
+                                                    encoder=mcp_config.json_encoder)
+    return _response_encoder
+
+
+def dumps_response(value: Any, tool: Optional[str] = None) -> str:
+    """Encode a tool response with the process-wide encoder."""
+    return get_response_encoder().dumps(value, tool=tool)
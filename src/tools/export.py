@@ -6,7 +6,9 @@ import json
 import csv
 import io
 from mcp.types import Tool, TextContent
-from ..splunk.client import SplunkClient, SplunkSearchError, SplunkConnectionError
+from ..splunk.client import SplunkSearchError, SplunkConnectionError
+from ..splunk.async_client import AsyncSplunkClient
+from ..splunk.pool import SplunkSessionPool, get_session_pool
 from ..config import get_config
 
 logger = structlog.get_logger(__name__)
@@ -18,14 +20,21 @@ class SplunkExportTool:
     def __init__(self):
         """Initialize the export tool."""
         self.config = get_config()
-        self._client: Optional[SplunkClient] = None
+        self._client: Optional[SplunkSessionPool] = None
+        self._async_client: Optional[AsyncSplunkClient] = None
     
-    def get_client(self) -> SplunkClient:
-        """Get or create Splunk client instance."""
+    def get_client(self) -> SplunkSessionPool:
+        """Get the shared Splunk session pool."""
         if self._client is None:
-            self._client = SplunkClient(self.config.splunk)
+            self._client = get_session_pool()
         return self._client
     
+    def get_async_client(self) -> AsyncSplunkClient:
+        """Get or create the async wrapper around the Splunk client."""
+        if self._async_client is None:
+            self._async_client = AsyncSplunkClient(self.get_client())
+        return self._async_client
+    
     def get_tool_definition(self) -> Tool:
         """Get the MCP tool definition for splunk_export."""
         return Tool(
@@ -74,6 +83,13 @@ class SplunkExportTool:
                         "items": {
                             "type": "string"
                         }
+                    },
+                    "sid": {
+                        "type": "string",
+                        "description": (
+                            "Export from a retained search job (e.g. from splunk_search with retain=true) "
+                            "instead of running the query again; the query is then only used as a label"
+                        )
                     }
                 },
                 "required": ["query"]
@@ -101,6 +117,7 @@ class SplunkExportTool:
             max_results = arguments.get("max_results", 1000)
             timeout = arguments.get("timeout", self.config.mcp.search_timeout)
             fields = arguments.get("fields")
+            sid = arguments.get("sid")
             
             # Validate format
             if export_format not in ["json", "csv", "xml"]:
@@ -114,8 +131,8 @@ class SplunkExportTool:
                        max_results=max_results,
                        fields=fields)
             
-            # Get client and execute search
-            client = self.get_client()
+            # Get client and execute search off the event loop
+            client = self.get_async_client()
             
             search_kwargs = {
                 'earliest_time': earliest_time,
@@ -124,7 +141,11 @@ class SplunkExportTool:
                 'timeout': timeout
             }
             
-            results = client.execute_search(query, **search_kwargs)
+            if sid:
+                # Read the existing artifact rather than dispatching the search again
+                results = await client.read_job(sid, max_results=max_results, fields=fields)
+            else:
+                results = await client.execute_search(query, **search_kwargs)
             
             # Limit results to max_results (Splunk may return more than requested)
             if len(results) > max_results:
@@ -390,13 +411,9 @@ class SplunkExportTool:
     
     def cleanup(self):
         """Clean up resources."""
-        if self._client is not None:
-            try:
-                self._client.disconnect()
-            except Exception as e:
-                logger.warning("Error during client cleanup", error=str(e))
-            finally:
-                self._client = None
+        # The session pool is shared with every other tool; only drop the reference
+        self._client = None
+        self._async_client = None
 
 
 # Global export tool instance
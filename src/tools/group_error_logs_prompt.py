@@ -3,22 +3,39 @@
 from __future__ import annotations
 
 import json
-from pathlib import Path
-from string import Template
+import time
+from collections import Counter
 from typing import Dict, Any, List, Optional
 
 import structlog
 from mcp.types import Tool, TextContent
-from .prompt import BasePromptTool
+from .encoding import dumps_response
+from .artifacts import ArtifactNotFoundError, get_artifact_store
+from .prompt import PLAN_TEMPLATE_FILE, BasePromptTool, get_prompt_registry
+from ..splunk.log_clustering import cluster_logs
 
 logger = structlog.get_logger(__name__)
 
+# 'local' clusters logs server-side and sends cluster summaries; 'model' sends every log
+CLUSTERING_MODES = ("local", "model")
+
+# Prompt used for clustering='local'
+CLUSTERS_PROMPT_FILE = "group_error_clusters_prompt.txt"
+
+# Clusters listed in the prompt; smaller ones are only counted
+MAX_PROMPT_CLUSTERS = 50
+
 
 class GroupErrorLogsTool(BasePromptTool):
     """
     Step 5 in the chain.
-    Input: log objects from Step 4 under arguments["logs"] (array of dict objects).
-    Behavior: prompts the model (via group_error_logs_prompt.txt) to:
+    Input: log objects from Step 4 under arguments["logs"] (array of dict objects),
+      or the `artifact_id` Step 4 stored them under.
+    Behavior (clustering='local', default): mines message templates server-side
+      (src/splunk/log_clustering.py), picks one representative trace ID per cluster and
+      prompts the model (via group_error_clusters_prompt.txt) with cluster summaries only
+      (template, count, exemplars, IDs) to merge look-alike clusters and confirm the IDs.
+    Behavior (clustering='model'): prompts the model (via group_error_logs_prompt.txt) to:
       - semantically group similar error messages by fuzzy matching
       - extract one representative trace ID per group
       - output simple JSON array of trace IDs: ["trace_id_1", "trace_id_2", ...]
@@ -35,9 +52,6 @@ class GroupErrorLogsTool(BasePromptTool):
             ),
             prompt_filename="group_error_logs_prompt.txt",
         )
-        # Shared plan template for chaining
-        self._plan_template_path = Path(__file__).parent.parent / "prompts" / "shared_plan_template.txt"
-        self._plan_template = Template(self._plan_template_path.read_text(encoding="utf-8"))
 
     def get_tool_definition(self) -> Tool:
         return Tool(
@@ -48,19 +62,34 @@ class GroupErrorLogsTool(BasePromptTool):
                 "properties": {
                     "logs": {
                         "type": "array",
-                        "description": "Array of log objects from splunk_error_search.",
+                        "description": "Array of log objects from splunk_error_search (omit when passing artifact_id).",
                         "items": {
                             "type": "object",
                             "additionalProperties": True
                         }
                     },
+                    "artifact_id": {
+                        "type": "string",
+                        "description": "Handle of the error logs stored by splunk_error_search."
+                    },
+                    "indices": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Indices the errors came from; passed on to narrow the trace search."
+                    },
+                    "clustering": {
+                        "type": "string",
+                        "enum": list(CLUSTERING_MODES),
+                        "default": "local",
+                        "description": "'local' clusters logs by message template server-side and sends only cluster summaries; 'model' sends every log for the model to group."
+                    },
                     "max_groups": {
                         "type": "integer",
                         "description": "Soft cap for number of groups to aim for (model-level guidance)",
                         "default": 10
                     }
                 },
-                "required": ["logs"]
+                "required": []
             }
         )
 
@@ -68,35 +97,49 @@ class GroupErrorLogsTool(BasePromptTool):
         # 1) basic input checks
         logs = arguments.get("logs")
         max_groups = arguments.get("max_groups", 10)
+        if logs is None and arguments.get("artifact_id"):
+            try:
+                logs = get_artifact_store().get(arguments["artifact_id"], kind="error_logs")
+            except ArtifactNotFoundError as e:
+                return [TextContent(type="text", text=f"❌ **Artifact not found**\n\n{e}")]
         
         if not isinstance(logs, list):
-            return [TextContent(type="text", text="❌ Expected 'logs' to be an array of log objects.")]
+            return [TextContent(type="text", text="❌ Expected 'logs' to be an array of log objects, or an 'artifact_id'.")]
         
         # Validate that all items are dict objects
         for i, log in enumerate(logs):
             if not isinstance(log, dict):
                 return [TextContent(type="text", text=f"❌ Expected all log entries to be dict objects. Item {i} is {type(log).__name__}.")]
         
+        clustering = arguments.get("clustering", "local")
+        if clustering not in CLUSTERING_MODES:
+            return [TextContent(type="text", text=f"❌ 'clustering' must be one of: {', '.join(CLUSTERING_MODES)}.")]
+
+        indices = arguments.get("indices")
+        if clustering == "local":
+            return [TextContent(type="text", text=self._clustered_prompt(logs, max_groups, indices))]
+
         # Prepare next step args
         next_step_args = {"field_name": "trace_id", "ids": ["<EXTRACTED_IDS>"]}
+        if isinstance(indices, list) and indices:
+            next_step_args["indices"] = indices
         
         # Use Template.substitute() with $ placeholders for shared template
         next_tool = "splunk_trace_search_by_ids"
-        args_json = json.dumps(next_step_args)
+        args_json = dumps_response(next_step_args, tool="group_error_logs")
         reason = "Search for detailed trace events using the extracted trace IDs to build comprehensive timeline"
 
-        # Simple template substitution - no string manipulation needed!
-        prompt_template = Template(self._get_prompt())
-        
         # Generate the workflow template with substituted variables
-        workflow_template = self._plan_template.substitute(
+        prompts = get_prompt_registry()
+        workflow_template = prompts.render(
+            PLAN_TEMPLATE_FILE,
             nextTool=next_tool,
             argsJson=args_json,
             reason=reason
         )
         
-        full_prompt = prompt_template.substitute(
-            INPUT_LOGS=json.dumps(logs, indent=2),
+        full_prompt = self._render_prompt(
+            INPUT_LOGS=dumps_response(logs, tool="group_error_logs"),
             MAX_GROUPS=max_groups,
             WORKFLOW_TEMPLATE=workflow_template
         )
@@ -105,6 +148,52 @@ class GroupErrorLogsTool(BasePromptTool):
         
         return [TextContent(type="text", text=full_prompt)]
 
+    def _clustered_prompt(self, logs: List[Dict[str, Any]], max_groups: int,
+                          indices: Optional[List[str]]) -> str:
+        """Cluster logs server-side and build the prompt from cluster summaries."""
+        started = time.monotonic()
+        raw_logs = [log["_raw"] if isinstance(log.get("_raw"), str) else json.dumps(log, ensure_ascii=False)
+                    for log in logs]
+        clusters = cluster_logs(raw_logs)
+        summaries = [cluster.to_dict() for cluster in clusters]
+        elapsed = time.monotonic() - started
+
+        # Pre-fill the plan with one representative ID for each of the largest clusters
+        chosen = [s for s in summaries if s["representative_id"]][:max(1, int(max_groups))]
+        id_fields = Counter(s["id_field"] for s in chosen)
+        next_step_args: Dict[str, Any] = {
+            "field_name": id_fields.most_common(1)[0][0] if id_fields else "trace_id",
+            "ids": [s["representative_id"] for s in chosen]
+        }
+        if isinstance(indices, list) and indices:
+            next_step_args["indices"] = indices
+
+        listed = summaries[:MAX_PROMPT_CLUSTERS]
+        input_clusters: Dict[str, Any] = {"clusters": listed}
+        if len(summaries) > len(listed):
+            input_clusters["omitted"] = {
+                "clusters": len(summaries) - len(listed),
+                "logs": sum(s["count"] for s in summaries[len(listed):])
+            }
+
+        prompts = get_prompt_registry()
+        workflow_template = prompts.render(
+            PLAN_TEMPLATE_FILE,
+            nextTool="splunk_trace_search_by_ids",
+            argsJson=dumps_response(next_step_args, tool="group_error_logs"),
+            reason="Search for detailed trace events of one representative ID per error cluster"
+        )
+        logger.info("Clustered error logs", log_count=len(logs), clusters=len(clusters),
+                    elapsed_seconds=round(elapsed, 3))
+
+        return prompts.render(
+            CLUSTERS_PROMPT_FILE,
+            LOG_COUNT=len(logs),
+            INPUT_CLUSTERS=dumps_response(input_clusters, tool="group_error_logs"),
+            MAX_GROUPS=max_groups,
+            WORKFLOW_TEMPLATE=workflow_template
+        )
+
 
 
 # Global instance + exports
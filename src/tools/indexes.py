@@ -1,20 +1,17 @@
 """Index management tool implementation for MCP."""
 
 from typing import Dict, Any, List, Optional
-from pathlib import Path
 import structlog
-import json
-from string import Template
 from mcp.types import Tool, TextContent
-from ..splunk.client import SplunkClient, SplunkConnectionError
+from .encoding import dumps_response
+from ..splunk.client import SplunkConnectionError
+from ..splunk.async_client import AsyncSplunkClient
+from ..splunk.pool import SplunkSessionPool, get_session_pool
 from ..config import get_config, Config
+from .prompt import PLAN_TEMPLATE_FILE, get_prompt_registry
 
 logger = structlog.get_logger(__name__)
 
-PLAN_TEMPLATE = Template(
-    (Path(__file__).parent.parent / "prompts" / "shared_plan_template.txt")
-        .read_text(encoding="utf-8")
-)
 
 
 class SplunkIndexesTool:
@@ -29,19 +26,24 @@ class SplunkIndexesTool:
 
     def __init__(self):
         self.config: Optional[Config] = None
-        self._client: Optional[SplunkClient] = None
+        self._client: Optional[SplunkSessionPool] = None
+        self._async_client: Optional[AsyncSplunkClient] = None
 
     def _get_config(self):
         if self.config is None:
             self.config = get_config()
         return self.config
 
-    def get_client(self) -> SplunkClient:
+    def get_client(self) -> SplunkSessionPool:
         if self._client is None:
-            config = self._get_config()
-            self._client = SplunkClient(config.splunk)
+            self._client = get_session_pool()
         return self._client
 
+    def get_async_client(self) -> AsyncSplunkClient:
+        if self._async_client is None:
+            self._async_client = AsyncSplunkClient(self.get_client())
+        return self._async_client
+
     def get_tool_definition(self) -> Tool:
         return Tool(
             name="splunk_indexes",
@@ -92,8 +94,8 @@ class SplunkIndexesTool:
                         sort_by=sort_by,
                         sort_order=sort_order)
 
-            client = self.get_client()
-            indexes = client.get_indexes(filter_pattern=filter_pattern)
+            client = self.get_async_client()
+            indexes = await client.get_indexes(filter_pattern=filter_pattern)
 
             if not include_disabled:
                 indexes = [idx for idx in indexes if not idx.get('disabled', False)]
@@ -104,14 +106,15 @@ class SplunkIndexesTool:
             index_names = [idx.get("name") for idx in indexes if "name" in idx]
 
             # Plan payload to hand over to search tool
-            plan_json = PLAN_TEMPLATE.substitute(
+            plan_json = get_prompt_registry().render(
+                PLAN_TEMPLATE_FILE,
                 nextTool="splunk_error_search",  # Jump directly to search tool
-                argsJson=json.dumps({
+                argsJson=dumps_response({
                     "indices": index_names,  # Pass array of index names
                     "earliest_time": "-24h",
                     "latest_time": "now",
                     "max_results": 500  # Match splunk_error_search default
-                }, ensure_ascii=False),
+                }, tool="splunk_indexes"),
                 reason="Indexes listed — proceed to search for errors across all available indexes."
             )
 
@@ -330,13 +333,9 @@ class SplunkIndexesTool:
         return suggestions
 
     def cleanup(self):
-        if self._client is not None:
-            try:
-                self._client.disconnect()
-            except Exception as e:
-                logger.warning("Error during client cleanup", error=str(e))
-            finally:
-                self._client = None
+        # The session pool is shared with every other tool; only drop the reference
+        self._client = None
+        self._async_client = None
 
 
 _indexes_tool = SplunkIndexesTool()
@@ -7,6 +7,7 @@ from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import structlog
 from mcp.types import Tool, TextContent
+from .encoding import dumps_response
 
 logger = structlog.get_logger(__name__)
 
@@ -826,7 +827,7 @@ For API token: https://id.atlassian.com/manage-profile/security/api-tokens
             # Add JSON data section
             summary_text += f"---\n\n"
             summary_text += f"## 📊 Structured Data (JSON)\n\n"
-            summary_text += f"```json\n{json.dumps(result_data, indent=2)}\n```\n\n"
+            summary_text += f"```json\n{dumps_response(result_data, tool='issue_reader')}\n```\n\n"
             summary_text += f"*Use the JSON data above for programmatic processing of ticket information.*"
             
             return [TextContent(type="text", text=summary_text)]
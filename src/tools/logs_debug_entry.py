@@ -2,14 +2,12 @@
 
 from __future__ import annotations
 
-import json
-from pathlib import Path
-from string import Template
 from typing import Dict, Any, List
 
 import structlog
 from mcp.types import Tool, TextContent
-from .prompt import BasePromptTool
+from .encoding import dumps_response
+from .prompt import PLAN_TEMPLATE_FILE, BasePromptTool, get_prompt_registry
 
 logger = structlog.get_logger(__name__)
 
@@ -46,10 +44,6 @@ class LogsDebugEntryTool(BasePromptTool):
             # No LLM prompt needed; we just render a plan.
             prompt_filename=None,
         )
-        # Use shared plan template (JSON with $nextTool / $argsJson / $reason)
-        self._plan_tpl = Template(
-            (Path(__file__).parent.parent / "prompts" / "shared_plan_template.txt").read_text(encoding="utf-8")
-        )
 
     def get_tool_definition(self) -> Tool:
         # Accept any object; we just pass it along to the next step.
@@ -66,9 +60,10 @@ class LogsDebugEntryTool(BasePromptTool):
         # Pass through whatever we received; no heuristics.
         args_for_next = dict(arguments or {})
 
-        plan_json = self._plan_tpl.substitute(
+        plan_json = get_prompt_registry().render(
+            PLAN_TEMPLATE_FILE,
             nextTool="splunk_indexes",
-            argsJson=json.dumps(args_for_next, ensure_ascii=False),
+            argsJson=dumps_response(args_for_next, tool="logs_debug_entry"),
             reason="Start log debug chain: list available Splunk indexes."
         )
         return [TextContent(type="text", text=plan_json)]
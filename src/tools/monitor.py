@@ -1,43 +1,157 @@
 """Continuous log monitoring tool implementation for MCP.
 
-Note: This implementation supports one monitoring session at a time.
-Multi-session monitoring is planned for future enhancement.
+Any number of monitoring sessions can run at once, keyed by session ID. Their
+checks are driven by the shared ``MonitorScheduler`` and borrow pooled Splunk
+sessions, so a monitor costs neither a thread nor a login of its own. A check
+waits for a background slot in the search scheduler before it borrows a
+session, so interactive searches get both first. A check that isn't admitted
+in time is skipped rather than counted as an error.
+
+Sessions started through the tool subscribe to a ``MonitorFeed``: sessions
+whose queries normalize to the same SPL and whose intervals are within the
+coalescing tolerance share one search per tick, fanned out into each
+session's own buffer.
+
+In 'realtime' mode a session instead keeps one real-time search open
+(``RealtimeStream``) and buffers events as they arrive; its status compares
+the Splunk jobs it dispatched with what polling would have run.
 """
 
-import asyncio
 import threading
-import time
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+from datetime import datetime
 import structlog
 from mcp.types import Tool, TextContent
-from ..splunk.client import SplunkClient, SplunkSearchError, SplunkConnectionError
+from .monitor_scheduler import MonitorScheduler, get_monitor_scheduler
+from ..splunk.buffer import OVERFLOW_POLICIES, ResultRingBuffer
+from ..splunk.cache import normalize_query
+from ..splunk.realtime import QUIET_READ_TIMEOUT, RealtimeStream
+from ..splunk.utils import parse_time_range
+from ..splunk.watermark import IndexTimeWatermark
+from ..splunk.client import (SplunkClient, SplunkSearchError, SplunkSearchQueueTimeoutError,
+                             SplunkConnectionError, search_slot)
+from ..splunk.pool import get_session_pool
+from ..splunk.scheduler import get_search_scheduler
 from ..config import get_config
 import uuid
-import json
 
 logger = structlog.get_logger(__name__)
 
+MONITOR_MODES = ("poll", "realtime")
+
+
+@contextmanager
+def _check_client(timeout: int) -> Iterator[SplunkClient]:
+    """Wait for a background search slot, then borrow a pooled client for one check.
+
+    Raises:
+        SplunkSearchQueueTimeoutError: If no slot frees up within the timeout
+    """
+    with search_slot(get_search_scheduler(), 'background', timeout):
+        with get_session_pool().session() as client:
+            yield client
+
+
+def _search_since(client: SplunkClient, query: str, watermark: Optional[IndexTimeWatermark],
+                  last_check_time: Optional[datetime], interval: int, now: datetime,
+                  max_results: int, timeout: int) -> List[Dict[str, Any]]:
+    """Search the window since the previous check and stamp results with the check time.
+    
+    With a watermark, the window is on _indextime and events delivered by
+    earlier checks are dropped; queries starting with a generating command
+    can't be windowed that way and fall back to wall-clock _time windows.
+    
+    Args:
+        client: Connected Splunk client
+        query: SPL query to run
+        watermark: Index-time watermark of the monitor (None for wall-clock windows)
+        last_check_time: End of the previous check's window (None on the first check)
+        interval: Monitoring interval, the lookback of the first check
+        now: End of this check's window
+        max_results: Maximum results to return
+        timeout: Search timeout in seconds
+        
+    Returns:
+        List[Dict[str, Any]]: Results of the check
+    """
+    index_latest = None
+    if watermark is not None and watermark.applies(query):
+        query, time_range, index_latest = watermark.plan(query, interval, now.timestamp())
+        earliest_time, latest_time = time_range['earliest_time'], time_range['latest_time']
+    elif last_check_time is None:
+        # First check - use the interval as lookback
+        earliest_time = f"-{interval}s"
+        latest_time = now.strftime("%Y-%m-%dT%H:%M:%S")
+    else:
+        # Subsequent checks - from last check time to now
+        earliest_time = last_check_time.strftime("%Y-%m-%dT%H:%M:%S")
+        latest_time = now.strftime("%Y-%m-%dT%H:%M:%S")
+    
+    logger.debug("Performing monitoring check", 
+                earliest_time=earliest_time,
+                latest_time=latest_time,
+                index_latest=index_latest)
+    
+    results = client.execute_search(
+        query,
+        earliest_time=earliest_time,
+        latest_time=latest_time,
+        max_results=max_results,
+        timeout=timeout,
+        # The check already holds a background slot
+        priority=None
+    ) or []
+    if index_latest is not None:
+        results = watermark.accept(results, index_latest)
+    for result in results:
+        result['_monitoring_check_time'] = now.isoformat()
+    return results
+
 
 class MonitoringSession:
-    """Represents the single active monitoring session."""
+    """One monitoring session: a query checked every interval into a result buffer."""
     
-    def __init__(self, query: str, interval: int, **search_params):
+    def __init__(self, query: str, interval: int, results_buffer: Optional[ResultRingBuffer] = None,
+                 session_id: Optional[str] = None, scheduler: Optional[MonitorScheduler] = None,
+                 feeds: Optional["MonitorFeeds"] = None, watermark: Optional[IndexTimeWatermark] = None,
+                 mode: str = "poll", window: Optional[str] = None, backfill_max: int = 300,
+                 **search_params):
         """Initialize monitoring session.
         
         Args:
             query: SPL query to monitor
             interval: Monitoring interval in seconds
+            results_buffer: Bounded buffer for collected results (a default-sized one if None)
+            session_id: Session ID (generated if None)
+            scheduler: Scheduler driving the checks (the process-wide one if None)
+            feeds: Feed registry to share searches through (the session checks on its own if None)
+            watermark: Index-time watermark (default settings if None); a feed's
+                watermark is built from its first subscriber's
+            mode: 'poll' for a search every interval, 'realtime' for one long-lived real-time search
+            window: Real-time window of the first connection, e.g. 'rt-5m' ('rt' if None)
+            backfill_max: Longest gap, in seconds, a real-time search backfills after reconnecting
             **search_params: Additional search parameters
         """
+        self.session_id = session_id or f"mon_{uuid.uuid4().hex[:8]}"
         self.query = query
         self.interval = interval
         self.search_params = search_params
         self.is_active = False
-        self.thread: Optional[threading.Thread] = None
-        self.stop_event = threading.Event()
+        self.scheduler = scheduler
+        self.feeds = feeds
+        self.feed: Optional["MonitorFeed"] = None
+        self.watermark = watermark if watermark is not None else IndexTimeWatermark()
+        self.mode = mode
+        self.window = window
+        self.backfill_max = backfill_max
+        self.stream: Optional[RealtimeStream] = None
+        self.searches = 0
+        self.started_at: Optional[datetime] = None
         self.last_check_time: Optional[datetime] = None
-        self.results_buffer: List[Dict[str, Any]] = []
+        self.results_buffer = results_buffer if results_buffer is not None else ResultRingBuffer()
+        self.paused_checks = 0
+        self.queued_checks = 0
         self.error_count = 0
         self.max_errors = 5
         self.created_at = datetime.now()
@@ -49,10 +163,28 @@ class MonitoringSession:
             return
             
         self.is_active = True
-        self.stop_event.clear()
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
-        logger.info("Monitoring session started")
+        self.started_at = datetime.now()
+        if self.mode == "realtime":
+            self.stream = RealtimeStream(self.query, self._receive_stream, window=self.window,
+                                         backfill_max=self.backfill_max, backfill_overlap=self.watermark.overlap,
+                                         max_failures=self.max_errors, on_stopped=self._stream_stopped,
+                                         read_timeout=max(QUIET_READ_TIMEOUT, 3 * self.interval))
+            self.stream.start()
+            logger.info("Monitoring session started", session_id=self.session_id, mode=self.mode)
+            return
+        
+        if self.feeds is not None:
+            self.scheduler = self.feeds.scheduler
+            self.feed = self.feeds.subscribe(self)
+            logger.info("Monitoring session started", session_id=self.session_id,
+                        feed_id=self.feed.feed_id, subscribers=len(self.feed.subscribers))
+            return
+        
+        if self.scheduler is None:
+            self.scheduler = get_monitor_scheduler()
+        first_delay = self.scheduler.schedule(self.session_id, self.interval, self.run_check)
+        logger.info("Monitoring session started", session_id=self.session_id,
+                    first_check_in=round(first_delay, 1))
         
     def stop(self):
         """Stop the monitoring session."""
@@ -60,12 +192,15 @@ class MonitoringSession:
             return
             
         self.is_active = False
-        self.stop_event.set()
-        
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=5)
+        if self.stream is not None:
+            self.stream.stop()
+        elif self.feed is not None:
+            self.feeds.unsubscribe(self)
+            self.feed = None
+        elif self.scheduler is not None:
+            self.scheduler.unschedule(self.session_id)
             
-        logger.info("Monitoring session stopped")
+        logger.info("Monitoring session stopped", session_id=self.session_id)
         
     def get_status(self) -> Dict[str, Any]:
         """Get current session status.
@@ -73,15 +208,40 @@ class MonitoringSession:
         Returns:
             Dict[str, Any]: Session status information
         """
+        buffer_stats = self.results_buffer.get_stats()
+        feed = self.feed
+        job_key = feed.feed_id if feed is not None else self.session_id
+        next_check_in = self.scheduler.next_due_in(job_key) if self.scheduler and self.is_active else None
+        if self.stream is not None:
+            splunk_jobs = self.stream.get_stats()['connects']
+        else:
+            splunk_jobs = feed.searches if feed is not None else self.searches
+        polling_jobs = 0
+        if self.started_at is not None:
+            polling_jobs = int((datetime.now() - self.started_at).total_seconds() // self.interval)
         return {
+            'session_id': self.session_id,
             'query': self.query,
             'interval': self.interval,
+            'mode': self.mode,
             'is_active': self.is_active,
             'created_at': self.created_at.isoformat(),
             'last_activity': self.last_activity.isoformat(),
             'last_check_time': self.last_check_time.isoformat() if self.last_check_time else None,
+            'next_check_in': round(next_check_in, 1) if next_check_in is not None else None,
             'error_count': self.error_count,
-            'results_in_buffer': len(self.results_buffer)
+            'results_in_buffer': len(self.results_buffer),
+            'dropped': buffer_stats['dropped'] + buffer_stats['rejected'],
+            'spilled': buffer_stats['spilled'],
+            'paused_checks': self.paused_checks,
+            'queued_checks': self.queued_checks,
+            'feed': feed.get_status() if feed is not None else None,
+            'watermark': (feed.watermark if feed is not None else self.watermark).get_stats(),
+            'splunk_jobs': splunk_jobs,
+            # Searches polling every interval would have dispatched since the start
+            'polling_jobs_equivalent': polling_jobs,
+            'realtime': self.stream.get_stats() if self.stream is not None else None,
+            'buffer': buffer_stats
         }
         
     def get_buffered_results(self, clear_buffer: bool = True) -> List[Dict[str, Any]]:
@@ -93,48 +253,80 @@ class MonitoringSession:
         Returns:
             List[Dict[str, Any]]: Buffered results
         """
-        results = self.results_buffer.copy()
         if clear_buffer:
-            self.results_buffer.clear()
-        return results
+            return self.results_buffer.drain()
+        return list(self.results_buffer)
+
+    def read_results(self, cursor: Optional[int] = None, limit: int = 100,
+                     clear_buffer: bool = False) -> Dict[str, Any]:
+        """Page through buffered results from a cursor.
+        
+        Args:
+            cursor: Cursor returned by the previous read (the oldest result if None)
+            limit: Maximum results to return
+            clear_buffer: Whether to discard the results up to the returned cursor
+            
+        Returns:
+            Dict[str, Any]: ``results``, ``next_cursor``, ``missed`` and ``remaining``
+        """
+        page = self.results_buffer.read(cursor=cursor, limit=limit)
+        if clear_buffer:
+            self.results_buffer.trim(page['next_cursor'])
+        return page
         
-    def _monitor_loop(self):
-        """Main monitoring loop running in separate thread."""
-        config = get_config()
-        client = SplunkClient(config.splunk)
+    def run_check(self) -> bool:
+        """Run one scheduled check on a pooled Splunk session.
         
+        Returns:
+            bool: Whether the session should stay scheduled
+        """
+        if not self.is_active:
+            return False
         try:
-            client.connect()
-            logger.info("Connected to Splunk for monitoring")
+            with _check_client(self.timeout) as client:
+                self._perform_check(client)
+            self.error_count = 0  # Reset error count on successful check
             
-            while not self.stop_event.is_set():
-                try:
-                    self._perform_check(client)
-                    self.error_count = 0  # Reset error count on successful check
-                    
-                except Exception as e:
-                    self.error_count += 1
-                    logger.error("Error during monitoring check", 
-                               error=str(e),
-                               error_count=self.error_count)
-                    
-                    if self.error_count >= self.max_errors:
-                        logger.error("Max errors reached, stopping monitoring session")
-                        break
-                
-                # Wait for next interval or stop signal
-                if self.stop_event.wait(timeout=self.interval):
-                    break
-                    
+        except SplunkSearchQueueTimeoutError:
+            # Splunk is busy with other searches; the window stays open for the next check
+            self._count_queued_check()
         except Exception as e:
-            logger.error("Fatal error in monitoring loop", error=str(e))
-        finally:
-            try:
-                client.disconnect()
-            except Exception as e:
-                logger.warning("Error disconnecting client", error=str(e))
+            self.error_count += 1
+            logger.error("Error during monitoring check", 
+                       session_id=self.session_id,
+                       error=str(e),
+                       error_count=self.error_count)
             
-            self.is_active = False
+            if self.error_count >= self.max_errors:
+                logger.error("Max errors reached, stopping monitoring session", session_id=self.session_id)
+                self.is_active = False
+                return False
+        return self.is_active
+            
+    @property
+    def max_results(self) -> int:
+        """Maximum results per check."""
+        return self.search_params.get('max_results', 1000)
+    
+    @property
+    def timeout(self) -> int:
+        """Search timeout per check."""
+        return self.search_params.get('timeout', 60)
+    
+    def _count_queued_check(self):
+        """Count a check skipped because no background search slot freed up in time."""
+        self.queued_checks += 1
+        logger.warning("Monitoring check not admitted in time, skipping", session_id=self.session_id,
+                       queued_checks=self.queued_checks)
+
+    def _skip_if_paused(self) -> bool:
+        """Count a skipped check if a full 'pause' buffer refuses results."""
+        if not self.results_buffer.paused:
+            return False
+        self.paused_checks += 1
+        logger.warning("Monitoring buffer full, skipping check", session_id=self.session_id,
+                       paused_checks=self.paused_checks)
+        return True
             
     def _perform_check(self, client: SplunkClient):
         """Perform a single monitoring check.
@@ -144,40 +336,32 @@ class MonitoringSession:
         """
         now = datetime.now()
         
-        # Determine time range for this check
-        if self.last_check_time is None:
-            # First check - use the interval as lookback
-            earliest_time = f"-{self.interval}s"
-        else:
-            # Subsequent checks - from last check time to now
-            earliest_time = self.last_check_time.strftime("%Y-%m-%dT%H:%M:%S")
-            
-        latest_time = now.strftime("%Y-%m-%dT%H:%M:%S")
-        
-        # Prepare search parameters
-        search_params = {
-            'earliest_time': earliest_time,
-            'latest_time': latest_time,
-            'max_results': self.search_params.get('max_results', 1000),
-            'timeout': self.search_params.get('timeout', 60)
-        }
-        
-        logger.debug("Performing monitoring check", 
-                    earliest_time=earliest_time,
-                    latest_time=latest_time)
+        # A full 'pause' buffer skips checks; the window stays open so the
+        # next check after a read covers it
+        if self._skip_if_paused():
+            return
         
-        # Execute search
-        results = client.execute_search(self.query, **search_params)
+        results = _search_since(client, self.query, self.watermark, self.last_check_time, self.interval, now,
+                                self.max_results, self.timeout)
+        self.searches += 1
+        self._deliver(results, now)
+    
+    def _deliver(self, results: List[Dict[str, Any]], now: datetime):
+        """Add one check's results to the buffer.
         
+        Args:
+            results: Results of the check
+            now: End of the check's window
+        """
         if results:
-            # Add metadata to results
-            for result in results:
-                result['_monitoring_check_time'] = now.isoformat()
-                
-            # Add to buffer
-            self.results_buffer.extend(results)
+            # Add to buffer; the next check searches on from this window, so a
+            # 'pause' buffer takes the check's results whole rather than in part
+            accepted = self.results_buffer.extend(results, whole_batch=True)
+            if accepted < len(results):
+                logger.warning("Monitoring buffer full, results dropped", dropped=len(results) - accepted)
             
             logger.info("Monitoring check completed", 
+                       session_id=self.session_id,
                        new_results=len(results),
                        total_buffered=len(self.results_buffer))
         else:
@@ -185,16 +369,242 @@ class MonitoringSession:
             
         self.last_check_time = now
         self.last_activity = now
+    
+    def _receive_stream(self, results: List[Dict[str, Any]]):
+        """Buffer events from the real-time stream, dropping ones already delivered.
+        
+        Args:
+            results: Events as they arrive
+        """
+        results = self.watermark.accept_stream(results)
+        if not results:
+            return
+        now = datetime.now()
+        for result in results:
+            result['_monitoring_check_time'] = now.isoformat()
+        accepted = self.results_buffer.extend(results)
+        if accepted < len(results):
+            logger.debug("Monitoring buffer full, streamed results dropped", session_id=self.session_id,
+                         dropped=len(results) - accepted)
+        self.last_check_time = now
+        self.last_activity = now
+        self.error_count = 0
+    
+    def _stream_stopped(self, error: str):
+        """Deactivate the session when its real-time search gives up reconnecting."""
+        self.error_count = self.max_errors
+        self.is_active = False
+        logger.error("Real-time monitoring stopped", session_id=self.session_id, error=error)
+
+
+class MonitorFeed:
+    """One scheduled search shared by sessions with equivalent queries."""
+    
+    def __init__(self, feed_id: str, key: str, query: str, interval: int, feeds: "MonitorFeeds",
+                 watermark: Optional[IndexTimeWatermark] = None):
+        """Initialize the feed.
+        
+        Args:
+            feed_id: Feed ID, also its scheduler job key
+            key: Normalized query shared by the subscribers
+            query: Query as given by the first subscriber
+            interval: Seconds between searches
+            feeds: Registry the feed belongs to
+            watermark: Index-time watermark of the shared search (default settings if None)
+        """
+        self.feed_id = feed_id
+        self.key = key
+        self.query = query
+        self.interval = interval
+        self.feeds = feeds
+        self.subscribers: Dict[str, MonitoringSession] = {}
+        self.last_check_time: Optional[datetime] = None
+        self.watermark = watermark if watermark is not None else IndexTimeWatermark()
+        self.searches = 0
+        self.deliveries = 0
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get the feed's query, interval and subscriber count."""
+        return {
+            'feed_id': self.feed_id,
+            'query': self.query,
+            'interval': self.interval,
+            'subscribers': len(self.subscribers),
+            'searches': self.searches,
+            'searches_saved': self.deliveries - self.searches,
+            'watermark': self.watermark.get_stats()
+        }
+    
+    def run_check(self) -> bool:
+        """Run one scheduled search on a pooled Splunk session for every subscriber.
+        
+        Returns:
+            bool: Whether the feed still has subscribers
+        """
+        subscribers = [session for session in list(self.subscribers.values()) if session.is_active]
+        if not subscribers:
+            return False
+        try:
+            timeout = max(session.timeout for session in subscribers)
+            with _check_client(timeout) as client:
+                self._perform_check(client, subscribers)
+            for session in subscribers:
+                session.error_count = 0
+        
+        except SplunkSearchQueueTimeoutError:
+            # Splunk is busy with other searches; the window stays open for the next check
+            for session in subscribers:
+                session._count_queued_check()
+        except Exception as e:
+            logger.error("Error during monitoring check", 
+                       feed_id=self.feed_id,
+                       error=str(e),
+                       subscribers=len(subscribers))
+            for session in subscribers:
+                session.error_count += 1
+                if session.error_count >= session.max_errors:
+                    logger.error("Max errors reached, stopping monitoring session", session_id=session.session_id)
+                    session.stop()
+        return bool(self.subscribers)
+    
+    def _perform_check(self, client: SplunkClient, subscribers: List[MonitoringSession]):
+        """Search once and fan the results out to the subscribers' buffers.
+        
+        Args:
+            client: Connected Splunk client
+            subscribers: Active subscribers
+        """
+        now = datetime.now()
+        
+        # Subscribers with a full 'pause' buffer miss this tick; when all of
+        # them are full the search is skipped and the window stays open
+        ready = [session for session in subscribers if not session._skip_if_paused()]
+        if not ready:
+            return
+        
+        results = _search_since(client, self.query, self.watermark, self.last_check_time, self.interval, now,
+                                max(session.max_results for session in ready),
+                                max(session.timeout for session in ready))
+        self.searches += 1
+        self.deliveries += len(ready)
+        for session in ready:
+            session._deliver(results[:session.max_results], now)
+        self.last_check_time = now
+
+
+class MonitorFeeds:
+    """Registry that coalesces equivalent monitoring sessions onto shared feeds.
+    
+    A session joins an existing feed when its query normalizes to the feed's
+    and its interval is within ``tolerance`` (a fraction) of the feed's; the
+    feed keeps the interval of the session that created it.
+    """
+    
+    def __init__(self, tolerance: float = 0.25, scheduler: Optional[MonitorScheduler] = None):
+        """Initialize the registry.
+        
+        Args:
+            tolerance: Relative interval difference still served by one feed
+            scheduler: Scheduler driving the feeds (the process-wide one if None)
+        """
+        self.tolerance = max(0.0, tolerance)
+        self._scheduler = scheduler
+        self._feeds: Dict[str, MonitorFeed] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def scheduler(self) -> MonitorScheduler:
+        """Scheduler driving the feeds."""
+        return self._scheduler if self._scheduler is not None else get_monitor_scheduler()
+    
+    def subscribe(self, session: MonitoringSession) -> MonitorFeed:
+        """Attach a session to a compatible feed, starting one if there is none.
+        
+        Args:
+            session: Session to attach
+            
+        Returns:
+            MonitorFeed: Feed now serving the session
+        """
+        key = normalize_query(session.query)
+        with self._lock:
+            for feed in self._feeds.values():
+                if feed.key == key and abs(session.interval - feed.interval) <= self.tolerance * feed.interval:
+                    feed.subscribers[session.session_id] = session
+                    logger.info("Coalesced monitoring session onto shared feed", session_id=session.session_id,
+                                feed_id=feed.feed_id, subscribers=len(feed.subscribers))
+                    return feed
+            feed = MonitorFeed(f"feed_{uuid.uuid4().hex[:8]}", key, session.query, session.interval, self,
+                               watermark=IndexTimeWatermark(session.watermark.lateness, session.watermark.overlap))
+            feed.subscribers[session.session_id] = session
+            self._feeds[feed.feed_id] = feed
+        self.scheduler.schedule(feed.feed_id, feed.interval, feed.run_check)
+        return feed
+    
+    def unsubscribe(self, session: MonitoringSession) -> None:
+        """Detach a session; a feed left without subscribers is unscheduled.
+        
+        Args:
+            session: Session to detach
+        """
+        feed = session.feed
+        if feed is None:
+            return
+        with self._lock:
+            feed.subscribers.pop(session.session_id, None)
+            empty = not feed.subscribers and self._feeds.pop(feed.feed_id, None) is not None
+        if empty:
+            self.scheduler.unschedule(feed.feed_id)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get feed and subscriber counts and the searches coalescing saved."""
+        with self._lock:
+            feeds = [feed.get_status() for feed in self._feeds.values()]
+        return {
+            'tolerance': self.tolerance,
+            'feeds': len(feeds),
+            'subscribers': sum(feed['subscribers'] for feed in feeds),
+            'searches': sum(feed['searches'] for feed in feeds),
+            'searches_saved': sum(feed['searches_saved'] for feed in feeds),
+            'shared_feeds': [feed for feed in feeds if feed['subscribers'] > 1]
+        }
 
 
 class SplunkMonitorTool:
-    """MCP tool for continuous Splunk log monitoring (single session)."""
+    """MCP tool for continuous Splunk log monitoring (registry of sessions by ID)."""
     
     def __init__(self):
         """Initialize the monitoring tool."""
         self.config = get_config()
-        self.current_session: Optional[MonitoringSession] = None
-        self._lock = threading.Lock()
+        self.sessions: Dict[str, MonitoringSession] = {}
+        self.feeds = MonitorFeeds(tolerance=self.config.mcp.monitor_coalesce_tolerance)
+        # Session used by actions that don't name one: the most recently started
+        self._current_id: Optional[str] = None
+        self._lock = threading.RLock()
+    
+    @property
+    def current_session(self) -> Optional[MonitoringSession]:
+        """The most recently started session, used when no session_id is given."""
+        return self.sessions.get(self._current_id) if self._current_id else None
+    
+    def _remove_session_locked(self, session_id: str) -> None:
+        """Stop a session and discard it with its buffered results; caller holds the lock."""
+        session = self.sessions.pop(session_id)
+        session.stop()
+        # Removed sessions can't be read again; delete spilled segments too
+        session.results_buffer.close()
+        if session_id == self._current_id:
+            self._current_id = None
+    
+    def _find_session(self, arguments: Dict[str, Any]) -> Optional[MonitoringSession]:
+        """The session named by session_id, or the current one."""
+        session_id = arguments.get("session_id")
+        if not session_id:
+            return self.current_session
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"Monitoring session not found: {session_id}")
+        return session
         
     def get_tool_definition(self) -> Tool:
         """Get the MCP tool definition for splunk_monitor."""
@@ -202,8 +612,8 @@ class SplunkMonitorTool:
             name="splunk_monitor",
             description=(
                 "Set up continuous monitoring (for ongoing surveillance of specific queries). "
-                "Creates a background monitoring session that collects logs at regular intervals. "
-                "Only one monitoring session can be active at a time."
+                "Creates background monitoring sessions that collect logs at regular intervals. "
+                "Several sessions can run at once; each is addressed by its session_id."
             ),
             inputSchema={
                 "type": "object",
@@ -213,6 +623,11 @@ class SplunkMonitorTool:
                         "enum": ["start", "stop", "status", "get_results"],
                         "description": "Action to perform: start monitoring, stop monitoring, get status, or retrieve results"
                     },
+                    "session_id": {
+                        "type": "string",
+                        "description": "Monitoring session to act on (returned by 'start'). Defaults to the most recently "
+                                       "started session; 'start' with an existing ID replaces that session"
+                    },
                     "query": {
                         "type": "string",
                         "description": "SPL search query to monitor (required for 'start' action)"
@@ -242,6 +657,38 @@ class SplunkMonitorTool:
                         "type": "boolean",
                         "description": "Whether to clear results buffer after retrieving (for get_results action)",
                         "default": True
+                    },
+                    "overflow": {
+                        "type": "string",
+                        "enum": list(OVERFLOW_POLICIES),
+                        "description": "What to do when the results buffer is full (for 'start'): drop the oldest "
+                                       "results, spill them to disk, or pause checks until results are read "
+                                       "(default from MCP_MONITOR_OVERFLOW)"
+                    },
+                    "cursor": {
+                        "type": "integer",
+                        "description": "Page through results from this cursor (for get_results; 0 starts at the oldest). "
+                                       "Each page returns the next cursor; clear_buffer discards what was read",
+                        "minimum": 0
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Results per page when paging with cursor",
+                        "default": 100,
+                        "minimum": 1,
+                        "maximum": 1000
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": list(MONITOR_MODES),
+                        "description": "How to collect (for 'start'): 'poll' runs a search every interval, "
+                                       "'realtime' keeps one real-time search open and buffers events as they "
+                                       "arrive, reconnecting if it drops (default from MCP_MONITOR_MODE)"
+                    },
+                    "window": {
+                        "type": "string",
+                        "description": "Real-time window to backfill when a 'realtime' session starts, "
+                                       "e.g. 'rt-5m' (default 'rt': only new events)"
                     }
                 },
                 "required": ["action"]
@@ -265,9 +712,9 @@ class SplunkMonitorTool:
             if action == "start":
                 return await self._start_monitoring(arguments)
             elif action == "stop":
-                return await self._stop_monitoring()
+                return await self._stop_monitoring(arguments)
             elif action == "status":
-                return await self._get_status()
+                return await self._get_status(arguments)
             elif action == "get_results":
                 return await self._get_results(arguments)
             else:
@@ -298,59 +745,114 @@ class SplunkMonitorTool:
         interval = arguments.get("interval", 60)
         max_results = arguments.get("max_results", 1000)
         timeout = arguments.get("timeout", 60)
+        mcp_config = self.config.mcp
+        overflow = arguments.get("overflow") or mcp_config.monitor_overflow
+        mode = arguments.get("mode") or mcp_config.monitor_mode
+        window = arguments.get("window")
         
         # Validate parameters
         if interval < 10 or interval > 3600:
             raise ValueError("Interval must be between 10 and 3600 seconds")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Overflow must be one of: {', '.join(OVERFLOW_POLICIES)}")
+        if mode not in MONITOR_MODES:
+            raise ValueError(f"Mode must be one of: {', '.join(MONITOR_MODES)}")
+        if mode == "realtime" and not IndexTimeWatermark.applies(query):
+            raise ValueError("Real-time monitoring needs an event search, not one starting with a generating command")
+        if window and (mode != "realtime" or not (parse_time_range(window) or "").lower().startswith("rt")):
+            raise ValueError("Window must be a real-time window such as 'rt-5m', for mode 'realtime'")
         
+        results_buffer = ResultRingBuffer(
+            max_items=mcp_config.monitor_buffer_max_results,
+            max_bytes=mcp_config.monitor_buffer_max_bytes,
+            overflow=overflow,
+            spill_dir=mcp_config.monitor_spill_dir or None,
+            spill_max_bytes=mcp_config.monitor_spill_max_bytes
+        )
+        
+        session_id = arguments.get("session_id")
         with self._lock:
-            # Stop existing session if any
-            if self.current_session and self.current_session.is_active:
-                self.current_session.stop()
+            # Starting with an existing session ID replaces that session
+            existing = self.sessions.get(session_id) if session_id else None
+            if existing is not None:
+                existing.stop()
+                existing.results_buffer.close()
+            else:
+                active = sum(1 for session in self.sessions.values() if session.is_active)
+                if active >= mcp_config.monitor_max_sessions:
+                    raise ValueError(f"Too many monitoring sessions ({active} active); "
+                                     f"stop one before starting another")
+                # Sessions stopped by errors stay readable until their slot is needed
+                inactive = [key for key, session in self.sessions.items() if not session.is_active]
+                while inactive and len(self.sessions) >= mcp_config.monitor_max_sessions:
+                    self._remove_session_locked(inactive.pop(0))
             
             # Create and start new monitoring session
-            self.current_session = MonitoringSession(
+            session = MonitoringSession(
                 query=query,
                 interval=interval,
+                results_buffer=results_buffer,
+                session_id=session_id,
+                feeds=self.feeds if mcp_config.monitor_coalesce and mode == "poll" else None,
+                watermark=IndexTimeWatermark(lateness=mcp_config.monitor_lateness,
+                                             overlap=mcp_config.monitor_index_overlap),
+                mode=mode,
+                window=window,
+                backfill_max=mcp_config.monitor_realtime_backfill,
                 max_results=max_results,
                 timeout=timeout
             )
-            
-            self.current_session.start()
+            self.sessions[session.session_id] = session
+            self._current_id = session.session_id
+            session.start()
         
         logger.info("Started monitoring session", 
+                   session_id=session.session_id,
                    query=query, 
-                   interval=interval)
+                   interval=interval,
+                   mode=mode)
+        
+        if mode == "realtime":
+            collection = (f"**Mode:** realtime (one long-lived search"
+                          f"{f', backfilling {window}' if window else ''}; reconnects automatically)\n")
+        else:
+            collection = f"**Interval:** {interval} seconds\n"
         
         return [TextContent(
             type="text",
             text=f"✅ **Monitoring Session Started**\n\n"
+                 f"**Session ID:** `{session.session_id}`\n"
                  f"**Query:** `{query}`\n"
-                 f"**Interval:** {interval} seconds\n"
+                 f"{collection}"
                  f"**Max Results per Check:** {max_results}\n"
-                 f"**Timeout:** {timeout} seconds\n\n"
+                 f"**Timeout:** {timeout} seconds\n"
+                 f"**Buffer:** {results_buffer.max_items} results, overflow: {overflow}\n\n"
                  f"The monitoring session is now running in the background. "
                  f"Use the available actions to check status, retrieve results, or stop monitoring.\n\n"
                  f"**Next Steps:**\n"
-                 f"- Check status: `action: status`\n"
-                 f"- Get results: `action: get_results`\n"
-                 f"- Stop monitoring: `action: stop`"
+                 f"- Check status: `action: status, session_id: {session.session_id}`\n"
+                 f"- Get results: `action: get_results, session_id: {session.session_id}`\n"
+                 f"- Stop monitoring: `action: stop, session_id: {session.session_id}`"
         )]
     
-    async def _stop_monitoring(self) -> List[TextContent]:
-        """Stop the current monitoring session.
+    async def _stop_monitoring(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Stop a monitoring session.
         
+        Args:
+            arguments: Tool arguments
+            
         Returns:
             List[TextContent]: Stop monitoring results
         """
         with self._lock:
-            if not self.current_session:
+            session = self._find_session(arguments)
+            if not session:
                 raise ValueError("No active monitoring session found")
             
-            self.current_session.stop()
-            self.current_session = None
+            session_id = next(key for key, value in self.sessions.items() if value is session)
+            self._remove_session_locked(session_id)
         
-        logger.info("Stopped monitoring session")
+        logger.info("Stopped monitoring session", session_id=session_id)
         
         return [TextContent(
             type="text",
@@ -359,14 +861,21 @@ class SplunkMonitorTool:
                  f"Any buffered results have been discarded."
         )]
     
-    async def _get_status(self) -> List[TextContent]:
-        """Get status of the current monitoring session.
+    async def _get_status(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Get status of a monitoring session, or of all sessions when several run.
         
+        Args:
+            arguments: Tool arguments
+            
         Returns:
             List[TextContent]: Session status
         """
         with self._lock:
-            if not self.current_session:
+            if not arguments.get("session_id") and len(self.sessions) > 1:
+                return [TextContent(type="text", text=self._format_session_list())]
+            
+            session = self._find_session(arguments)
+            if not session:
                 return [TextContent(
                     type="text",
                     text="📭 **No Active Monitoring Session**\n\n"
@@ -374,27 +883,96 @@ class SplunkMonitorTool:
                          "Use `action: start` to create a new monitoring session."
                 )]
             
-            status = self.current_session.get_status()
+            status = session.get_status()
         
         # Format status information
         status_text = f"📊 **Monitoring Session Status**\n\n"
+        if status.get('session_id'):
+            status_text += f"**Session ID:** `{status['session_id']}`\n"
         status_text += f"**Query:** `{status['query']}`\n"
         status_text += f"**Interval:** {status['interval']} seconds\n"
+        if status.get('mode'):
+            status_text += f"**Mode:** {status['mode']}\n"
         status_text += f"**Status:** {'🟢 Active' if status['is_active'] else '🔴 Inactive'}\n"
         status_text += f"**Created:** {status['created_at']}\n"
         status_text += f"**Last Activity:** {status['last_activity']}\n"
         
         if status['last_check_time']:
             status_text += f"**Last Check:** {status['last_check_time']}\n"
+        if status.get('next_check_in') is not None:
+            status_text += f"**Next Check In:** {status['next_check_in']} seconds\n"
+        if status.get('feed'):
+            feed = status['feed']
+            status_text += (f"**Shared Search:** `{feed['feed_id']}` every {feed['interval']} seconds, "
+                            f"{feed['subscribers']} subscriber(s)\n")
         
         status_text += f"**Error Count:** {status['error_count']}\n"
-        status_text += f"**Buffered Results:** {status['results_in_buffer']}\n\n"
+        status_text += f"**Buffered Results:** {status['results_in_buffer']}\n"
+        if status.get('buffer'):
+            status_text += f"**Dropped:** {status['dropped']} | **Spilled:** {status['spilled']}"
+            status_text += f" | **Overflow:** {status['buffer']['overflow']}\n"
+            if status['buffer']['paused']:
+                status_text += f"⏸️ **Paused:** buffer full, {status['paused_checks']} checks skipped\n"
+        if status.get('queued_checks'):
+            status_text += f"🚦 **Queued:** {status['queued_checks']} checks skipped waiting for a search slot\n"
+        if status.get('realtime'):
+            realtime = status['realtime']
+            status_text += (f"**Real-Time Search:** {'🟢 connected' if realtime['connected'] else '🟡 reconnecting'} | "
+                            f"**Events:** {realtime['events']} | **Reconnects:** {realtime['reconnects']}\n")
+            if realtime['last_error']:
+                status_text += f"**Last Error:** {realtime['last_error']}\n"
+        if status.get('splunk_jobs') is not None:
+            status_text += (f"**Splunk Jobs:** {status['splunk_jobs']} "
+                            f"(polling every {status['interval']} seconds: ~{status['polling_jobs_equivalent']})\n")
+        watermark = status.get('watermark')
+        if watermark and watermark['scanned_until'] is not None:
+            status_text += (f"**Index-Time Watermark:** {watermark['scanned_until']} | "
+                            f"**Duplicates Dropped:** {watermark['duplicates']} | "
+                            f"**Late Events Caught:** {watermark['late']}\n")
+        status_text += "\n"
         
         if status['results_in_buffer'] > 0:
             status_text += f"💡 **Tip:** Use `action: get_results` to retrieve buffered results."
         
         return [TextContent(type="text", text=status_text)]
     
+    def get_job_stats(self) -> Dict[str, Any]:
+        """Splunk jobs dispatched by monitoring sessions, by mode, and what polling would have run."""
+        with self._lock:
+            sessions = list(self.sessions.values())
+        jobs = {'poll': 0, 'realtime': 0, 'polling_equivalent': 0}
+        counted_feeds = set()
+        for session in sessions:
+            status = session.get_status()
+            jobs['polling_equivalent'] += status['polling_jobs_equivalent']
+            if session.feed is not None:
+                # Subscribers of a shared search report its jobs once
+                if session.feed.feed_id in counted_feeds:
+                    continue
+                counted_feeds.add(session.feed.feed_id)
+            jobs['realtime' if status['mode'] == "realtime" else 'poll'] += status['splunk_jobs']
+        return jobs
+    
+    def _format_session_list(self) -> str:
+        """Summary table of every monitoring session."""
+        text = f"📊 **Monitoring Sessions ({len(self.sessions)})**\n\n"
+        text += "| Session ID | Query | Interval | Status | Buffered | Dropped | Next Check | Shared Search |\n"
+        text += "|---|---|---|---|---|---|---|---|\n"
+        for session_id, session in self.sessions.items():
+            status = session.get_status()
+            next_check = f"{status['next_check_in']}s" if status.get('next_check_in') is not None else "-"
+            feed = status.get('feed')
+            shared = f"`{feed['feed_id']}` ({feed['subscribers']} subscribers)" if feed else "-"
+            text += (f"| `{session_id}` | `{status['query']}` | {status['interval']}s | "
+                     f"{'🟢 Active' if status['is_active'] else '🔴 Inactive'} | {status['results_in_buffer']} | "
+                     f"{status.get('dropped', 0)} | {next_check} | {shared} |\n")
+        feeds = self.feeds.get_stats()
+        if feeds['subscribers'] > feeds['feeds']:
+            text += (f"\n🔗 **Coalesced:** {feeds['subscribers']} sessions share {feeds['feeds']} searches "
+                     f"({feeds['searches_saved']} searches saved so far)\n")
+        text += "\n💡 **Tip:** Pass `session_id` to get one session's status or results."
+        return text
+    
     async def _get_results(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Get results from the current monitoring session.
         
@@ -405,25 +983,39 @@ class SplunkMonitorTool:
             List[TextContent]: Monitoring results
         """
         clear_buffer = arguments.get("clear_buffer", True)
+        cursor = arguments.get("cursor")
+        page = None
         
         with self._lock:
-            if not self.current_session:
+            session = self._find_session(arguments)
+            if not session:
                 raise ValueError("No active monitoring session found")
             
-            results = self.current_session.get_buffered_results(clear_buffer=clear_buffer)
+            if cursor is not None:
+                page = session.read_results(cursor=int(cursor), limit=int(arguments.get("limit", 100)),
+                                                         clear_buffer=clear_buffer)
+                results = page['results']
+            else:
+                results = session.get_buffered_results(clear_buffer=clear_buffer)
         
         if not results:
+            cursor_hint = f"\n\n**Next Cursor:** {page['next_cursor']}" if page is not None else ""
             return [TextContent(
                 type="text",
                 text=f"📭 **No Results Available**\n\n"
                      f"No new results have been collected since the last retrieval. "
-                     f"The monitoring session is still active and will continue collecting data."
+                     f"The monitoring session is still active and will continue collecting data.{cursor_hint}"
             )]
         
         # Format results
         result_text = f"📊 **Monitoring Results**\n\n"
         result_text += f"**Results Count:** {len(results)}\n"
-        result_text += f"**Buffer Cleared:** {'Yes' if clear_buffer else 'No'}\n\n"
+        result_text += f"**Buffer Cleared:** {'Yes' if clear_buffer else 'No'}\n"
+        if page is not None:
+            result_text += f"**Next Cursor:** {page['next_cursor']} ({page['remaining']} more)\n"
+            if page['missed']:
+                result_text += f"**Missed:** {page['missed']} results before the cursor were dropped or already read\n"
+        result_text += "\n"
         
         # Group results by check time for better organization
         results_by_check = {}
@@ -523,17 +1115,19 @@ class SplunkMonitorTool:
         return analysis
     
     def cleanup(self):
-        """Clean up the monitoring session."""
+        """Stop and remove every monitoring session."""
         with self._lock:
-            if self.current_session:
+            for session_id, session in list(self.sessions.items()):
                 try:
-                    self.current_session.stop()
+                    session.stop()
+                    session.results_buffer.close()
                 except Exception as e:
-                    logger.warning("Error stopping session during cleanup", error=str(e))
-                
-                self.current_session = None
+                    logger.warning("Error stopping session during cleanup", session_id=session_id, error=str(e))
+            
+            self.sessions.clear()
+            self._current_id = None
         
-        logger.info("Monitoring session cleaned up")
+        logger.info("Monitoring sessions cleaned up")
 
 
 # Global monitor tool instance
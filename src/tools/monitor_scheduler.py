@@ -0,0 +1,281 @@
+"""Shared asyncio scheduler for monitoring checks.
+
+Every monitoring session used to own a thread that slept between checks.
+``MonitorScheduler`` drives all of them from one asyncio task: jobs sit in a
+heap keyed by their next due time, and the task sleeps until the earliest
+one. Checks are blocking Splunk searches, so they run in a small thread pool
+that bounds how many are in flight; each borrows a pooled Splunk session.
+
+New jobs are staggered: the first check is offset by a golden-ratio fraction
+of the interval, so monitors started together spread over the interval
+instead of firing on the same second. Later checks keep that phase
+(fixed-rate), and a job is never run again while its previous check is
+still in progress.
+
+The task runs on the server's event loop when started from async code, and
+on a private loop thread otherwise.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import structlog
+
+from ..config import MCPConfig, get_config
+
+logger = structlog.get_logger(__name__)
+
+# Fraction of the interval between consecutive first checks
+_GOLDEN_RATIO = 0.6180339887498949
+
+
+@dataclass
+class _Job:
+    """A periodic check; ``check`` returns False to unschedule itself."""
+    key: str
+    interval: float
+    check: Callable[[], bool]
+    due: float
+    generation: int
+    running: bool = False
+    runs: int = 0
+    max_lag: float = 0.0
+
+
+class MonitorScheduler:
+    """Runs periodic monitor checks from a single asyncio task."""
+
+    def __init__(self, max_concurrent_checks: int = 8, stagger: bool = True):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrent_checks: Checks allowed to run at once
+            stagger: Offset first checks so jobs don't fire together
+        """
+        self.max_concurrent_checks = max(1, max_concurrent_checks)
+        self.stagger = stagger
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, _Job] = {}
+        # (due, generation, key); stale entries are skipped when popped
+        self._heap: List[Tuple[float, int, str]] = []
+        self._generations = itertools.count()
+        self._stagger_slots = itertools.count()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_checks,
+                                            thread_name_prefix="monitor-check")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Future] = None
+        self._check_tasks: Set[asyncio.Future] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'checks': 0, 'failed_checks': 0, 'skipped_busy': 0}
+
+    def schedule(self, key: str, interval: float, check: Callable[[], bool],
+                 first_delay: Optional[float] = None) -> float:
+        """Schedule (or reschedule) a periodic check.
+
+        Args:
+            key: Job key, e.g. the monitoring session ID
+            interval: Seconds between checks
+            check: Blocking callable run in the check pool; returns False to stop
+            first_delay: Seconds until the first check (staggered if None)
+
+        Returns:
+            float: Seconds until the first check
+        """
+        if first_delay is None:
+            first_delay = self._stagger_delay(interval)
+        with self._lock:
+            job = _Job(key=key, interval=interval, check=check, due=time.monotonic() + first_delay,
+                       generation=next(self._generations))
+            self._jobs[key] = job
+            heapq.heappush(self._heap, (job.due, job.generation, key))
+        self._ensure_running()
+        self._wake()
+        logger.debug("Scheduled monitor check", key=key, interval=interval, first_delay=round(first_delay, 3))
+        return first_delay
+
+    def unschedule(self, key: str) -> bool:
+        """Remove a job; a check already running finishes but isn't rescheduled."""
+        with self._lock:
+            removed = self._jobs.pop(key, None) is not None
+        self._wake()
+        return removed
+
+    def next_due_in(self, key: str) -> Optional[float]:
+        """Seconds until a job's next check, or None if it isn't scheduled."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return None
+            return max(0.0, job.due - time.monotonic())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job counts, check counts and the largest start lag."""
+        with self._lock:
+            return {
+                'jobs': len(self._jobs),
+                'running_checks': sum(1 for job in self._jobs.values() if job.running),
+                'max_concurrent_checks': self.max_concurrent_checks,
+                'max_lag_seconds': round(max((job.max_lag for job in self._jobs.values()), default=0.0), 3),
+                'loop': 'server' if self._thread is None and self._loop is not None else
+                        ('private' if self._thread is not None else None),
+                **self._stats
+            }
+
+    def shutdown(self) -> None:
+        """Drop all jobs and stop the scheduler task."""
+        with self._lock:
+            self._jobs.clear()
+            self._heap.clear()
+            loop, task, thread = self._loop, self._task, self._thread
+            tasks = [task, *self._check_tasks] if task is not None else list(self._check_tasks)
+            self._loop = self._task = self._thread = None
+        if loop is not None and not loop.is_closed():
+            for pending in tasks:
+                loop.call_soon_threadsafe(pending.cancel)
+            if thread is not None:
+                loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_checks,
+                                            thread_name_prefix="monitor-check")
+
+    # --- internals ---
+
+    def _stagger_delay(self, interval: float) -> float:
+        if not self.stagger:
+            return 0.0
+        slot = next(self._stagger_slots)
+        return ((slot * _GOLDEN_RATIO) % 1.0) * interval
+
+    def _ensure_running(self) -> None:
+        with self._lock:
+            if (self._loop is not None and not self._loop.is_closed()
+                    and self._task is not None and not self._task.done()):
+                return
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+
+            if loop is not None:
+                self._thread = None
+                self._loop = loop
+                self._wakeup = asyncio.Event()
+                self._task = loop.create_task(self._run())
+                return
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop() -> None:
+                asyncio.set_event_loop(loop)
+                self._wakeup = asyncio.Event()
+                self._task = loop.create_task(self._run())
+                started.set()
+                try:
+                    loop.run_forever()
+                    # Let cancelled tasks finish before the loop goes away
+                    pending = asyncio.all_tasks(loop)
+                    if pending:
+                        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                finally:
+                    loop.close()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=run_loop, name="monitor-scheduler", daemon=True)
+            self._thread.start()
+        started.wait(timeout=5)
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            for job in self._pop_due():
+                task = asyncio.ensure_future(self._run_check(job))
+                with self._lock:
+                    self._check_tasks.add(task)
+                task.add_done_callback(self._check_done)
+            with self._lock:
+                timeout = max(0.0, self._heap[0][0] - time.monotonic()) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _pop_due(self) -> List[_Job]:
+        now = time.monotonic()
+        due: List[_Job] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, generation, key = heapq.heappop(self._heap)
+                job = self._jobs.get(key)
+                if job is None or job.generation != generation:
+                    continue
+                if job.running:
+                    self._stats['skipped_busy'] += 1
+                    continue
+                job.running = True
+                job.max_lag = max(job.max_lag, now - job.due)
+                due.append(job)
+        return due
+
+    def _check_done(self, task: asyncio.Future) -> None:
+        with self._lock:
+            self._check_tasks.discard(task)
+
+    async def _run_check(self, job: _Job) -> None:
+        loop = asyncio.get_running_loop()
+        keep = True
+        try:
+            keep = await loop.run_in_executor(self._executor, job.check)
+        except Exception as e:
+            with self._lock:
+                self._stats['failed_checks'] += 1
+            logger.error("Monitor check raised", key=job.key, error=str(e))
+        with self._lock:
+            job.running = False
+            job.runs += 1
+            self._stats['checks'] += 1
+            if keep is False or self._jobs.get(job.key) is not job:
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]
+                return
+            # Fixed rate keeps the staggered phase; a check that overran starts the next one now
+            now = time.monotonic()
+            job.due = max(job.due + job.interval, now)
+            heapq.heappush(self._heap, (job.due, job.generation, job.key))
+        self._wake()
+
+
+_monitor_scheduler: Optional[MonitorScheduler] = None
+_monitor_scheduler_lock = threading.Lock()
+
+
+def create_monitor_scheduler(config: MCPConfig) -> MonitorScheduler:
+    """Create a monitor scheduler from configuration."""
+    return MonitorScheduler(max_concurrent_checks=config.monitor_max_concurrent_checks)
+
+
+def get_monitor_scheduler() -> MonitorScheduler:
+    """Get the process-wide monitor scheduler."""
+    global _monitor_scheduler
+    with _monitor_scheduler_lock:
+        if _monitor_scheduler is None:
+            _monitor_scheduler = create_monitor_scheduler(get_config().mcp)
+        return _monitor_scheduler
@@ -1,12 +1,175 @@
 """Base prompt tool implementation for MCP."""
 
-import os
-from typing import Dict, Any, List
+import threading
+import time
+from pathlib import Path
+from string import Template
+from typing import Dict, Any, List, Optional, Tuple
 import structlog
 from mcp.types import Tool, TextContent
 
 logger = structlog.get_logger(__name__)
 
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+
+# Plan template shared by every tool that chains to a next step
+PLAN_TEMPLATE_FILE = "shared_plan_template.txt"
+
+# Seconds between mtime checks of a loaded prompt file
+PROMPT_CHECK_INTERVAL = 2.0
+
+
+class PromptRegistry:
+    """Prompt files loaded and compiled once, shared by all prompt tools.
+
+    Every ``*.txt`` under the prompts directory is read and compiled into a
+    ``string.Template`` on first use. A file's mtime is checked at most once per
+    ``check_interval``, and changed files are reloaded; ``request_reload()``
+    (wired to SIGHUP by the server) makes the next access reload everything.
+    Render times are recorded per template.
+    """
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR, check_interval: float = PROMPT_CHECK_INTERVAL):
+        """Initialize the registry.
+
+        Args:
+            prompts_dir: Directory holding the prompt files
+            check_interval: Seconds between mtime checks of a file (0 checks on every access)
+        """
+        self.prompts_dir = Path(prompts_dir)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        # name -> (mtime_ns, text, compiled template, last mtime check)
+        self._entries: Dict[str, Tuple[int, str, Template, float]] = {}
+        self._loaded = False
+        self._reload_requested = False
+        self._loads = 0
+        self._reloads = 0
+        self._renders: Dict[str, Dict[str, float]] = {}
+
+    def get_text(self, name: str) -> str:
+        """Get the content of a prompt file.
+
+        Raises:
+            FileNotFoundError: If there is no such prompt file
+        """
+        return self._entry(name)[1]
+
+    def get_template(self, name: str) -> Template:
+        """Get the compiled template of a prompt file.
+
+        Raises:
+            FileNotFoundError: If there is no such prompt file
+        """
+        return self._entry(name)[2]
+
+    def render(self, name: str, /, **values: Any) -> str:
+        """Substitute values into a prompt template and record the render time.
+
+        Args:
+            name: Prompt file name (e.g. 'shared_plan_template.txt')
+            **values: Placeholder values
+
+        Returns:
+            str: The rendered prompt
+
+        Raises:
+            FileNotFoundError: If there is no such prompt file
+            KeyError: If a placeholder has no value
+        """
+        template = self.get_template(name)
+        started = time.perf_counter()
+        text = template.substitute(**values)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self._renders.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        return text
+
+    def request_reload(self) -> None:
+        """Reload every prompt file on next access; safe to call from a signal handler."""
+        self._reload_requested = True
+
+    def reload(self) -> None:
+        """Reload every prompt file now."""
+        with self._lock:
+            self._load_all()
+            self._reloads += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get load counts and render timings per template."""
+        with self._lock:
+            return {
+                "templates": len(self._entries),
+                "loads": self._loads,
+                "reloads": self._reloads,
+                "renders": {
+                    name: {
+                        "count": int(stats["count"]),
+                        "avg_ms": round(stats["total_ms"] / stats["count"], 3),
+                        "max_ms": round(stats["max_ms"], 3)
+                    }
+                    for name, stats in self._renders.items()
+                }
+            }
+
+    def _entry(self, name: str) -> Tuple[int, str, Template, float]:
+        with self._lock:
+            if not self._loaded or self._reload_requested:
+                if self._reload_requested:
+                    self._reloads += 1
+                self._reload_requested = False
+                self._load_all()
+
+            entry = self._entries.get(name)
+            now = time.monotonic()
+            if entry is None or now - entry[3] >= self.check_interval:
+                entry = self._refresh(name, entry, now)
+            return entry
+
+    def _load_all(self) -> None:
+        self._entries.clear()
+        for path in sorted(self.prompts_dir.glob("*.txt")):
+            self._refresh(path.name, None, time.monotonic())
+        self._loaded = True
+        logger.info("Loaded prompt templates", directory=str(self.prompts_dir), count=len(self._entries))
+
+    def _refresh(self, name: str, entry: Optional[Tuple[int, str, Template, float]],
+                 now: float) -> Tuple[int, str, Template, float]:
+        """Load a prompt file if it is new or its mtime changed."""
+        path = self.prompts_dir / name
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._entries.pop(name, None)
+            raise
+        if entry is not None and entry[0] == mtime:
+            entry = (mtime, entry[1], entry[2], now)
+        else:
+            text = path.read_text(encoding="utf-8")
+            entry = (mtime, text, Template(text), now)
+            self._loads += 1
+            if self._loaded:
+                logger.info("Reloaded changed prompt file", file=name)
+        self._entries[name] = entry
+        return entry
+
+
+_prompt_registry: Optional[PromptRegistry] = None
+_prompt_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Get the process-wide prompt registry."""
+    global _prompt_registry
+    if _prompt_registry is None:
+        with _prompt_registry_lock:
+            if _prompt_registry is None:
+                _prompt_registry = PromptRegistry()
+    return _prompt_registry
+
 
 class BasePromptTool:
     """Base MCP tool for serving ready-to-use prompts."""
@@ -62,30 +225,17 @@ class BasePromptTool:
             )]
     
     def _get_prompt(self) -> str:
-        """Get the ready-to-use prompt from external file.
+        """Get the ready-to-use prompt from the prompt registry.
         
         Returns:
             str: The prompt content
         """
         try:
-            # Get the path to the prompt file
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Go up two levels: from src/tools to project root, then to src/prompts
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            prompt_file_path = os.path.join(project_root, "src", "prompts", self.prompt_filename)
-            
-            # Read the prompt content from file and return as-is
-            with open(prompt_file_path, 'r', encoding='utf-8') as f:
-                prompt_content = f.read().strip()
-            
-            return prompt_content
+            return get_prompt_registry().get_text(self.prompt_filename).strip()
             
         except FileNotFoundError:
-            logger.error("Prompt file not found", path=prompt_file_path)
-            return f"""❌ **Prompt File Not Found**
-
-The prompt file `src/prompts/{self.prompt_filename}` could not be found.
-Please ensure the file exists and contains your prompt content."""
+            logger.error("Prompt file not found", file=self.prompt_filename)
+            return self._missing_prompt_message()
             
         except Exception as e:
             logger.error("Error reading prompt file", error=str(e))
@@ -94,6 +244,24 @@ Please ensure the file exists and contains your prompt content."""
 An error occurred while reading the prompt file: {str(e)}
 Please check the file permissions and content."""
 
+    def _render_prompt(self, **values: Any) -> str:
+        """Render the tool's prompt template with the given placeholder values.
+
+        Returns:
+            str: The rendered prompt
+        """
+        try:
+            return get_prompt_registry().render(self.prompt_filename, **values).strip()
+        except FileNotFoundError:
+            logger.error("Prompt file not found", file=self.prompt_filename)
+            return self._missing_prompt_message()
+
+    def _missing_prompt_message(self) -> str:
+        return f"""❌ **Prompt File Not Found**
+
+The prompt file `src/prompts/{self.prompt_filename}` could not be found.
+Please ensure the file exists and contains your prompt content."""
+
 
 # Concrete implementation for analysis prompt
 class AnalysisPromptTool(BasePromptTool):
@@ -3,11 +3,10 @@
 from __future__ import annotations
 
 import json
-from pathlib import Path
-from string import Template
 from typing import Dict, Any, List
 import structlog
 from mcp.types import Tool, TextContent
+from .encoding import dumps_response
 from .prompt import BasePromptTool
 
 logger = structlog.get_logger(__name__)
@@ -41,10 +40,6 @@ class RootCauseIdentificationPromptTool(BasePromptTool):
             ),
             prompt_filename="root_cause_identification_prompt.txt",
         )
-        # Shared plan template: contains {{nextTool}}, {{argsJson}}, {{reason}}
-        self._plan_tpl = Template(
-            (Path(__file__).parent.parent / "prompts" / "shared_plan_template.txt").read_text(encoding="utf-8")
-        )
 
     def get_tool_definition(self) -> Tool:
         return Tool(
@@ -103,7 +98,7 @@ class RootCauseIdentificationPromptTool(BasePromptTool):
 
         # Use Template.substitute() with $ placeholders for shared template
         next_tool = "automated_issue_creation"
-        args_json = json.dumps(next_step_args)
+        args_json = dumps_response(next_step_args, tool="root_cause_identification_prompt")
         reason = "Create GitHub/JIRA issues directly from root cause analysis"
 
         # Format input data with mode and confidence_floor
@@ -114,9 +109,8 @@ class RootCauseIdentificationPromptTool(BasePromptTool):
         }
 
         # Simple template substitution - no string manipulation needed!
-        prompt_template = Template(self._get_prompt())
-        full_prompt = prompt_template.substitute(
-            INPUT_ANALYSIS=json.dumps(input_data, indent=2),
+        full_prompt = self._render_prompt(
+            INPUT_ANALYSIS=dumps_response(input_data, tool="root_cause_identification_prompt"),
             nextTool=next_tool,
             argsJson=args_json,
             reason=reason
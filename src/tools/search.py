@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-import json
 from typing import Dict, Any, List
 import structlog
 from mcp.types import Tool, TextContent
+from .encoding import dumps_response
+from ..splunk.cache import CACHE_MODES
+from ..splunk.client import EXECUTION_STRATEGIES, SplunkCacheMissError
+from ..splunk.slicing import MAX_TIME_SLICES
 
 logger = structlog.get_logger(__name__)
 
@@ -19,6 +22,7 @@ class SplunkSearchTool:
     def __init__(self):
         """Initialize the Splunk search tool."""
         self._client = None
+        self._async_client = None
 
     def get_tool_definition(self) -> Tool:
         """Get the MCP tool definition for splunk_search."""
@@ -54,6 +58,51 @@ class SplunkSearchTool:
                         "default": 300,
                         "title": "Timeout",
                         "type": "integer"
+                    },
+                    "strategy": {
+                        "default": "auto",
+                        "title": "Strategy",
+                        "type": "string",
+                        "enum": ["auto", "oneshot", "export", "normal"],
+                        "description": (
+                            "How to run the search: 'oneshot' for small bounded searches, 'export' to "
+                            "stream large pulls, 'normal' for a pollable job; 'auto' picks by max_results"
+                        )
+                    },
+                    "retain": {
+                        "default": False,
+                        "title": "Retain",
+                        "type": "boolean",
+                        "description": (
+                            "Keep the finished search job alive and return its sid, so later pages "
+                            "(offset), splunk_export(sid=...) or '| loadjob <sid>' reuse it"
+                        )
+                    },
+                    "offset": {
+                        "default": 0,
+                        "title": "Offset",
+                        "type": "integer",
+                        "description": "Index of the first result to return, for paging through results"
+                    },
+                    "cache": {
+                        "default": "prefer",
+                        "title": "Cache",
+                        "type": "string",
+                        "enum": ["prefer", "bypass", "only"],
+                        "description": (
+                            "'prefer' serves recent identical searches from cache, 'bypass' always runs "
+                            "the search, 'only' returns cached results without searching"
+                        )
+                    },
+                    "slices": {
+                        "default": 1,
+                        "title": "Slices",
+                        "type": "integer",
+                        "description": (
+                            "Split the time range into this many slices searched in parallel, newest "
+                            "first, stopping once max_results is reached. Speeds up wide windows "
+                            "(-7d, -30d) for event searches; ignored for transforming searches"
+                        )
                     }
                 },
                 "required": ["query"],
@@ -62,14 +111,19 @@ class SplunkSearchTool:
         )
 
     def get_client(self):
-        """Get or create Splunk client."""
+        """Get the shared Splunk session pool."""
         if self._client is None:
-            from ..splunk.client import SplunkClient
-            from ..config import get_config
-            config = get_config()
-            self._client = SplunkClient(config.splunk)
+            from ..splunk.pool import get_session_pool
+            self._client = get_session_pool()
         return self._client
 
+    def get_async_client(self):
+        """Get or create the async wrapper around the Splunk client."""
+        if self._async_client is None:
+            from ..splunk.async_client import AsyncSplunkClient
+            self._async_client = AsyncSplunkClient(self.get_client())
+        return self._async_client
+
     async def execute(self, arguments: Dict[str, Any]) -> List[TextContent]:
         """Execute the splunk_search tool and return structured JSON data."""
         try:
@@ -86,6 +140,11 @@ class SplunkSearchTool:
             latest_time = arguments.get("latest_time", "now")
             max_results = int(arguments.get("max_results", 100))
             timeout = int(arguments.get("timeout", 300))
+            strategy = arguments.get("strategy", "auto")
+            cache = arguments.get("cache", "prefer")
+            retain = bool(arguments.get("retain", False))
+            offset = int(arguments.get("offset", 0))
+            slices = int(arguments.get("slices", 1))
 
             # Validate parameters
             if max_results < 1 or max_results > 10000:
@@ -100,17 +159,48 @@ class SplunkSearchTool:
                     text="❌ **Invalid Parameters**\n\ntimeout must be between 10 and 3600 seconds."
                 )]
 
-            # Get client and execute search
-            client = self.get_client()
+            if strategy not in EXECUTION_STRATEGIES:
+                return [TextContent(
+                    type="text",
+                    text=f"❌ **Invalid Parameters**\n\nstrategy must be one of: {', '.join(EXECUTION_STRATEGIES)}."
+                )]
+
+            if cache not in CACHE_MODES:
+                return [TextContent(
+                    type="text",
+                    text=f"❌ **Invalid Parameters**\n\ncache must be one of: {', '.join(CACHE_MODES)}."
+                )]
+
+            if offset < 0:
+                return [TextContent(
+                    type="text",
+                    text="❌ **Invalid Parameters**\n\noffset must not be negative."
+                )]
+
+            if slices < 1 or slices > MAX_TIME_SLICES:
+                return [TextContent(
+                    type="text",
+                    text=f"❌ **Invalid Parameters**\n\nslices must be between 1 and {MAX_TIME_SLICES}."
+                )]
+
+            # Get client and execute search off the event loop
+            client = self.get_async_client()
 
             search_kwargs = {
                 'earliest_time': earliest_time,
                 'latest_time': latest_time,
                 'max_results': max_results,
-                'timeout': timeout
+                'timeout': timeout,
+                'retain': retain,
+                'offset': offset
             }
 
-            results = client.execute_search(query, **search_kwargs)
+            if slices > 1:
+                search_result = await client.run_sliced_search(query, slices, strategy=strategy,
+                                                               cache=cache, **search_kwargs)
+            else:
+                search_result = await client.run_search(query, strategy=strategy, cache=cache, **search_kwargs)
+            results = search_result["results"]
 
             # Return structured JSON data
             response_data = {
@@ -121,15 +211,23 @@ class SplunkSearchTool:
                     "latest_time": latest_time,
                     "result_count": len(results),
                     "max_results": max_results,
-                    "timeout": timeout
+                    "offset": offset,
+                    "timeout": timeout,
+                    "execution": search_result["execution"]
                 }
             }
 
             return [TextContent(
                 type="text",
-                text=json.dumps(response_data, ensure_ascii=False, indent=2)
+                text=dumps_response(response_data, tool="splunk_search")
             )]
 
+        except SplunkCacheMissError:
+            return [TextContent(
+                type="text",
+                text="❌ **Not Cached**\n\n"
+                     "No cached results for this search. Run it again with cache='prefer' or 'bypass'."
+            )]
         except Exception as e:
             logger.error("Splunk search error", error=str(e))
             return [TextContent(
@@ -141,13 +239,9 @@ class SplunkSearchTool:
 
     def cleanup(self):
         """Clean up resources."""
-        if self._client is not None:
-            try:
-                self._client.disconnect()
-            except Exception as e:
-                logger.warning("Error during client cleanup", error=str(e))
-            finally:
-                self._client = None
+        # The session pool is shared with every other tool; only drop the reference
+        self._client = None
+        self._async_client = None
 
 
 # Global search tool instance
@@ -156,7 +250,8 @@ _search_tool = SplunkSearchTool()
 
 async def execute_splunk_query(query: str, earliest_time: str = "-24h", 
                               latest_time: str = "now", max_results: int = 100, 
-                              timeout: int = 300) -> Dict[str, Any]:
+                              timeout: int = 300, strategy: str = "auto",
+                              cache: str = "prefer", slices: int = 1) -> Dict[str, Any]:
     """
     Vanilla helper function for internal tool-to-tool search calls.
     Returns raw dictionary instead of TextContent to avoid breaking chains.
@@ -167,6 +262,9 @@ async def execute_splunk_query(query: str, earliest_time: str = "-24h",
         latest_time: End time for search  
         max_results: Maximum number of results
         timeout: Search timeout in seconds
+        strategy: Execution strategy ('auto', 'oneshot', 'export', 'normal')
+        cache: Result cache mode ('prefer', 'bypass', 'only')
+        slices: Time slices to search in parallel (1 runs a single search)
         
     Returns:
         Dict with 'results' and 'metadata' keys
@@ -184,8 +282,8 @@ async def execute_splunk_query(query: str, earliest_time: str = "-24h",
     if timeout < 10 or timeout > 3600:
         raise ValueError("timeout must be between 10 and 3600 seconds")
     
-    # Get client and execute search
-    client = _search_tool.get_client()
+    # Get client and execute search off the event loop
+    client = _search_tool.get_async_client()
     
     search_kwargs = {
         'earliest_time': earliest_time,
@@ -194,7 +292,12 @@ async def execute_splunk_query(query: str, earliest_time: str = "-24h",
         'timeout': timeout
     }
     
-    results = client.execute_search(query, **search_kwargs)
+    if slices > 1:
+        search_result = await client.run_sliced_search(query, slices, strategy=strategy, cache=cache,
+                                                       **search_kwargs)
+    else:
+        search_result = await client.run_search(query, strategy=strategy, cache=cache, **search_kwargs)
+    results = search_result["results"]
     
     # Return structured data
     return {
@@ -205,7 +308,8 @@ async def execute_splunk_query(query: str, earliest_time: str = "-24h",
             "latest_time": latest_time,
             "result_count": len(results),
             "max_results": max_results,
-            "timeout": timeout
+            "timeout": timeout,
+            "execution": search_result["execution"]
         }
     }
 
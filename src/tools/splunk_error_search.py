@@ -14,31 +14,52 @@ Design notes for splunk_error_search:
    - Accepts `indices` and `earliest_time`/`latest_time` as arguments.
    - If `earliest_time` is provided, do NOT auto-broaden search — respect the exact user request.
    - If `earliest_time` is omitted, automatically broaden search progressively (-24h, -48h, -72h) until results found or max range reached.
+   - Each broadening step only searches the new, non-overlapping window (-48h..-24h, then -72h..-48h),
+     so the newest day is never re-scanned. With `concurrent`, all windows run at once and the nearest
+     non-empty one wins.
+   - Every attempt reports how many events Splunk scanned, so "no errors" can be told apart from "no data".
+     Windows run on the oneshot/export fast path report no scan count, so empty ones are counted with
+     `| tstats count` over the same indices and window instead (an index-metadata lookup).
 
 3. Chaining behavior:
    - If results are found and running as part of a multi-step plan, return both:
-       a) Raw logs (JSON) for next tool consumption.
+       a) Raw logs for next tool consumption, stored server-side and passed as an `artifact_id`
+          (with a short preview) so the model doesn't have to echo them back.
        b) A plan JSON object instructing the next step (group_error_logs).
 """
 
-from typing import Dict, Any, List
-import json
-from pathlib import Path
-from string import Template
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 import structlog
 from mcp.types import Tool, TextContent
-from .search import execute_splunk_query_raw_only
+from .encoding import dumps_response
+from .artifacts import get_artifact_store
+from .prompt import PLAN_TEMPLATE_FILE, get_prompt_registry
+from .search import execute_splunk_query
 
 logger = structlog.get_logger(__name__)
 
+# Earliest bound of each auto-broadening step
+BROADENING_STEPS = ["-24h", "-48h", "-72h"]
+
+# Logs (and characters of each) shown in the plan next to the artifact_id
+PREVIEW_LOGS = 3
+PREVIEW_CHARS = 200
+
+
+def broadening_windows(latest_time: str = "now") -> List[Tuple[str, str]]:
+    """Non-overlapping (earliest, latest) windows, nearest first: -24h..latest, -48h..-24h, ..."""
+    windows = []
+    upper = latest_time
+    for step in BROADENING_STEPS:
+        windows.append((step, upper))
+        upper = step
+    return windows
+
 
 class SplunkErrorSearchTool:
     """MCP tool for finding recent error logs in given Splunk indices and chaining to grouping step."""
 
-    def __init__(self):
-        self._plan_tpl_path = Path(__file__).parent.parent / "prompts" / "shared_plan_template.txt"
-        self._plan_tpl = Template(self._plan_tpl_path.read_text(encoding="utf-8"))
-
     def get_tool_definition(self) -> Tool:
         return Tool(
             name="splunk_error_search",
@@ -81,6 +102,11 @@ class SplunkErrorSearchTool:
                         "minimum": 1,
                         "maximum": 10000
                     },
+                    "concurrent": {
+                        "type": "boolean",
+                        "description": "When auto-broadening, search all windows at once and keep the nearest one with errors (faster, more load on Splunk).",
+                        "default": False
+                    },
                     "context_note": {
                         "type": "string",
                         "description": "Optional note about why this search is being performed (e.g., 'user requested payment indices', 'retry with longer time range')"
@@ -98,47 +124,47 @@ class SplunkErrorSearchTool:
 
             latest_time = arguments.get("latest_time", "now")
             max_results = arguments.get("max_results", 500)
+            concurrent = bool(arguments.get("concurrent", False))
             user_provided_earliest = "earliest_time" in arguments and arguments["earliest_time"]
 
             if user_provided_earliest:
                 # Only try the provided range
-                time_ranges = [arguments["earliest_time"]]
+                windows = [(arguments["earliest_time"], latest_time)]
             else:
-                # Auto-broaden if earliest_time not specified
-                time_ranges = ["-24h", "-48h", "-72h"]
+                # Auto-broaden if earliest_time not specified, one new window at a time
+                windows = broadening_windows(latest_time)
 
-            found_results = None
-            used_range = None
+            index_filter = " OR ".join([f'index="{idx}"' for idx in indices])
+            spl = f'search ({index_filter}) ("ERROR" OR "error")'
 
-            for tr in time_ranges:
-                index_filter = " OR ".join([f'index="{idx}"' for idx in indices])
-                spl = f'search ({index_filter}) ("ERROR" OR "error")'
-
-                logger.info("Running Splunk error search", query=spl, earliest_time=tr, latest_time=latest_time)
-
-                raw_logs = await execute_splunk_query_raw_only(
-                    query=spl,
-                    earliest_time=tr,
-                    latest_time=latest_time,
-                    max_results=max_results
-                )
+            if concurrent and len(windows) > 1:
+                attempts = await asyncio.gather(*[
+                    self._search_window(spl, index_filter, earliest, latest, max_results)
+                    for earliest, latest in windows
+                ])
+            else:
+                attempts = []
+                for earliest, latest in windows:
+                    attempts.append(await self._search_window(spl, index_filter, earliest, latest, max_results))
+                    if attempts[-1]["logs"]:
+                        break
 
-                if raw_logs:
-                    found_results = raw_logs
-                    used_range = tr
-                    break
+            found = next((attempt for attempt in attempts if attempt["logs"]), None)
+            found_results = found["logs"] if found else None
 
             if not found_results:
                 # Build detailed no-results explanation
-                attempted_ranges = ", ".join(time_ranges)
+                attempted_ranges = "".join(f"  - {self._describe_attempt(attempt)}\n" for attempt in attempts)
                 indices_str = ", ".join(indices)
+                empty_note = (" (no events at all were scanned, so the indices may be empty)"
+                              if self._scanned_nothing(attempts) else "")
                 msg = (
                     f"ℹ️ **No matching error logs found**\n\n"
                     f"- **Indices searched:** {indices_str}\n"
-                    f"- **Time ranges attempted:** {attempted_ranges}\n"
+                    f"- **Time ranges attempted:**\n{attempted_ranges}"
                     f"- **Query pattern:** ('ERROR' OR 'error')\n\n"
                     f"Possible reasons:\n"
-                    f"- No error logs were generated in these time windows.\n"
+                    f"- No error logs were generated in these time windows{empty_note}.\n"
                     f"- The logs may be stored in different indices.\n"
                     f"- The error keywords differ (e.g., WARN, FAIL, etc.).\n\n"
                     f"💡 You can refine the search by:\n"
@@ -148,15 +174,25 @@ class SplunkErrorSearchTool:
                 )
                 return [TextContent(type="text", text=msg)]
 
-            # If found logs and invoked as part of chain → send plan for grouping
-            plan_text = self._plan_tpl.substitute(
+            # If found logs and invoked as part of chain → send plan for grouping,
+            # passing on the indices that actually had errors to narrow the trace search.
+            # The logs go by artifact_id so they aren't echoed back through the model.
+            next_args: Dict[str, Any] = {"indices": found["indices"] or indices}
+            artifact_id = get_artifact_store().put("error_logs", found_results)
+            if artifact_id:
+                next_args.update(artifact_id=artifact_id, log_count=len(found_results),
+                                 preview=[log["_raw"][:PREVIEW_CHARS] for log in found_results[:PREVIEW_LOGS]])
+            else:
+                next_args["logs"] = found_results
+            plan_text = get_prompt_registry().render(
+                PLAN_TEMPLATE_FILE,
                 nextTool="group_error_logs",
-                argsJson=json.dumps({"logs": found_results}, ensure_ascii=False),
-                reason=f"Found error logs in the last {used_range[1:]} hours, proceed to group them by similarity."
+                argsJson=dumps_response(next_args, tool="splunk_error_search"),
+                reason=f"Found error logs {self._describe_window(found)}, proceed to group them by similarity."
             )
 
             return [
-                TextContent(type="text", text=plan_text)  # plan to next step with logs included
+                TextContent(type="text", text=plan_text)  # plan to next step with the logs' artifact_id
             ]
 
         except Exception as e:
@@ -166,6 +202,72 @@ class SplunkErrorSearchTool:
                 text=f"❌ **Splunk Error Search Failed**\n\nError: {e}"
             )]
 
+    async def _search_window(self, spl: str, index_filter: str, earliest_time: str, latest_time: str,
+                             max_results: int) -> Dict[str, Any]:
+        """Search one window and record what it cost."""
+        logger.info("Running Splunk error search", query=spl, earliest_time=earliest_time, latest_time=latest_time)
+
+        result = await execute_splunk_query(
+            query=spl,
+            earliest_time=earliest_time,
+            latest_time=latest_time,
+            max_results=max_results,
+            strategy="auto"
+        )
+        execution = result["metadata"]["execution"]
+        attempt = {
+            "earliest_time": earliest_time,
+            "latest_time": latest_time,
+            "logs": [{"_raw": r.get("_raw", "")} for r in result.get("results", [])],
+            "indices": sorted({r["index"] for r in result.get("results", []) if r.get("index")}),
+            "scan_count": execution.get("scan_count"),
+            "event_count": None,
+            "cached": execution.get("cache") == "hit",
+            "elapsed_seconds": execution.get("elapsed_seconds")
+        }
+        # Only searches run as a job report scanCount; count an empty fast-path window's events instead
+        if not attempt["logs"] and attempt["scan_count"] is None and not attempt["cached"]:
+            attempt["event_count"] = await self._count_events(index_filter, earliest_time, latest_time)
+        return attempt
+
+    @staticmethod
+    async def _count_events(index_filter: str, earliest_time: str, latest_time: str) -> Optional[int]:
+        """Count a window's events in the searched indices from index metadata."""
+        try:
+            result = await execute_splunk_query(
+                query=f"| tstats count where ({index_filter})",
+                earliest_time=earliest_time,
+                latest_time=latest_time,
+                max_results=1,
+                strategy="auto"
+            )
+            rows = result.get("results", [])
+            return int(rows[0].get("count", 0)) if rows else 0
+        except Exception as e:
+            logger.warning("Could not count events in error search window", error=str(e))
+            return None
+
+    @staticmethod
+    def _describe_window(attempt: Dict[str, Any]) -> str:
+        if attempt["latest_time"] == "now":
+            return f"in the last {attempt['earliest_time'].lstrip('-')}"
+        return f"between {attempt['earliest_time']} and {attempt['latest_time']}"
+
+    def _describe_attempt(self, attempt: Dict[str, Any]) -> str:
+        window = f"{attempt['earliest_time']} → {attempt['latest_time']}"
+        if attempt["cached"]:
+            return f"{window}: 0 matches (served from cache)"
+        if attempt["scan_count"] is not None:
+            return (f"{window}: 0 matches, {attempt['scan_count']:,} events scanned "
+                    f"in {attempt['elapsed_seconds']}s")
+        if attempt["event_count"] is not None:
+            return f"{window}: 0 matches, {attempt['event_count']:,} events in these indices"
+        return f"{window}: 0 matches"
+
+    @staticmethod
+    def _scanned_nothing(attempts: List[Dict[str, Any]]) -> bool:
+        return all(0 in (attempt["scan_count"], attempt["event_count"]) for attempt in attempts)
+
 
 # Global instance
 _error_search_tool = SplunkErrorSearchTool()
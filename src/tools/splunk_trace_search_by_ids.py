@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from pathlib import Path
-from string import Template
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
 
 import structlog
 from mcp.types import Tool, TextContent
+from .encoding import dumps_response
 
 # Reuse the generic search tool
-from .search import execute_splunk_query_raw_only
+from .search import execute_splunk_query
+from .splunk_error_search import broadening_windows
+from ..config import get_config
+from ..splunk.cache import CACHE_MODES, get_trace_cache
+from ..splunk.id_matcher import IdMatcher
+from .artifacts import get_artifact_store
+from .prompt import PLAN_TEMPLATE_FILE, get_prompt_registry
 
 logger = structlog.get_logger(__name__)
 
@@ -26,6 +33,17 @@ CANDIDATE_ID_FIELDS = [
 # Reasonable chunk size to keep SPL length manageable
 ID_CHUNK_SIZE = 25
 
+# 'term' looks IDs up as indexed tokens and scans _raw only for IDs it misses;
+# 'scan' matches every ID against _raw with like()
+LOOKUP_MODES = ("term", "scan")
+
+# Splunk's default major breakers; a token containing one can't be matched with TERM()
+MAJOR_BREAKERS = set(' \t\r\n[]<>(){}|!;,\'"*&?+')
+
+# What to do with a log line that belongs to several requested IDs:
+# 'all' adds it to every trace, 'first' to the first ID found, 'drop' skips it
+MULTI_ID_POLICIES = ("all", "first", "drop")
+
 
 class SplunkTraceSearchByIdsTool:
     """
@@ -33,16 +51,23 @@ class SplunkTraceSearchByIdsTool:
     Inputs: `field_name` (type of ID field) and `ids` (list of trace/correlation IDs).
     Behavior:
       - Build SPL that fetches ALL logs for the given IDs across candidate ID fields (equality) with a fallback to _raw.
-      - Execute via splunk_search (raw_return=True) with auto-broadening time ranges (24h → 48h → 72h until results found).
-      - Uses default settings: all indices, 4000 max results per chunk.
-      - Bucket events by the ID value (best-effort field detection; fallback to _raw contains).
-      - Emit machine-readable `{"traces":[{"id":..., "events":[...]}, ...]}` and a plan to the analysis step.
+      - Execute via splunk_search with auto-broadening over non-overlapping windows
+        (-24h..now → -48h..-24h → -72h..-48h). Chunks of a window run concurrently (bounded by
+        the search concurrency limit) and IDs that already have events are not searched again
+        in older windows.
+      - IDs are looked up as indexed tokens (TERM()), so Splunk reads only events whose lexicon
+        contains them; IDs with no hits get one like(_raw) scan over the whole range.
+      - Token lookups search every index, since a trace spans services whose logs live in other
+        indices; the indices where the error search found errors only narrow the like(_raw)
+        fallback. 4000 max results per chunk.
+      - Events found per ID are cached (ID + resolved window + indices), so repeated lookups
+        only search Splunk for IDs not seen within the trace cache TTL.
+      - Bucket events by ID in one pass per line: candidate ID fields first, then _raw contains.
+        Lines naming several IDs follow `multi_id_policy`.
+      - Store `[{"id":..., "events":[...]}, ...]` server-side and plan the analysis step with its
+        `artifact_id` and per-ID event counts, so the traces aren't echoed back through the model.
     """
 
-    def __init__(self):
-        self._plan_tpl_path = Path(__file__).parent.parent / "prompts" / "shared_plan_template.txt"
-        self._plan_tpl = Template(self._plan_tpl_path.read_text(encoding="utf-8"))
-
     def get_tool_definition(self) -> Tool:
         return Tool(
             name="splunk_trace_search_by_ids",
@@ -61,6 +86,29 @@ class SplunkTraceSearchByIdsTool:
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "Trace/correlation IDs to fetch."
+                    },
+                    "indices": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Indices the errors were found in, as passed on from splunk_error_search. Token lookups always search all indices; these only narrow the raw-scan fallback of 'term' mode (default: all indices)."
+                    },
+                    "lookup_mode": {
+                        "type": "string",
+                        "enum": list(LOOKUP_MODES),
+                        "default": "term",
+                        "description": "'term' uses indexed-token lookups with a raw scan only for IDs not found; 'scan' always scans _raw."
+                    },
+                    "multi_id_policy": {
+                        "type": "string",
+                        "enum": list(MULTI_ID_POLICIES),
+                        "default": "all",
+                        "description": "Log lines matching several IDs: 'all' adds them to each trace, 'first' to the first ID found, 'drop' skips them."
+                    },
+                    "cache": {
+                        "type": "string",
+                        "enum": list(CACHE_MODES),
+                        "default": "prefer",
+                        "description": "'prefer' reuses events of recently fetched IDs, 'bypass' searches every ID again, 'only' never searches."
                     }
                 },
                 "required": ["field_name", "ids"]
@@ -74,8 +122,18 @@ class SplunkTraceSearchByIdsTool:
                 return [TextContent(type="text", text="❌ 'ids' must be a non-empty list of strings.")]
 
             field_name = arguments.get("field_name", "unknown")
+            lookup_mode = arguments.get("lookup_mode", "term")
+            if lookup_mode not in LOOKUP_MODES:
+                return [TextContent(type="text", text=f"❌ 'lookup_mode' must be one of: {', '.join(LOOKUP_MODES)}.")]
+            multi_id_policy = arguments.get("multi_id_policy", "all")
+            if multi_id_policy not in MULTI_ID_POLICIES:
+                return [TextContent(type="text", text=f"❌ 'multi_id_policy' must be one of: {', '.join(MULTI_ID_POLICIES)}.")]
+            cache_mode = arguments.get("cache", "prefer")
+            if cache_mode not in CACHE_MODES:
+                return [TextContent(type="text", text=f"❌ 'cache' must be one of: {', '.join(CACHE_MODES)}.")]
+            # Indices learned from the error search; they only narrow the raw-scan fallback
+            indices: Optional[List[str]] = arguments.get("indices") or None
             # Use default values for simplified interface
-            indices: Optional[List[str]] = None  # Search all indices
             latest = "now"     # Search up to now
             max_results = 4000 # Default result limit
 
@@ -83,41 +141,82 @@ class SplunkTraceSearchByIdsTool:
                        field_name=field_name, 
                        id_count=len(ids))
 
-            # Auto-broaden search time range: 24h → 48h → 72h
-            time_ranges = ["-24h", "-48h", "-72h"]
+            # Auto-broaden over non-overlapping windows, only for IDs still without events
+            pending = list(dict.fromkeys(ids))
             all_raw_logs: List[str] = []
+            chunk_stats: List[Dict[str, Any]] = []
             used_range = None
-
-            for time_range in time_ranges:
-                logger.info("Trying time range", time_range=time_range)
-                
-                # Build and run in chunks to avoid overly long SPL queries
-                range_raw_logs: List[str] = []
-                id_chunks = [ids[i:i + ID_CHUNK_SIZE] for i in range(0, len(ids), ID_CHUNK_SIZE)]
-
-                for chunk in id_chunks:
-                    spl = self._build_trace_spl(chunk, indices)
-                    logger.info("Trace search chunk", ids=len(chunk), time_range=time_range)
-                    raw_logs = await execute_splunk_query_raw_only(
-                        query=spl,
-                        earliest_time=time_range,
-                        latest_time=latest,
-                        max_results=max_results
-                    )
-                    range_raw_logs.extend(raw_logs)
-
-                # Check if we found any logs in this time range
-                if range_raw_logs:
-                    all_raw_logs = range_raw_logs
-                    used_range = time_range
-                    logger.info("Found traces in time range", time_range=time_range, log_count=len(all_raw_logs))
+            semaphore = asyncio.Semaphore(max(1, get_config().splunk.max_concurrent_searches))
+            matcher = IdMatcher(ids, CANDIDATE_ID_FIELDS)
+
+            windows = broadening_windows(latest)
+            # Every window searches all indices so events of other services aren't missed
+            passes = [(window, lookup_mode, None) for window in windows]
+            if lookup_mode == "term":
+                # IDs not found as indexed tokens get one raw scan over the whole range,
+                # limited to the indices they were found in
+                passes.append(((windows[-1][0], latest), "scan", indices))
+
+            # Serve IDs looked up recently from the trace cache
+            trace_cache = get_trace_cache()
+            now = time.time()
+            cache_keys = {i: trace_cache.make_key(i, windows[-1][0], latest, indices, lookup_mode, now)
+                          for i in pending}
+            cached_ids: List[str] = []
+            cached_without_events: List[str] = []
+            if cache_mode != "bypass":
+                for trace_id, key in cache_keys.items():
+                    cached = trace_cache.get(key) if key else None
+                    if cached is not None:
+                        cached_ids.append(trace_id)
+                        all_raw_logs.extend(cached)
+                        if not cached:
+                            cached_without_events.append(trace_id)
+            pending = [i for i in pending if i not in cached_ids]
+            searched_ids = list(pending)
+            fresh_raw_logs: List[str] = []
+            # IDs of chunks cut off at max_results may have more events than were returned
+            truncated_ids: Set[str] = set()
+            uncached_ids: List[str] = []
+            if cache_mode == "only":
+                passes = []
+                uncached_ids, pending = pending, []
+
+            for (earliest_time, latest_time), mode, pass_indices in passes:
+                if not pending:
                     break
-                else:
-                    logger.info("No traces found in time range", time_range=time_range)
+                used_range = earliest_time
+                logger.info("Trying time range", time_range=earliest_time, mode=mode, pending_ids=len(pending))
 
-            # Group raw logs by ID (using _raw contains matching)
-            traces = self._group_raw_logs_by_ids(all_raw_logs, ids)
-            earliest = used_range or "-72h"  # Use the successful range or max range for reporting
+                # Build and run in chunks to avoid overly long SPL queries
+                id_chunks = [pending[i:i + ID_CHUNK_SIZE] for i in range(0, len(pending), ID_CHUNK_SIZE)]
+                chunk_results = await asyncio.gather(*[
+                    self._run_chunk(chunk, pass_indices, earliest_time, latest_time, max_results, semaphore, mode)
+                    for chunk in id_chunks
+                ])
+
+                window_logs = [raw for raw_logs, _ in chunk_results for raw in raw_logs]
+                chunk_stats.extend(stats for _, stats in chunk_results)
+                for chunk, (_, stats) in zip(id_chunks, chunk_results):
+                    if stats["truncated"]:
+                        truncated_ids.update(chunk)
+                fresh_raw_logs.extend(window_logs)
+
+                found = self._ids_with_events(window_logs, pending, matcher)
+                pending = [i for i in pending if i not in found]
+                logger.info("Trace search window done", time_range=earliest_time, mode=mode,
+                            log_count=len(window_logs), ids_found=len(found), ids_pending=len(pending))
+
+            # A line returned for several IDs (or cached under several) is only needed once
+            all_raw_logs = list(dict.fromkeys(all_raw_logs + fresh_raw_logs))
+            if passes:
+                complete_ids = [i for i in searched_ids if i not in truncated_ids]
+                self._cache_trace_events(trace_cache, cache_keys, complete_ids, fresh_raw_logs, matcher)
+
+            # Group raw logs by ID (candidate fields, then _raw contains)
+            traces, grouping = self._group_raw_logs_by_ids(all_raw_logs, ids, matcher, multi_id_policy)
+            # Oldest window searched, for reporting; cached events cover the widest window
+            earliest = windows[-1][0] if cached_ids or used_range is None else used_range
 
             # Always proceed to analysis step, even with empty traces
             if not traces or all(len(t.get("events", [])) == 0 for t in traces):
@@ -131,13 +230,37 @@ class SplunkTraceSearchByIdsTool:
             else:
                 reason = "Full logs collected per ID — proceed to cross-service narrative and root-cause analysis."
 
-            # Plan to analysis step (Step 8) — adjust nextTool name if different
-            plan_json = self._plan_tpl.substitute(
+            # Plan to analysis step (Step 8), passing the traces by handle
+            artifact_id = get_artifact_store().put("traces", traces)
+            if artifact_id:
+                next_args = {"artifact_id": artifact_id,
+                             "event_counts": {t["id"]: len(t["events"]) for t in traces}}
+            else:
+                next_args = {"traces": traces}
+            plan_json = get_prompt_registry().render(
+                PLAN_TEMPLATE_FILE,
                 nextTool="analyze_traces_narrative",
-                argsJson=json.dumps({"traces": traces}, ensure_ascii=False),
+                argsJson=dumps_response(next_args, tool="splunk_trace_search_by_ids"),
                 reason=reason
             )
-            return [TextContent(type="text", text=plan_json)]
+            search_stats = {
+                "kind": "search_stats",
+                "chunks": chunk_stats,
+                "searches": len(chunk_stats),
+                "ids_without_events": cached_without_events + pending,
+                "uncached_ids": uncached_ids,
+                "grouping": grouping,
+                "trace_cache": {
+                    "mode": cache_mode,
+                    "ids_cached": len(cached_ids),
+                    "ids_searched": len(searched_ids) if passes else 0,
+                    **trace_cache.get_stats()
+                }
+            }
+            return [
+                TextContent(type="text", text=plan_json),
+                TextContent(type="text", text=dumps_response(search_stats, tool="splunk_trace_search_by_ids"))
+            ]
 
         except Exception as e:
             logger.error("splunk_trace_search_by_ids failed", error=str(e))
@@ -145,10 +268,63 @@ class SplunkTraceSearchByIdsTool:
 
     # ---------------------------------------------------------------------
 
-    def _build_trace_spl(self, ids: List[str], indices: Optional[List[str]]) -> str:
+    async def _run_chunk(self, chunk: List[str], indices: Optional[List[str]], earliest_time: str,
+                         latest_time: str, max_results: int, semaphore: asyncio.Semaphore,
+                         mode: str = "term") -> Tuple[List[str], Dict[str, Any]]:
+        """Search one chunk of IDs in one window; returns raw logs and timing."""
+        spl = self._build_trace_spl(chunk, indices, mode)
+        async with semaphore:
+            logger.info("Trace search chunk", ids=len(chunk), earliest_time=earliest_time, latest_time=latest_time)
+            started = time.monotonic()
+            result = await execute_splunk_query(
+                query=spl,
+                earliest_time=earliest_time,
+                latest_time=latest_time,
+                max_results=max_results
+            )
+            elapsed = time.monotonic() - started
+
+        raw_logs = [r.get("_raw", "") for r in result.get("results", [])]
+        execution = result["metadata"].get("execution", {})
+        return raw_logs, {
+            "earliest_time": earliest_time,
+            "latest_time": latest_time,
+            "mode": mode,
+            "ids": len(chunk),
+            "events": len(raw_logs),
+            "truncated": len(raw_logs) >= max_results,
+            "strategy": execution.get("strategy"),
+            "cache": execution.get("cache"),
+            "elapsed_seconds": round(elapsed, 3)
+        }
+
+    @staticmethod
+    def _cache_trace_events(trace_cache, cache_keys: Dict[str, Optional[str]], searched_ids: List[str],
+                            raw_logs: List[str], matcher: IdMatcher) -> None:
+        """Store the events found for each searched ID, including IDs that had none."""
+        per_id: Dict[str, List[str]] = {i: [] for i in searched_ids}
+        for raw_log in raw_logs:
+            for trace_id in matcher.find(raw_log):
+                if trace_id in per_id:
+                    per_id[trace_id].append(raw_log)
+        for trace_id, logs in per_id.items():
+            key = cache_keys.get(trace_id)
+            if key:
+                trace_cache.put(key, logs)
+
+    @staticmethod
+    def _ids_with_events(raw_logs: List[str], ids: List[str], matcher: Optional[IdMatcher] = None) -> Set[str]:
+        """IDs mentioned in at least one raw log."""
+        matcher = matcher or IdMatcher(ids)
+        wanted = set(ids)
+        return {i for raw_log in raw_logs for i in matcher.find(raw_log) if i in wanted}
+
+    def _build_trace_spl(self, ids: List[str], indices: Optional[List[str]], mode: str = "term") -> str:
         """
-        Build SPL to fetch events where ANY candidate id field matches ANY of the IDs.
-        Adds a conservative fallback on _raw contains for each id.
+        Build SPL to fetch events mentioning ANY of the IDs.
+        'term' mode matches IDs as indexed tokens, so only events whose lexicon contains an ID
+        are read. 'scan' mode matches candidate id fields (equality) plus _raw contains, which
+        has to read every event in the selected indices.
         """
         # index filter
         if indices:
@@ -156,37 +332,73 @@ class SplunkTraceSearchByIdsTool:
         else:
             index_clause = "index=*"
 
-        # field IN (...) for each candidate field
+        if mode == "term":
+            predicate = "(" + " OR ".join(self._term_token(i) for i in ids) + ")"
+            # final SPL; no head here — rely on max_results in API
+            return f"search {index_clause} {predicate} | sort _time"
+
+        # in(field, ...) for each candidate field
         quoted_ids = ",".join(f'"{i}"' for i in ids)
-        field_in_clauses = [f'{f} IN ({quoted_ids})' for f in CANDIDATE_ID_FIELDS]
+        field_in_clauses = [f"in('{f}', {quoted_ids})" for f in CANDIDATE_ID_FIELDS]
 
         # fallback _raw contains for each id (kept last to avoid noise)
-        raw_contains = " OR ".join(f'like(_raw, "%{i}%")' for i in ids)
+        raw_contains = [f'like(_raw, "%{i}%")' for i in ids]
 
-        predicate = "(" + " OR ".join(field_in_clauses + ([raw_contains] if raw_contains else [])) + ")"
+        predicate = " OR ".join(field_in_clauses + raw_contains)
 
-        # final SPL; no head here — rely on max_results in API
-        return f"search {index_clause} {predicate} | sort _time"
+        return f"search {index_clause} | where {predicate} | sort _time"
 
-    def _group_raw_logs_by_ids(self, raw_logs: List[str], ids: List[str]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _term_token(trace_id: str) -> str:
+        """
+        Indexed-token match for an ID.
+        Plain alphanumeric IDs are bare tokens (found even inside 'trace=<id>'); IDs made of
+        several minor segments (UUIDs) use TERM() to hit the whole lexicon entry; anything with
+        a major breaker falls back to a quoted phrase.
+        """
+        if any(c in MAJOR_BREAKERS for c in trace_id) or trace_id.upper() in ("AND", "OR", "NOT"):
+            return '"' + trace_id.replace('"', '\\"') + '"'
+        if trace_id.isalnum():
+            return trace_id
+        return f"TERM({trace_id})"
+
+    def _group_raw_logs_by_ids(self, raw_logs: List[str], ids: List[str], matcher: Optional[IdMatcher] = None,
+                               multi_id_policy: str = "all") -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
         """
         Group raw log strings into traces per requested ID and parse JSON events.
-        Uses _raw contains matching since we only have the raw log strings.
+        Each line is matched once against all IDs: candidate ID fields decide first, _raw
+        contains otherwise. Lines belonging to several IDs follow `multi_id_policy`.
+        Returns the traces and counts of how lines were assigned.
         """
+        matcher = matcher or IdMatcher(ids, CANDIDATE_ID_FIELDS)
         # map id -> parsed events
         buckets: Dict[str, List[Dict[str, Any]]] = {i: [] for i in ids}
+        grouping = {"lines": 0, "by_field": 0, "by_raw": 0, "unmatched": 0, "multi_id": 0, "dropped": 0}
 
-        # Match raw logs to IDs by string contains
         for raw_log in raw_logs:
             if not raw_log:
                 continue
-                
-            # Find which IDs are mentioned in this log (only assign if exactly one match to avoid ambiguity)
-            matches = [i for i in ids if i and i in raw_log]
-            if len(matches) == 1:
-                # Parse JSON if possible, otherwise create a structured event
-                parsed_event = self._parse_log_event(raw_log)
-                buckets[matches[0]].append(parsed_event)
+            grouping["lines"] += 1
+
+            # Parse JSON if possible, otherwise create a structured event
+            parsed_event = self._parse_log_event(raw_log)
+            structured = None if parsed_event.get("raw") is raw_log else parsed_event
+            matches, source = matcher.match(raw_log, structured)
+            if not matches:
+                grouping["unmatched"] += 1
+                continue
+            grouping["by_" + source] += 1
+
+            if len(matches) > 1:
+                grouping["multi_id"] += 1
+                if multi_id_policy == "drop":
+                    grouping["dropped"] += 1
+                    continue
+                if multi_id_policy == "first":
+                    matches = matches[:1]
+
+            for trace_id in matches:
+                buckets[trace_id].append(parsed_event)
 
         # Convert to expected format with parsed events
         traces: List[Dict[str, Any]] = []
@@ -194,7 +406,7 @@ class SplunkTraceSearchByIdsTool:
             events_for_id = buckets.get(i, [])
             traces.append({"id": i, "events": events_for_id})
 
-        return traces
+        return traces, grouping
 
     def _parse_log_event(self, raw_log: str) -> Dict[str, Any]:
         """
@@ -202,10 +414,11 @@ class SplunkTraceSearchByIdsTool:
         Attempts JSON parsing first, falls back to structured plain text parsing.
         """
         try:
-            # Try to parse as JSON
-            parsed = json.loads(raw_log)
-            if isinstance(parsed, dict):
-                return parsed
+            # Try to parse as JSON (only objects are events)
+            if raw_log.lstrip().startswith("{"):
+                parsed = json.loads(raw_log)
+                if isinstance(parsed, dict):
+                    return parsed
         except (json.JSONDecodeError, TypeError):
             pass
         
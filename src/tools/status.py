@@ -0,0 +1,128 @@
+"""Splunk status tool implementation for MCP."""
+
+from typing import Dict, Any, List, Optional
+import structlog
+from mcp.types import Tool, TextContent
+from .encoding import get_response_encoder
+from ..splunk.async_client import AsyncSplunkClient
+from ..splunk.cache import get_search_cache, get_trace_cache
+from .artifacts import get_artifact_store
+from .monitor import get_monitor_tool
+from .monitor_scheduler import get_monitor_scheduler
+from .prompt import get_prompt_registry
+from ..splunk.jobs import get_job_registry
+from ..splunk.pool import SplunkSessionPool, get_session_pool
+from ..splunk.resilience import CircuitBreaker, get_circuit_breaker
+from ..splunk.scheduler import get_search_scheduler
+
+logger = structlog.get_logger(__name__)
+
+
+class SplunkStatusTool:
+    """
+    MCP tool reporting the health of the Splunk connection layer.
+
+    Shows the circuit breaker state (is splunkd being short-circuited and
+    when is the next probe), search admission, session pool, result cache
+    and retained job counters, so an agent can tell "Splunk is down" apart
+    from "my search is wrong".
+    """
+
+    def __init__(self):
+        self._client: Optional[SplunkSessionPool] = None
+        self._async_client: Optional[AsyncSplunkClient] = None
+
+    def get_client(self) -> SplunkSessionPool:
+        if self._client is None:
+            self._client = get_session_pool()
+        return self._client
+
+    def get_async_client(self) -> AsyncSplunkClient:
+        if self._async_client is None:
+            self._async_client = AsyncSplunkClient(self.get_client())
+        return self._async_client
+
+    def get_tool_definition(self) -> Tool:
+        return Tool(
+            name="splunk_status",
+            description=(
+                "Report Splunk connectivity health: circuit breaker state, search queue, "
+                "session pool, result cache and retained jobs. Use it when searches fail "
+                "with 'circuit breaker open' or seem slow."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "check_connection": {
+                        "type": "boolean",
+                        "description": "Also make a live server-info call (goes through the breaker)",
+                        "default": False
+                    }
+                },
+                "required": []
+            }
+        )
+
+    async def execute(self, arguments: Dict[str, Any]) -> List[TextContent]:
+        try:
+            check_connection = arguments.get("check_connection", False)
+            breaker = get_circuit_breaker()
+
+            status: Dict[str, Any] = {
+                'circuit_breaker': breaker.get_state(),
+                'scheduler': get_search_scheduler().get_stats(),
+                'session_pool': self.get_client().get_stats(),
+                'result_cache': get_search_cache().get_stats(),
+                'trace_cache': get_trace_cache().get_stats(),
+                'artifacts': get_artifact_store().get_stats(),
+                'job_registry': get_job_registry().get_stats(),
+                'prompts': get_prompt_registry().get_stats(),
+                'responses': get_response_encoder().get_stats(),
+                'monitors': {**get_monitor_scheduler().get_stats(), 'coalescing': get_monitor_tool().feeds.get_stats(),
+                             'splunk_jobs': get_monitor_tool().get_job_stats()}
+            }
+
+            if check_connection:
+                try:
+                    status['connection'] = await self.get_async_client().test_connection()
+                except Exception as e:
+                    status['connection'] = {'connected': False, 'error': str(e)}
+                status['circuit_breaker'] = breaker.get_state()
+
+            state = status['circuit_breaker']['state']
+            if state == CircuitBreaker.CLOSED:
+                header = "✅ **Splunk Status: Healthy**"
+            elif state == CircuitBreaker.HALF_OPEN:
+                header = "⚠️ **Splunk Status: Recovering**"
+            else:
+                header = (f"❌ **Splunk Status: Unavailable**\n\n"
+                          f"Calls are short-circuited; next probe in "
+                          f"{status['circuit_breaker']['retry_in_seconds']}s.")
+
+            return [TextContent(
+                type="text",
+                text=f"{header}\n\n```json\n{get_response_encoder().dumps(status, tool='splunk_status', mode='pretty')}\n```"
+            )]
+
+        except Exception as e:
+            logger.error("Unexpected error in status tool", error=str(e))
+            return [TextContent(
+                type="text",
+                text=f"❌ **Unexpected Error**\n\n"
+                     f"An unexpected error occurred: {e}"
+            )]
+
+
+_status_tool = SplunkStatusTool()
+
+
+def get_status_tool() -> SplunkStatusTool:
+    return _status_tool
+
+
+def get_tool_definition() -> Tool:
+    return _status_tool.get_tool_definition()
+
+
+async def execute_status(arguments: Dict[str, Any]) -> List[TextContent]:
+    return await _status_tool.execute(arguments)
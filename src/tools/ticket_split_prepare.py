@@ -3,12 +3,11 @@
 from __future__ import annotations
 
 import json
-from pathlib import Path
-from string import Template
 from typing import Dict, Any, List, Optional
 
 import structlog
 from mcp.types import Tool, TextContent
+from .encoding import dumps_response
 from .prompt import BasePromptTool
 
 logger = structlog.get_logger(__name__)
@@ -39,10 +38,6 @@ class TicketSplitPrepareTool(BasePromptTool):
             ),
             prompt_filename="ticket_split_prepare.txt",
         )
-        # Shared plan template: contains {{nextTool}}, {{argsJson}}, {{reason}}
-        self._plan_tpl = Template(
-            (Path(__file__).parent.parent / "prompts" / "shared_plan_template.txt").read_text(encoding="utf-8")
-        )
 
     def get_tool_definition(self) -> Tool:
         return Tool(
@@ -140,7 +135,7 @@ Please analyze the inputData below and provide the ticket split preparation as s
             ],
             "autoExecuteHint": True
         }
-        response_json = json.dumps(response_data, indent=2)
+        response_json = dumps_response(response_data, tool="ticket_split_prepare")
         
         return [TextContent(type="text", text=response_json)]
 
@@ -0,0 +1,60 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from src.splunk import cache, resilience, scheduler
+from src.tools import artifacts, encoding, monitor_scheduler
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breaker():
+    """Give each test a fresh process-wide circuit breaker.
+
+    Tests that simulate an unreachable splunkd would otherwise leave the
+    shared breaker open for the tests that follow.
+    """
+    resilience._circuit_breaker = None
+    yield
+    resilience._circuit_breaker = None
+
+
+@pytest.fixture(autouse=True)
+def reset_search_scheduler():
+    """Give each test a fresh process-wide search scheduler."""
+    scheduler._search_scheduler = None
+    yield
+    scheduler._search_scheduler = None
+
+
+@pytest.fixture(autouse=True)
+def reset_trace_cache():
+    """Give each test an empty process-wide trace cache."""
+    cache._trace_cache = None
+    yield
+    cache._trace_cache = None
+
+
+@pytest.fixture(autouse=True)
+def reset_artifact_store():
+    """Give each test an empty process-wide artifact store."""
+    artifacts._artifact_store = None
+    yield
+    artifacts._artifact_store = None
+
+
+@pytest.fixture(autouse=True)
+def reset_response_encoder():
+    """Give each test a response encoder built from the current config."""
+    encoding._response_encoder = None
+    yield
+    encoding._response_encoder = None
+
+
+@pytest.fixture(autouse=True)
+def reset_monitor_scheduler():
+    """Give each test a fresh monitor scheduler and stop the one it used."""
+    monitor_scheduler._monitor_scheduler = None
+    yield
+    if monitor_scheduler._monitor_scheduler is not None:
+        monitor_scheduler._monitor_scheduler.shutdown()
+    monitor_scheduler._monitor_scheduler = None
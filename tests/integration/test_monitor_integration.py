@@ -27,7 +27,7 @@ class TestMonitorIntegration:
         """Test complete monitoring workflow: start -> status -> get_results -> stop."""
         
         # Mock the Splunk client to avoid real connections
-        with patch('src.tools.monitor.SplunkClient') as mock_client_class, \
+        with patch('src.tools.monitor.get_session_pool') as mock_get_pool, \
              patch('src.tools.monitor.get_config') as mock_get_config:
             
             # Setup mocks
@@ -36,7 +36,7 @@ class TestMonitorIntegration:
             mock_get_config.return_value = mock_config
             
             mock_client = Mock()
-            mock_client_class.return_value = mock_client
+            mock_get_pool.return_value.session.return_value.__enter__.return_value = mock_client
             mock_client.execute_search.return_value = [
                 {
                     "_time": "2023-01-01T10:00:00",
@@ -103,9 +103,9 @@ class TestMonitorIntegration:
             
     @pytest.mark.asyncio
     async def test_monitoring_session_replacement(self):
-        """Test that starting a new session replaces the existing one."""
+        """Test that starting a new session runs alongside the existing one."""
         
-        with patch('src.tools.monitor.SplunkClient') as mock_client_class, \
+        with patch('src.tools.monitor.get_session_pool') as mock_get_pool, \
              patch('src.tools.monitor.get_config') as mock_get_config:
             
             # Setup mocks
@@ -114,7 +114,7 @@ class TestMonitorIntegration:
             mock_get_config.return_value = mock_config
             
             mock_client = Mock()
-            mock_client_class.return_value = mock_client
+            mock_get_pool.return_value.session.return_value.__enter__.return_value = mock_client
             mock_client.execute_search.return_value = []
             
             # Start first session
@@ -131,7 +131,7 @@ class TestMonitorIntegration:
             assert first_session is not None
             assert first_session.query == "index=main error"
             
-            # Start second session (should replace first)
+            # Start second session (first keeps running)
             start_args2 = {
                 "action": "start",
                 "query": "index=web status=500",
@@ -145,6 +145,9 @@ class TestMonitorIntegration:
             assert second_session is not None
             assert second_session.query == "index=web status=500"
             assert second_session is not first_session
+            assert first_session.is_active and second_session.is_active
+            assert len(self.tool.sessions) == 2
+            self.tool.cleanup()
             
     @pytest.mark.asyncio
     async def test_error_handling_workflow(self):
@@ -193,7 +196,7 @@ class TestMonitorIntegration:
     async def test_monitoring_analysis_generation(self):
         """Test monitoring analysis generation with various data patterns."""
         
-        with patch('src.tools.monitor.SplunkClient') as mock_client_class, \
+        with patch('src.tools.monitor.get_session_pool') as mock_get_pool, \
              patch('src.tools.monitor.get_config') as mock_get_config:
             
             # Setup mocks
@@ -202,7 +205,7 @@ class TestMonitorIntegration:
             mock_get_config.return_value = mock_config
             
             mock_client = Mock()
-            mock_client_class.return_value = mock_client
+            mock_get_pool.return_value.session.return_value.__enter__.return_value = mock_client
             mock_client.execute_search.return_value = []
             
             # Start monitoring session
@@ -264,7 +267,7 @@ class TestMonitorIntegration:
     async def test_buffer_management(self):
         """Test result buffer management and clearing."""
         
-        with patch('src.tools.monitor.SplunkClient') as mock_client_class, \
+        with patch('src.tools.monitor.get_session_pool') as mock_get_pool, \
              patch('src.tools.monitor.get_config') as mock_get_config:
             
             # Setup mocks
@@ -273,7 +276,7 @@ class TestMonitorIntegration:
             mock_get_config.return_value = mock_config
             
             mock_client = Mock()
-            mock_client_class.return_value = mock_client
+            mock_get_pool.return_value.session.return_value.__enter__.return_value = mock_client
             mock_client.execute_search.return_value = []
             
             # Start monitoring session
@@ -325,7 +328,7 @@ class TestMonitorIntegration:
         assert isinstance(tool1, SplunkMonitorTool)
         
         # Test execute_monitor function
-        with patch('src.tools.monitor.SplunkClient') as mock_client_class, \
+        with patch('src.tools.monitor.get_session_pool') as mock_get_pool, \
              patch('src.tools.monitor.get_config') as mock_get_config:
             
             # Setup mocks
@@ -334,7 +337,7 @@ class TestMonitorIntegration:
             mock_get_config.return_value = mock_config
             
             mock_client = Mock()
-            mock_client_class.return_value = mock_client
+            mock_get_pool.return_value.session.return_value.__enter__.return_value = mock_client
             mock_client.execute_search.return_value = []
             
             # Test status when no session
@@ -349,7 +352,8 @@ class TestMonitorIntegration:
         
         # Create a mock session
         mock_session = Mock()
-        self.tool.current_session = mock_session
+        self.tool.sessions["mon_test"] = mock_session
+        self.tool._current_id = "mon_test"
         
         # Call cleanup
         self.tool.cleanup()
@@ -0,0 +1,104 @@
+"""Unit tests for the artifact store and tools passing artifacts."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.splunk.cache import ByteLRUCache
+from src.tools.analyze_traces_narrative import SplunkLogAnalysisPromptTool
+from src.tools.artifacts import ArtifactNotFoundError, ArtifactStore, get_artifact_store
+from src.tools.group_error_logs_prompt import GroupErrorLogsTool
+from src.tools.splunk_error_search import SplunkErrorSearchTool
+
+
+class TestArtifactStore:
+    """Test cases for ArtifactStore."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.store = ArtifactStore(ByteLRUCache(max_bytes=4096, ttl=60))
+
+    def test_round_trip(self):
+        """Test that a stored payload comes back by id."""
+        artifact_id = self.store.put("traces", [{"id": "t1", "events": []}], session_id="s1")
+
+        assert artifact_id.startswith("art_")
+        assert self.store.get(artifact_id, kind="traces", session_id="s1") == [{"id": "t1", "events": []}]
+
+    def test_sessions_are_isolated(self):
+        """Test that another session can't read an artifact."""
+        artifact_id = self.store.put("traces", [], session_id="s1")
+
+        with pytest.raises(ArtifactNotFoundError):
+            self.store.get(artifact_id, session_id="s2")
+
+    def test_kind_is_checked(self):
+        """Test that an artifact isn't read as another kind."""
+        artifact_id = self.store.put("error_logs", [], session_id="s1")
+
+        with pytest.raises(ArtifactNotFoundError, match="holds error_logs"):
+            self.store.get(artifact_id, kind="traces", session_id="s1")
+
+    def test_expired_artifact(self):
+        """Test that expired artifacts are not found."""
+        store = ArtifactStore(ByteLRUCache(max_bytes=4096, ttl=0.01))
+        artifact_id = store.put("traces", [], session_id="s1")
+
+        with patch('src.splunk.cache.time.monotonic', return_value=1e12):
+            with pytest.raises(ArtifactNotFoundError, match="not found or expired"):
+                store.get(artifact_id, session_id="s1")
+
+    def test_oversized_payload_is_not_stored(self):
+        """Test that a payload larger than the store gets no id."""
+        assert self.store.put("traces", ["x" * 5000], session_id="s1") is None
+
+    def test_spills_to_disk(self, tmp_path):
+        """Test that artifacts evicted from memory are still readable from disk."""
+        store = ArtifactStore(ByteLRUCache(max_bytes=200, ttl=60, disk_dir=str(tmp_path),
+                                           disk_max_bytes=10000))
+        first = store.put("traces", ["a" * 100], session_id="s1")
+        store.put("traces", ["b" * 100], session_id="s1")
+
+        assert store.get(first, session_id="s1") == ["a" * 100]
+
+
+class TestArtifactChain:
+    """Test that chained tools pass payloads by artifact_id."""
+
+    @pytest.mark.asyncio
+    async def test_error_logs_reach_group_step_by_handle(self):
+        """Test that group_error_logs renders logs stored by splunk_error_search."""
+        results = {"results": [{"_raw": "ERROR payment declined trace=abc", "index": "payments"}],
+                   "metadata": {"execution": {"strategy": "normal", "scan_count": 10}}}
+
+        with patch('src.tools.splunk_error_search.execute_splunk_query', AsyncMock(return_value=results)):
+            plan = await SplunkErrorSearchTool().execute({"indices": ["payments"]})
+
+        args = json.loads(plan[0].text)["next"][0]["args"]
+        assert "logs" not in args
+        assert args["log_count"] == 1
+        assert args["preview"] == ["ERROR payment declined trace=abc"]
+
+        prompt = await GroupErrorLogsTool().execute({"artifact_id": args["artifact_id"],
+                                                     "indices": args["indices"]})
+        assert "ERROR payment declined trace=abc" in prompt[0].text
+
+    @pytest.mark.asyncio
+    async def test_analysis_accepts_handle_or_inline(self):
+        """Test that analyze_traces_narrative takes traces inline or by artifact_id."""
+        traces = [{"id": "t1", "events": [{"message": "timeout calling ledger"}]}]
+        artifact_id = get_artifact_store().put("traces", traces)
+        tool = SplunkLogAnalysisPromptTool()
+
+        by_handle = await tool.execute({"artifact_id": artifact_id})
+        inline = await tool.execute({"traces": traces})
+
+        assert by_handle[0].text == inline[0].text
+        assert "timeout calling ledger" in by_handle[0].text
+
+    @pytest.mark.asyncio
+    async def test_unknown_handle(self):
+        """Test that a stale artifact_id is reported."""
+        result = await GroupErrorLogsTool().execute({"artifact_id": "art_missing"})
+
+        assert "Artifact not found" in result[0].text
@@ -0,0 +1,195 @@
+"""Unit tests for the bounded monitoring result buffer."""
+
+import os
+import pytest
+from unittest.mock import Mock
+
+from src.splunk.buffer import ResultRingBuffer
+from src.tools.monitor import MonitoringSession, SplunkMonitorTool
+
+
+def results(start, count):
+    """Monitoring results numbered from start."""
+    return [{"_raw": f"ERROR event {n}", "n": n} for n in range(start, start + count)]
+
+
+class TestResultRingBuffer:
+    """Test cases for ResultRingBuffer."""
+
+    def test_drop_oldest_keeps_newest(self):
+        """Test that a full buffer evicts the oldest results and counts them."""
+        buffer = ResultRingBuffer(max_items=5)
+
+        buffer.extend(results(0, 8))
+
+        assert [r["n"] for r in buffer] == [3, 4, 5, 6, 7]
+        assert buffer.get_stats()["dropped"] == 3
+
+    def test_byte_limit(self):
+        """Test that the byte limit bounds memory independently of the count."""
+        buffer = ResultRingBuffer(max_items=1000, max_bytes=200)
+
+        buffer.extend(results(0, 20))
+
+        stats = buffer.get_stats()
+        assert stats["bytes"] <= 200
+        assert stats["items"] + stats["dropped"] == 20
+
+    def test_cursor_paging(self):
+        """Test that consumers page with cursors and trim what they acknowledged."""
+        buffer = ResultRingBuffer(max_items=100)
+        buffer.extend(results(0, 25))
+
+        first = buffer.read(limit=10)
+        second = buffer.read(cursor=first["next_cursor"], limit=10)
+
+        assert [r["n"] for r in first["results"]] == list(range(10))
+        assert [r["n"] for r in second["results"]] == list(range(10, 20))
+        assert second["remaining"] == 5
+        assert buffer.trim(second["next_cursor"]) == 20
+        assert len(buffer) == 5
+
+    def test_cursor_reports_missed_results(self):
+        """Test that a cursor behind dropped results reports how many were missed."""
+        buffer = ResultRingBuffer(max_items=5)
+        buffer.extend(results(0, 12))
+
+        page = buffer.read(cursor=2, limit=3)
+
+        assert page["missed"] == 5
+        assert [r["n"] for r in page["results"]] == [7, 8, 9]
+
+    def test_spill_to_segments(self, tmp_path):
+        """Test that evicted results are spilled to disk and read back in order."""
+        buffer = ResultRingBuffer(max_items=4, overflow="spill", spill_dir=str(tmp_path), segment_bytes=100)
+
+        buffer.extend(results(0, 10))
+
+        stats = buffer.get_stats()
+        assert (stats["items"], stats["spilled"], stats["dropped"]) == (4, 6, 0)
+        assert len(os.listdir(tmp_path)) > 1
+        page = buffer.read(cursor=3, limit=5)
+        assert [r["n"] for r in page["results"]] == [3, 4, 5, 6, 7]
+        assert [r["n"] for r in buffer.drain()] == list(range(10))
+        assert os.listdir(tmp_path) == []
+
+    def test_spill_is_bounded(self, tmp_path):
+        """Test that the oldest segments are deleted when the spill area is full."""
+        buffer = ResultRingBuffer(max_items=2, overflow="spill", spill_dir=str(tmp_path),
+                                  spill_max_bytes=300, segment_bytes=100)
+
+        buffer.extend(results(0, 30))
+
+        stats = buffer.get_stats()
+        assert stats["spill_bytes"] <= 300
+        assert stats["dropped"] > 0
+        assert len(buffer) == 30 - stats["dropped"]
+        assert [r["n"] for r in buffer][-1] == 29
+
+    def test_cursor_skips_unspilled_gap(self, tmp_path):
+        """Test that paging past a result that failed to spill doesn't repeat results."""
+        buffer = ResultRingBuffer(max_items=2, overflow="spill", spill_dir=str(tmp_path))
+        spill = buffer._spill_locked
+        buffer._spill_locked = lambda seq, result: seq != 2 and spill(seq, result)
+        buffer.extend(results(0, 8))
+
+        first = buffer.read(limit=3)
+        second = buffer.read(cursor=first["next_cursor"], limit=10)
+
+        assert [r["n"] for r in first["results"]] == [0, 1, 3]
+        assert (first["next_cursor"], first["remaining"]) == (4, 4)
+        assert [r["n"] for r in second["results"]] == [4, 5, 6, 7]
+        assert (second["next_cursor"], second["remaining"]) == (8, 0)
+
+    def test_close_removes_own_spill_dir(self):
+        """Test that closing discards spilled results and the temporary spill directory."""
+        buffer = ResultRingBuffer(max_items=2, overflow="spill")
+        buffer.extend(results(0, 6))
+        spill_dir = buffer.spill_dir
+        assert os.listdir(spill_dir)
+
+        assert buffer.close() == 6
+
+        assert not os.path.exists(spill_dir)
+        assert buffer.extend(results(6, 8)) == 0
+        assert len(buffer) == 0
+
+    def test_pause_refuses_overflow(self):
+        """Test that a 'pause' buffer refuses results until it is trimmed."""
+        buffer = ResultRingBuffer(max_items=5, overflow="pause")
+
+        assert buffer.extend(results(0, 8)) == 5
+        assert buffer.paused
+        assert buffer.get_stats()["rejected"] == 3
+
+        buffer.clear()
+        assert not buffer.paused
+
+    def test_pause_takes_whole_batches(self):
+        """Test that a 'pause' buffer takes a whole batch unless it is already full."""
+        buffer = ResultRingBuffer(max_items=5, overflow="pause")
+
+        assert buffer.extend(results(0, 8), whole_batch=True) == 8
+        assert buffer.paused
+        assert buffer.extend(results(8, 2), whole_batch=True) == 0
+
+        stats = buffer.get_stats()
+        assert (stats["items"], stats["dropped"], stats["rejected"]) == (8, 0, 2)
+
+    def test_unknown_policy(self):
+        """Test that an unknown overflow policy is rejected."""
+        with pytest.raises(ValueError, match="Unknown overflow policy"):
+            ResultRingBuffer(overflow="block")
+
+
+class TestMonitoringBuffer:
+    """Test that monitoring sessions use the bounded buffer."""
+
+    def test_paused_session_skips_checks(self):
+        """Test that a session with a full 'pause' buffer doesn't search."""
+        session = MonitoringSession("index=main error", 30,
+                                    results_buffer=ResultRingBuffer(max_items=2, overflow="pause"))
+        client = Mock()
+        client.execute_search.return_value = results(0, 3)
+
+        session._perform_check(client)
+        checked_until = session.last_check_time
+        session._perform_check(client)
+
+        assert client.execute_search.call_count == 1
+        assert session.last_check_time == checked_until
+        status = session.get_status()
+        # The check that filled the buffer keeps all its results; none of its window is lost
+        assert (status["dropped"], status["paused_checks"]) == (0, 1)
+        assert [r["n"] for r in session.results_buffer] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_get_results_with_cursor(self):
+        """Test that get_results pages with a cursor and trims what was read."""
+        tool = SplunkMonitorTool()
+        session = MonitoringSession("index=main error", 30)
+        tool.sessions[session.session_id] = session
+        tool._current_id = session.session_id
+        tool.current_session.results_buffer.extend(results(0, 12))
+
+        page = await tool.execute({"action": "get_results", "cursor": 0, "limit": 5})
+
+        assert "Results Count:** 5" in page[0].text
+        assert "Next Cursor:** 5 (7 more)" in page[0].text
+        assert len(tool.current_session.results_buffer) == 7
+
+    @pytest.mark.asyncio
+    async def test_stop_discards_spilled_results(self):
+        """Test that stopping a session deletes its spill segments and temporary directory."""
+        tool = SplunkMonitorTool()
+        session = MonitoringSession("index=main error", 30,
+                                    results_buffer=ResultRingBuffer(max_items=2, overflow="spill"))
+        tool.sessions[session.session_id] = session
+        tool._current_id = session.session_id
+        session.results_buffer.extend(results(0, 6))
+        spill_dir = session.results_buffer.spill_dir
+
+        await tool.execute({"action": "stop"})
+
+        assert not os.path.exists(spill_dir)
+        assert len(session.results_buffer) == 0
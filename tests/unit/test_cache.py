@@ -0,0 +1,188 @@
+"""Unit tests for the search result cache."""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.config import SplunkConfig
+from src.splunk.cache import ByteLRUCache, SearchResultCache, TraceCache
+from src.splunk.client import SplunkCacheMissError
+from src.splunk.pool import SplunkSessionPool
+
+
+class TestByteLRUCache:
+    """Test cases for ByteLRUCache."""
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Test that the byte budget evicts the least recently used entry."""
+        cache = ByteLRUCache(max_bytes=10, ttl=60)
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        cache.get("a")
+        cache.set("c", b"cccc")
+
+        assert cache.get("a") == b"aaaa"
+        assert cache.get("b") is None
+        assert cache.get("c") == b"cccc"
+        stats = cache.get_stats()
+        assert stats['evictions'] == 1
+        assert stats['bytes'] == 8
+
+    def test_entries_expire(self):
+        """Test that entries are not served after their TTL."""
+        cache = ByteLRUCache(max_bytes=100, ttl=10)
+        with patch('src.splunk.cache.time.monotonic', return_value=100.0):
+            cache.set("a", b"value")
+        with patch('src.splunk.cache.time.monotonic', return_value=111.0):
+            assert cache.get("a") is None
+
+        stats = cache.get_stats()
+        assert stats['expired'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 0
+
+    def test_oversized_values_are_not_cached(self):
+        """Test that a value larger than the budget is ignored."""
+        cache = ByteLRUCache(max_bytes=4, ttl=60)
+        cache.set("a", b"too large")
+
+        assert cache.get("a") is None
+
+    def test_evicted_entries_spill_to_disk(self, tmp_path):
+        """Test that memory evictions are served from the disk tier."""
+        cache = ByteLRUCache(max_bytes=10, ttl=60, disk_dir=str(tmp_path), disk_max_bytes=100)
+        cache.set("a", b"aaaaaa")
+        cache.set("b", b"bbbbbb")
+
+        assert cache.get_stats()['disk_entries'] == 1
+        assert cache.get("a") == b"aaaaaa"
+        stats = cache.get_stats()
+        assert stats['disk_hits'] == 1
+        assert stats['spills'] >= 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test that a new cache instance picks up unexpired disk entries."""
+        cache = ByteLRUCache(max_bytes=10, ttl=60, disk_dir=str(tmp_path), disk_max_bytes=100)
+        cache.set("a", b"aaaaaa")
+        cache.set("b", b"bbbbbb")
+
+        reopened = ByteLRUCache(max_bytes=10, ttl=60, disk_dir=str(tmp_path), disk_max_bytes=100)
+
+        assert reopened.get("a") == b"aaaaaa"
+
+
+class TestSearchResultCache:
+    """Test cache key construction."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = SearchResultCache(ByteLRUCache(max_bytes=1024, ttl=60), granularity=60)
+        self.now = 1700000000.0
+
+    def test_equivalent_queries_share_key(self):
+        """Test that whitespace and the implicit search command are normalized."""
+        key = self.cache.make_key("index=main  error", now=self.now)
+        assert self.cache.make_key("search index=main error", now=self.now) == key
+        assert self.cache.make_key('index=main "a  b"', now=self.now) != \
+            self.cache.make_key('index=main "a b"', now=self.now)
+
+    def test_relative_window_snaps_to_granularity(self):
+        """Test that re-issuing '-24h' within the same bucket hits the same key."""
+        start = 1700000040.0
+        key = self.cache.make_key("index=main", "-24h", "now", now=start)
+
+        assert self.cache.make_key("index=main", "-24h", "now", now=start + 10) == key
+        assert self.cache.make_key("index=main", "-24h", "now", now=start + 60) != key
+
+    def test_shape_is_part_of_key(self):
+        """Test that max_results and fields change the key."""
+        key = self.cache.make_key("index=main", max_results=100, fields=["a", "b"], now=self.now)
+
+        assert self.cache.make_key("index=main", max_results=100, fields=["b", "a"], now=self.now) == key
+        assert self.cache.make_key("index=main", max_results=50, fields=["a", "b"], now=self.now) != key
+        assert self.cache.make_key("index=main", max_results=100, now=self.now) != key
+
+    def test_real_time_searches_are_uncacheable(self):
+        """Test that unresolvable windows produce no key."""
+        assert self.cache.make_key("index=main", "rt-5m", "rt") is None
+
+    def test_results_round_trip(self):
+        """Test that cached results are independent copies."""
+        key = self.cache.make_key("index=main", now=self.now)
+        self.cache.put(key, [{"_raw": "x"}])
+
+        first = self.cache.get(key)
+        first[0]["_raw"] = "mutated"
+
+        assert self.cache.get(key) == [{"_raw": "x"}]
+
+
+class TestTraceCache:
+    """Test trace cache keys."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = TraceCache(ByteLRUCache(max_bytes=1024, ttl=300), granularity=300)
+        self.now = 1700000100.0
+
+    def test_scope_is_part_of_key(self):
+        """Test that indices and lookup mode change the key but index order doesn't."""
+        key = self.cache.make_key("t1", "-72h", "now", ["a", "b"], now=self.now)
+
+        assert self.cache.make_key("t1", "-72h", "now", ["b", "a"], now=self.now + 10) == key
+        assert self.cache.make_key("t1", "-72h", "now", ["a"], now=self.now) != key
+        assert self.cache.make_key("t1", "-72h", "now", ["a", "b"], "scan", now=self.now) != key
+        assert self.cache.make_key("t2", "-72h", "now", ["a", "b"], now=self.now) != key
+
+    def test_empty_result_is_cached(self):
+        """Test that an ID without events is remembered as an empty list."""
+        key = self.cache.make_key("t1", "-72h", "now", now=self.now)
+        self.cache.put(key, [])
+
+        assert self.cache.get(key) == []
+
+
+class TestPoolResultCache:
+    """Test cache modes on SplunkSessionPool.run_search."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.mock_client = Mock()
+        self.mock_client.run_search.side_effect = lambda query, **kwargs: {
+            'results': [{"_raw": "fresh"}],
+            'execution': {'strategy': 'oneshot', 'elapsed_seconds': 0.1}
+        }
+        self.result_cache = SearchResultCache(ByteLRUCache(max_bytes=1024, ttl=60))
+        self.pool = SplunkSessionPool(SplunkConfig(host="localhost", port=8089),
+                                      client_factory=lambda: self.mock_client,
+                                      result_cache=self.result_cache)
+
+    def test_prefer_serves_repeat_searches_from_cache(self):
+        """Test that an identical search is only run once."""
+        first = self.pool.run_search("index=main", cache="prefer", earliest_time="-1h")
+        second = self.pool.run_search("index=main", cache="prefer", earliest_time="-1h")
+
+        assert first['execution']['cache'] == 'miss'
+        assert second['execution']['cache'] == 'hit'
+        assert second['results'] == [{"_raw": "fresh"}]
+        assert self.mock_client.run_search.call_count == 1
+
+    def test_bypass_always_searches(self):
+        """Test that bypass runs the search and refreshes the cache."""
+        self.pool.run_search("index=main", cache="prefer")
+        result = self.pool.run_search("index=main", cache="bypass")
+
+        assert result['execution']['cache'] == 'bypass'
+        assert self.mock_client.run_search.call_count == 2
+
+    def test_only_never_searches(self):
+        """Test that cache-only mode raises on a miss."""
+        with pytest.raises(SplunkCacheMissError):
+            self.pool.run_search("index=main", cache="only")
+
+        self.mock_client.run_search.assert_not_called()
+
+    def test_cache_kwarg_is_not_forwarded(self):
+        """Test that the client never sees the cache argument."""
+        self.pool.run_search("index=main", cache="prefer", max_results=10)
+
+        self.mock_client.run_search.assert_called_once_with("index=main", priority=None, max_results=10)
@@ -0,0 +1,349 @@
+"""Unit tests for the Splunk client."""
+
+import asyncio
+import socket
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+from src.config import SplunkConfig
+from src.splunk.async_client import AsyncSplunkClient
+from src.splunk.client import (
+    SplunkClient,
+    SplunkSearchError,
+    SplunkSearchTimeoutError
+)
+
+
+def make_job(done_sequence, progress_sequence=None, dispatch_state="RUNNING"):
+    """Build a mock job whose is_done() walks through done_sequence."""
+    job = Mock()
+    job.sid = "test-sid"
+    job.resultCount = "0"
+    job.eventCount = "0"
+    progress_sequence = list(progress_sequence or [])
+
+    def is_done():
+        progress = progress_sequence.pop(0) if progress_sequence else "0.0"
+        job._state = Mock(content={'dispatchState': dispatch_state,
+                                   'isFailed': '0',
+                                   'doneProgress': progress})
+        return done_sequence.pop(0)
+
+    job.is_done.side_effect = is_done
+    return job
+
+
+class TestWaitForJob:
+    """Test adaptive job polling."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = SplunkConfig(host="localhost", port=8089, timeout=30,
+                                   poll_interval_min=0.1, poll_interval_max=2.0,
+                                   poll_backoff_factor=2.0)
+        self.client = SplunkClient(self.config)
+
+    @patch('src.splunk.client.time.sleep')
+    def test_backoff_grows_to_max(self, mock_sleep):
+        """Test that the poll interval grows geometrically and is capped."""
+        job = make_job([False] * 6 + [True])
+
+        stats = self.client.wait_for_job(job)
+
+        sleeps = [call.args[0] for call in mock_sleep.call_args_list]
+        assert sleeps == [0.2, 0.4, 0.8, 1.6, 2.0, 2.0]
+        assert stats['polls'] == 7
+        assert stats['sid'] == "test-sid"
+
+    @patch('src.splunk.client.time.sleep')
+    @patch('src.splunk.client.time.monotonic')
+    def test_progress_shortens_interval(self, mock_monotonic, mock_sleep):
+        """Test that a nearly finished job is polled sooner than the backoff."""
+        mock_monotonic.side_effect = [0.0, 1.0, 1.0]
+        job = make_job([False, True], progress_sequence=["0.95"])
+
+        self.client.wait_for_job(job)
+
+        # 1s elapsed at 95% leaves ~0.05s, so poll at the floor instead of 0.2s
+        mock_sleep.assert_called_once_with(0.1)
+
+    @patch('src.splunk.client.time.sleep')
+    @patch('src.splunk.client.time.monotonic')
+    def test_timeout_is_enforced(self, mock_monotonic, mock_sleep):
+        """Test that the wait raises once the deadline passes."""
+        mock_monotonic.side_effect = [0.0, 5.0, 31.0]
+        job = make_job([False, False, True])
+
+        with pytest.raises(SplunkSearchTimeoutError):
+            self.client.wait_for_job(job, timeout=30)
+
+        assert self.client.get_poll_stats()['timeouts'] == 1
+
+    @patch('src.splunk.client.time.sleep')
+    @patch('src.splunk.client.time.monotonic')
+    def test_default_timeout_is_search_timeout(self, mock_monotonic, mock_sleep):
+        """Test that the deadline defaults to the search timeout, not the HTTP timeout."""
+        mock_monotonic.side_effect = [0.0, 31.0, 31.0]
+        job = make_job([False, True])
+
+        stats = self.client.wait_for_job(job)
+
+        assert stats['polls'] == 2
+        assert self.client.get_poll_stats()['timeouts'] == 0
+
+    @patch('src.splunk.client.time.sleep')
+    def test_failed_job_raises(self, mock_sleep):
+        """Test that a FAILED dispatch state aborts the wait."""
+        job = make_job([False], dispatch_state="FAILED")
+
+        with pytest.raises(SplunkSearchError, match="Search job failed"):
+            self.client.wait_for_job(job)
+
+        mock_sleep.assert_not_called()
+
+    @patch('src.splunk.client.time.sleep')
+    def test_poll_stats_accumulate(self, mock_sleep):
+        """Test that poll counters accumulate across jobs."""
+        self.client.wait_for_job(make_job([False, True]))
+        self.client.wait_for_job(make_job([False, False, True]))
+
+        stats = self.client.get_poll_stats()
+        assert stats['jobs'] == 2
+        assert stats['polls'] == 5
+        assert stats['avg_polls_per_job'] == 2.5
+        assert stats['timeouts'] == 0
+
+
+class TestAsyncSplunkClient:
+    """Test the executor-backed async client."""
+
+    @pytest.mark.asyncio
+    async def test_execute_search_delegates(self):
+        """Test that calls are forwarded to the sync client."""
+        sync_client = Mock()
+        sync_client.execute_search.return_value = [{"_raw": "x"}]
+        async_client = AsyncSplunkClient(sync_client, executor=ThreadPoolExecutor(max_workers=2))
+
+        results = await async_client.execute_search("index=main", max_results=5)
+
+        assert results == [{"_raw": "x"}]
+        sync_client.execute_search.assert_called_once_with("index=main", max_results=5)
+
+    @pytest.mark.asyncio
+    async def test_searches_run_concurrently(self):
+        """Test that blocking searches do not serialize on the event loop."""
+        sync_client = Mock()
+        sync_client.execute_search.side_effect = lambda *args, **kwargs: time.sleep(0.2) or []
+        async_client = AsyncSplunkClient(sync_client, executor=ThreadPoolExecutor(max_workers=4))
+
+        started = time.monotonic()
+        await asyncio.gather(*(async_client.execute_search("index=main") for _ in range(4)))
+
+        assert time.monotonic() - started < 0.6
+        assert sync_client.execute_search.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_get_job_results_materializes(self):
+        """Test that job results are consumed on the executor thread."""
+        sync_client = Mock()
+        sync_client.get_job_results.return_value = iter([{"a": 1}, {"a": 2}])
+        async_client = AsyncSplunkClient(sync_client, executor=ThreadPoolExecutor(max_workers=1))
+
+        results = await async_client.get_job_results(Mock())
+
+        assert results == [{"a": 1}, {"a": 2}]
+
+    @pytest.mark.asyncio
+    async def test_execute_search_stream(self):
+        """Test that batches are pulled from the sync stream one at a time."""
+        sync_client = Mock()
+        sync_client.execute_search_stream.return_value = (batch for batch in [[{"a": 1}], [{"a": 2}]])
+        async_client = AsyncSplunkClient(sync_client, executor=ThreadPoolExecutor(max_workers=1))
+
+        batches = [batch async for batch in async_client.execute_search_stream("index=main", batch_size=1)]
+
+        assert batches == [[{"a": 1}], [{"a": 2}]]
+        sync_client.execute_search_stream.assert_called_once_with("index=main", batch_size=1)
+
+
+def make_results_job(total_rows):
+    """Build a mock job whose results() pages through total_rows rows."""
+    job = Mock()
+    job.sid = "test-sid"
+    rows = [{"n": i} for i in range(total_rows)]
+
+    def job_results(output_mode='json', count=0, offset=0, **params):
+        return rows[offset:offset + count] if count else rows[offset:]
+
+    job.results.side_effect = job_results
+    return job
+
+
+@patch('src.splunk.client.results.JSONResultsReader', side_effect=lambda stream: stream)
+class TestJobResultsPaging:
+    """Test paged and streaming result retrieval."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = SplunkConfig(host="localhost", port=8089, results_page_size=10)
+        self.client = SplunkClient(self.config)
+
+    def test_pages_until_short_page(self, mock_reader):
+        """Test that results are requested with count/offset until exhausted."""
+        job = make_results_job(25)
+
+        rows = list(self.client.get_job_results(job))
+
+        assert [row["n"] for row in rows] == list(range(25))
+        offsets = [call.kwargs['offset'] for call in job.results.call_args_list]
+        assert offsets == [0, 10, 20]
+        assert all(call.kwargs['count'] == 10 for call in job.results.call_args_list)
+
+    def test_max_results_limits_last_page(self, mock_reader):
+        """Test that the final page only asks for the remaining rows."""
+        job = make_results_job(100)
+
+        rows = list(self.client.get_job_results(job, max_results=15))
+
+        assert len(rows) == 15
+        counts = [call.kwargs['count'] for call in job.results.call_args_list]
+        assert counts == [10, 5]
+
+    def test_fields_are_pushed_down(self, mock_reader):
+        """Test that field projection is sent to splunkd as f=."""
+        job = make_results_job(3)
+
+        list(self.client.get_job_results(job, fields=["_time", "_raw"]))
+
+        assert job.results.call_args.kwargs['f'] == ["_time", "_raw"]
+
+    def test_execute_search_stream_yields_batches(self, mock_reader):
+        """Test that the streaming search yields page-sized batches and cancels the job."""
+        job = make_results_job(23)
+        self.client.create_search_job = Mock(return_value=job)
+        self.client.wait_for_job = Mock(return_value={'sid': job.sid, 'polls': 1, 'elapsed_seconds': 0.1})
+
+        batches = list(self.client.execute_search_stream("index=main", max_results=50,
+                                                         fields=["_raw"]))
+
+        assert [len(batch) for batch in batches] == [10, 10, 3]
+        self.client.create_search_job.assert_called_once_with("index=main", max_results=50)
+        job.cancel.assert_called_once()
+
+    def test_execute_search_collects_batches(self, mock_reader):
+        """Test that execute_search still returns a flat list."""
+        job = make_results_job(12)
+        self.client.create_search_job = Mock(return_value=job)
+        self.client.wait_for_job = Mock(return_value={'sid': job.sid, 'polls': 1, 'elapsed_seconds': 0.1})
+
+        rows = self.client.execute_search("index=main", max_results=100, strategy="normal")
+
+        assert len(rows) == 12
+        job.cancel.assert_called_once()
+
+    def test_normal_job_reports_scan_stats(self, mock_reader):
+        """Test that run_search reports how much a normal job scanned."""
+        job = make_results_job(2)
+        job._state = Mock(content={'scanCount': '48000', 'eventCount': '2', 'runDuration': '1.25'})
+        self.client.create_search_job = Mock(return_value=job)
+        self.client.wait_for_job = Mock(return_value={'sid': job.sid, 'polls': 1, 'elapsed_seconds': 0.1})
+
+        execution = self.client.run_search("index=main", max_results=10, strategy="normal")['execution']
+
+        assert execution['scan_count'] == 48000
+        assert execution['event_count'] == 2
+        assert execution['run_duration_seconds'] == 1.25
+
+    def test_closing_stream_cancels_job(self, mock_reader):
+        """Test that abandoning the stream early still cancels the job."""
+        job = make_results_job(50)
+        self.client.create_search_job = Mock(return_value=job)
+        self.client.wait_for_job = Mock(return_value={'sid': job.sid, 'polls': 1, 'elapsed_seconds': 0.1})
+
+        stream = self.client.execute_search_stream("index=main", max_results=50)
+        next(stream)
+        stream.close()
+
+        job.cancel.assert_called_once()
+        assert job.results.call_count == 1
+
+
+class FakeResultsReader:
+    """Results reader over (row, is_preview) pairs."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.is_preview = False
+
+    def __iter__(self):
+        for row, is_preview in self.rows:
+            self.is_preview = is_preview
+            yield row
+
+
+class TestExecutionStrategy:
+    """Test oneshot/export/normal strategy selection."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = SplunkConfig(host="localhost", port=8089, oneshot_max_results=1000)
+        self.client = SplunkClient(self.config)
+        self.service = Mock()
+        self.client.get_service = Mock(return_value=self.service)
+
+    def test_choose_strategy(self):
+        """Test that the strategy follows result size and progress needs."""
+        assert self.client.choose_strategy(100) == 'oneshot'
+        assert self.client.choose_strategy(1000) == 'oneshot'
+        assert self.client.choose_strategy(5000) == 'export'
+        assert self.client.choose_strategy(100, needs_progress=True) == 'normal'
+
+    @patch('src.splunk.client.results.JSONResultsReader')
+    def test_small_search_runs_oneshot(self, mock_reader):
+        """Test that a small bounded search is a single oneshot request."""
+        mock_reader.return_value = FakeResultsReader([({"_raw": "a"}, False)])
+
+        result = self.client.run_search("index=main error", max_results=50,
+                                        earliest_time="-1h", fields=["_raw"])
+
+        assert result['results'] == [{"_raw": "a"}]
+        assert result['execution']['strategy'] == 'oneshot'
+        self.service.jobs.oneshot.assert_called_once_with(
+            "search index=main error", output_mode='json', earliest_time="-1h",
+            latest_time='now', count=50, f=["_raw"]
+        )
+        self.service.jobs.create.assert_not_called()
+
+    @patch('src.splunk.client.results.JSONResultsReader')
+    def test_large_search_streams_export(self, mock_reader):
+        """Test that export skips previews, stops at max_results and closes the stream."""
+        rows = [({"n": -1}, True)] + [({"n": i}, False) for i in range(5000)]
+        mock_reader.return_value = FakeResultsReader(rows)
+        stream = self.service.jobs.export.return_value
+
+        result = self.client.run_search("index=main", max_results=2000)
+
+        assert result['execution']['strategy'] == 'export'
+        assert len(result['results']) == 2000
+        assert result['results'][0] == {"n": 0}
+        stream.close.assert_called_once()
+
+    @patch('src.splunk.client.results.JSONResultsReader')
+    def test_oneshot_timeout_falls_back_to_job(self, mock_reader):
+        """Test that a fast-path socket timeout is retried as a normal job."""
+        self.service.jobs.oneshot.side_effect = socket.timeout("timed out")
+        self.client._execute_job = Mock(return_value=[{"_raw": "late"}])
+
+        result = self.client.run_search("index=main", max_results=10)
+
+        assert result['results'] == [{"_raw": "late"}]
+        assert result['execution']['strategy'] == 'normal'
+        assert result['execution']['fallback_from'] == 'oneshot'
+        assert self.client.get_execution_stats()['normal']['searches'] == 1
+
+    def test_unknown_strategy_rejected(self):
+        """Test that an invalid strategy name is an error."""
+        with pytest.raises(SplunkSearchError, match="Unknown execution strategy"):
+            self.client.run_search("index=main", strategy="fastest")
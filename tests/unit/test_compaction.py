@@ -0,0 +1,107 @@
+"""Unit tests for token-budgeted trace compaction."""
+
+import json
+import pytest
+
+from src.tools.analyze_traces_narrative import SplunkLogAnalysisPromptTool
+from src.tools.compaction import collapse_stack_trace, compact_traces, estimate_tokens
+
+STACK = "java.lang.IllegalStateException: ledger closed\n" + "\n".join(
+    f"    at com.shop.Ledger.step{n}(Ledger.java:{n})" for n in range(20))
+
+
+def event(n, message, level="INFO", **extra):
+    """Event of the checkout service as returned by splunk_trace_search_by_ids."""
+    return {"_time": f"2025-10-10T12:00:{n:02d}Z", "service": "checkout", "level": level,
+            "message": message, "_bkt": "main~1~abc", "punct": "--::", "date_hour": "12", **extra}
+
+
+class TestCompactTraces:
+    """Test cases for compact_traces."""
+
+    def test_noise_dropped_and_common_hoisted(self):
+        """Test that Splunk metadata goes and shared fields move to common."""
+        traces = [{"id": "t1", "events": [event(1, "start"), event(2, "done")]}]
+
+        compacted, report = compact_traces(traces, trace_budget=10000)
+
+        assert compacted[0]["common"] == {"service": "checkout", "level": "INFO"}
+        assert compacted[0]["events"] == [{"_time": "2025-10-10T12:00:01Z", "message": "start"},
+                                          {"_time": "2025-10-10T12:00:02Z", "message": "done"}]
+        assert report["traces"][0]["noise_fields_dropped"] == ["_bkt", "date_hour", "punct"]
+        assert report["tokens_after"] < report["tokens_before"]
+
+    def test_repeated_events_are_counted(self):
+        """Test that events equal apart from their time are kept once with a count."""
+        events = [event(0, "start")] + [event(n, "retrying ledger") for n in range(1, 6)]
+
+        compacted, report = compact_traces([{"id": "t1", "events": events}], trace_budget=10000)
+
+        retry = compacted[0]["events"][1]
+        assert (retry["repeat"], retry["repeat_until"]) == (5, "2025-10-10T12:00:05Z")
+        assert report["traces"][0]["duplicates_collapsed"] == 4
+        assert report["events_after"] == 2
+
+    def test_stack_trace_keeps_top_frames(self):
+        """Test that long stack traces are cut to their first frames."""
+        collapsed, elided = collapse_stack_trace(STACK, max_frames=3)
+
+        assert elided == 17
+        assert "step2(" in collapsed and "step3(" not in collapsed
+        assert collapsed.endswith("... 17 more frames")
+
+    def test_budget_keeps_errors_and_ends(self):
+        """Test that an over-budget trace loses middle events but keeps errors, first and last."""
+        events = [event(n, f"step {n} " + "x" * 200) for n in range(40)]
+        events[25] = event(25, "ledger failed", level="ERROR", stack=STACK)
+
+        compacted, report = compact_traces([{"id": "t1", "events": events}], trace_budget=1000)
+
+        kept = compacted[0]["events"]
+        messages = [e.get("message", "") for e in kept]
+        assert messages[0].startswith("step 0 ") and messages[-1].startswith("step 39 ")
+        assert "ledger failed" in messages
+        assert any("elided_events" in e for e in kept)
+        assert estimate_tokens(compacted[0]) <= 1000
+        assert report["traces"][0]["events_elided"] == 40 - report["events_after"]
+        assert report["traces"][0]["stack_frames_elided"] == 15
+
+    def test_total_budget_is_shared(self):
+        """Test that the overall budget caps every trace's share."""
+        traces = [{"id": f"t{i}", "events": [event(n, "x" * 400 + str(n)) for n in range(20)]}
+                  for i in range(4)]
+
+        compacted, report = compact_traces(traces, trace_budget=10000, total_budget=2000)
+
+        assert report["trace_token_budget"] == 500
+        assert report["tokens_after"] <= 2000
+
+
+class TestAnalysisCompaction:
+    """Test that analyze_traces_narrative compacts its input."""
+
+    @pytest.mark.asyncio
+    async def test_prompt_holds_compacted_traces_and_report(self):
+        """Test that the prompt carries the report and compact=False keeps the raw events."""
+        traces = [{"id": "t1", "events": [event(n, "retrying ledger") for n in range(30)]}]
+        tool = SplunkLogAnalysisPromptTool()
+
+        compacted = (await tool.execute({"traces": traces}))[0].text
+        raw = (await tool.execute({"traces": traces, "compact": False}))[0].text
+
+        assert '"compaction":' in compacted
+        assert '"repeat":30' in compacted
+        assert "main~1~abc" not in compacted
+        assert "main~1~abc" in raw and '"compaction":' not in raw
+        assert len(compacted) < len(raw)
+
+    @pytest.mark.asyncio
+    async def test_token_budget_argument(self):
+        """Test that token_budget overrides the configured overall budget."""
+        traces = [{"id": "t1", "events": [event(n, f"step {n} " + "y" * 300) for n in range(50)]}]
+
+        text = (await SplunkLogAnalysisPromptTool().execute({"traces": traces, "token_budget": 800}))[0].text
+
+        report = json.loads(text[text.index('{"traces"'):text.index("\n", text.index('{"traces"'))])["compaction"]
+        assert report["trace_token_budget"] == 800
+        assert report["events_after"] < 50
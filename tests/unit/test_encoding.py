@@ -0,0 +1,78 @@
+"""Unit tests for the response encoder."""
+
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from src.tools import encoding
+from src.tools.encoding import ResponseEncoder, get_response_encoder
+
+PAYLOAD = {"results": [{"host": "web-1", "message": "café timeout", "count": n} for n in range(20)],
+           "metadata": {"query": "index=main error", "execution": {"strategy": "oneshot"}}}
+
+
+class TestResponseEncoder:
+    """Test cases for ResponseEncoder."""
+
+    @pytest.mark.parametrize("encoder", ["json", "auto"])
+    def test_compact_and_pretty_round_trip(self, encoder):
+        """Test that both formats decode to the same value and compact has no whitespace."""
+        compact = ResponseEncoder("compact", encoder).dumps(PAYLOAD)
+        pretty = ResponseEncoder("pretty", encoder).dumps(PAYLOAD)
+
+        assert json.loads(compact) == json.loads(pretty) == PAYLOAD
+        assert "\n" not in compact and '": ' not in compact
+        assert '\n  "results": [' in pretty
+        assert "café" in compact
+        assert len(compact) < len(pretty) * 0.8
+
+    def test_unknown_types_use_str(self):
+        """Test that values JSON can't represent are encoded with str()."""
+        text = ResponseEncoder("compact", "json").dumps({"at": datetime(2025, 10, 10), 1: 2 ** 70})
+
+        assert json.loads(text) == {"at": "2025-10-10 00:00:00", "1": 2 ** 70}
+
+    @pytest.mark.skipif(encoding.orjson is None, reason="orjson not installed")
+    def test_orjson_falls_back_for_big_integers(self):
+        """Test that orjson encoding errors fall back to the standard library."""
+        encoder = ResponseEncoder("compact", "orjson")
+
+        assert encoder.use_orjson
+        assert json.loads(encoder.dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+
+    def test_byte_counters_estimate_savings(self):
+        """Test that bytes are counted per tool and savings estimated from samples."""
+        encoder = ResponseEncoder("compact", "json")
+        for _ in range(12):
+            encoder.dumps(PAYLOAD, tool="splunk_search")
+        encoder.dumps({"ok": True}, tool="logs_debug_entry")
+
+        stats = encoder.get_stats()
+        search = stats["tools"]["splunk_search"]
+        size = len(encoder.dumps(PAYLOAD).encode("utf-8"))
+        pretty_size = len(json.dumps(PAYLOAD, ensure_ascii=False, indent=2).encode("utf-8"))
+        assert (stats["format"], stats["encoder"]) == ("compact", "json")
+        assert (search["responses"], search["bytes"]) == (12, 12 * size)
+        assert search["estimated_bytes_saved"] == pytest.approx(12 * (pretty_size - size), rel=0.01)
+        assert stats["tools"]["logs_debug_entry"]["responses"] == 1
+
+    def test_invalid_mode(self):
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError, match="Unknown response format"):
+            ResponseEncoder("tiny")
+
+
+class TestResponseFormatConfig:
+    """Test that the shared encoder follows MCP settings."""
+
+    def test_pretty_from_environment(self):
+        """Test that MCP_RESPONSE_FORMAT=pretty indents responses."""
+        with patch.dict('os.environ', {'MCP_RESPONSE_FORMAT': 'pretty', 'MCP_JSON_ENCODER': 'json'}), \
+                patch('src.tools.encoding.get_config') as get_config:
+            from src.config import ConfigLoader
+            get_config.return_value = ConfigLoader().load()
+            encoder = get_response_encoder()
+
+        assert (encoder.mode, encoder.use_orjson) == ("pretty", False)
+        assert "\n" in encoder.dumps({"a": [1]})
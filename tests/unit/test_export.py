@@ -39,9 +39,9 @@ class TestSplunkExportTool:
         assert tool_def.inputSchema["required"] == ["query"]
     
     @patch('src.tools.export.get_config')
-    @patch('src.tools.export.SplunkClient')
+    @patch('src.tools.export.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_json_export(self, mock_client_class, mock_get_config):
+    async def test_execute_json_export(self, mock_get_pool, mock_get_config):
         """Test successful JSON export."""
         # Mock configuration
         mock_config = Mock()
@@ -51,7 +51,7 @@ class TestSplunkExportTool:
         
         # Mock client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         
         # Mock search results
         mock_results = [
@@ -95,9 +95,9 @@ class TestSplunkExportTool:
         assert call_args[1]['max_results'] == 100
     
     @patch('src.tools.export.get_config')
-    @patch('src.tools.export.SplunkClient')
+    @patch('src.tools.export.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_csv_export(self, mock_client_class, mock_get_config):
+    async def test_execute_csv_export(self, mock_get_pool, mock_get_config):
         """Test successful CSV export."""
         # Mock configuration
         mock_config = Mock()
@@ -107,7 +107,7 @@ class TestSplunkExportTool:
         
         # Mock client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         
         # Mock search results
         mock_results = [
@@ -140,9 +140,9 @@ class TestSplunkExportTool:
         assert "2024-01-01T12:00:00,server1,ERROR" in result[0].text
     
     @patch('src.tools.export.get_config')
-    @patch('src.tools.export.SplunkClient')
+    @patch('src.tools.export.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_xml_export(self, mock_client_class, mock_get_config):
+    async def test_execute_xml_export(self, mock_get_pool, mock_get_config):
         """Test successful XML export."""
         # Mock configuration
         mock_config = Mock()
@@ -152,7 +152,7 @@ class TestSplunkExportTool:
         
         # Mock client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         
         # Mock search results
         mock_results = [
@@ -180,9 +180,9 @@ class TestSplunkExportTool:
         assert 'Test &amp; message' in result[0].text  # XML escaped
     
     @patch('src.tools.export.get_config')
-    @patch('src.tools.export.SplunkClient')
+    @patch('src.tools.export.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_with_field_filtering(self, mock_client_class, mock_get_config):
+    async def test_execute_with_field_filtering(self, mock_get_pool, mock_get_config):
         """Test export with field filtering."""
         # Mock configuration
         mock_config = Mock()
@@ -192,7 +192,7 @@ class TestSplunkExportTool:
         
         # Mock client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         
         # Mock search results
         mock_results = [
@@ -224,9 +224,9 @@ class TestSplunkExportTool:
         assert 'extra_field' not in result[0].text
     
     @patch('src.tools.export.get_config')
-    @patch('src.tools.export.SplunkClient')
+    @patch('src.tools.export.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_no_results(self, mock_client_class, mock_get_config):
+    async def test_execute_no_results(self, mock_get_pool, mock_get_config):
         """Test export with no results."""
         # Mock configuration
         mock_config = Mock()
@@ -236,7 +236,7 @@ class TestSplunkExportTool:
         
         # Mock client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         mock_client.execute_search.return_value = []
         
         # Execute tool
@@ -281,9 +281,36 @@ class TestSplunkExportTool:
         assert "Unsupported export format: invalid" in result[0].text
     
     @patch('src.tools.export.get_config')
-    @patch('src.tools.export.SplunkClient')
+    @patch('src.tools.export.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_connection_error(self, mock_client_class, mock_get_config):
+    async def test_execute_from_retained_job(self, mock_get_pool, mock_get_config):
+        """Test exporting from a retained job without re-running the search."""
+        mock_config = Mock()
+        mock_config.mcp.search_timeout = 300
+        mock_get_config.return_value = mock_config
+        
+        mock_client = Mock()
+        mock_get_pool.return_value = mock_client
+        mock_client.read_job.return_value = [{'host': 'web01', 'count': '5'}]
+        
+        arguments = {
+            'query': 'index=main | stats count by host',
+            'format': 'csv',
+            'max_results': 500,
+            'sid': 'sid-123'
+        }
+        
+        result = await self.tool.execute(arguments)
+        
+        mock_client.read_job.assert_called_once_with('sid-123', max_results=500, fields=None)
+        mock_client.execute_search.assert_not_called()
+        assert "✅ **Splunk Export Completed**" in result[0].text
+        assert "web01" in result[0].text
+    
+    @patch('src.tools.export.get_config')
+    @patch('src.tools.export.get_session_pool')
+    @pytest.mark.asyncio
+    async def test_execute_connection_error(self, mock_get_pool, mock_get_config):
         """Test execution with connection error."""
         # Mock configuration
         mock_config = Mock()
@@ -293,7 +320,7 @@ class TestSplunkExportTool:
         
         # Mock client to raise connection error
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         mock_client.execute_search.side_effect = SplunkConnectionError("Connection failed")
         
         # Execute tool
@@ -310,9 +337,9 @@ class TestSplunkExportTool:
         assert "Connection failed" in result[0].text
     
     @patch('src.tools.export.get_config')
-    @patch('src.tools.export.SplunkClient')
+    @patch('src.tools.export.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_search_error(self, mock_client_class, mock_get_config):
+    async def test_execute_search_error(self, mock_get_pool, mock_get_config):
         """Test execution with search error."""
         # Mock configuration
         mock_config = Mock()
@@ -322,7 +349,7 @@ class TestSplunkExportTool:
         
         # Mock client to raise search error
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         mock_client.execute_search.side_effect = SplunkSearchError("Invalid SPL")
         
         # Execute tool
@@ -427,8 +454,8 @@ class TestSplunkExportTool:
         # Call cleanup
         self.tool.cleanup()
         
-        # Verify client was disconnected and cleared
-        mock_client.disconnect.assert_called_once()
+        # Verify the shared pool was left logged in and the reference cleared
+        mock_client.disconnect.assert_not_called()
         assert self.tool._client is None
     
     def test_cleanup_with_error(self):
@@ -0,0 +1,58 @@
+"""Unit tests for the multi-ID matcher."""
+
+from src.splunk.id_matcher import IdMatcher
+
+FIELDS = ["traceId", "trace_id", "x-b3-traceid"]
+
+
+class TestIdMatcher:
+    """Test cases for IdMatcher."""
+
+    def test_finds_all_ids_in_one_line(self):
+        """Test that every ID in a line is found, in order of occurrence."""
+        matcher = IdMatcher(["abc", "abd", "xyz"])
+
+        assert matcher.find("call xyz then abd and abc, abc again") == ["xyz", "abd", "abc"]
+        assert matcher.find("nothing here") == []
+
+    def test_matches_agree_with_substring_search(self):
+        """Test that the automaton finds the same IDs as a substring check."""
+        ids = [f"{n:04x}ab{n % 7}" for n in range(300)]
+        matcher = IdMatcher(ids)
+        line = "start " + " ".join(ids[::17]) + " " + ids[5] + "zz end"
+
+        assert sorted(matcher.find(line)) == sorted(i for i in ids if i in line)
+
+    def test_id_inside_longer_id_is_not_counted(self):
+        """Test that t1 is not reported for an occurrence of t10."""
+        matcher = IdMatcher(["t1", "t10", "10"])
+
+        assert matcher.find("trace t10 done") == ["t10"]
+        assert matcher.find("t1 and t10") == ["t1", "t10"]
+
+    def test_special_characters_are_literal(self):
+        """Test that regex metacharacters in IDs match literally."""
+        matcher = IdMatcher(["a.b*c", "(x)"])
+
+        assert matcher.find("got a.b*c and (x)") == ["a.b*c", "(x)"]
+        assert matcher.find("got aXbbc") == []
+
+    def test_structured_fields_take_precedence(self):
+        """Test that an ID field decides the trace even when other IDs are mentioned."""
+        matcher = IdMatcher(["t1", "t2"], FIELDS)
+
+        assert matcher.match('{"traceId": "t1", "msg": "retrying t2"}', {"traceId": "t1", "msg": "retrying t2"}) \
+            == (["t1"], "field")
+        assert matcher.match("level=INFO trace_id=t2 parent t1") == (["t2"], "field")
+        assert matcher.match("level=INFO caller t1 and t2") == (["t1", "t2"], "raw")
+        assert matcher.match("level=INFO nothing") == ([], None)
+
+    def test_field_value_must_be_requested(self):
+        """Test that an unrequested field value falls back to raw matching."""
+        matcher = IdMatcher(["t1"], FIELDS)
+
+        assert matcher.match("x-b3-traceid=other mentions t1") == (["t1"], "raw")
+
+    def test_empty_ids(self):
+        """Test that a matcher without IDs matches nothing."""
+        assert IdMatcher(["", ""]).find("anything") == []
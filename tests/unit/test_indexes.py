@@ -27,9 +27,9 @@ class TestSplunkIndexesTool:
         assert "sort_order" in tool_def.inputSchema["properties"]
     
     @patch('src.tools.indexes.get_config')
-    @patch('src.tools.indexes.SplunkClient')
+    @patch('src.tools.indexes.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_success(self, mock_client_class, mock_get_config):
+    async def test_execute_success(self, mock_get_pool, mock_get_config):
         """Test successful execution of indexes tool."""
         # Mock configuration
         mock_config = Mock()
@@ -38,7 +38,7 @@ class TestSplunkIndexesTool:
         
         # Mock client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         
         # Mock index data
         mock_indexes = [
@@ -85,9 +85,9 @@ class TestSplunkIndexesTool:
         mock_client.get_indexes.assert_called_once_with(filter_pattern=None)
     
     @patch('src.tools.indexes.get_config')
-    @patch('src.tools.indexes.SplunkClient')
+    @patch('src.tools.indexes.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_with_filter(self, mock_client_class, mock_get_config):
+    async def test_execute_with_filter(self, mock_get_pool, mock_get_config):
         """Test execution with filter pattern."""
         # Mock configuration
         mock_config = Mock()
@@ -96,7 +96,7 @@ class TestSplunkIndexesTool:
         
         # Mock client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         
         # Mock filtered index data
         mock_indexes = [
@@ -131,9 +131,9 @@ class TestSplunkIndexesTool:
         mock_client.get_indexes.assert_called_once_with(filter_pattern='sec')
     
     @patch('src.tools.indexes.get_config')
-    @patch('src.tools.indexes.SplunkClient')
+    @patch('src.tools.indexes.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_exclude_disabled(self, mock_client_class, mock_get_config):
+    async def test_execute_exclude_disabled(self, mock_get_pool, mock_get_config):
         """Test execution excluding disabled indexes."""
         # Mock configuration
         mock_config = Mock()
@@ -142,7 +142,7 @@ class TestSplunkIndexesTool:
         
         # Mock client
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         
         # Mock index data with disabled index
         mock_indexes = [
@@ -174,9 +174,9 @@ class TestSplunkIndexesTool:
         assert "old_index" not in result[0].text
     
     @patch('src.tools.indexes.get_config')
-    @patch('src.tools.indexes.SplunkClient')
+    @patch('src.tools.indexes.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_connection_error(self, mock_client_class, mock_get_config):
+    async def test_execute_connection_error(self, mock_get_pool, mock_get_config):
         """Test execution with connection error."""
         # Mock configuration
         mock_config = Mock()
@@ -185,7 +185,7 @@ class TestSplunkIndexesTool:
         
         # Mock client to raise connection error
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         mock_client.get_indexes.side_effect = SplunkConnectionError("Connection failed")
         
         # Execute tool
@@ -197,9 +197,9 @@ class TestSplunkIndexesTool:
         assert "Connection failed" in result[0].text
     
     @patch('src.tools.indexes.get_config')
-    @patch('src.tools.indexes.SplunkClient')
+    @patch('src.tools.indexes.get_session_pool')
     @pytest.mark.asyncio
-    async def test_execute_unexpected_error(self, mock_client_class, mock_get_config):
+    async def test_execute_unexpected_error(self, mock_get_pool, mock_get_config):
         """Test execution with unexpected error."""
         # Mock configuration
         mock_config = Mock()
@@ -208,7 +208,7 @@ class TestSplunkIndexesTool:
         
         # Mock client to raise unexpected error
         mock_client = Mock()
-        mock_client_class.return_value = mock_client
+        mock_get_pool.return_value = mock_client
         mock_client.get_indexes.side_effect = Exception("Unexpected error")
         
         # Execute tool
@@ -303,8 +303,8 @@ class TestSplunkIndexesTool:
         # Call cleanup
         self.tool.cleanup()
         
-        # Verify client was disconnected and cleared
-        mock_client.disconnect.assert_called_once()
+        # Verify the shared pool was left logged in and the reference cleared
+        mock_client.disconnect.assert_not_called()
         assert self.tool._client is None
     
     def test_cleanup_with_error(self):
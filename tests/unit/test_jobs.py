@@ -0,0 +1,127 @@
+"""Unit tests for retained search jobs."""
+
+from unittest.mock import Mock, patch
+
+from src.config import SplunkConfig
+from src.splunk.client import SplunkClient
+from src.splunk.jobs import JobRegistry
+
+
+class TestJobRegistry:
+    """Test cases for JobRegistry."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.registry = JobRegistry(ttl=600, max_entries=2)
+
+    def register(self, query, sid, result_count=10, max_results=100):
+        """Register a job for query over the last hour."""
+        key = self.registry.make_key(query, "-1h", "now")
+        return key, self.registry.register(key, sid, query, "-1h", "now",
+                                           max_results=max_results, result_count=result_count)
+
+    def test_lookup_by_key_and_sid(self):
+        """Test that retained jobs are found by key and SID."""
+        key, entry = self.register("index=main", "sid-1")
+
+        assert self.registry.lookup(key) is entry
+        assert self.registry.get("sid-1") is entry
+        assert self.registry.lookup(None) is None
+
+    def test_expired_jobs_are_dropped(self):
+        """Test that jobs past their TTL are no longer returned."""
+        key, _ = self.register("index=main", "sid-1")
+
+        with patch('src.splunk.jobs.time.time', return_value=10 ** 10):
+            assert self.registry.lookup(key) is None
+
+        assert self.registry.get_stats()['expired'] == 1
+
+    def test_oldest_job_is_evicted(self):
+        """Test that the registry stays within max_entries."""
+        first_key, _ = self.register("index=a", "sid-a")
+        self.register("index=b", "sid-b")
+        self.register("index=c", "sid-c")
+
+        assert self.registry.lookup(first_key) is None
+        assert [job['sid'] for job in self.registry.list_jobs()] == ["sid-b", "sid-c"]
+
+    def test_covers(self):
+        """Test which result ranges a retained job can serve."""
+        _, capped = self.register("index=a", "sid-a", result_count=100, max_results=100)
+        _, complete = self.register("index=b", "sid-b", result_count=40, max_results=100)
+
+        assert capped.covers(0, 100)
+        assert not capped.covers(50, 100)
+        assert complete.covers(50, 100)
+
+    def test_loadjob_query(self):
+        """Test building a loadjob pipeline."""
+        _, entry = self.register("index=main", "sid-1")
+
+        assert entry.loadjob_query() == "| loadjob sid-1"
+        assert entry.loadjob_query("| stats count by host") == "| loadjob sid-1 | stats count by host"
+
+
+@patch('src.splunk.client.results.JSONResultsReader', side_effect=lambda stream: stream)
+class TestJobRetention:
+    """Test retaining and reusing jobs from SplunkClient."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.registry = JobRegistry(ttl=600)
+        self.client = SplunkClient(SplunkConfig(host="localhost", port=8089),
+                                   job_registry=self.registry)
+        self.service = Mock()
+        self.client.get_service = Mock(return_value=self.service)
+        self.client.wait_for_job = Mock(return_value={'sid': 'sid-1', 'polls': 1, 'elapsed_seconds': 0.1})
+
+        rows = [{"n": i} for i in range(30)]
+        self.job = Mock()
+        self.job.sid = "sid-1"
+        self.job._state = Mock(content={'resultCount': '30'})
+        self.job.results.side_effect = lambda output_mode='json', count=0, offset=0, **params: \
+            rows[offset:offset + count]
+        self.service.jobs.create.return_value = self.job
+        self.service.job.return_value = self.job
+
+    def test_retained_job_is_not_cancelled(self, mock_reader):
+        """Test that retain keeps the job alive with a TTL and records it."""
+        result = self.client.run_search("index=main", retain=True, max_results=10, earliest_time="-1h")
+
+        self.job.cancel.assert_not_called()
+        self.job.set_ttl.assert_called_once_with(600)
+        assert result['execution']['strategy'] == 'normal'
+        assert result['execution']['sid'] == "sid-1"
+        assert self.registry.get("sid-1").result_count == 30
+
+    def test_follow_up_reads_reuse_job(self, mock_reader):
+        """Test that the next page is read from the retained artifact."""
+        self.client.run_search("index=main", retain=True, max_results=10, earliest_time="-1h")
+
+        page = self.client.run_search("index=main", offset=10, max_results=10, earliest_time="-1h")
+
+        assert page['execution']['strategy'] == 'loadjob'
+        assert [row["n"] for row in page['results']] == list(range(10, 20))
+        self.service.jobs.create.assert_called_once()
+        self.service.jobs.oneshot.assert_not_called()
+        assert self.registry.get_stats()['reused'] == 1
+
+    def test_unretained_job_is_cancelled(self, mock_reader):
+        """Test that normal jobs are still cleaned up."""
+        self.client.run_search("index=main", strategy="normal", max_results=10)
+
+        self.job.cancel.assert_called_once()
+        assert self.registry.list_jobs() == []
+
+    def test_missing_artifact_runs_search_again(self, mock_reader):
+        """Test that a job gone from splunkd is forgotten and the search re-run."""
+        self.client.run_search("index=main", retain=True, max_results=10, earliest_time="-1h")
+        self.service.job.side_effect = Exception("HTTP 404 Not Found")
+
+        result = self.client.run_search("index=main", strategy="normal", max_results=10,
+                                        earliest_time="-1h")
+
+        assert result['execution']['strategy'] == 'normal'
+        assert self.service.jobs.create.call_count == 2
+        assert self.registry.get("sid-1") is None
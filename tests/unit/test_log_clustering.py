@@ -0,0 +1,105 @@
+"""Unit tests for error log template clustering."""
+
+import json
+import time
+import pytest
+
+from src.splunk.log_clustering import cluster_logs, extract_ids, mask_token
+from src.tools.group_error_logs_prompt import GroupErrorLogsTool
+
+
+def payment_log(trace_id, order):
+    """JSON error log of the payment service."""
+    return json.dumps({"level": "ERROR", "service": "payment-api", "traceId": trace_id,
+                       "message": f"Payment declined for order {order}: insufficient funds"})
+
+
+def timeout_log(request_id, millis):
+    """Plain-text timeout log of the ledger service."""
+    return f"2025-10-10T12:00:00Z ERROR ledger request_id={request_id} Timeout after {millis}ms calling 10.0.3.7:5432"
+
+
+class TestMasking:
+    """Test token masking and ID extraction."""
+
+    def test_variable_tokens_are_masked(self):
+        """Test that numbers, hex, UUIDs and IPs become placeholders."""
+        assert mask_token("4858ms") == "<NUM>"
+        assert mask_token("10.0.3.7:5432") == "<IP>"
+        assert mask_token("c6f87718-6d76-b07e-881e-d162ae2eb154") == "<UUID>"
+        assert mask_token("a02f34a6795b929e") == "<HEX>"
+        assert mask_token("trace=a02f34a6795b929e") == "trace=<HEX>"
+        assert mask_token("declined") == "declined"
+
+    def test_named_id_fields_win_over_bare_ids(self):
+        """Test that trace fields rank above other IDs and bare hex."""
+        raw = "ERROR request_id=r1 traceId=t1 parent=0123456789abcdef"
+
+        assert extract_ids(raw) == [("t1", "trace_id"), ("r1", "request_id")]
+        assert extract_ids("failed for 0123456789abcdef0123456789abcdef") == \
+            [("0123456789abcdef0123456789abcdef", "generic_id")]
+
+
+class TestClusterLogs:
+    """Test cases for cluster_logs."""
+
+    def test_logs_group_by_template(self):
+        """Test that logs differing only in variables share a cluster."""
+        logs = ([payment_log(f"p{n}", 1000 + n) for n in range(5)]
+                + [timeout_log(f"r{n}", 100 * n) for n in range(3)]
+                + ["ERROR inventory stock service unavailable"])
+
+        clusters = cluster_logs(logs)
+
+        assert [cluster.count for cluster in clusters] == [5, 3, 1]
+        summary = clusters[0].to_dict()
+        assert summary["template"] == "payment-api Payment declined for order <*> insufficient funds"
+        assert (summary["representative_id"], summary["id_field"]) == ("p0", "trace_id")
+        assert len(summary["exemplars"]) == 2
+        assert clusters[1].to_dict()["id_field"] == "request_id"
+        assert clusters[2].to_dict()["representative_id"] is None
+
+    def test_different_messages_stay_apart(self):
+        """Test that messages of the same length but different words are not merged."""
+        clusters = cluster_logs(["ERROR db connection refused by host",
+                                 "ERROR cache key evicted too early"])
+
+        assert len(clusters) == 2
+
+    def test_ten_thousand_logs_cluster_quickly(self):
+        """Test that 10k logs are clustered in well under a second."""
+        logs = [payment_log(f"{n:032x}", n) if n % 2 else timeout_log(f"{n:032x}", n) for n in range(10000)]
+
+        started = time.monotonic()
+        clusters = cluster_logs(logs)
+
+        assert time.monotonic() - started < 2.0
+        assert len(clusters) == 2
+
+
+class TestGroupErrorLogsClustering:
+    """Test that group_error_logs sends cluster summaries."""
+
+    @pytest.mark.asyncio
+    async def test_prompt_lists_clusters_and_prefills_ids(self):
+        """Test that the prompt holds summaries, not every log, and a pre-filled plan."""
+        logs = [{"_raw": payment_log(f"p{n}", n)} for n in range(200)] + [{"_raw": timeout_log("r1", 5)}]
+
+        result = await GroupErrorLogsTool().execute({"logs": logs, "indices": ["payments"]})
+
+        text = result[0].text
+        assert "201 ERROR logs" in text
+        assert '"count":200' in text
+        assert "p150" not in text
+        plan = json.loads(text[text.index('{\n  "kind": "plan"'):text.index("🔴")])
+        assert plan["next"][0]["args"] == {"field_name": "trace_id", "ids": ["p0", "r1"], "indices": ["payments"]}
+
+    @pytest.mark.asyncio
+    async def test_model_clustering_sends_every_log(self):
+        """Test that clustering='model' keeps the original prompt."""
+        logs = [{"_raw": payment_log(f"p{n}", n)} for n in range(3)]
+
+        result = await GroupErrorLogsTool().execute({"logs": logs, "clustering": "model"})
+
+        assert all(f"p{n}" in result[0].text for n in range(3))
+        assert "<EXTRACTED_IDS>" in result[0].text
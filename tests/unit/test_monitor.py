@@ -8,7 +8,9 @@ from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 
+from src.splunk.buffer import ResultRingBuffer
 from src.tools.monitor import (
+    MonitorFeeds,
     MonitoringSession, 
     SplunkMonitorTool, 
     get_monitor_tool,
@@ -17,6 +19,7 @@ from src.tools.monitor import (
 )
 from src.config import Config, SplunkConfig, MCPConfig
 from src.splunk.client import SplunkClient, SplunkSearchError, SplunkConnectionError
+from src.splunk.scheduler import SearchScheduler
 from mcp.types import Tool, TextContent
 
 
@@ -41,9 +44,9 @@ class TestMonitoringSession:
         assert session.interval == self.interval
         assert session.search_params == self.search_params
         assert not session.is_active
-        assert session.thread is None
+        assert session.session_id.startswith("mon_")
         assert session.last_check_time is None
-        assert session.results_buffer == []
+        assert len(session.results_buffer) == 0
         assert session.error_count == 0
         assert session.max_errors == 5
         
@@ -88,21 +91,17 @@ class TestMonitoringSession:
         assert len(results) == 2
         assert len(session.results_buffer) == 0  # Buffer should be empty
         
-    @patch('src.tools.monitor.SplunkClient')
-    @patch('src.tools.monitor.get_config')
-    def test_monitor_loop_success(self, mock_get_config, mock_splunk_client):
+    @patch('src.tools.monitor.get_session_pool')
+    def test_monitor_loop_success(self, mock_get_pool):
         """Test successful monitoring loop execution."""
-        # Mock configuration
-        mock_config = Mock()
-        mock_config.splunk = Mock()
-        mock_get_config.return_value = mock_config
-        
-        # Mock Splunk client
+        # Mock pooled Splunk client
         mock_client_instance = Mock()
         mock_client_instance.execute_search.return_value = [
             {"_time": "2023-01-01T10:00:00", "_raw": "test log"}
         ]
-        mock_splunk_client.return_value = mock_client_instance
+        mock_pool = MagicMock()
+        mock_pool.session.return_value.__enter__.return_value = mock_client_instance
+        mock_get_pool.return_value = mock_pool
         
         session = MonitoringSession(
             query=self.query,
@@ -114,28 +113,22 @@ class TestMonitoringSession:
         time.sleep(2)  # Let it run for 2 seconds
         session.stop()
         
-        # Verify client was called
-        mock_client_instance.connect.assert_called_once()
+        # Verify a pooled session was borrowed for each check
+        mock_pool.session.assert_called()
         mock_client_instance.execute_search.assert_called()
-        mock_client_instance.disconnect.assert_called_once()
+        mock_client_instance.connect.assert_not_called()
         
         # Verify results were collected
         assert len(session.results_buffer) > 0
         assert session.error_count == 0
         
-    @patch('src.tools.monitor.SplunkClient')
-    @patch('src.tools.monitor.get_config')
-    def test_monitor_loop_error_handling(self, mock_get_config, mock_splunk_client):
+    @patch('src.tools.monitor.get_session_pool')
+    def test_monitor_loop_error_handling(self, mock_get_pool):
         """Test error handling in monitoring loop."""
-        # Mock configuration
-        mock_config = Mock()
-        mock_config.splunk = Mock()
-        mock_get_config.return_value = mock_config
-        
-        # Mock Splunk client to raise errors
+        # Mock pooled Splunk client to raise errors
         mock_client_instance = Mock()
         mock_client_instance.execute_search.side_effect = SplunkSearchError("Search failed")
-        mock_splunk_client.return_value = mock_client_instance
+        mock_get_pool.return_value.session.return_value.__enter__.return_value = mock_client_instance
         
         session = MonitoringSession(
             query=self.query,
@@ -152,6 +145,34 @@ class TestMonitoringSession:
         assert not session.is_active
         assert session.error_count >= session.max_errors
         
+    @patch('src.tools.monitor.get_search_scheduler')
+    @patch('src.tools.monitor.get_session_pool')
+    def test_check_waits_for_background_slot(self, mock_get_pool, mock_get_scheduler):
+        """Test that a check queues behind interactive searches before borrowing a session."""
+        scheduler = SearchScheduler(max_concurrent=1, detect_quota=False)
+        mock_get_scheduler.return_value = scheduler
+        session = MonitoringSession(query=self.query, interval=60, timeout=0.05)
+        session.max_errors = 1
+        session.is_active = True
+
+        with scheduler.slot('interactive'):
+            assert session.run_check() is True
+            assert session.run_check() is True
+
+        # Queue timeouts skip the check without counting towards max_errors
+        mock_get_pool.return_value.session.assert_not_called()
+        assert session.is_active
+        assert session.error_count == 0
+        assert session.queued_checks == 2
+        assert session.last_check_time is None
+        assert scheduler.get_stats()['by_priority']['background']['queue_timeouts'] == 2
+
+        # Once the slot frees up the check borrows a session and runs
+        mock_get_pool.return_value.session.return_value.__enter__.return_value.execute_search.return_value = []
+        assert session.run_check() is True
+        mock_get_pool.return_value.session.assert_called_once()
+        assert session.last_check_time is not None
+
     def test_session_start_stop(self):
         """Test session start and stop functionality."""
         session = MonitoringSession(
@@ -161,17 +182,18 @@ class TestMonitoringSession:
         
         # Initially not active
         assert not session.is_active
-        assert session.thread is None
+        session.scheduler = Mock()
+        session.scheduler.schedule.return_value = 0.0
         
         # Start session
-        with patch.object(session, '_monitor_loop'):
-            session.start()
-            assert session.is_active
-            assert session.thread is not None
-            
-            # Stop session
-            session.stop()
-            assert not session.is_active
+        session.start()
+        assert session.is_active
+        session.scheduler.schedule.assert_called_once_with(session.session_id, session.interval, session.run_check)
+        
+        # Stop session
+        session.stop()
+        assert not session.is_active
+        session.scheduler.unschedule.assert_called_once_with(session.session_id)
 
 
 class TestSplunkMonitorTool:
@@ -262,11 +284,14 @@ class TestSplunkMonitorTool:
         # Create an existing session
         existing_session = Mock()
         existing_session.is_active = True
-        self.tool.current_session = existing_session
+        existing_session.session_id = "mon_1"
+        self.tool.sessions[existing_session.session_id] = existing_session
+        self.tool._current_id = existing_session.session_id
         
         arguments = {
             "action": "start",
-            "query": "index=main error"
+            "query": "index=main error",
+            "session_id": "mon_1"
         }
         
         with patch.object(MonitoringSession, 'start') as mock_start:
@@ -279,7 +304,8 @@ class TestSplunkMonitorTool:
             existing_session.stop.assert_called_once()
             
             # Verify new session was created
-            assert self.tool.current_session is not None
+            assert self.tool.current_session is not existing_session
+            assert list(self.tool.sessions) == ["mon_1"]
             mock_start.assert_called_once()
         
     @pytest.mark.asyncio
@@ -287,7 +313,8 @@ class TestSplunkMonitorTool:
         """Test successful monitoring stop."""
         # Create a session first
         session = Mock()
-        self.tool.current_session = session
+        self.tool.sessions["mon_test"] = session
+        self.tool._current_id = "mon_test"
         
         arguments = {
             "action": "stop"
@@ -328,7 +355,8 @@ class TestSplunkMonitorTool:
             'error_count': 0,
             'results_in_buffer': 5
         }
-        self.tool.current_session = session
+        self.tool.sessions["mon_test"] = session
+        self.tool._current_id = "mon_test"
         
         arguments = {
             "action": "status"
@@ -367,7 +395,8 @@ class TestSplunkMonitorTool:
             }
         ]
         session.get_buffered_results.return_value = test_results
-        self.tool.current_session = session
+        self.tool.sessions["mon_test"] = session
+        self.tool._current_id = "mon_test"
         
         arguments = {
             "action": "get_results"
@@ -387,7 +416,8 @@ class TestSplunkMonitorTool:
         # Create a mock session with no results
         session = Mock()
         session.get_buffered_results.return_value = []
-        self.tool.current_session = session
+        self.tool.sessions["mon_test"] = session
+        self.tool._current_id = "mon_test"
         
         arguments = {
             "action": "get_results"
@@ -471,7 +501,8 @@ class TestSplunkMonitorTool:
         """Test cleanup functionality."""
         # Create mock session
         session = Mock()
-        self.tool.current_session = session
+        self.tool.sessions["mon_test"] = session
+        self.tool._current_id = "mon_test"
         
         self.tool.cleanup()
         
@@ -522,7 +553,8 @@ class TestThreadSafety:
         # Create a session
         session = Mock()
         session.get_status.return_value = {"query": "test", "is_active": True}
-        self.tool.current_session = session
+        self.tool.sessions["mon_test"] = session
+        self.tool._current_id = "mon_test"
         
         results = []
         
@@ -546,5 +578,111 @@ class TestThreadSafety:
         assert all(result["query"] == "test" for result in results)
 
 
+class TestMonitorFeeds:
+    """Test cases for coalescing equivalent monitoring sessions."""
+    
+    def setup_method(self):
+        """Set up a feed registry on a mock scheduler."""
+        self.scheduler = Mock()
+        self.scheduler.schedule.return_value = 0.0
+        self.scheduler.next_due_in.return_value = 12.0
+        self.feeds = MonitorFeeds(tolerance=0.25, scheduler=self.scheduler)
+        
+    def session(self, query="index=prod_payments error", interval=60, **kwargs):
+        """Start a session on the feed registry."""
+        session = MonitoringSession(query, interval, feeds=self.feeds, **kwargs)
+        session.start()
+        return session
+        
+    def test_equivalent_queries_share_a_feed(self):
+        """Test that normalized-equal queries at compatible intervals share one scheduled search."""
+        first = self.session()
+        second = self.session("  index=prod_payments   error ", interval=70)
+        slower = self.session(interval=300)
+        other = self.session("index=prod_orders error")
+        
+        assert first.feed is second.feed
+        assert slower.feed is not first.feed and other.feed is not first.feed
+        assert self.scheduler.schedule.call_count == 3
+        status = second.get_status()
+        assert status['feed']['subscribers'] == 2
+        assert status['next_check_in'] == 12.0
+        self.scheduler.next_due_in.assert_called_with(first.feed.feed_id)
+        
+    @patch('src.tools.monitor.get_session_pool')
+    def test_one_search_fans_out(self, mock_get_pool):
+        """Test that a feed searches once per tick and fills every subscriber's buffer."""
+        client = Mock()
+        client.execute_search.return_value = [{"_raw": f"ERROR {n}"} for n in range(5)]
+        mock_get_pool.return_value.session.return_value.__enter__.return_value = client
+        first = self.session(max_results=5)
+        second = self.session(max_results=3, timeout=120)
+        
+        assert first.feed.run_check()
+        
+        assert client.execute_search.call_count == 1
+        assert client.execute_search.call_args.kwargs['max_results'] == 5
+        assert client.execute_search.call_args.kwargs['timeout'] == 120
+        assert (len(first.results_buffer), len(second.results_buffer)) == (5, 3)
+        assert first.last_check_time == second.last_check_time
+        assert self.feeds.get_stats()['searches_saved'] == 1
+        
+    @patch('src.tools.monitor.get_search_scheduler')
+    @patch('src.tools.monitor.get_session_pool')
+    def test_queued_feed_check_is_skipped(self, mock_get_pool, mock_get_scheduler):
+        """Test that a feed check not admitted in time is counted for every subscriber, not as an error."""
+        scheduler = SearchScheduler(max_concurrent=1, detect_quota=False)
+        mock_get_scheduler.return_value = scheduler
+        first = self.session(timeout=0.01)
+        second = self.session(timeout=0.05)
+        
+        with scheduler.slot('interactive'):
+            assert first.feed.run_check()
+        
+        mock_get_pool.return_value.session.assert_not_called()
+        assert (first.queued_checks, second.queued_checks) == (1, 1)
+        assert (first.error_count, second.error_count) == (0, 0)
+        assert scheduler.get_stats()['by_priority']['background']['queue_timeouts'] == 1
+        
+    def test_paused_subscribers_skip_the_search(self):
+        """Test that a feed doesn't search when every subscriber's buffer is paused."""
+        first = self.session(results_buffer=ResultRingBuffer(max_items=1, overflow="pause"))
+        first.results_buffer.append({"_raw": "ERROR"})
+        client = Mock()
+        
+        first.feed._perform_check(client, [first])
+        
+        client.execute_search.assert_not_called()
+        assert first.paused_checks == 1
+        
+    def test_last_unsubscribe_unschedules(self):
+        """Test that a feed is unscheduled when its last subscriber stops."""
+        first = self.session()
+        second = self.session()
+        feed_id = first.feed.feed_id
+        
+        first.stop()
+        self.scheduler.unschedule.assert_not_called()
+        second.stop()
+        
+        self.scheduler.unschedule.assert_called_once_with(feed_id)
+        assert self.feeds.get_stats()['feeds'] == 0
+        
+    @pytest.mark.asyncio
+    async def test_tool_status_shows_subscribers(self):
+        """Test that the session list shows sessions sharing a search."""
+        tool = SplunkMonitorTool()
+        tool.feeds = self.feeds
+        for _ in range(3):
+            await tool.execute({"action": "start", "query": "index=prod_payments error", "interval": 30})
+        
+        listing = (await tool.execute({"action": "status"}))[0].text
+        tool.cleanup()
+        
+        assert "(3 subscribers)" in listing
+        assert "3 sessions share 1 searches" in listing
+        assert self.scheduler.schedule.call_count == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
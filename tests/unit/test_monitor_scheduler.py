@@ -0,0 +1,186 @@
+"""Unit tests for the shared monitor scheduler."""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.config import get_config
+from src.tools.monitor import MonitoringSession, SplunkMonitorTool
+from src.tools.monitor_scheduler import MonitorScheduler
+
+
+def wait_for(condition, timeout=3.0):
+    """Poll until condition() is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestMonitorScheduler:
+    """Test cases for MonitorScheduler."""
+
+    def setup_method(self):
+        """Set up a private scheduler."""
+        self.scheduler = MonitorScheduler(max_concurrent_checks=4)
+
+    def teardown_method(self):
+        """Stop the scheduler."""
+        self.scheduler.shutdown()
+
+    def test_first_checks_are_staggered(self):
+        """Test that jobs started together get spread first delays."""
+        delays = [self.scheduler.schedule(f"job{n}", 60, lambda: True) for n in range(8)]
+
+        assert delays[0] == 0.0
+        assert all(0 <= delay < 60 for delay in delays)
+        gaps = [b - a for a, b in zip(sorted(delays), sorted(delays)[1:])]
+        assert min(gaps) > 3
+
+    def test_checks_repeat_until_unscheduled(self):
+        """Test that a job runs every interval and stops when unscheduled."""
+        runs = []
+        self.scheduler.schedule("job", 0.05, lambda: runs.append(1) or True, first_delay=0)
+
+        assert wait_for(lambda: len(runs) >= 3)
+        assert self.scheduler.unschedule("job")
+        time.sleep(0.1)
+        count = len(runs)
+        time.sleep(0.15)
+
+        assert len(runs) == count
+        assert self.scheduler.next_due_in("job") is None
+
+    def test_check_returning_false_stops_job(self):
+        """Test that a check returning False unschedules itself."""
+        runs = []
+        self.scheduler.schedule("job", 0.02, lambda: runs.append(1) or False, first_delay=0)
+
+        assert wait_for(lambda: self.scheduler.get_stats()["checks"] == 1)
+        time.sleep(0.1)
+
+        assert len(runs) == 1
+        assert self.scheduler.get_stats()["jobs"] == 0
+
+    def test_slow_check_does_not_overlap(self):
+        """Test that a job isn't started again while its check is running."""
+        active, overlaps = [], []
+
+        def slow_check():
+            if active:
+                overlaps.append(1)
+            active.append(1)
+            time.sleep(0.15)
+            active.pop()
+            return True
+
+        self.scheduler.schedule("job", 0.02, slow_check, first_delay=0)
+        time.sleep(0.5)
+
+        assert overlaps == []
+        assert self.scheduler.get_stats()["checks"] >= 2
+
+    def test_many_sessions_share_one_loop(self):
+        """Test that many jobs run from one scheduler thread within the check limit."""
+        running, peak, threads = [0], [0], set()
+        lock = threading.Lock()
+
+        def check():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                threads.add(threading.current_thread().name)
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return True
+
+        for n in range(20):
+            self.scheduler.schedule(f"job{n}", 0.2, check)
+
+        assert wait_for(lambda: self.scheduler.get_stats()["checks"] >= 40)
+        stats = self.scheduler.get_stats()
+        assert (stats["jobs"], stats["loop"]) == (20, "private")
+        assert peak[0] <= 4
+        assert all(name.startswith("monitor-check") for name in threads)
+        assert len([t for t in threading.enumerate() if t.name == "monitor-scheduler"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_runs_on_server_loop(self):
+        """Test that the scheduler uses the running event loop when there is one."""
+        runs = []
+        self.scheduler.schedule("job", 0.05, lambda: runs.append(1) or True, first_delay=0)
+
+        for _ in range(100):
+            if len(runs) >= 2:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(runs) >= 2
+        assert self.scheduler.get_stats()["loop"] == "server"
+
+
+class TestMonitorToolSessions:
+    """Test that splunk_monitor runs several sessions at once."""
+
+    @pytest.mark.asyncio
+    @patch('src.tools.monitor.get_session_pool')
+    async def test_concurrent_sessions(self, mock_get_pool):
+        """Test that sessions started separately are addressed by ID and all collect results."""
+        client = MagicMock()
+        client.execute_search.side_effect = lambda query, **kwargs: [{"_raw": query}]
+        mock_get_pool.return_value.session.return_value.__enter__.return_value = client
+        tool = SplunkMonitorTool()
+
+        try:
+            ids = []
+            for index in ("web", "db", "auth"):
+                text = (await tool.execute({"action": "start", "query": f"index={index} error",
+                                            "interval": 10}))[0].text
+                ids.append(text.split("**Session ID:** `")[1].split("`")[0])
+
+            assert len(set(ids)) == 3
+            listing = (await tool.execute({"action": "status"}))[0].text
+            assert "Monitoring Sessions (3)" in listing and all(session_id in listing for session_id in ids)
+
+            # Only the first session is due at once; run every session's search directly
+            for session_id in ids:
+                assert tool.sessions[session_id].feed.run_check()
+            assert all(len(session.results_buffer) >= 1 for session in tool.sessions.values())
+
+            results = (await tool.execute({"action": "get_results", "session_id": ids[1]}))[0].text
+            assert "index=db error" in results and "index=web error" not in results
+
+            await tool.execute({"action": "stop", "session_id": ids[0]})
+            assert sorted(tool.sessions) == sorted(ids[1:])
+            assert tool.sessions[ids[2]].scheduler.get_stats()["jobs"] == 2
+
+            missing = (await tool.execute({"action": "stop", "session_id": ids[0]}))[0].text
+            assert "not found" in missing
+        finally:
+            tool.cleanup()
+
+        assert tool.sessions == {}
+
+    @pytest.mark.asyncio
+    async def test_inactive_sessions_do_not_count_toward_limit(self):
+        """Test that sessions stopped by errors don't block new starts and make room when needed."""
+        tool = SplunkMonitorTool()
+        start = {"action": "start", "query": "index=main error", "interval": 10}
+
+        with patch.object(get_config().mcp, 'monitor_max_sessions', 2), \
+                patch.object(MonitoringSession, 'start', lambda session: setattr(session, 'is_active', True)):
+            await tool.execute(dict(start, session_id="first"))
+            await tool.execute(dict(start, session_id="second"))
+            rejected = (await tool.execute(dict(start, session_id="third")))[0].text
+            assert "Too many monitoring sessions (2 active)" in rejected
+
+            tool.sessions["first"].is_active = False
+            started = (await tool.execute(dict(start, session_id="third")))[0].text
+
+        assert "Monitoring Session Started" in started
+        assert sorted(tool.sessions) == ["second", "third"]
@@ -0,0 +1,220 @@
+"""Unit tests for the Splunk session pool."""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from src.config import SplunkConfig
+from src.splunk.client import SplunkConnectionError
+from src.splunk.pool import SplunkSessionPool
+from src.splunk.scheduler import SearchScheduler
+
+
+class TestSplunkSessionPool:
+    """Test cases for SplunkSessionPool."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = SplunkConfig(host="localhost", port=8089, timeout=5)
+        self.created = []
+        self.scheduler = SearchScheduler(max_concurrent=2, detect_quota=False)
+
+    def factory(self):
+        """Create mock clients and remember them."""
+        mock_client = Mock()
+        mock_client.is_connected.return_value = True
+        mock_client.run_search.return_value = {'results': [], 'execution': {'queue_seconds': 0.0}}
+        self.created.append(mock_client)
+        return mock_client
+
+    def make_pool(self, **kwargs):
+        """Create a pool backed by mock clients."""
+        params = {'size': 2, 'idle_timeout': 300, 'health_check_interval': 60}
+        params.update(kwargs)
+        return SplunkSessionPool(self.config, client_factory=self.factory, scheduler=self.scheduler, **params)
+
+    def test_sessions_are_reused(self):
+        """Test that sequential borrows share one login."""
+        pool = self.make_pool()
+
+        for _ in range(5):
+            with pool.session() as pooled_client:
+                pooled_client.execute_search("index=main")
+
+        assert len(self.created) == 1
+        self.created[0].connect.assert_called_once()
+        stats = pool.get_stats()
+        assert stats['logins'] == 1
+        assert stats['borrows'] == 5
+        assert stats['idle'] == 1
+
+    def test_pool_is_bounded(self):
+        """Test that borrowing beyond the pool size waits and then times out."""
+        pool = self.make_pool(size=1)
+        held = pool.acquire()
+
+        with pytest.raises(SplunkConnectionError, match="Timed out"):
+            pool.acquire(timeout=0.05)
+
+        pool.release(held)
+        assert pool.acquire(timeout=0.05) is held
+
+    def test_waiting_borrower_gets_released_session(self):
+        """Test that a waiting borrower is woken when a session is returned."""
+        pool = self.make_pool(size=1)
+        held = pool.acquire()
+        borrowed = []
+
+        waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire(timeout=2)))
+        waiter.start()
+        pool.release(held)
+        waiter.join(timeout=2)
+
+        assert borrowed == [held]
+        assert pool.get_stats()['waits'] >= 1
+
+    def test_idle_sessions_are_evicted(self):
+        """Test that sessions idle past the timeout are logged out."""
+        pool = self.make_pool(idle_timeout=10)
+        with patch('src.splunk.pool.time.monotonic', return_value=100.0):
+            with pool.session():
+                pass
+
+        with patch('src.splunk.pool.time.monotonic', return_value=200.0):
+            evicted = pool.evict_idle()
+
+        assert evicted == 1
+        self.created[0].disconnect.assert_called_once()
+        assert pool.get_stats()['live'] == 0
+
+    def test_unhealthy_session_is_replaced(self):
+        """Test that a stale session failing its health check is reconnected."""
+        pool = self.make_pool(health_check_interval=0)
+        with pool.session():
+            pass
+        self.created[0].test_connection.side_effect = Exception("session expired")
+
+        with pool.session() as pooled_client:
+            assert pooled_client is self.created[1]
+
+        self.created[0].disconnect.assert_called_once()
+        assert pool.get_stats()['health_check_failures'] == 1
+
+    def test_connection_error_discards_session(self):
+        """Test that sessions raising connection errors are not reused."""
+        pool = self.make_pool()
+
+        with pytest.raises(SplunkConnectionError):
+            with pool.session():
+                raise SplunkConnectionError("connection reset")
+
+        assert pool.get_stats()['live'] == 0
+        assert pool.get_stats()['discarded'] == 1
+        self.created[0].disconnect.assert_called_once()
+
+    def test_execute_search_borrows_session(self):
+        """Test the client-compatible surface of the pool."""
+        pool = self.make_pool()
+
+        pool.execute_search("index=main", max_results=10)
+
+        # The pool holds the scheduler slot, so the client doesn't queue again
+        self.created[0].run_search.assert_called_once_with("index=main", priority=None, max_results=10)
+        assert self.scheduler.get_stats()['by_priority']['interactive']['admitted'] == 1
+
+    def test_interactive_search_overtakes_background_searches(self):
+        """Test that searches queue by priority in the scheduler, not for pooled sessions."""
+        pool = self.make_pool(size=2)
+        order = []
+        finish = threading.Event()
+
+        def run_search(query, **kwargs):
+            order.append(query)
+            finish.wait(2)
+            return {'results': [], 'execution': {'queue_seconds': 0.0}}
+
+        def waiting(priority, count):
+            deadline = time.monotonic() + 2
+            while self.scheduler.get_stats()['by_priority'][priority]['waiting'] < count:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+        pool._client_factory = lambda: Mock(run_search=Mock(side_effect=run_search))
+        interactive = {}
+        searches = [threading.Thread(target=pool.run_search, args=(f"background {n}",),
+                                     kwargs={'priority': 'background'}) for n in range(4)]
+        searches.append(threading.Thread(target=lambda: interactive.update(pool.run_search("interactive"))))
+        for search in searches[:4]:
+            search.start()
+        waiting('background', 2)
+        searches[4].start()
+        waiting('interactive', 1)
+        finish.set()
+        for search in searches:
+            search.join(timeout=2)
+
+        assert len(order) == 5 and order[2] == "interactive"
+        assert interactive['execution']['queue_seconds'] > 0
+        assert pool.get_stats()['waits'] == 0
+
+    def test_borrow_waits_default_to_search_timeout(self):
+        """Test that waiting for a pooled session is bounded by the search timeout."""
+        self.config.search_timeout = 0.05
+        pool = self.make_pool(size=1)
+        held = pool.acquire()
+
+        started = time.monotonic()
+        with pytest.raises(SplunkConnectionError, match="Timed out"):
+            pool.acquire()
+
+        assert time.monotonic() - started < self.config.timeout
+        pool.release(held)
+
+    def test_job_calls_do_not_borrow_sessions(self):
+        """Test that polling and reading a bound job leave every pooled session free."""
+        pool = self.make_pool(size=1)
+        held = pool.acquire()
+        job = Mock()
+        job_client = self.factory()
+        job_client.get_job_results.return_value = iter([{"_raw": "row"}])
+        pool._job_client = job_client
+
+        pool.wait_for_job(job, 10)
+        assert list(pool.get_job_results(job, max_results=5)) == [{"_raw": "row"}]
+
+        job_client.connect.assert_not_called()
+        job_client.wait_for_job.assert_called_once_with(job, 10)
+        job_client.get_job_results.assert_called_once_with(job, output_mode='json', max_results=5)
+        assert pool.get_stats()['borrows'] == 1
+        pool.release(held)
+
+    def test_dedicated_session_is_outside_the_pool(self):
+        """Test that a dedicated session logs in separately and leaves the pool's sessions free."""
+        pool = self.make_pool(size=1)
+        held = pool.acquire()
+
+        with patch('src.splunk.pool.keepalive_handler') as handler, \
+                patch('src.splunk.pool.SplunkClient') as client_class:
+            with pool.dedicated_session(600) as dedicated:
+                assert pool.get_stats()['dedicated'] == 1
+                dedicated.connect.assert_called_once()
+
+        handler.assert_called_once_with(self.config, 600)
+        assert client_class.call_args.kwargs['handler'] is handler.return_value
+        dedicated.disconnect.assert_called_once()
+        stats = pool.get_stats()
+        assert (stats['dedicated'], stats['dedicated_logins'], stats['borrows']) == (0, 1, 1)
+        pool.release(held)
+
+    def test_close_rejects_borrows(self):
+        """Test that a closed pool logs out idle sessions and refuses borrows."""
+        pool = self.make_pool()
+        with pool.session():
+            pass
+
+        pool.close()
+
+        self.created[0].disconnect.assert_called_once()
+        with pytest.raises(SplunkConnectionError, match="closed"):
+            pool.acquire()
@@ -0,0 +1,85 @@
+"""Unit tests for the prompt registry."""
+
+import json
+import os
+import pytest
+from unittest.mock import patch
+
+from src.tools.prompt import PLAN_TEMPLATE_FILE, BasePromptTool, PromptRegistry, get_prompt_registry
+
+
+class TestPromptRegistry:
+    """Test cases for PromptRegistry."""
+
+    def make_registry(self, tmp_path, check_interval=60.0):
+        """Registry over two prompt files in tmp_path."""
+        (tmp_path / "greet.txt").write_text("Hello $name\n", encoding="utf-8")
+        (tmp_path / "other.txt").write_text("Bye", encoding="utf-8")
+        return PromptRegistry(tmp_path, check_interval=check_interval)
+
+    def test_files_are_read_once(self, tmp_path):
+        """Test that all prompts load on first use and renders do no file reads."""
+        registry = self.make_registry(tmp_path)
+
+        assert registry.render("greet.txt", name="Ada") == "Hello Ada\n"
+        with patch("pathlib.Path.read_text", side_effect=AssertionError("disk read")):
+            for _ in range(3):
+                registry.render("greet.txt", name="Bob")
+            assert registry.get_text("other.txt") == "Bye"
+
+        stats = registry.get_stats()
+        assert (stats["templates"], stats["loads"]) == (2, 2)
+        assert stats["renders"]["greet.txt"]["count"] == 4
+        assert stats["renders"]["greet.txt"]["avg_ms"] >= 0
+
+    def test_changed_file_is_reloaded(self, tmp_path):
+        """Test that a file with a new mtime is reloaded once its check interval passed."""
+        registry = self.make_registry(tmp_path, check_interval=0)
+        registry.get_text("greet.txt")
+
+        path = tmp_path / "greet.txt"
+        path.write_text("Hi $name", encoding="utf-8")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+
+        assert registry.render("greet.txt", name="Ada") == "Hi Ada"
+        assert registry.get_stats()["loads"] == 3
+
+    def test_check_interval_defers_reload(self, tmp_path):
+        """Test that mtimes are not checked again within the interval."""
+        registry = self.make_registry(tmp_path)
+        registry.get_text("greet.txt")
+
+        (tmp_path / "greet.txt").write_text("Changed", encoding="utf-8")
+
+        assert registry.get_text("greet.txt") == "Hello $name\n"
+        registry.request_reload()
+        assert registry.get_text("greet.txt") == "Changed"
+        assert registry.get_stats()["reloads"] == 1
+
+    def test_missing_file(self, tmp_path):
+        """Test that an unknown prompt raises FileNotFoundError."""
+        registry = self.make_registry(tmp_path)
+
+        with pytest.raises(FileNotFoundError):
+            registry.get_text("nope.txt")
+
+    def test_shared_plan_template(self):
+        """Test that the shared registry renders the repo's plan template."""
+        plan = get_prompt_registry().render(PLAN_TEMPLATE_FILE, nextTool="splunk_indexes",
+                                            argsJson="{}", reason="start")
+
+        assert json.loads(plan)["next"][0]["toolName"] == "splunk_indexes"
+
+
+class TestBasePromptTool:
+    """Test that prompt tools serve prompts from the registry."""
+
+    @pytest.mark.asyncio
+    async def test_missing_prompt_file(self):
+        """Test that a tool with an unknown prompt file reports it."""
+        tool = BasePromptTool("missing", "Missing prompt", "does_not_exist.txt")
+
+        result = await tool.execute({})
+
+        assert "Prompt File Not Found" in result[0].text
+        assert "Prompt File Not Found" in tool._render_prompt(value="x")
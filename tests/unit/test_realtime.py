@@ -0,0 +1,212 @@
+"""Unit tests for real-time monitoring searches."""
+
+import io
+import json
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from src.splunk.client import SplunkSearchError
+from src.splunk.realtime import RealtimeStream
+from src.tools.monitor import MonitoringSession, SplunkMonitorTool
+
+
+def wait_for(condition, timeout=3.0):
+    """Poll until condition() is true or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def event(offset, indextime=None):
+    """Raw event as streamed by the export endpoint."""
+    return {"_indextime": str(indextime or int(time.time())), "_cd": f"7:{offset}", "_bkt": "main~7~XYZ",
+            "_raw": f"ERROR event {offset}"}
+
+
+class FakeExport(io.RawIOBase):
+    """Export response that streams events, then stays open until closed (or ends if finite).
+
+    With ``error`` set, reading past the events raises it instead.
+    """
+
+    def __init__(self, events, finite=False, error=None):
+        self._data = b"".join(json.dumps({"preview": False, "result": e}).encode() + b"\n" for e in events)
+        self._finite = finite
+        self._error = error
+        self._closed = threading.Event()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._data:
+            if self._error is not None:
+                raise self._error
+            if not self._finite:
+                self._closed.wait(5)
+            return 0
+        size = min(len(buffer), len(self._data))
+        buffer[:size], self._data = self._data[:size], self._data[size:]
+        return size
+
+    def close(self):
+        self._closed.set()
+        super().close()
+
+
+@pytest.fixture
+def export_client():
+    """Dedicated client whose real-time exports are scripted per test."""
+    client = MagicMock()
+    with patch('src.splunk.realtime.get_session_pool') as get_pool:
+        get_pool.return_value.dedicated_session.return_value.__enter__.return_value = client
+        client.pool = get_pool.return_value
+        yield client
+
+
+class TestRealtimeStream:
+    """Test cases for RealtimeStream."""
+
+    def test_events_are_delivered_as_they_arrive(self, export_client):
+        """Test that one connection delivers every event and stop ends it."""
+        export_client.open_realtime_export.return_value = FakeExport([event(n) for n in range(3)])
+        received = []
+        stream = RealtimeStream("index=main error", received.extend)
+
+        stream.start()
+        assert wait_for(lambda: len(received) == 3)
+        stream.stop()
+
+        assert not stream.running
+        assert stream.get_stats()["connects"] == 1
+        export_client.open_realtime_export.assert_called_once_with("index=main error", earliest_time="rt")
+        export_client.pool.session.assert_not_called()
+        export_client.pool.dedicated_session.assert_called_once_with(300.0)
+
+    def test_quiet_timeout_reconnects_without_failing(self, export_client):
+        """Test that read timeouts and dropped connections on a working search aren't failures."""
+        export_client.open_realtime_export.side_effect = [
+            FakeExport([], error=TimeoutError("The read operation timed out")),
+            FakeExport([], error=TimeoutError("The read operation timed out")),
+            FakeExport([event(1)], error=ConnectionResetError("reset by peer")),
+            FakeExport([event(2)]),
+        ]
+        received = []
+        stopped = []
+        stream = RealtimeStream("index=main error", received.extend, reconnect_min=0.01,
+                                max_failures=1, on_stopped=stopped.append, read_timeout=60)
+
+        stream.start()
+        assert wait_for(lambda: len(received) == 2)
+        stream.stop()
+
+        stats = stream.get_stats()
+        assert (stats["connects"], stats["quiet_reconnects"], stats["failures"]) == (4, 2, 0)
+        assert stats["last_error"] == "reset by peer"
+        assert stopped == []
+        export_client.pool.dedicated_session.assert_called_with(60)
+
+    def test_reconnect_backfills_the_gap(self, export_client):
+        """Test that a dropped search reconnects with a backfill window limited by index time."""
+        export_client.open_realtime_export.side_effect = [
+            FakeExport([event(1)], finite=True),
+            SplunkSearchError("splunkd restarting"),
+            FakeExport([event(2)]),
+        ]
+        received = []
+        stream = RealtimeStream("index=main error", received.extend, window="rt-5m",
+                                reconnect_min=0.01, backfill_overlap=10)
+
+        stream.start()
+        assert wait_for(lambda: len(received) == 2)
+        stream.stop()
+
+        calls = export_client.open_realtime_export.call_args_list
+        assert calls[0].kwargs["earliest_time"] == "rt-5m"
+        assert calls[2].kwargs["earliest_time"].startswith("rt-") and calls[2].kwargs["earliest_time"].endswith("s")
+        assert calls[2].args[0].startswith("search index_earliest=")
+        stats = stream.get_stats()
+        assert (stats["connects"], stats["reconnects"], stats["failures"]) == (2, 1, 1)
+        assert stats["last_error"] == "splunkd restarting"
+
+    def test_gives_up_after_repeated_failures(self, export_client):
+        """Test that the stream stops and reports after max_failures failed connections."""
+        export_client.open_realtime_export.side_effect = SplunkSearchError("no real-time quota")
+        stopped = []
+        stream = RealtimeStream("index=main error", lambda results: None, reconnect_min=0.01,
+                                max_failures=3, on_stopped=stopped.append)
+
+        stream.start()
+
+        assert wait_for(lambda: not stream.running)
+        assert stopped == ["no real-time quota"]
+        assert export_client.open_realtime_export.call_count == 3
+
+
+class TestRealtimeMonitoring:
+    """Test real-time mode of monitoring sessions."""
+
+    def test_session_buffers_stream_once(self, export_client):
+        """Test that a real-time session buffers each event once and counts one Splunk job."""
+        repeated = event(1)
+        export_client.open_realtime_export.return_value = FakeExport([repeated, event(2), dict(repeated)])
+        session = MonitoringSession("index=main error", 10, mode="realtime")
+
+        session.start()
+        assert wait_for(lambda: session.get_status()["watermark"]["duplicates"] == 1)
+        session.started_at = datetime.now() - timedelta(minutes=10)
+        status = session.get_status()
+        session.stop()
+
+        assert [r["_cd"] for r in session.results_buffer] == ["7:1", "7:2"]
+        assert (status["splunk_jobs"], status["polling_jobs_equivalent"]) == (1, 60)
+        assert status["realtime"]["connected"]
+
+    def test_session_stops_when_stream_gives_up(self):
+        """Test that a session whose stream gives up is marked inactive."""
+        session = MonitoringSession("index=main error", 10, mode="realtime")
+        session.is_active = True
+
+        session._stream_stopped("no real-time quota")
+
+        assert not session.is_active
+        assert session.error_count == session.max_errors
+
+    @pytest.mark.asyncio
+    async def test_tool_validates_realtime_arguments(self):
+        """Test that real-time mode rejects generating searches and non real-time windows."""
+        tool = SplunkMonitorTool()
+
+        tstats = await tool.execute({"action": "start", "query": "| tstats count where index=main",
+                                     "mode": "realtime"})
+        window = await tool.execute({"action": "start", "query": "index=main error",
+                                     "mode": "realtime", "window": "-5m"})
+
+        assert "event search" in tstats[0].text
+        assert "real-time window" in window[0].text
+        assert tool.sessions == {}
+
+    @pytest.mark.asyncio
+    async def test_tool_reports_jobs_against_polling(self, export_client):
+        """Test that status compares Splunk jobs with the polling equivalent."""
+        export_client.open_realtime_export.return_value = FakeExport([event(1)])
+        tool = SplunkMonitorTool()
+
+        try:
+            started = (await tool.execute({"action": "start", "query": "index=main error",
+                                           "mode": "realtime", "window": "rt-1m"}))[0].text
+            tool.current_session.started_at = datetime.now() - timedelta(minutes=5)
+            status = (await tool.execute({"action": "status"}))[0].text
+            jobs = tool.get_job_stats()
+        finally:
+            tool.cleanup()
+
+        assert "**Mode:** realtime" in started
+        assert "**Splunk Jobs:** 1 (polling every 60 seconds: ~5)" in status
+        assert jobs == {"poll": 0, "realtime": 1, "polling_equivalent": 5}
@@ -0,0 +1,212 @@
+"""Unit tests for retries and the circuit breaker."""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.config import SplunkConfig
+from src.splunk.client import SplunkClient, SplunkCircuitOpenError, SplunkSearchError
+from src.splunk.resilience import (
+    CircuitBreaker, CircuitOpenError, RetryPolicy, call_with_retry, is_transient
+)
+from src.tools.encoding import get_response_encoder
+from src.tools.status import SplunkStatusTool
+
+
+class HTTPError(Exception):
+    """Stand-in for splunklib's HTTPError."""
+
+    def __init__(self, status, message=""):
+        super().__init__(f"HTTP {status} {message}")
+        self.status = status
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    """Skip backoff sleeps."""
+    with patch('src.splunk.resilience.time.sleep') as sleep:
+        yield sleep
+
+
+class TestClassification:
+    """Test which errors are retried."""
+
+    def test_transient_errors(self):
+        """Test that throttling, 5xx and connection errors are transient."""
+        assert is_transient(HTTPError(503))
+        assert is_transient(HTTPError(429))
+        assert is_transient(ConnectionResetError())
+        assert is_transient(TimeoutError())
+
+    def test_permanent_errors(self):
+        """Test that client errors and quota rejections are not retried."""
+        assert not is_transient(HTTPError(400))
+        assert not is_transient(HTTPError(401))
+        assert not is_transient(HTTPError(503, "maximum number of concurrent searches reached"))
+        assert not is_transient(ValueError("bad"))
+
+
+class TestCallWithRetry:
+    """Test cases for call_with_retry."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.breaker = CircuitBreaker(failure_threshold=10, recovery_timeout=30)
+        self.policy = RetryPolicy(max_attempts=3, base_delay=0.1)
+
+    def test_retries_transient_failure(self, no_sleep):
+        """Test that an idempotent call is retried until it succeeds."""
+        func = Mock(side_effect=[ConnectionResetError(), HTTPError(502), "ok"])
+
+        assert call_with_retry(func, self.breaker, self.policy, "op") == "ok"
+        assert func.call_count == 3
+        assert no_sleep.call_count == 2
+        assert self.breaker.get_state()['consecutive_failures'] == 0
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that the last error is raised once attempts run out."""
+        func = Mock(side_effect=HTTPError(503))
+
+        with pytest.raises(HTTPError):
+            call_with_retry(func, self.breaker, self.policy, "op")
+        assert func.call_count == 3
+
+    def test_permanent_error_not_retried(self):
+        """Test that a client error is raised immediately and keeps the breaker closed."""
+        func = Mock(side_effect=HTTPError(400))
+
+        with pytest.raises(HTTPError):
+            call_with_retry(func, self.breaker, self.policy, "op")
+        assert func.call_count == 1
+        assert self.breaker.get_state()['failures'] == 0
+
+    def test_non_idempotent_only_retried_when_unsent(self):
+        """Test that a dispatched search is not repeated after a reset."""
+        reset = Mock(side_effect=ConnectionResetError())
+        with pytest.raises(ConnectionResetError):
+            call_with_retry(reset, self.breaker, self.policy, "op", idempotent=False)
+        assert reset.call_count == 1
+
+        refused = Mock(side_effect=[ConnectionRefusedError(), "sid"])
+        assert call_with_retry(refused, self.breaker, self.policy, "op", idempotent=False) == "sid"
+
+    def test_slow_search_timeout_is_not_a_failure(self):
+        """Test that read timeouts of long calls do not count against splunkd."""
+        func = Mock(side_effect=TimeoutError("timed out"))
+
+        with pytest.raises(TimeoutError):
+            call_with_retry(func, self.breaker, self.policy, "op", idempotent=False,
+                            timeouts_are_failures=False)
+        assert self.breaker.get_state()['failures'] == 0
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        breaker.record_failure(ConnectionResetError())
+        breaker.before_call()
+        breaker.record_failure(ConnectionResetError())
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.get_state()['rejected'] == 1
+
+    def test_half_open_allows_single_probe(self):
+        """Test that one probe is let through after the recovery timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        with patch('src.splunk.resilience.time.monotonic', return_value=100.0):
+            breaker.record_failure(ConnectionResetError())
+
+        with patch('src.splunk.resilience.time.monotonic', return_value=131.0):
+            breaker.before_call()
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing probe opens the circuit again."""
+        breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=0)
+        for _ in range(5):
+            breaker.record_failure(ConnectionResetError())
+        breaker.before_call()
+
+        breaker.record_failure(ConnectionResetError())
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_slow_probe_releases_half_open(self):
+        """Test that a probe ending in a slow-search timeout lets the next call probe."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        policy = RetryPolicy(max_attempts=3)
+        with patch('src.splunk.resilience.time.monotonic', return_value=100.0):
+            breaker.record_failure(ConnectionResetError())
+
+        with patch('src.splunk.resilience.time.monotonic', return_value=131.0):
+            with pytest.raises(TimeoutError):
+                call_with_retry(Mock(side_effect=TimeoutError("timed out")), breaker, policy, "op",
+                                idempotent=False, timeouts_are_failures=False)
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+
+            assert call_with_retry(Mock(return_value="ok"), breaker, policy, "op") == "ok"
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.get_state()['rejected'] == 0
+
+
+class TestClientIntegration:
+    """Test the breaker around SplunkClient calls."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        self.client = SplunkClient(SplunkConfig(host="localhost", port=8089, retry_max_attempts=2),
+                                   breaker=self.breaker)
+        self.service = Mock()
+        self.client.get_service = Mock(return_value=self.service)
+
+    def test_job_status_poll_is_retried(self):
+        """Test that a reset during polling does not fail the search."""
+        job = Mock(sid="sid-1")
+        job.is_done.side_effect = [ConnectionResetError(), True]
+
+        stats = self.client.wait_for_job(job, timeout=10)
+
+        assert stats['polls'] == 1
+        assert job.is_done.call_count == 2
+
+    def test_open_circuit_surfaces_dedicated_error(self):
+        """Test that an open breaker raises SplunkCircuitOpenError rather than a search error."""
+        self.service.jobs.create.side_effect = HTTPError(503)
+        for _ in range(2):
+            with pytest.raises(SplunkSearchError):
+                self.client.create_search_job("index=main")
+
+        with pytest.raises(SplunkCircuitOpenError):
+            self.client.create_search_job("index=main")
+        assert self.service.jobs.create.call_count == 2
+
+
+class TestStatusTool:
+    """Test cases for the splunk_status tool."""
+
+    @pytest.mark.asyncio
+    async def test_reports_breaker_state(self):
+        """Test that the breaker state is reported."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure(ConnectionResetError("reset by peer"))
+        tool = SplunkStatusTool()
+        tool._client = Mock(get_stats=Mock(return_value={'size': 4}))
+
+        with patch('src.tools.status.get_circuit_breaker', return_value=breaker):
+            result = await tool.execute({})
+
+        assert "Unavailable" in result[0].text
+        assert '"state": "open"' in result[0].text
+        assert "reset by peer" in result[0].text
+        assert get_response_encoder().get_stats()['tools']['splunk_status']['responses'] == 1
@@ -0,0 +1,167 @@
+"""Unit tests for the search scheduler."""
+
+import io
+import json
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from src.config import SplunkConfig
+from src.splunk.client import SplunkClient, SplunkQuotaExceededError
+from src.splunk.scheduler import SearchScheduler, detect_search_quota, set_session_id, current_session_id
+
+
+def queue_waiter(scheduler, order, label, priority='interactive', session_id=None):
+    """Start a thread that records label once admitted, then releases."""
+    def run():
+        scheduler.acquire(priority, session_id=session_id, timeout=5)
+        order.append(label)
+        scheduler.release()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def wait_for_waiting(scheduler, count):
+    """Block until count tickets are queued."""
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        waiting = sum(stats['waiting'] for stats in scheduler.get_stats()['by_priority'].values())
+        if waiting >= count:
+            return
+        time.sleep(0.005)
+    raise AssertionError("waiters did not queue")
+
+
+class TestSearchScheduler:
+    """Test cases for SearchScheduler."""
+
+    def test_limit_is_enforced(self):
+        """Test that searches beyond the limit wait."""
+        scheduler = SearchScheduler(max_concurrent=1, detect_quota=False)
+        scheduler.acquire()
+
+        with pytest.raises(TimeoutError):
+            scheduler.acquire(timeout=0.05)
+
+        scheduler.release()
+        assert scheduler.acquire(timeout=0.05) == 0.0
+
+    def test_interactive_admitted_before_background(self):
+        """Test that queued interactive searches jump queued monitor checks."""
+        scheduler = SearchScheduler(max_concurrent=1, detect_quota=False)
+        scheduler.acquire()
+        order = []
+
+        threads = [queue_waiter(scheduler, order, "monitor", priority='background', session_id="m")]
+        wait_for_waiting(scheduler, 1)
+        threads.append(queue_waiter(scheduler, order, "agent", session_id="a"))
+        wait_for_waiting(scheduler, 2)
+        scheduler.release()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert order == ["agent", "monitor"]
+
+    def test_sessions_are_served_round_robin(self):
+        """Test that one busy session cannot starve another."""
+        scheduler = SearchScheduler(max_concurrent=1, detect_quota=False)
+        scheduler.acquire()
+        order = []
+
+        threads = []
+        for label in ["a1", "a2", "a3"]:
+            threads.append(queue_waiter(scheduler, order, label, session_id="a"))
+            wait_for_waiting(scheduler, len(threads))
+        threads.append(queue_waiter(scheduler, order, "b1", session_id="b"))
+        wait_for_waiting(scheduler, 4)
+        scheduler.release()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert order.index("b1") < order.index("a2")
+
+    def test_queue_time_metrics(self):
+        """Test that queue waits are recorded per priority."""
+        scheduler = SearchScheduler(max_concurrent=1, detect_quota=False)
+        scheduler.acquire()
+        order = []
+
+        thread = queue_waiter(scheduler, order, "monitor", priority='background')
+        wait_for_waiting(scheduler, 1)
+        time.sleep(0.05)
+        scheduler.release()
+        thread.join(timeout=2)
+
+        stats = scheduler.get_stats()['by_priority']['background']
+        assert stats['queued'] == 1
+        assert stats['admitted'] == 1
+        assert stats['max_wait_seconds'] >= 0.04
+
+    def test_quota_caps_limit(self):
+        """Test that a detected role quota lowers the configured limit once."""
+        scheduler = SearchScheduler(max_concurrent=8)
+        provider = Mock(return_value=3)
+
+        scheduler.ensure_quota(provider)
+        scheduler.ensure_quota(provider)
+
+        provider.assert_called_once()
+        stats = scheduler.get_stats()
+        assert stats['limit'] == 3
+        assert stats['detected_quota'] == 3
+
+    def test_quota_detection_failure_keeps_limit(self):
+        """Test that detection errors fall back to the configured limit."""
+        scheduler = SearchScheduler(max_concurrent=5)
+
+        scheduler.ensure_quota(Mock(side_effect=Exception("403 Forbidden")))
+
+        assert scheduler.get_stats()['limit'] == 5
+
+    def test_unknown_priority(self):
+        """Test that priorities are validated."""
+        scheduler = SearchScheduler(detect_quota=False)
+
+        with pytest.raises(ValueError):
+            scheduler.acquire("urgent")
+
+    def test_session_id_context(self):
+        """Test that the session id can be bound to the current context."""
+        set_session_id("session-1")
+        try:
+            assert current_session_id() == "session-1"
+        finally:
+            set_session_id(None)
+
+
+class TestQuotaDetection:
+    """Test reading the search quota from the REST API."""
+
+    def test_detect_search_quota(self):
+        """Test that the largest role quota applies."""
+        service = Mock()
+        body = json.dumps({'entry': [{'content': {'roles': ['user', 'power']}}]}).encode()
+        service.get.return_value = Mock(body=io.BytesIO(body))
+        service.roles = {
+            'user': Mock(content={'srchJobsQuota': '3'}),
+            'power': Mock(content={'srchJobsQuota': '10'})
+        }
+
+        assert detect_search_quota(service) == 10
+        service.get.assert_called_once_with('authentication/current-context', output_mode='json')
+
+    def test_quota_error_is_reported(self):
+        """Test that quota rejections from splunkd get a dedicated error."""
+        client = SplunkClient(SplunkConfig(host="localhost", port=8089),
+                              scheduler=SearchScheduler(detect_quota=False))
+        service = Mock()
+        service.jobs.create.side_effect = Exception(
+            "HTTP 503: The maximum number of concurrent historical searches for this user has been reached"
+        )
+        client.get_service = Mock(return_value=service)
+
+        with pytest.raises(SplunkQuotaExceededError):
+            client.create_search_job("index=main")
@@ -0,0 +1,120 @@
+"""Unit tests for time-sliced searches."""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from src.splunk.slicing import is_sliceable_query, plan_time_slices, run_sliced_search
+
+NOW = 1_700_000_000.0
+
+
+def slice_search(rows_per_slice, started=None, delay=0.0):
+    """Fake run_search returning rows tagged with their slice's earliest time."""
+    def run_search(query, **kwargs):
+        if started is not None:
+            started.append(kwargs['earliest_time'])
+        time.sleep(delay)
+        rows = [{"slice": kwargs['earliest_time'], "n": i} for i in range(rows_per_slice)]
+        return {'results': rows[:kwargs.get('max_results', 100)],
+                'execution': {'strategy': 'oneshot', 'elapsed_seconds': 0.1}}
+    return run_search
+
+
+class TestPlanTimeSlices:
+    """Test splitting a window into slices."""
+
+    def test_slices_are_contiguous_newest_first(self):
+        """Test that slices cover the window without gaps, newest first."""
+        windows = plan_time_slices("-4h", "now", 4, now=NOW)
+
+        assert len(windows) == 4
+        assert windows[0][1] == "now"
+        assert windows[-1][0] == "-4h"
+        for newer, older in zip(windows, windows[1:]):
+            assert older[1] == newer[0]
+        assert windows[0][0] == str(int(NOW - 3600))
+
+    def test_unresolvable_window(self):
+        """Test that real-time and inverted windows are not sliced."""
+        assert plan_time_slices("rt-5m", "rt", 4, now=NOW) is None
+        assert plan_time_slices("now", "-1h", 4, now=NOW) is None
+
+    def test_slices_are_capped_by_window_length(self):
+        """Test that a short window gets no sub-second slices."""
+        assert len(plan_time_slices("-3s", "now", 10, now=NOW)) == 3
+
+
+class TestIsSliceableQuery:
+    """Test detecting streaming searches."""
+
+    def test_streaming_queries(self):
+        """Test that event searches with streaming commands are sliceable."""
+        assert is_sliceable_query("index=main error")
+        assert is_sliceable_query('index=main | rex "id=(?<id>\\w+)" | table _time id')
+        assert is_sliceable_query('index=main "a|stats" | fields _raw')
+
+    def test_transforming_queries(self):
+        """Test that transforming and generating searches are not sliced."""
+        assert not is_sliceable_query("index=main | stats count by host")
+        assert not is_sliceable_query("index=main | head 10")
+        assert not is_sliceable_query("| tstats count where index=main")
+
+
+class TestRunSlicedSearch:
+    """Test cases for run_sliced_search."""
+
+    def test_results_merged_newest_first(self):
+        """Test that slice results are concatenated newest slice first."""
+        result = run_sliced_search(slice_search(2), "index=main", 3, max_workers=3,
+                                   earliest_time="-3h", latest_time="now", max_results=100)
+
+        slices_seen = [row["slice"] for row in result['results']]
+        assert len(result['results']) == 6
+        assert slices_seen[-1] == "-3h"
+        assert result['execution']['slices_run'] == 3
+        assert len(result['execution']['per_slice']) == 3
+
+    def test_stops_once_max_results_reached(self):
+        """Test that older slices are skipped when newer ones fill max_results."""
+        started = []
+        result = run_sliced_search(slice_search(10, started, delay=0.05), "index=main", 8, max_workers=1,
+                                   earliest_time="-8h", latest_time="now", max_results=15)
+
+        assert len(result['results']) == 15
+        assert result['execution']['slices_run'] == 2
+        assert result['execution']['slices_skipped'] == 6
+        assert len(started) < 8
+
+    def test_transforming_search_runs_unsliced(self):
+        """Test that a stats search runs once over the whole window."""
+        run_search = Mock(return_value={'results': [{"count": "5"}], 'execution': {'strategy': 'oneshot'}})
+
+        result = run_sliced_search(run_search, "index=main | stats count", 4, max_workers=4,
+                                   earliest_time="-4h", latest_time="now")
+
+        run_search.assert_called_once()
+        assert result['execution']['sliced'] is False
+
+    def test_slice_failure_propagates(self):
+        """Test that a failing slice fails the search."""
+        def run_search(query, **kwargs):
+            raise RuntimeError("search failed")
+
+        with pytest.raises(RuntimeError):
+            run_sliced_search(run_search, "index=main", 2, max_workers=2,
+                              earliest_time="-2h", latest_time="now")
+
+    def test_slices_run_concurrently(self):
+        """Test that slices are in flight at the same time."""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def run_search(query, **kwargs):
+            barrier.wait()
+            return {'results': [], 'execution': {'strategy': 'oneshot'}}
+
+        result = run_sliced_search(run_search, "index=main", 3, max_workers=3,
+                                   earliest_time="-3h", latest_time="now")
+
+        assert result['execution']['slices_run'] == 3
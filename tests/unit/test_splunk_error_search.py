@@ -0,0 +1,130 @@
+"""Unit tests for the splunk_error_search tool."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.tools.splunk_error_search import SplunkErrorSearchTool, broadening_windows
+
+
+def search_result(logs, scan_count=1000, cache="miss", index="main"):
+    """Build an execute_splunk_query return value."""
+    return {
+        "results": [{"_raw": line, "index": index} for line in logs],
+        "metadata": {"execution": {"strategy": "normal", "scan_count": scan_count,
+                                   "cache": cache, "elapsed_seconds": 0.5}}
+    }
+
+
+class TestSplunkErrorSearchTool:
+    """Test cases for SplunkErrorSearchTool."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tool = SplunkErrorSearchTool()
+
+    def test_broadening_windows_do_not_overlap(self):
+        """Test that each broadening step covers only the new day."""
+        assert broadening_windows() == [("-24h", "now"), ("-48h", "-24h"), ("-72h", "-48h")]
+
+    @pytest.mark.asyncio
+    async def test_broadening_searches_only_new_windows(self):
+        """Test that the second attempt searches -48h..-24h and stops when errors are found."""
+        query = AsyncMock(side_effect=[search_result([]), search_result(["ERROR boom"])])
+
+        with patch('src.tools.splunk_error_search.execute_splunk_query', query):
+            result = await self.tool.execute({"indices": ["main"]})
+
+        windows = [(call.kwargs["earliest_time"], call.kwargs["latest_time"]) for call in query.call_args_list]
+        assert windows == [("-24h", "now"), ("-48h", "-24h")]
+        assert "ERROR boom" in result[0].text
+        assert "between -48h and -24h" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_concurrent_keeps_nearest_window(self):
+        """Test that concurrent broadening prefers the most recent non-empty window."""
+        results = {
+            "-24h": search_result([]),
+            "-48h": search_result(["ERROR newer"]),
+            "-72h": search_result(["ERROR older"])
+        }
+        query = AsyncMock(side_effect=lambda **kwargs: results[kwargs["earliest_time"]])
+
+        with patch('src.tools.splunk_error_search.execute_splunk_query', query):
+            result = await self.tool.execute({"indices": ["main"], "concurrent": True})
+
+        assert query.call_count == 3
+        assert "ERROR newer" in result[0].text
+        assert "ERROR older" not in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_no_results_reports_scan_per_attempt(self):
+        """Test that the no-results message lists events scanned for each window."""
+        query = AsyncMock(side_effect=[search_result([], scan_count=1500),
+                                       search_result([], scan_count=0, cache="hit"),
+                                       search_result([], scan_count=20)])
+
+        with patch('src.tools.splunk_error_search.execute_splunk_query', query):
+            result = await self.tool.execute({"indices": ["main"]})
+
+        text = result[0].text
+        assert "No matching error logs found" in text
+        assert "-24h → now: 0 matches, 1,500 events scanned" in text
+        assert "-48h → -24h: 0 matches (served from cache)" in text
+        assert "-72h → -48h: 0 matches, 20 events scanned" in text
+
+    @pytest.mark.asyncio
+    async def test_fast_path_windows_count_events_with_tstats(self):
+        """Test that empty oneshot/export windows report the events in their indices instead of a scan."""
+        oneshot = {"results": [], "metadata": {"execution": {"strategy": "oneshot", "cache": "miss",
+                                                             "elapsed_seconds": 0.1}}}
+        counts = iter([{"results": [{"count": "4200"}]}, {"results": [{"count": "0"}]},
+                       {"results": []}])
+        query = AsyncMock(side_effect=lambda **kwargs: next(counts) if "tstats" in kwargs["query"] else oneshot)
+
+        with patch('src.tools.splunk_error_search.execute_splunk_query', query):
+            result = await self.tool.execute({"indices": ["main"]})
+
+        text = result[0].text
+        assert all(call.kwargs["strategy"] == "auto" for call in query.call_args_list)
+        tstats = [call.kwargs for call in query.call_args_list if "tstats" in call.kwargs["query"]]
+        assert tstats[1]["query"] == '| tstats count where (index="main")'
+        assert (tstats[1]["earliest_time"], tstats[1]["latest_time"]) == ("-48h", "-24h")
+        assert "-24h → now: 0 matches, 4,200 events in these indices" in text
+        assert "-48h → -24h: 0 matches, 0 events in these indices" in text
+        assert "indices may be empty" not in text
+
+    @pytest.mark.asyncio
+    async def test_empty_indices_are_reported(self):
+        """Test that windows with no events at all are told apart from windows without errors."""
+        oneshot = {"results": [], "metadata": {"execution": {"strategy": "oneshot", "cache": "miss",
+                                                             "elapsed_seconds": 0.1}}}
+        empty = {"results": [{"count": "0"}]}
+        query = AsyncMock(side_effect=lambda **kwargs: empty if "tstats" in kwargs["query"] else oneshot)
+
+        with patch('src.tools.splunk_error_search.execute_splunk_query', query):
+            result = await self.tool.execute({"indices": ["main"]})
+
+        assert "no events at all were scanned, so the indices may be empty" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_user_range_is_not_broadened(self):
+        """Test that an explicit earliest_time is searched once."""
+        query = AsyncMock(return_value=search_result([]))
+
+        with patch('src.tools.splunk_error_search.execute_splunk_query', query):
+            await self.tool.execute({"indices": ["main"], "earliest_time": "-7d"})
+
+        query.assert_called_once()
+        assert query.call_args.kwargs["earliest_time"] == "-7d"
+
+    @pytest.mark.asyncio
+    async def test_plan_passes_indices_with_errors(self):
+        """Test that the next step is told which indices the errors came from."""
+        query = AsyncMock(return_value=search_result(["ERROR boom"], index="payments"))
+
+        with patch('src.tools.splunk_error_search.execute_splunk_query', query):
+            result = await self.tool.execute({"indices": ["payments", "web"]})
+
+        plan = json.loads(result[0].text[result[0].text.index("{"):])
+        assert plan["next"][0]["args"]["indices"] == ["payments"]
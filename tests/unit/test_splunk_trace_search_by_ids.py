@@ -0,0 +1,248 @@
+"""Unit tests for the splunk_trace_search_by_ids tool."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+
+from src.tools import splunk_trace_search_by_ids as trace_module
+from src.tools.artifacts import get_artifact_store
+from src.tools.splunk_trace_search_by_ids import SplunkTraceSearchByIdsTool
+
+
+def search_result(raw_logs):
+    """Build an execute_splunk_query return value."""
+    return {
+        "results": [{"_raw": raw} for raw in raw_logs],
+        "metadata": {"execution": {"strategy": "export", "cache": "miss"}}
+    }
+
+
+def parse_plan(result):
+    """Extract the traces passed to the next step."""
+    args = json.loads(result[0].text)["next"][0]["args"]
+    return get_artifact_store().get(args["artifact_id"], kind="traces")
+
+
+class TestSplunkTraceSearchByIdsTool:
+    """Test cases for SplunkTraceSearchByIdsTool."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tool = SplunkTraceSearchByIdsTool()
+
+    @pytest.mark.asyncio
+    async def test_found_ids_are_dropped_from_wider_windows(self):
+        """Test that older windows only search IDs that had no events."""
+        calls = []
+
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            calls.append((query, earliest_time, latest_time))
+            if earliest_time == "-24h":
+                return search_result(['{"traceId": "t1", "msg": "a"}'])
+            return search_result(['{"traceId": "t2", "msg": "b"}'])
+
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            result = await self.tool.execute({"field_name": "traceId", "ids": ["t1", "t2"]})
+
+        assert [(earliest, latest) for _, earliest, latest in calls] == [("-24h", "now"), ("-48h", "-24h")]
+        assert "(t2)" in calls[1][0] and "t1" not in calls[1][0]
+        traces = {trace["id"]: trace["events"] for trace in parse_plan(result)}
+        assert traces["t1"] == [{"traceId": "t1", "msg": "a"}]
+        assert traces["t2"] == [{"traceId": "t2", "msg": "b"}]
+
+    @pytest.mark.asyncio
+    async def test_chunks_run_concurrently(self):
+        """Test that chunks of one window are in flight together and timed."""
+        in_flight = []
+        peak = []
+
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            in_flight.append(query)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(query)
+            return search_result([f"id-{n} seen" for n in range(60)])
+
+        ids = [f"id-{n}" for n in range(60)]
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            result = await self.tool.execute({"field_name": "traceId", "ids": ids})
+
+        assert max(peak) > 1
+        stats = json.loads(result[1].text)
+        assert stats["searches"] == 3
+        assert all("elapsed_seconds" in chunk for chunk in stats["chunks"])
+        assert stats["ids_without_events"] == []
+
+    @pytest.mark.asyncio
+    async def test_missing_ids_are_reported(self):
+        """Test that IDs never found are listed after all windows are tried."""
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            return search_result([])
+
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            result = await self.tool.execute({"field_name": "traceId", "ids": ["t1"]})
+
+        stats = json.loads(result[1].text)
+        assert stats["searches"] == 4
+        assert stats["chunks"][-1]["mode"] == "scan"
+        assert (stats["chunks"][-1]["earliest_time"], stats["chunks"][-1]["latest_time"]) == ("-72h", "now")
+        assert stats["ids_without_events"] == ["t1"]
+        assert parse_plan(result) == [{"id": "t1", "events": []}]
+
+    @pytest.mark.asyncio
+    async def test_raw_scan_only_for_ids_without_term_hits(self):
+        """Test that the like() fallback searches only IDs the term lookups missed."""
+        calls = []
+
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            calls.append(query)
+            if "| where" in query:
+                return search_result(["key=ledgert2x"])
+            return search_result(['{"traceId": "t1"}'])
+
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            result = await self.tool.execute({"field_name": "traceId", "ids": ["t1", "t2"],
+                                              "indices": ["payments"]})
+
+        assert len(calls) == 4
+        assert all(query.startswith("search index=* ") for query in calls[:3])
+        assert calls[-1].startswith('search (index="payments") | where')
+        assert 'like(_raw, "%t2%")' in calls[-1] and "t1" not in calls[-1]
+        assert json.loads(result[1].text)["ids_without_events"] == []
+
+    @pytest.mark.asyncio
+    async def test_scan_mode_skips_term_lookup(self):
+        """Test that lookup_mode='scan' matches _raw in every window and adds no extra pass."""
+        calls = []
+
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            calls.append(query)
+            return search_result([])
+
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            await self.tool.execute({"field_name": "traceId", "ids": ["t1"], "lookup_mode": "scan"})
+
+        assert len(calls) == 3
+        assert all("like(_raw" in query for query in calls)
+
+    @pytest.mark.asyncio
+    async def test_invalid_lookup_mode(self):
+        """Test that an unknown lookup mode is rejected."""
+        result = await self.tool.execute({"field_name": "traceId", "ids": ["t1"], "lookup_mode": "fuzzy"})
+
+        assert "lookup_mode" in result[0].text
+
+    def test_term_spl_restricted_to_indices(self):
+        """Test that term lookups search only the given indices with indexed tokens."""
+        uuid = "c6f87718-6d76-b07e-881e-d162ae2eb154"
+        spl = self.tool._build_trace_spl(["4cdd2055930d6eaf14f4733f3e7d1bfb", uuid], ["payments", "auth"])
+
+        assert spl == (f'search (index="payments" OR index="auth") '
+                       f'(4cdd2055930d6eaf14f4733f3e7d1bfb OR TERM({uuid})) | sort _time')
+        assert "like(" not in spl
+
+    def test_term_token_quotes_major_breakers(self):
+        """Test that IDs TERM() can't match become quoted phrases."""
+        assert self.tool._term_token("abc def") == '"abc def"'
+        assert self.tool._term_token("OR") == '"OR"'
+        assert self.tool._term_token("a=b") == "TERM(a=b)"
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookup_searches_only_new_ids(self):
+        """Test that IDs fetched before are served from the trace cache."""
+        calls = []
+
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            calls.append(query)
+            return search_result([f'{{"traceId": "{i}"}}' for i in ("t1", "t2") if i in query])
+
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            await self.tool.execute({"field_name": "traceId", "ids": ["t1"]})
+            calls.clear()
+            result = await self.tool.execute({"field_name": "traceId", "ids": ["t1", "t2"]})
+
+        assert calls == ["search index=* (t2) | sort _time"]
+        traces = {trace["id"]: trace["events"] for trace in parse_plan(result)}
+        assert traces == {"t1": [{"traceId": "t1"}], "t2": [{"traceId": "t2"}]}
+        cache_stats = json.loads(result[1].text)["trace_cache"]
+        assert (cache_stats["ids_cached"], cache_stats["ids_searched"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_cached_lookup_reports_cached_range(self):
+        """Test that IDs served only from the cache report the range their events were cached for."""
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            return search_result([])
+
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            await self.tool.execute({"field_name": "traceId", "ids": ["t1"]})
+            result = await self.tool.execute({"field_name": "traceId", "ids": ["t1"]})
+
+        assert json.loads(result[1].text)["trace_cache"]["ids_cached"] == 1
+        assert "in time range -72h → now" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_cache_bypass_and_only(self):
+        """Test that 'bypass' searches cached IDs again and 'only' never searches."""
+        calls = []
+
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            calls.append(query)
+            return search_result([])
+
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            await self.tool.execute({"field_name": "traceId", "ids": ["t1"]})
+            searches = len(calls)
+            await self.tool.execute({"field_name": "traceId", "ids": ["t1"]})
+            assert len(calls) == searches
+            await self.tool.execute({"field_name": "traceId", "ids": ["t1"], "cache": "bypass"})
+            assert len(calls) == 2 * searches
+            result = await self.tool.execute({"field_name": "traceId", "ids": ["t2"], "cache": "only"})
+
+        assert len(calls) == 2 * searches
+        stats = json.loads(result[1].text)
+        assert (stats["ids_without_events"], stats["uncached_ids"]) == ([], ["t2"])
+
+    @pytest.mark.asyncio
+    async def test_truncated_chunk_is_not_cached(self):
+        """Test that IDs of a chunk cut off at max_results are not cached as complete or empty."""
+        async def fake_query(query, earliest_time, latest_time, max_results):
+            if earliest_time == "-24h":
+                return search_result(['{"traceId": "t1"}'] * max_results)
+            return search_result([])
+
+        with patch.object(trace_module, 'execute_splunk_query', fake_query):
+            first = await self.tool.execute({"field_name": "traceId", "ids": ["t1", "t2"]})
+            cached = await self.tool.execute({"field_name": "traceId", "ids": ["t1", "t2"], "cache": "only"})
+
+        assert json.loads(first[1].text)["chunks"][0]["truncated"]
+        stats = json.loads(cached[1].text)
+        assert (stats["ids_without_events"], stats["uncached_ids"]) == ([], ["t1", "t2"])
+
+    def test_grouping_uses_fields_then_raw(self):
+        """Test that lines go to the ID in their field, else to every ID they mention."""
+        raw_logs = [
+            '{"traceId": "t1", "msg": "calls t2"}',
+            "ERROR request_id=t2 failed",
+            "batch t1 t2 retried",
+            "unrelated"
+        ]
+
+        traces, grouping = self.tool._group_raw_logs_by_ids(raw_logs, ["t1", "t2"])
+
+        events = {trace["id"]: trace["events"] for trace in traces}
+        assert events["t1"][0] == {"traceId": "t1", "msg": "calls t2"}
+        assert [e["raw"] for e in events["t1"][1:]] == ["batch t1 t2 retried"]
+        assert [e["raw"] for e in events["t2"]] == ["ERROR request_id=t2 failed", "batch t1 t2 retried"]
+        assert grouping == {"lines": 4, "by_field": 2, "by_raw": 1, "unmatched": 1, "multi_id": 1, "dropped": 0}
+
+    def test_multi_id_policies(self):
+        """Test that 'first' keeps the first ID and 'drop' skips multi-ID lines."""
+        raw_logs = ["batch t2 t1 retried"]
+
+        first, _ = self.tool._group_raw_logs_by_ids(raw_logs, ["t1", "t2"], multi_id_policy="first")
+        dropped, grouping = self.tool._group_raw_logs_by_ids(raw_logs, ["t1", "t2"], multi_id_policy="drop")
+
+        assert [len(trace["events"]) for trace in first] == [0, 1]
+        assert all(not trace["events"] for trace in dropped)
+        assert grouping["dropped"] == 1
@@ -1,9 +1,12 @@
 """Unit tests for utility functions."""
 
+import time
 import pytest
+from datetime import datetime
 from src.splunk.utils import (
     validate_spl_query,
     parse_time_range,
+    resolve_time,
     format_search_results,
     extract_field_statistics,
     generate_spl_suggestions,
@@ -110,6 +113,38 @@ class TestTimeRangeParsing:
         assert parse_time_range("") is None
         assert parse_time_range(None) is None
 
+    def test_resolve_relative_times(self):
+        """Test resolving relative times against a reference time."""
+        now = 1700000000.0
+        assert resolve_time("now", now) == now
+        assert resolve_time("-24h", now) == now - 86400
+        assert resolve_time("-5m", now) == now - 300
+        snapped = resolve_time("-5m@m", now)
+        assert snapped <= now - 300 and snapped % 60 == 0
+    
+    def test_resolve_absolute_times(self):
+        """Test resolving absolute and epoch times."""
+        assert resolve_time("1690000000") == 1690000000.0
+        assert resolve_time("2023-01-01T12:00:00.000Z") == 1672574400.0
+        assert resolve_time("2023-01-01T12:00:00") == datetime(2023, 1, 1, 12).timestamp()
+
+    def test_resolve_utc_times_ignore_local_timezone(self, monkeypatch):
+        """Test that 'Z' timestamps resolve to the same epoch whatever the host's timezone."""
+        if not hasattr(time, 'tzset'):
+            pytest.skip("time.tzset is not available")
+        monkeypatch.setenv("TZ", "America/New_York")
+        time.tzset()
+        try:
+            assert resolve_time("2023-01-01T12:00:00.000Z") == 1672574400.0
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+    
+    def test_resolve_unresolvable_times(self):
+        """Test that open-ended and real-time modifiers do not resolve."""
+        for time_str in ["earliest", "latest", "rt", "rt-5m", "invalid"]:
+            assert resolve_time(time_str) is None, f"Time '{time_str}' should not resolve"
+
 
 class TestResultFormatting:
     """Test search result formatting."""
@@ -0,0 +1,118 @@
+"""Unit tests for index-time watermarks."""
+
+import time
+from unittest.mock import Mock
+
+from src.splunk.watermark import IndexTimeWatermark
+from src.tools.monitor import MonitoringSession
+
+NOW = 1760097600
+
+
+def event(indextime, offset, event_time=None, bucket="main~42~ABC"):
+    """Raw event as returned by the REST API."""
+    return {"_indextime": str(indextime), "_cd": f"42:{offset}", "_bkt": bucket,
+            "_time": str(event_time if event_time is not None else indextime), "_raw": f"ERROR event {offset}"}
+
+
+class TestIndexTimeWatermark:
+    """Test cases for IndexTimeWatermark."""
+
+    def test_first_window_covers_the_interval(self):
+        """Test that the first check searches one interval of index time with lateness on _time."""
+        watermark = IndexTimeWatermark(lateness=300, overlap=10)
+
+        query, time_range, index_latest = watermark.plan("index=main  error", 60, NOW + 0.7)
+
+        assert query == f"search index_earliest={NOW - 60} index_latest={NOW} index=main error"
+        assert time_range == {"earliest_time": str(NOW - 360), "latest_time": str(NOW + 300)}
+        assert index_latest == NOW
+
+    def test_overlap_is_deduplicated(self):
+        """Test that events re-read in the overlap are delivered once."""
+        watermark = IndexTimeWatermark(overlap=10)
+        first = [event(NOW - 5 + n, n) for n in range(5)]
+        assert watermark.accept(first, NOW) == first
+
+        query, _, index_latest = watermark.plan("index=main error", 60, NOW + 60)
+        second = [event(NOW - 2, 3), event(NOW - 1, 4), event(NOW + 30, 5)]
+        fresh = watermark.accept(second, index_latest)
+
+        assert f"index_earliest={NOW - 10} " in query
+        assert fresh == [second[2]]
+        assert watermark.get_stats()["duplicates"] == 2
+
+    def test_same_offset_in_other_bucket_is_distinct(self):
+        """Test that _bkt breaks ties between events with equal _indextime and _cd."""
+        watermark = IndexTimeWatermark()
+
+        fresh = watermark.accept([event(NOW, 1), event(NOW, 1, bucket="main~43~DEF")], NOW + 1)
+
+        assert len(fresh) == 2
+
+    def test_late_event_is_delivered(self):
+        """Test that an event indexed late, with an old _time, is delivered and counted."""
+        watermark = IndexTimeWatermark()
+        watermark.accept([event(NOW - 30, 1)], NOW)
+
+        late = event(NOW + 20, 2, event_time=NOW - 200)
+        fresh = watermark.accept([late], NOW + 60)
+
+        assert fresh == [late]
+        assert watermark.get_stats()["late"] == 1
+
+    def test_dedup_set_is_bounded(self):
+        """Test that keys below the watermark's overlap are forgotten."""
+        watermark = IndexTimeWatermark(overlap=10)
+        for tick in range(50):
+            end = NOW + tick * 60
+            watermark.accept([event(end - 60 + n, tick * 100 + n) for n in range(0, 60, 2)], end)
+
+        assert watermark.get_stats()["dedup_keys"] == 5
+
+    def test_unkeyed_results_get_back_to_back_windows(self):
+        """Test that results without _indextime pass through and windows don't overlap."""
+        watermark = IndexTimeWatermark(overlap=10)
+        rows = [{"host": "web-1", "count": "3"}]
+
+        assert watermark.accept(rows, NOW) == rows
+        query, _, _ = watermark.plan("index=main error | stats count by host", 60, NOW + 60)
+
+        assert watermark.keyed is False
+        assert f"index_earliest={NOW} " in query
+
+    def test_generating_commands_do_not_apply(self):
+        """Test that queries starting with a generating command aren't windowed on _indextime."""
+        assert not IndexTimeWatermark.applies("| tstats count where index=main")
+        assert IndexTimeWatermark.applies("search index=main")
+
+
+class TestMonitoringWatermark:
+    """Test that monitoring checks use the watermark."""
+
+    def test_checks_deliver_each_event_once(self):
+        """Test that overlapping checks fill the buffer with each event once."""
+        session = MonitoringSession("index=main error", 60, watermark=IndexTimeWatermark(overlap=30))
+        now = int(time.time())
+        client = Mock()
+        client.execute_search.side_effect = [[event(now - 5, 1), event(now - 4, 2)],
+                                             [event(now - 4, 2), event(now - 3, 3)]]
+
+        session._perform_check(client)
+        session._perform_check(client)
+
+        assert [r["_cd"] for r in session.results_buffer] == ["42:1", "42:2", "42:3"]
+        query = client.execute_search.call_args.args[0]
+        assert query.startswith("search index_earliest=") and query.endswith(" index=main error")
+        assert session.get_status()["watermark"]["duplicates"] == 1
+
+    def test_generating_query_uses_wall_clock(self):
+        """Test that a tstats monitor keeps relative wall-clock windows."""
+        session = MonitoringSession("| tstats count where index=main", 60)
+        client = Mock()
+        client.execute_search.return_value = []
+
+        session._perform_check(client)
+
+        assert client.execute_search.call_args.args[0] == "| tstats count where index=main"
+        assert client.execute_search.call_args.kwargs["earliest_time"] == "-60s"